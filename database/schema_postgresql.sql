@@ -62,6 +62,9 @@ CREATE INDEX IF NOT EXISTS idx_applications_is_training ON Applications(is_train
 CREATE INDEX IF NOT EXISTS idx_applications_status ON Applications(status);
 CREATE INDEX IF NOT EXISTS idx_applications_uploaded_date ON Applications(uploaded_date);
 CREATE INDEX IF NOT EXISTS idx_applications_email ON Applications(email);
+-- Keyset order of the student list's default (name) sort
+CREATE INDEX IF NOT EXISTS idx_applications_sort_name
+ON Applications(LOWER(COALESCE(last_name, '') || ' ' || COALESCE(first_name, '') || ' ' || COALESCE(applicant_name, '')), application_id);
 -- Index for accurate student record matching
 CREATE INDEX IF NOT EXISTS idx_app_student_match 
 ON Applications(first_name, last_name, high_school, state_code);
@@ -419,6 +422,105 @@ CREATE INDEX IF NOT EXISTS idx_file_upload_audit_match_confidence ON file_upload
 CREATE INDEX IF NOT EXISTS idx_file_upload_audit_human_reviewed ON file_upload_audit(human_reviewed);
 CREATE INDEX IF NOT EXISTS idx_file_upload_audit_match_status ON file_upload_audit(match_status);
 
+-- Chunked upload sessions — which chunks of a resumable upload arrived
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    upload_id VARCHAR(64) PRIMARY KEY,
+    filename VARCHAR(500) NOT NULL,
+    application_type VARCHAR(20) DEFAULT '2026',
+    total_chunks INTEGER NOT NULL,
+    chunk_size INTEGER,
+    total_size BIGINT,
+    file_sha256 VARCHAR(64),
+    status VARCHAR(20) DEFAULT 'open', -- 'open', 'committing', 'committed', 'failed'
+    blob_path VARCHAR(1000),
+    container VARCHAR(255),
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    committed_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS upload_session_chunks (
+    upload_id VARCHAR(64) NOT NULL REFERENCES upload_sessions(upload_id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    chunk_sha256 VARCHAR(64),
+    chunk_bytes INTEGER,
+    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (upload_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_upload_sessions_status ON upload_sessions(status, updated_at);
+
+-- Evaluation checkpoints — latest output of each completed workflow step,
+-- so an interrupted or incremental evaluation resumes without re-running it
+CREATE TABLE IF NOT EXISTS evaluation_checkpoints (
+    application_id INTEGER NOT NULL REFERENCES Applications(application_id) ON DELETE CASCADE,
+    step VARCHAR(100) NOT NULL,
+    output_hash VARCHAR(64),
+    output JSONB, -- the step's result keys, restored verbatim on resume
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (application_id, step)
+);
+
+-- Evaluation summary — typed values derived from agent_results /
+-- student_summary, rewritten whenever agent outputs are persisted so list
+-- and calibration reads never parse agent JSON
+CREATE TABLE IF NOT EXISTS evaluation_summary (
+    application_id INTEGER PRIMARY KEY REFERENCES Applications(application_id) ON DELETE CASCADE,
+    merlin_score NUMERIC(5,2),
+    recommendation VARCHAR(100),
+    school_name VARCHAR(500), -- latest Moana school context
+    tier VARCHAR(50), -- Milo tier
+    nextgen_match NUMERIC(5,2),
+    tiana_readiness NUMERIC(5,2),
+    tiana_stem NUMERIC(5,2),
+    tiana_essay NUMERIC(5,2),
+    rapunzel_rigor NUMERIC(5,2),
+    rapunzel_gpa NUMERIC(5,2),
+    mulan_endorsement NUMERIC(5,2),
+    mulan_recommendation NUMERIC(5,2),
+    moana_opportunity NUMERIC(5,2),
+    milo_match NUMERIC(5,2),
+    milo_academic NUMERIC(5,2),
+    milo_stem NUMERIC(5,2),
+    milo_essay NUMERIC(5,2),
+    milo_rec NUMERIC(5,2),
+    milo_bonus NUMERIC(5,2),
+    gaston_flags INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_evaluation_summary_score ON evaluation_summary(merlin_score);
+CREATE INDEX IF NOT EXISTS idx_evaluation_summary_match ON evaluation_summary(nextgen_match);
+
+-- Governance snapshots — Trust & Governance report payloads shared by every
+-- worker; recomputed when source_version (a stamp of the source tables) no
+-- longer matches or the row is older than GOVERNANCE_SNAPSHOT_MAX_AGE
+CREATE TABLE IF NOT EXISTS governance_snapshots (
+    kind VARCHAR(50) PRIMARY KEY, -- provenance, agent_report, oversight
+    payload JSONB NOT NULL,
+    source_version TEXT,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Background jobs — progress, partial metrics and results of long-running
+-- work (Milo validation, cross-validation), shared by every worker
+CREATE TABLE IF NOT EXISTS background_jobs (
+    job_id VARCHAR(64) PRIMARY KEY,
+    kind VARCHAR(100) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running', -- running, done, error
+    params JSONB,
+    progress JSONB,
+    result JSONB,
+    error TEXT,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- heartbeat
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_background_jobs_kind ON background_jobs(kind, started_at DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_running ON background_jobs(kind) WHERE status = 'running';
+
 -- =====================================================================
 -- Views for Common Queries
 -- =====================================================================
@@ -465,6 +567,26 @@ CREATE INDEX IF NOT EXISTS idx_telem_created ON telemetry_events (created_at DES
 CREATE INDEX IF NOT EXISTS idx_telem_agent   ON telemetry_events (agent_name);
 CREATE INDEX IF NOT EXISTS idx_telem_model   ON telemetry_events (model);
 
+-- Per-minute rollup of telemetry_events, refreshed by the telemetry sink
+-- after each batch; the dashboard aggregates read this instead of raw events.
+CREATE TABLE IF NOT EXISTS telemetry_rollup_minute (
+    bucket_start    TIMESTAMPTZ     NOT NULL,
+    agent_name      VARCHAR(200)    NOT NULL,
+    model           VARCHAR(200)    NOT NULL,
+    call_count      INTEGER         DEFAULT 0,
+    success_count   INTEGER         DEFAULT 0,
+    input_tokens    BIGINT          DEFAULT 0,
+    output_tokens   BIGINT          DEFAULT 0,
+    total_tokens    BIGINT          DEFAULT 0,
+    duration_sum_ms DOUBLE PRECISION DEFAULT 0,
+    duration_min_ms REAL            DEFAULT 0,
+    duration_max_ms REAL            DEFAULT 0,
+    p50_ms          REAL            DEFAULT 0,
+    p95_ms          REAL            DEFAULT 0,
+    last_event_at   TIMESTAMPTZ,
+    PRIMARY KEY (bucket_start, agent_name, model)
+);
+
 -- =====================================================================
 -- End of Schema Definition
 -- =====================================================================
@@ -83,6 +83,12 @@ ALTER TABLE school_enriched_data ADD COLUMN IF NOT EXISTS
 ALTER TABLE school_enriched_data ADD COLUMN IF NOT EXISTS 
   last_moana_validation TIMESTAMP;
 
+-- Input fingerprints: Naveen / Moana results are reused while these match
+ALTER TABLE school_enriched_data ADD COLUMN IF NOT EXISTS
+  enrichment_fingerprint VARCHAR(64);  -- source fields + Naveen prompt version
+ALTER TABLE school_enriched_data ADD COLUMN IF NOT EXISTS
+  moana_fingerprint VARCHAR(64);       -- source fields + Moana summary prompt version
+
 -- NAEP (Nation's Report Card) state-level assessment data
 ALTER TABLE school_enriched_data ADD COLUMN IF NOT EXISTS
   naep_state_data JSONB;           -- Full NAEP profile returned by NAEPDataClient
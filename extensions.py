@@ -91,6 +91,7 @@ def run_async(coro, timeout: float = 1800.0):
 # ---------------------------------------------------------------------------
 evaluator_agent = None
 orchestrator_agent = None
+_orchestrator_lock = threading.Lock()
 belle_analyzer = None
 mirabel_analyzer = None
 feedback_agent = None
@@ -260,9 +261,19 @@ def get_feedback_agent():
 
 
 def get_orchestrator():
-    """Get or create Smee orchestrator with registered agents."""
+    """Get or create Smee orchestrator with registered agents.
+
+    One orchestrator (and one set of agents, clients and caches) serves
+    every request and pipeline worker in the process; per-evaluation state
+    lives on an ``EvaluationContext``, so concurrent evaluations may share
+    it.  Creation is locked so racing first callers build it only once.
+    """
     global orchestrator_agent
-    if not orchestrator_agent:
+    if orchestrator_agent:
+        return orchestrator_agent
+    with _orchestrator_lock:
+        if orchestrator_agent:
+            return orchestrator_agent
         client = get_ai_client()
         client_mini = get_ai_client_mini()
         model_premium = config.model_tier_premium        # gpt-5.4-pro (160 RPM)
@@ -272,69 +283,69 @@ def get_orchestrator():
         model_lightweight = config.model_tier_lightweight # gpt-5.4-nano (200 RPM)
         model_orchestrator = config.model_tier_orchestrator # gpt-5.4 (500 RPM)
         model_reasoning = config.model_tier_reasoning    # o4-mini (100 RPM)
-        orchestrator_agent = SmeeOrchestrator(
+        orchestrator = SmeeOrchestrator(
             name="Smee",
             client=client,
             model=model_orchestrator,
             db_connection=db
         )
 
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "application_reader",
             TianaApplicationReader(name="Tiana Application Reader", client=client, model=model_workhorse, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "grade_reader",
             RapunzelGradeReader(name="Rapunzel Grade Reader", client=client, model=model_premium, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "school_context",
             MoanaSchoolContext(name="Moana School Context Analyzer", client=client, model=model_fast, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "recommendation_reader",
             MulanRecommendationReader(name="Mulan Recommendation Reader", client=client, model=model_workhorse, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "student_evaluator",
             MerlinStudentEvaluator(name="Merlin Student Evaluator", client=client, model=model_merlin, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "data_scientist",
             MiloDataScientist(name="Milo Data Scientist", client=client, model=model_premium, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "naveen",
             NaveenSchoolDataScientist(name="Naveen School Data Scientist", client=client, model=model_lightweight)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "pocahontas",
             PocahontasCohortAnalyst(name="Pocahontas Cohort Analyst", client=client, model=model_workhorse)
         )
-        orchestrator_agent.register_agent("aurora", AuroraAgent() if AuroraAgent else None)
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent("aurora", AuroraAgent() if AuroraAgent else None)
+        orchestrator.register_agent(
             "gaston",
             GastonEvaluator(name="Gaston Evaluator", client=client, model=model_reasoning)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "fairy_godmother",
             FairyGodmotherDocumentGenerator(db_connection=db, storage_manager=storage)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "bashful",
             BashfulAgent(name="Bashful Agent", client=client, model=model_lightweight, system_prompt="You are Bashful, a helpful assistant in the evaluation system.")
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "belle",
             BelleDocumentAnalyzer(name="Belle Document Analyzer", client=client, model=model_fast, db_connection=db)
         )
-        orchestrator_agent.register_agent(
+        orchestrator.register_agent(
             "scuttle",
             ScuttleFeedbackTriageAgent(name="Scuttle Feedback Triage", client=client, model=model_lightweight)
         )
 
         try:
-            for agent_key, agent_inst in orchestrator_agent.agents.items():
+            for agent_key, agent_inst in orchestrator.agents.items():
                 try:
                     if getattr(agent_inst, 'client', None) is None:
                         agent_inst.client = client
@@ -344,6 +355,9 @@ def get_orchestrator():
         except Exception:
             logger.debug("Error while assigning clients to orchestrator agents", exc_info=True)
 
+        # Publish only once every agent is registered
+        orchestrator_agent = orchestrator
+
     return orchestrator_agent
 
 
@@ -365,7 +379,9 @@ def _make_ocr_callback():
 
     def _ocr(image_bytes: bytes, page_label: str) -> str:
         import base64 as _b64
+        from src.ocr_preprocessing import image_mime_type
         b64_image = _b64.b64encode(image_bytes).decode('utf-8')
+        mime_type = image_mime_type(image_bytes)
         messages = [
             {
                 "role": "system",
@@ -412,7 +428,7 @@ def _make_ocr_callback():
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/png;base64,{b64_image}",
+                            "url": f"data:{mime_type};base64,{b64_image}",
                             "detail": "high"
                         }
                     }
@@ -483,6 +499,7 @@ def start_incremental_processing(application_id: int) -> Dict[str, Any]:
 
     Checks the application's agent_results for agents that returned 'skipped'
     or 'error', then re-runs those plus Merlin + Aurora for fresh synthesis.
+    Every other step is restored from its evaluation checkpoint.
     """
     application = db.get_application(application_id)
     if not application:
@@ -521,7 +538,7 @@ def start_incremental_processing(application_id: int) -> Dict[str, Any]:
                 return
             orchestrator = get_orchestrator()
             result = run_async(orchestrator.coordinate_evaluation(
-                application=app, evaluation_steps=steps_list,
+                application=app, evaluation_steps=steps_list, rerun_steps=steps_list,
             ))
             if isinstance(result, dict) and result.get('status') == 'paused':
                 db.update_application_status(application_id, 'Needs Docs')
@@ -15,6 +15,7 @@ from extensions import (
 )
 from src.config import config
 from src.database import db
+from src.job_store import latest_job
 
 logger = logging.getLogger(__name__)
 
@@ -121,13 +122,19 @@ _BACKGROUND_TASKS = [
     {
         'id': 'batch_naveen',
         'label': 'Batch School Analysis',
-        'state_file': os.path.join(tempfile.gettempdir(), 'batch_naveen_state.json'),
+        'job_kind': 'school_enrichment',
         'poll_url': '/api/schools/batch-naveen-moana',
     },
+    {
+        'id': 'seed_academics',
+        'label': 'Academic Data Lookup',
+        'job_kind': 'seed_academics',
+        'poll_url': '/api/schools/seed-academics',
+    },
     {
         'id': 'milo_validation',
         'label': 'Milo Validation',
-        'state_file': os.path.join(tempfile.gettempdir(), 'milo_validation_state.json'),
+        'job_kind': 'milo_validation',
         'poll_url': '/api/milo/validate',
     },
     {
@@ -157,12 +164,39 @@ _BACKGROUND_TASKS = [
     {
         'id': 'cross_validation',
         'label': 'Milo Cross-Validation',
-        'state_file': os.path.join(tempfile.gettempdir(), 'cross_validation_state.json'),
+        'job_kind': 'cross_validation',
         'poll_url': '/api/calibration/cross-validate',
     },
 ]
 
 
+# Finished job-store tasks stay in the banner this long after they end
+_FINISHED_JOB_BANNER_SECONDS = 3600
+
+
+def _read_task_state(task: dict):
+    """Latest state of a background task: its job-store row or its state file."""
+    if task.get('job_kind'):
+        try:
+            job = latest_job(db, task['job_kind'])
+        except Exception:
+            return None
+        if not job:
+            return None
+        finished_ago = job.get('finished_seconds_ago')
+        if finished_ago is not None and float(finished_ago) > _FINISHED_JOB_BANNER_SECONDS:
+            return None
+        return {**job['progress'], 'status': job['status'], 'error': job.get('error')}
+    path = task['state_file']
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
 @admin_bp.route('/api/tasks/status')
 def background_task_status():
     """Return the status of all known background tasks.
@@ -172,13 +206,8 @@ def background_task_status():
     """
     tasks = []
     for task in _BACKGROUND_TASKS:
-        path = task['state_file']
-        if not os.path.isfile(path):
-            continue
-        try:
-            with open(path, 'r') as f:
-                state = json.load(f)
-        except Exception:
+        state = _read_task_state(task)
+        if not state:
             continue
         status = state.get('status') or state.get('state', 'unknown')
         if status in ('idle', 'unknown'):
@@ -390,11 +419,9 @@ def team_page():
 def student_counts():
     """Return quick counts for the data management dashboard."""
     try:
-        all_students = db.get_formatted_student_list()
-        training = db.get_formatted_student_list(is_training=True)
         return jsonify({
-            'total': len(all_students) if all_students else 0,
-            'training': len(training) if training else 0
+            'total': db.get_student_list_counts()['total'],
+            'training': db.get_student_list_counts(is_training=True)['total'],
         })
     except Exception as e:
         logger.error(f"student_counts error: {e}")
@@ -591,12 +618,13 @@ def start_retention_scheduler():
 # ---------------------------------------------------------------------------
 @admin_bp.route('/api/admin/db-status', methods=['GET'])
 def db_status():
-    """Check if the database is reachable."""
+    """Check if the database is reachable (plus audit-trail writer backlog)."""
     try:
         db.execute_query("SELECT 1")
-        return jsonify({'status': 'online'})
+        return jsonify({'status': 'online', 'audit_writer': db.audit_writer_stats()})
     except Exception as e:
-        return jsonify({'status': 'offline', 'error': str(e)}), 503
+        return jsonify({'status': 'offline', 'error': str(e),
+                        'audit_writer': db.audit_writer_stats()}), 503
 
 
 @admin_bp.route('/api/admin/start-database', methods=['POST'])
@@ -25,8 +25,9 @@ from src.config import config
 from src.database import db
 from src.storage import storage
 from src.document_processor import DocumentProcessor
-from src.utils import safe_load_json
+from src.student_detail import agent_rows, load_student_detail
 from src.agents.agent_requirements import AgentRequirements
+from src.agents.cancellation import acquire_unless_cancelled, cancel_scope
 
 logger = logging.getLogger(__name__)
 
@@ -122,18 +123,121 @@ def evaluate_all():
 
 
 
+# Rows per page on /students, /training and /api/students
+STUDENT_PAGE_SIZE = int(os.getenv("STUDENT_PAGE_SIZE", "100"))
+# Sorts that list highest first when the query string gives no ``dir``
+STUDENT_SORTS_DESCENDING = {'score'}
+
+
+def _bool_arg(value):
+    if value is None or value == '':
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def student_filters_from_request() -> dict:
+    """``get_student_page`` / ``get_student_list_counts`` filters for the list's query string.
+
+    Reads ``school``, ``selected``, ``matched``, ``min_score`` and
+    ``max_score``.  The training page's ``filter`` dropdown (``selected`` /
+    ``not_selected`` / ``matched``) maps onto the same filters.
+
+    Raises:
+        ValueError: malformed score bound.
+    """
+    args = request.args
+    legacy = args.get('filter', '')
+    filters = {
+        'school': args.get('school', '').strip() or None,
+        'selected': _bool_arg(args.get('selected')),
+        'historical_match': _bool_arg(args.get('matched')),
+        'min_score': float(args['min_score']) if args.get('min_score') else None,
+        'max_score': float(args['max_score']) if args.get('max_score') else None,
+    }
+    if legacy in ('selected', 'not_selected'):
+        filters['selected'] = legacy == 'selected'
+    elif legacy == 'matched':
+        filters['historical_match'] = True
+    return filters
+
+
+def student_page_from_request(is_training: bool, default_sort: str = 'name') -> dict:
+    """``db.get_student_page`` for the list's query string.
+
+    Reads ``search``, ``sort``, ``dir`` (score defaults to ``desc``, the
+    rest to ``asc``), ``limit`` and ``after`` (the previous page's
+    ``next_cursor``), plus the filters read by
+    ``student_filters_from_request``.
+
+    Raises:
+        ValueError: unknown sort, malformed number or stale cursor.
+    """
+    args = request.args
+    sort = args.get('sort') or default_sort
+    direction = args.get('dir') or ('desc' if sort in STUDENT_SORTS_DESCENDING else 'asc')
+    return db.get_student_page(
+        is_training=is_training,
+        search_query=args.get('search', '').strip() or None,
+        sort=sort,
+        descending=direction == 'desc',
+        filters=student_filters_from_request(),
+        after=args.get('after') or None,
+        limit=args.get('limit', STUDENT_PAGE_SIZE, type=int),
+    )
+
+
+def student_page_urls(page: dict) -> dict:
+    """``next_page_url`` / ``first_page_url`` for the list template, keeping the query string."""
+    query = request.args.to_dict()
+    query.pop('after', None)
+    urls = {'next_page_url': None, 'first_page_url': None}
+    if page.get('next_cursor'):
+        urls['next_page_url'] = url_for(request.endpoint, **query, after=page['next_cursor'])
+    if request.args.get('after'):
+        urls['first_page_url'] = url_for(request.endpoint, **query)
+    return urls
+
+
+@applications_bp.route('/api/students', methods=['GET'])
+def api_students():
+    """Keyset-paginated student list.
+
+    Query: ``view`` (``applications`` | ``training``), ``sort`` (name,
+    school, score, selected, uploaded), ``dir`` (asc | desc; score defaults
+    to desc), ``search``, ``school``, ``selected``, ``matched``,
+    ``min_score``, ``max_score``, ``limit`` (max 500) and ``after`` — the
+    ``next_cursor`` of the previous page.  Rows carry only list columns; agent JSON never leaves the DB.
+    """
+    is_training = request.args.get('view') == 'training'
+    try:
+        page = student_page_from_request(is_training, default_sort='school' if is_training else 'name')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error('Student page failed: %s', e, exc_info=True)
+        return jsonify({'error': 'An internal error occurred'}), 500
+    return jsonify(page)
+
+
 @applications_bp.route('/students')
 def students():
-    """View all students sorted by last name."""
+    """View 2026 students, one keyset page at a time (sorted by last name by default)."""
     try:
         search_query = request.args.get('search', '').strip()
-        
-        # Get formatted student list sorted by last name
-        students = db.get_formatted_student_list(is_training=False, search_query=search_query if search_query else None)
-        
+        try:
+            filters = student_filters_from_request()
+            page = student_page_from_request(is_training=False)
+        except ValueError:
+            # Stale cursor or bad sort from an old link: start over
+            filters = {}
+            page = db.get_student_page(is_training=False, search_query=search_query or None,
+                                       limit=STUDENT_PAGE_SIZE)
+        counts = db.get_student_list_counts(is_training=False, search_query=search_query or None,
+                                            filters=filters)
+
         # CRITICAL: Defensive filtering to ensure test data NEVER appears in 2026 production view
         filtered_students = []
-        for student in students:
+        for student in page['students']:
             is_test = student.get('is_test_data')
             is_training = student.get('is_training_example')
             
@@ -148,7 +252,10 @@ def students():
         
         return render_template('students.html', 
                              students=filtered_students,
-                             search_query=search_query)
+                             search_query=search_query,
+                             list_sort=request.args.get('sort') or 'name',
+                             list_total=counts['total'],
+                             **student_page_urls(page))
     except Exception as e:
         logger.error('Error loading students: %s', e, exc_info=True); flash('An error occurred while loading students', 'error')
         return render_template('students.html', students=[], search_query='')
@@ -176,11 +283,26 @@ def process_student(application_id):
 
 
 
-# Serialise background processing — the Smee orchestrator is a singleton
-# whose instance attributes (evaluation_results, workflow_state, etc.) are
-# not thread-safe.  A threading.Semaphore(1) ensures only one student is
-# evaluated at a time; additional submissions queue up in FIFO order.
-_process_semaphore = threading.Semaphore(1)
+# Bound background processing.  The Smee orchestrator singleton keeps each
+# evaluation's state on its own EvaluationContext, so several students can
+# be evaluated at once; the cap only protects model rate limits.  Further
+# submissions queue up until a slot frees.
+PROCESS_MAX_CONCURRENT = int(os.getenv("PROCESS_MAX_CONCURRENT", "2"))
+_process_semaphore = threading.Semaphore(PROCESS_MAX_CONCURRENT)
+
+
+def _write_cancelled_state(st_path, app_id):
+    """Mark a background job cancelled in its state file and the database."""
+    try:
+        with open(st_path) as f:
+            s = json.load(f)
+    except Exception:
+        s = {'application_id': app_id}
+    s['status'] = 'cancelled'
+    s['completed_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    with open(st_path, 'w') as f:
+        json.dump(s, f, default=str)
+    db.update_application_status(app_id, 'Cancelled')
 
 
 @applications_bp.route('/api/process/<int:application_id>', methods=['POST'])
@@ -231,98 +353,105 @@ def api_process_student(application_id):
         def _background_process(app_id, app_data, st_path):
             """Run the full agent pipeline off the request thread.
 
-            Acquires ``_process_semaphore`` so only one evaluation runs at a
-            time — the Smee orchestrator singleton is not safe for concurrent
-            use.  Queued jobs update their state file to ``queued`` while
-            waiting for the lock.
+            Acquires ``_process_semaphore`` so at most
+            ``PROCESS_MAX_CONCURRENT`` evaluations run at once.  Queued jobs
+            update their state file to ``queued`` while waiting for a slot;
+            ``/api/pipeline/<id>/cancel`` takes them out of the queue.
             """
-            # Mark as queued while waiting for the lock
-            try:
-                with open(st_path) as f:
-                    s = json.load(f)
-                s['status'] = 'queued'
-                with open(st_path, 'w') as f:
-                    json.dump(s, f)
-            except Exception:
-                pass
-
-            _process_semaphore.acquire()
-            try:
-                # Update status to running now that we hold the lock
+            with cancel_scope(app_id) as token:
+                # Mark as queued while waiting for the lock
                 try:
                     with open(st_path) as f:
                         s = json.load(f)
-                    s['status'] = 'running'
-                    s['started_processing_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                    s['status'] = 'queued'
                     with open(st_path, 'w') as f:
                         json.dump(s, f)
                 except Exception:
                     pass
 
-                orchestrator = get_orchestrator()
-                evaluation_steps = [
-                    'application_reader', 'grade_reader',
-                    'recommendation_reader', 'school_context',
-                    'data_scientist', 'student_evaluator', 'aurora',
-                ]
-
-                def _progress(update):
-                    """Write incremental progress to state file."""
+                if not acquire_unless_cancelled(_process_semaphore, token):
+                    # Cancelled while queued — never took a slot
+                    _write_cancelled_state(st_path, app_id)
+                    return
+                try:
+                    # Update status to running now that we hold the lock
                     try:
                         with open(st_path) as f:
                             s = json.load(f)
-                        agent = update.get('agent')
-                        utype = update.get('type', '')
-                        if agent:
-                            s['current_agent'] = agent
-                        if utype == 'agent_complete' and agent:
-                            done = s.get('agents_completed', [])
-                            if agent not in done:
-                                done.append(agent)
-                            s['agents_completed'] = done
+                        s['status'] = 'running'
+                        s['started_processing_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
                         with open(st_path, 'w') as f:
                             json.dump(s, f)
                     except Exception:
-                        pass  # progress tracking is best-effort
+                        pass
 
-                result = run_async(
-                    orchestrator.coordinate_evaluation(
-                        application=app_data,
-                        evaluation_steps=evaluation_steps,
-                        progress_callback=_progress,
+                    orchestrator = get_orchestrator()
+                    evaluation_steps = [
+                        'application_reader', 'grade_reader',
+                        'recommendation_reader', 'school_context',
+                        'data_scientist', 'student_evaluator', 'aurora',
+                    ]
+
+                    def _progress(update):
+                        """Write incremental progress to state file."""
+                        try:
+                            with open(st_path) as f:
+                                s = json.load(f)
+                            agent = update.get('agent')
+                            utype = update.get('type', '')
+                            if agent:
+                                s['current_agent'] = agent
+                            if utype == 'agent_complete' and agent:
+                                done = s.get('agents_completed', [])
+                                if agent not in done:
+                                    done.append(agent)
+                                s['agents_completed'] = done
+                            with open(st_path, 'w') as f:
+                                json.dump(s, f)
+                        except Exception:
+                            pass  # progress tracking is best-effort
+
+                    result = run_async(
+                        orchestrator.coordinate_evaluation(
+                            application=app_data,
+                            evaluation_steps=evaluation_steps,
+                            progress_callback=_progress,
+                        )
                     )
-                )
 
-                with open(st_path) as f:
-                    s = json.load(f)
+                    with open(st_path) as f:
+                        s = json.load(f)
 
-                if result.get('status') == 'paused':
-                    s['status'] = 'paused'
-                    s['missing_fields'] = result.get('missing_fields')
-                    s['message'] = result.get('message')
-                else:
-                    db.update_application_status(app_id, 'Completed')
-                    s['status'] = 'complete'
+                    if result.get('status') == 'cancelled':
+                        db.update_application_status(app_id, 'Cancelled')
+                        s['status'] = 'cancelled'
+                    elif result.get('status') == 'paused':
+                        s['status'] = 'paused'
+                        s['missing_fields'] = result.get('missing_fields')
+                        s['message'] = result.get('message')
+                    else:
+                        db.update_application_status(app_id, 'Completed')
+                        s['status'] = 'complete'
 
-                s['result'] = result
-                s['completed_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-                with open(st_path, 'w') as f:
-                    json.dump(s, f, default=str)
+                    s['result'] = result
+                    s['completed_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                    with open(st_path, 'w') as f:
+                        json.dump(s, f, default=str)
 
-            except Exception as exc:
-                logger.error("Background process failed for %s: %s", app_id, exc, exc_info=True)
-                try:
-                    with open(st_path) as f:
-                        s = json.load(f)
-                except Exception:
-                    s = {'application_id': app_id}
-                s['status'] = 'error'
-                s['error'] = str(exc)
-                s['completed_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-                with open(st_path, 'w') as f:
-                    json.dump(s, f, default=str)
-            finally:
-                _process_semaphore.release()
+                except Exception as exc:
+                    logger.error("Background process failed for %s: %s", app_id, exc, exc_info=True)
+                    try:
+                        with open(st_path) as f:
+                            s = json.load(f)
+                    except Exception:
+                        s = {'application_id': app_id}
+                    s['status'] = 'error'
+                    s['error'] = str(exc)
+                    s['completed_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                    with open(st_path, 'w') as f:
+                        json.dump(s, f, default=str)
+                finally:
+                    _process_semaphore.release()
 
         thread = threading.Thread(
             target=_background_process,
@@ -356,7 +485,7 @@ def api_process_student_status(application_id):
     try:
         with open(state_path) as f:
             state = json.load(f)
-        status_code = 200 if state.get('status') in ('complete', 'error', 'paused') else 202
+        status_code = 200 if state.get('status') in ('complete', 'error', 'paused', 'cancelled') else 202
         return jsonify(state), status_code
     except (json.JSONDecodeError, OSError) as exc:
         logger.warning("Could not read process state for %s: %s", application_id, exc)
@@ -775,581 +904,28 @@ def api_resume_evaluation(application_id):
 
 @applications_bp.route('/application/<int:application_id>')
 def student_detail(application_id):
-    """View details of a student application with all agent evaluations."""
+    """View details of a student application with all agent evaluations.
+
+    The page context comes from ``load_student_detail``: one query for the
+    application and every agent table, cached until any of them changes.
+    """
     try:
-        logger.debug(f"student_detail called with application_id={application_id}")
-        application = db.get_application(application_id)
-        logger.debug(f"db.get_application returned: {application is not None}")
-        
-        if not application:
+        view = load_student_detail(db, application_id)
+        if not view:
             logger.warning(f"Application {application_id} not found")
             flash('Student not found', 'error')
             return redirect(url_for('applications.students'))
-        
-        # CRITICAL: Sanitize application dict to prevent circular references during template rendering
-        # Convert to plain dict to break any DB row object references
-        try:
-            application = dict(application)
-        except Exception:
-            pass  # Already a plain dict
-        
-        logger.debug(f"Application found: {application.get('applicant_name')}")
-        
-        # ===== FETCH SCHOOL ENRICHMENT DATA (PART OF TRAINING DATA CONTEXT) =====
-        school_context = None
-        school_name = application.get('school_name') or application.get('SchoolName')
-        state_code = application.get('state_code') or application.get('StateCode')
-        
-        if school_name:
-            try:
-                # Get enriched school data that informed this evaluation
-                school_data = db.get_school_enriched_data(
-                    school_name=school_name,
-                    state_code=state_code
-                )
-                if school_data:
-                    school_context = {
-                        'school_name': school_data.get('school_name'),
-                        'state_code': school_data.get('state_code'),
-                        'school_district': school_data.get('school_district'),
-                        'enrollment_size': school_data.get('enrollment_size'),
-                        'diversity_index': school_data.get('diversity_index'),
-                        'socioeconomic_level': school_data.get('socioeconomic_level'),
-                        'academic_programs': school_data.get('academic_programs'),
-                        'graduation_rate': school_data.get('graduation_rate'),
-                        'college_placement_rate': school_data.get('college_placement_rate'),
-                        'opportunity_score': school_data.get('opportunity_score'),
-                        'analysis_date': school_data.get('updated_at') or school_data.get('analysis_date'),
-                    }
-                    logger.debug(f"School context loaded for {school_name}: opportunity_score={school_context.get('opportunity_score')}")
-            except Exception as e:
-                logger.debug(f"Could not load school context: {e}")
-        
-        # Fetch all agent evaluations
-        agent_results = {}
-        
-        # Tiana - Application Reader
-        try:
-            tiana_results = db.execute_query(
-                "SELECT *FROM tiana_applications WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                (application_id,)
-            )
-            if tiana_results:
-                agent_results['tiana'] = dict(tiana_results[0])  # Create explicit copy
-                # Normalize common key variants used in templates (underscored vs concatenated)
-                try:
-                    t = agent_results['tiana']
-                    # parsed_json -> parsed_data for consistency
-                    raw_parsed = t.get('parsed_json')
-                    if raw_parsed:
-                        try:
-                            import json as _json
-                            parsed_obj = _json.loads(raw_parsed) if isinstance(raw_parsed, str) else raw_parsed
-                            if isinstance(parsed_obj, dict):
-                                t.setdefault('parsed_data', parsed_obj)
-                        except Exception:
-                            pass
-
-                    # If parsed_data contains a 'content' field which is itself
-                    # a stringified JSON (many agents store nested content there),
-                    # try to decode and promote commonly used keys into the
-                    # top-level tiana dict so templates can access them directly.
-                    try:
-                        pd = t.get('parsed_data')
-                        if isinstance(pd, dict):
-                            inner = None
-                            try:
-                                content = pd.get('content') or pd.get('text') or pd.get('body')
-                                if isinstance(content, str) and content.strip():
-                                    inner = json.loads(content)
-                            except Exception:
-                                inner = None
-
-                            if isinstance(inner, dict):
-                                # Promote essay_summary/readiness_score/confidence
-                                if inner.get('essay_summary') and not t.get('essaysummary'):
-                                    t['essaysummary'] = inner.get('essay_summary')
-                                if inner.get('readiness_score') is not None and not t.get('readinessscore'):
-                                    t['readinessscore'] = inner.get('readiness_score')
-                                if inner.get('confidence') and not t.get('conf'):
-                                    t['conf'] = inner.get('confidence')
-                                # Merge any other simple keys if missing
-                                for k, v in inner.items():
-                                    if k not in t or not t.get(k):
-                                        t.setdefault(k, v)
-                    except Exception:
-                        pass
-
-                    # essay_summary -> essaysummary
-                    if t.get('essay_summary') and not t.get('essaysummary'):
-                        t['essaysummary'] = t.get('essay_summary')
-                    # readiness_score -> readinessscore
-                    if t.get('readiness_score') is not None and not t.get('readinessscore'):
-                        t['readinessscore'] = t.get('readiness_score')
-                    # confidence already uses 'confidence' but keep a defensive alias
-                    if t.get('confidence') and not t.get('conf'):
-                        t['conf'] = t.get('confidence')
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.debug(f"No Tiana data: {e}")
-        
-        # Rapunzel - Grade Reader
-        try:
-            rapunzel_results = db.execute_query(
-                "SELECT * FROM rapunzel_grades WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                (application_id,)
-            )
-            if rapunzel_results:
-                agent_results['rapunzel'] = dict(rapunzel_results[0])  # Create explicit copy
-                # Parse JSON fields if present
-                if agent_results['rapunzel'].get('parsed_json'):
-                    try:
-                        import json
-                        raw = agent_results['rapunzel']['parsed_json']
-                        parsed = json.loads(raw) if isinstance(raw, str) else raw
-                        if isinstance(parsed, dict):
-                            # Merge parsed data into a safe copy
-                            for key, value in parsed.items():
-                                if key not in agent_results['rapunzel'] or not agent_results['rapunzel'].get(key):
-                                    # Ensure we're not creating circular references
-                                    if key != 'rapunzel' and key != 'agent_results':
-                                        agent_results['rapunzel'][key] = value
-                            # If parsed contains an inner 'content' stringified JSON,
-                            # decode and promote keys similarly so templates can read them.
-                            try:
-                                content = parsed.get('content') or parsed.get('text') or parsed.get('body')
-                                if isinstance(content, str) and content.strip():
-                                    inner = json.loads(content)
-                                    if isinstance(inner, dict):
-                                        for k, v in inner.items():
-                                            if k not in agent_results['rapunzel'] or not agent_results['rapunzel'].get(k):
-                                                agent_results['rapunzel'][k] = v
-                            except Exception:
-                                pass
-                    except Exception as parse_err:
-                        logger.debug(f"Error parsing rapunzel JSON: {parse_err}")
-                # Promote summary → human_summary so Rapunzel appears in Agent Insights cards
-                rap = agent_results['rapunzel']
-                if not rap.get('human_summary'):
-                    if rap.get('summary'):
-                        rap['human_summary'] = rap['summary']
-                    elif rap.get('full_analysis'):
-                        # Use first 500 chars of full analysis as fallback
-                        rap['human_summary'] = rap['full_analysis'][:500]
-                # Promote GPA as a display-friendly overall_score
-                if not rap.get('overall_score') and rap.get('gpa'):
-                    rap['overall_score'] = f"GPA: {rap['gpa']}"
-        except Exception as e:
-            logger.debug(f"No Rapunzel data: {e}")
-        
-        # Moana - School Context
-        try:
-            moana_results = db.execute_query(
-                "SELECT * FROM student_school_context WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                (application_id,)
-            )
-            if moana_results:
-                agent_results['moana'] = dict(moana_results[0])  # Create explicit copy
-                # Parse JSON fields if present
-                if agent_results['moana'].get('parsed_json'):
-                    try:
-                        import json
-                        parsed = json.loads(agent_results['moana']['parsed_json'])
-                        if isinstance(parsed, dict):
-                            # Merge parsed data into a safe copy
-                            for key, value in parsed.items():
-                                if key not in agent_results['moana'] or not agent_results['moana'].get(key):
-                                    # Ensure we're not creating circular references
-                                    if key != 'moana' and key != 'agent_results':
-                                        agent_results['moana'][key] = value
-                            # Promote inner 'content' JSON if present
-                            try:
-                                content = parsed.get('content') or parsed.get('text') or parsed.get('body')
-                                if isinstance(content, str) and content.strip():
-                                    inner = json.loads(content)
-                                    if isinstance(inner, dict):
-                                        for k, v in inner.items():
-                                            if k not in agent_results['moana'] or not agent_results['moana'].get(k):
-                                                agent_results['moana'][k] = v
-                            except Exception:
-                                pass
-                    except Exception as parse_err:
-                        logger.debug(f"Error parsing moana JSON: {parse_err}")
-        except Exception as e:
-            logger.debug(f"No Moana data: {e}")
-        
-        # Mulan - Recommendation Reader
-        try:
-            mulan_results = db.execute_query(
-                "SELECT * FROM mulan_recommendations WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                (application_id,)
-            )
-            if mulan_results:
-                # Normalize to a list of recommendations so templates can iterate
-                try:
-                    # If multiple rows are present return them all (most recent first)
-                    rows = db.execute_query(
-                        "SELECT * FROM mulan_recommendations WHERE application_id = %s ORDER BY created_at DESC",
-                        (application_id,)
-                    )
-                    agent_results['mulan'] = [dict(r) for r in rows] if rows else [dict(mulan_results[0])]
-                    # Normalize recommendation field names to match template expectations
-                    try:
-                        normalized = []
-                        for rec in agent_results['mulan']:
-                            # alias fields without underscores for template
-                            try:
-                                # If parsed_json exists and contains nested content, promote keys
-                                rawp = rec.get('parsed_json')
-                                if rawp:
-                                    try:
-                                        pdat = json.loads(rawp) if isinstance(rawp, str) else rawp
-                                        if isinstance(pdat, dict):
-                                            inner_content = None
-                                            try:
-                                                c = pdat.get('content') or pdat.get('text')
-                                                if isinstance(c, str) and c.strip():
-                                                    inner_content = json.loads(c)
-                                            except Exception:
-                                                inner_content = None
-                                            if isinstance(inner_content, dict):
-                                                for k, v in inner_content.items():
-                                                    if k not in rec or not rec.get(k):
-                                                        rec.setdefault(k, v)
-                                            else:
-                                                # merge top-level parsed_data
-                                                for k, v in pdat.items():
-                                                    if k not in rec or not rec.get(k):
-                                                        rec.setdefault(k, v)
-                                    except Exception:
-                                        pass
-                            except Exception:
-                                pass
-                            if rec.get('recommender_name') and not rec.get('recommendername'):
-                                rec['recommendername'] = rec.get('recommender_name')
-                            if rec.get('recommender_role') and not rec.get('recommenderrole'):
-                                rec['recommenderrole'] = rec.get('recommender_role')
-                            if rec.get('endorsement_strength') is not None and not rec.get('endorsementstrength'):
-                                rec['endorsementstrength'] = rec.get('endorsement_strength')
-                            normalized.append(rec)
-                        agent_results['mulan'] = normalized
-                    except Exception:
-                        pass
-                except Exception:
-                    agent_results['mulan'] = [dict(mulan_results[0])]
-        except Exception as e:
-            logger.debug(f"No Mulan data: {e}")
-        
-        # Merlin - Student Evaluator
-        # --- Patch: Promote executive summary from Merlin content ---
-        try:
-            merlin_results = db.execute_query(
-                "SELECT * FROM merlin_evaluations WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                (application_id,)
-            )
-            if merlin_results:
-                agent_results['merlin'] = dict(merlin_results[0])  # Create explicit copy
-                if agent_results['merlin'].get('parsed_json'):
-                    try:
-                        import json
-                        raw_parsed = agent_results['merlin'].get('parsed_json')
-                        if isinstance(raw_parsed, str):
-                            parsed = json.loads(raw_parsed)
-                        elif isinstance(raw_parsed, dict):
-                            parsed = raw_parsed
-                        else:
-                            parsed = {}
-                        agent_results['merlin']['parsed_data'] = parsed
-                        mer = agent_results['merlin']
-
-                        # Detect message-object-shaped parsed_json (has 'role'
-                        # and 'refusal' from Foundry adapter) and try to unwrap
-                        # the nested 'content' to find actual evaluation data.
-                        if isinstance(parsed, dict) and 'role' in parsed and 'refusal' in parsed:
-                            inner_content = parsed.get('content', '')
-                            if isinstance(inner_content, str) and inner_content.strip():
-                                try:
-                                    unwrapped = json.loads(inner_content)
-                                    if isinstance(unwrapped, dict):
-                                        parsed = unwrapped
-                                        agent_results['merlin']['parsed_data'] = parsed
-                                except Exception:
-                                    pass
-                            elif isinstance(inner_content, dict):
-                                parsed = inner_content
-                                agent_results['merlin']['parsed_data'] = parsed
-
-                        if isinstance(parsed, dict):
-                            # Promote all useful keys from parsed_json to top-level for template access
-                            for k in ('overall_score', 'match_score', 'nextgen_match', 'recommendation',
-                                       'rationale', 'confidence', 'key_strengths', 'key_risks',
-                                       'decision_drivers', 'top_risk', 'context_factors', 'evidence_used',
-                                       'executive_summary'):
-                                if parsed.get(k) is not None and not mer.get(k):
-                                    mer[k] = parsed[k]
-                            # Promote human_summary from the best available field
-                            if not mer.get('human_summary'):
-                                if parsed.get('executive_summary'):
-                                    mer['human_summary'] = parsed['executive_summary']
-                                elif parsed.get('summary'):
-                                    mer['human_summary'] = parsed['summary']
-                                elif parsed.get('rationale'):
-                                    mer['human_summary'] = parsed['rationale']
-                            # Also try nested 'content' JSON if present
-                            content = parsed.get('content')
-                            if isinstance(content, str) and content.strip():
-                                try:
-                                    inner = json.loads(content)
-                                    if isinstance(inner, dict):
-                                        for k in ('overall_score', 'recommendation', 'rationale', 'confidence',
-                                                   'key_strengths', 'key_risks', 'executive_summary'):
-                                            if inner.get(k) is not None and not mer.get(k):
-                                                mer[k] = inner[k]
-                                        if not mer.get('human_summary'):
-                                            mer['human_summary'] = inner.get('executive_summary') or inner.get('summary') or inner.get('rationale')
-                                except Exception:
-                                    pass
-                    except Exception as parse_err:
-                        logger.debug(f"Error parsing merlin JSON: {parse_err}")
-        except Exception as e:
-            logger.debug(f"No Merlin data: {e}")
-        
-        # Aurora - Formatter
-        try:
-            aurora_results = db.execute_query(
-                "SELECT * FROM aurora_evaluations WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                (application_id,)
-            )
-            if aurora_results:
-                agent_results['aurora'] = dict(aurora_results[0])  # Create explicit copy
-        except Exception as e:
-            logger.debug(f"No Aurora data: {e}")
-
-        # If the applications table has an `agent_results` JSON/JSONB column
-        # (newer persistence path), prefer those consolidated results for the
-        # UI.  Merge keys only when they don't collide with already-loaded
-        # per-agent rows so local table data (if present) continues to take
-        # precedence for individual agent records.
-        try:
-            app_agent_results = application.get('agent_results')
-            if isinstance(app_agent_results, str):
-                app_agent_results = safe_load_json(app_agent_results)
-            if isinstance(app_agent_results, dict) and app_agent_results:
-                for k, v in app_agent_results.items():
-                    if k not in agent_results:
-                        # Agent not in per-table results — use applications.agent_results
-                        agent_results[k] = v
-                    elif k == 'merlin' and isinstance(v, dict):
-                        # Special handling: if merlin_evaluations row exists but has
-                        # no meaningful data (empty response saved earlier), prefer
-                        # the richer data from applications.agent_results
-                        existing = agent_results.get('merlin', {})
-                        existing_has_content = (
-                            existing.get('overall_score') is not None
-                            or existing.get('recommendation')
-                            or existing.get('executive_summary')
-                            or existing.get('human_summary')
-                        )
-                        app_has_content = (
-                            v.get('overall_score') is not None
-                            or v.get('recommendation')
-                            or v.get('executive_summary')
-                            or v.get('applicant_summary')
-                        )
-                        if not existing_has_content and app_has_content:
-                            logger.info(f"Merlin: preferring applications.agent_results (has content) over empty merlin_evaluations row")
-                            agent_results['merlin'] = v
-                        elif existing_has_content:
-                            # Merge supplementary keys from agent_results that
-                            # might not exist in the per-table row
-                            for mk, mv in v.items():
-                                if mk not in existing or not existing.get(mk):
-                                    existing[mk] = mv
-        except Exception as e:
-            logger.debug(f"Failed to merge application.agent_results: {e}")
 
         # Get document download info
+        application = view['summary']
         document_path = application.get('evaluation_document_path')
-        document_url = application.get('evaluation_document_url')
         document_available = bool(document_path and os.path.exists(document_path))
 
-        reprocess_notice = None
-        try:
-            audit_table = db.get_table_name("agent_audit_logs")
-            if audit_table and db.has_table(audit_table):
-                audit_app_id_col = db.resolve_table_column(
-                    "agent_audit_logs",
-                    ["application_id", "applicationid"],
-                )
-                audit_agent_col = db.resolve_table_column(
-                    "agent_audit_logs",
-                    ["agent_name", "agentname"],
-                )
-                audit_source_col = db.resolve_table_column(
-                    "agent_audit_logs",
-                    ["source_file_name", "sourcefilename"],
-                )
-                audit_created_col = db.resolve_table_column(
-                    "agent_audit_logs",
-                    ["created_at", "createdat"],
-                )
-                if not audit_created_col:
-                    audit_created_col = "created_at"
-                if audit_app_id_col and audit_agent_col and audit_source_col:
-                    audit_query = f"""
-                        SELECT {audit_source_col} as source_file_name, {audit_created_col} as created_at
-                        FROM {audit_table}
-                        WHERE {audit_app_id_col} = %s AND {audit_agent_col} = %s
-                        ORDER BY {audit_created_col} DESC
-                        LIMIT 1
-                    """
-                    audit_rows = db.execute_query(audit_query, (application_id, 'System'))
-                    if audit_rows:
-                        source = audit_rows[0].get('source_file_name') or ''
-                        if source.startswith('reprocess:'):
-                            message = source.replace('reprocess:', '').strip()
-                            if message.startswith('new_upload:'):
-                                message = message.replace('new_upload:', 'New upload: ', 1).strip()
-                            reprocess_notice = {
-                                'message': message,
-                                'created_at': audit_rows[0].get('created_at')
-                            }
-        except Exception as exc:
-            logger.debug(f"Reprocess audit lookup failed: {exc}")
-        
-        # Fetch Aurora evaluation (formatted) - prefer this if available - BACKWARD COMPATIBILITY
-        aurora_evaluation = db.get_aurora_evaluation(application_id)
-        
-        # Fetch Merlin evaluation (raw data) as backup - BACKWARD COMPATIBILITY
-        merlin_evaluation = None
-        if not aurora_evaluation:
-            try:
-                merlin_results = db.execute_query(
-                    "SELECT * FROM merlin_evaluations WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                    (application_id,)
-                )
-                if merlin_results:
-                    merlin_evaluation = merlin_results[0]
-                    # Parse JSON if available to make fields accessible
-                    if merlin_evaluation.get('parsed_json'):
-                        try:
-                            import json
-                            parsed = json.loads(merlin_evaluation['parsed_json'])
-                            # Merge parsed fields into evaluation dict
-                            for key, value in parsed.items():
-                                if key not in merlin_evaluation or not merlin_evaluation[key]:
-                                    merlin_evaluation[key] = value
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-
-        # If the database row didn't include a precomputed student_summary we can
-        # derive one on the fly from the agent_results we just gathered.  This is
-        # helpful for older records created before the migration and prevents the
-        # UI from appearing empty when agents have already run.
-        if not application.get('student_summary') and agent_results:
-            try:
-                merlin = agent_results.get('merlin') or {}
-                aurora = agent_results.get('aurora') or {}
-                derived = {
-                    'status': 'completed',
-                    'overall_score': merlin.get('overallscore') or merlin.get('overall_score'),
-                    'recommendation': merlin.get('recommendation'),
-                    'rationale': merlin.get('rationale') or merlin.get('parsedjson', ''),
-                    'key_strengths': merlin.get('parsed_data', {}).get('key_strengths', []) if isinstance(merlin.get('parsed_data'), dict) else [],
-                    'key_risks': merlin.get('parsed_data', {}).get('considerations', []) if isinstance(merlin.get('parsed_data'), dict) else [],
-                    'confidence': merlin.get('confidence'),
-                    'agents_completed': list(agent_results.keys()),
-                    'formatted_by_aurora': bool(aurora),
-                    'aurora_sections': list(aurora.keys()) if isinstance(aurora, dict) else []
-                }
-                derived['agent_details'] = agent_results
-                application['student_summary'] = derived
-            except Exception as exc:
-                logger.debug(f"Failed to derive summary on the fly: {exc}")
-        
-        logger.debug(f"About to render template with application_id={application.get('application_id')}")
-
-        # Pull Milo insights from already-persisted results — do NOT make
-        # live AI calls during page load as that blocks the worker for 10-30s
-        # and causes the page to hang/timeout under Front Door.
-        milo_insights = {}
-        milo_alignment = None
-        alignment_score = None
-        try:
-            # Check persisted agent_results on the application row
-            stored = application.get('agent_results') or {}
-            if isinstance(stored, str):
-                stored = safe_load_json(stored)
-            if isinstance(stored, dict):
-                milo_alignment = stored.get('milo_alignment') or \
-                    (stored.get('data_scientist') or {}).get('computed_alignment')
-                # Extract cached training insights from data_scientist result
-                ds = stored.get('data_scientist') or {}
-                if isinstance(ds, dict) and ds.get('status') == 'success':
-                    milo_insights = ds
-
-            # Simple numeric alignment from Merlin score vs stored average
-            merlin_score = None
-            if agent_results.get('merlin'):
-                try:
-                    merlin_score = float(agent_results['merlin'].get('overall_score') or
-                                          agent_results['merlin'].get('overallscore') or 0)
-                except Exception:
-                    merlin_score = None
-            avg = milo_insights.get('average_merlin_score')
-            if merlin_score is not None and avg is not None:
-                try:
-                    alignment_score = round(merlin_score - float(avg), 1)
-                except Exception:
-                    alignment_score = None
-        except Exception as e:
-            logger.debug(f"Milo insights load failed in student_detail: {e}")
-
-        try:
-            human_summary = _synthesize_human_summary(agent_results, application)
-        except Exception:
-            human_summary = None
-
-        # Resolve Next Gen Match score for the UI
-        # Priority: DB column > Merlin output > Milo alignment output
-        nextgen_match = None
-        try:
-            # 1. Check DB column (persisted by orchestrator)
-            db_val = application.get('nextgen_match')
-            if db_val is not None:
-                nextgen_match = int(float(db_val))
-            # 2. Fallback to Merlin result
-            if nextgen_match is None and agent_results.get('merlin'):
-                merlin_ngm = agent_results['merlin'].get('nextgen_match')
-                if merlin_ngm is not None:
-                    nextgen_match = int(float(merlin_ngm))
-            # 3. Fallback to Milo alignment
-            if nextgen_match is None and milo_alignment and isinstance(milo_alignment, dict):
-                milo_ngm = milo_alignment.get('nextgen_match')
-                if milo_ngm is not None:
-                    nextgen_match = int(float(milo_ngm))
-        except Exception:
-            nextgen_match = None
-
-        return render_template('student_detail.html', 
-                     summary=application,
-                     agent_results=agent_results,
+        return render_template('student_detail.html',
                      document_available=document_available,
                      document_path=document_path,
-                     aurora_evaluation=aurora_evaluation,  # For backward compatibility
-                     merlin_evaluation=merlin_evaluation,  # For backward compatibility
-                     is_training=application.get('is_training_example', False),
-                     reprocess_notice=reprocess_notice,
-                     school_context=school_context,  # School data for training context
-                     human_summary=human_summary,
-                     milo_insights=milo_insights,
-                     milo_alignment=milo_alignment,
-                     alignment_score=alignment_score,
-                     nextgen_match=nextgen_match)
-        
+                     **view)
+
     except Exception as e:
         logger.error(f"Error in student_detail: {str(e)}", exc_info=True)
         flash('An error occurred while loading student details', 'error')
@@ -1361,30 +937,11 @@ def student_detail(application_id):
 def student_agent_results(application_id):
     """Return raw agent_results for a student as JSON for debugging."""
     try:
-        application = db.get_application(application_id)
-        if not application:
+        # the same single-query agent collection used by student_detail
+        rows = db.get_student_detail_rows(application_id)
+        if not rows:
             return jsonify({'error': 'Student not found'}), 404
-
-        # replicate the same agent collection logic used in student_detail
-        agent_results = {}
-        for tbl, key in [
-            ('tiana_applications', 'tiana'),
-            ('rapunzel_grades', 'rapunzel'),
-            ('student_school_context', 'moana'),
-            ('mulan_recommendations', 'mulan'),
-            ('merlin_evaluations', 'merlin'),
-            ('aurora_evaluations', 'aurora')
-        ]:
-            try:
-                rows = db.execute_query(
-                    f"SELECT * FROM {tbl} WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                    (application_id,)
-                )
-                if rows:
-                    agent_results[key] = dict(rows[0])
-            except Exception:
-                pass
-        return jsonify(agent_results)
+        return jsonify(agent_rows(rows))
     except Exception as e:
         logger.error(f"Error in student_agent_results: {e}", exc_info=True)
         logger.error('Request failed: %s', e, exc_info=True)
@@ -1396,10 +953,11 @@ def student_agent_results(application_id):
 def student_summary_json(application_id):
     """Render a compact student summary page directly from agent-results JSON."""
     try:
-        application = db.get_application(application_id)
-        if not application:
+        rows = db.get_student_detail_rows(application_id)
+        if not rows:
             flash('Student not found', 'error')
             return redirect(url_for('applications.students'))
+        application = rows['application']
 
         # reuse the same collection logic as the debug JSON endpoint
         agent_results = {}
@@ -1417,23 +975,7 @@ def student_summary_json(application_id):
                     agent_results.update(ar)
         except Exception:
             pass
-        for tbl, key in [
-            ('tiana_applications', 'tiana'),
-            ('rapunzel_grades', 'rapunzel'),
-            ('student_school_context', 'moana'),
-            ('mulan_recommendations', 'mulan'),
-            ('merlin_evaluations', 'merlin'),
-            ('aurora_evaluations', 'aurora')
-        ]:
-            try:
-                rows = db.execute_query(
-                    f"SELECT * FROM {tbl} WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
-                    (application_id,)
-                )
-                if rows:
-                    agent_results[key] = dict(rows[0])
-            except Exception:
-                pass
+        agent_results.update(agent_rows(rows))
 
         # Executive summary: prefer Merlin's output only. Aurora is used
         # elsewhere for formatting but should not drive the executive text.
@@ -2043,82 +1585,6 @@ def generate_process_updates(application_id: int):
 
 
 
-def _synthesize_human_summary(agent_results: dict, application: dict) -> str:
-    """Create a concise, human-readable executive summary from agent_results.
-
-    Uses available fields from merlin, tiana, rapunzel, mulan, moana and aurora.
-    """
-    try:
-        parts = []
-        merlin = agent_results.get('merlin') or {}
-        tiana = agent_results.get('tiana') or {}
-        rap = agent_results.get('rapunzel') or {}
-        mulan = agent_results.get('mulan') or {}
-        moana = agent_results.get('moana') or {}
-        aurora = agent_results.get('aurora') or {}
-
-        # Profile / headline
-        headline = []
-        name = application.get('applicant_name') or application.get('student_name')
-        if name:
-            headline.append(name)
-        # course rigor + GPA
-        cr = rap.get('course_rigor_index') or rap.get('course_rigor')
-        gpa = rap.get('gpa') or rap.get('cumulative_weighted') or rap.get('cumulative')
-        if cr:
-            headline.append(f"pursues high‑rigor coursework (rigor={cr})")
-        elif gpa:
-            headline.append(f"weighted GPA ~{gpa}")
-        if headline:
-            parts.append('. '.join(headline) + '.')
-
-        # Strengths
-        strengths = []
-        if (rap.get('honors_awards') or rap.get('honor_roll')):
-            strengths.append('consistent honor‑roll performance')
-        if tiana.get('essay_summary') or (tiana.get('parsed_data') and tiana.get('parsed_data').get('essay_summary')):
-            strengths.append('essay expresses motivation and fit for STEM')
-        if mulan:
-            # if list, inspect first
-            first = mulan[0] if isinstance(mulan, list) and mulan else (mulan if isinstance(mulan, dict) else None)
-            if first and (first.get('endorsement_strength') or first.get('endorsement_strength') == 0 or first.get('endorsementstrength')):
-                strengths.append('teacher recommendation with modest endorsement')
-        if strengths:
-            parts.append('Strengths: ' + '; '.join(strengths) + '.')
-
-        # Risks / concerns
-        risks = []
-        # check AP/Honors performance pattern in rapunzel parsed content
-        if rap.get('course_rigor_index') and (rap.get('summary') and 'AP' in str(rap.get('summary'))):
-            # heuristics: presence of AP and note of lower grades
-            if 'C+' in str(rap.get('summary')) or 'drop' in str(rap.get('summary')).lower():
-                risks.append('modest AP/Honors grades despite high course rigor')
-        if not strengths and (not rap and not mulan and not tiana):
-            risks.append('limited supporting evidence in agent outputs')
-        if risks:
-            parts.append('Risks: ' + '; '.join(risks) + '.')
-
-        # Recommendation / verdict
-        rec = merlin.get('recommendation') or merlin.get('parsed_data', {}).get('recommendation') or aurora.get('merlin_recommendation')
-        score = merlin.get('overall_score') or merlin.get('overallscore')
-        verdict = []
-        if score:
-            verdict.append(f'Overall score ~{score}/100')
-        if rec:
-            verdict.append(f'Recommendation: {rec}')
-        if verdict:
-            parts.append(' '.join(verdict) + '.')
-
-        # If nothing produced, fall back to aurora short note
-        if not parts and aurora:
-            parts.append('Aurora produced a formatted evaluation; see detailed report.')
-
-        return ' '.join(parts)
-    except Exception:
-        return ''
-
-
-
 def api_provide_missing_info(application_id):
     """
     Handle providing missing information/documents for a student.
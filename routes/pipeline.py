@@ -10,21 +10,8 @@ from typing import Any, Dict, List, Optional
 
 from flask import Blueprint, jsonify, redirect, render_template, request, session, url_for
 
-from extensions import csrf, get_ai_client, run_async
-from src.agents.smee_orchestrator import SmeeOrchestrator
-from src.agents.tiana_application_reader import TianaApplicationReader
-from src.agents.rapunzel_grade_reader import RapunzelGradeReader
-from src.agents.mulan_recommendation_reader import MulanRecommendationReader
-from src.agents.merlin_student_evaluator import MerlinStudentEvaluator
-from src.agents.gaston_evaluator import GastonEvaluator
-from src.agents.aurora_agent import AuroraAgent
-from src.agents.moana_school_context import MoanaSchoolContext
-from src.agents.milo_data_scientist import MiloDataScientist
-from src.agents.naveen_school_data_scientist import NaveenSchoolDataScientist
-from src.agents.pocahontas_cohort_analyst import PocahontasCohortAnalyst
-from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
-from src.agents.bashful_agent import BashfulAgent
-from src.config import config
+from extensions import csrf, get_orchestrator, run_async
+from src.agents.cancellation import acquire_unless_cancelled, cancel, cancel_scope
 from src.database import db
 
 logger = logging.getLogger(__name__)
@@ -41,7 +28,7 @@ def pipeline_dashboard():
 
 
 # ---------------------------------------------------------------------------
-# Concurrent pipeline pool — each slot has its own Smee instance
+# Concurrent pipeline pool — slots share the process-wide Smee instance
 # ---------------------------------------------------------------------------
 MAX_CONCURRENT = int(os.getenv("PIPELINE_MAX_CONCURRENT", "4"))
 _pool_semaphore = threading.Semaphore(MAX_CONCURRENT)
@@ -51,136 +38,112 @@ _pipeline_state: Dict[int, Dict[str, Any]] = {}
 _pipeline_lock = threading.Lock()
 
 
-def _create_orchestrator() -> SmeeOrchestrator:
-    """Create a fresh Smee orchestrator instance (thread-safe, not shared).\n    
-    Model tier assignments (optimized March 22 2026):
-      gpt-5.4 (500 RPM): Smee, Tiana, Mulan, Pocahontas
-      gpt-5.4-mini (200 RPM): Belle, Moana
-      gpt-5.4-nano (200 RPM): Naveen, Aurora, Bashful
-      gpt-5.4-pro (160 RPM): Rapunzel, Milo
-      o3 (100 RPM): Merlin (the judgment call)
-      o4-mini (100 RPM): Gaston interleaved quality checks
-    """
-    client = get_ai_client()
-    orchestrator = SmeeOrchestrator(
-        name="Smee",
-        client=client,
-        model=config.model_tier_orchestrator,  # gpt-5.4
-        db_connection=db
-    )
-    orchestrator.register_agent("application_reader",
-        TianaApplicationReader(name="Tiana", client=client, model=config.model_tier_workhorse, db_connection=db))
-    orchestrator.register_agent("grade_reader",
-        RapunzelGradeReader(name="Rapunzel", client=client, model=config.model_tier_premium, db_connection=db))
-    orchestrator.register_agent("school_context",
-        MoanaSchoolContext(name="Moana", client=client, model=config.model_tier_fast, db_connection=db))
-    orchestrator.register_agent("recommendation_reader",
-        MulanRecommendationReader(name="Mulan", client=client, model=config.model_tier_workhorse, db_connection=db))
-    orchestrator.register_agent("student_evaluator",
-        MerlinStudentEvaluator(name="Merlin", client=client, model=config.model_tier_merlin, db_connection=db))
-    orchestrator.register_agent("data_scientist",
-        MiloDataScientist(name="Milo", client=client, model=config.model_tier_premium, db_connection=db))
-    orchestrator.register_agent("naveen",
-        NaveenSchoolDataScientist(name="Naveen", client=client, model=config.model_tier_lightweight))
-    orchestrator.register_agent("pocahontas",
-        PocahontasCohortAnalyst(name="Pocahontas", client=client, model=config.model_tier_workhorse))
-    orchestrator.register_agent("aurora", AuroraAgent())
-    orchestrator.register_agent("gaston",
-        GastonEvaluator(name="Gaston", client=client, model=config.model_tier_reasoning))
-    orchestrator.register_agent("belle",
-        BelleDocumentAnalyzer(name="Belle", client=client, model=config.model_tier_fast, db_connection=db))
-    orchestrator.register_agent("bashful",
-        BashfulAgent(name="Bashful", client=client, model=config.model_tier_lightweight,
-                     system_prompt="You are Bashful, a helpful summarizer."))
-    return orchestrator
+def _finish_cancelled_state(application_id: int) -> None:
+    """Record a cancelled evaluation in the observatory state and the database."""
+    with _pipeline_lock:
+        state = _pipeline_state.get(application_id, {})
+        state['status'] = 'cancelled'
+        state['completed_at'] = datetime.now(timezone.utc).isoformat()
+    db.update_application_status(application_id, 'Cancelled')
+    logger.info("Pipeline: %d cancelled", application_id)
 
 
 def _run_pipeline(application_id: int, batch_mode: bool = False):
-    """Run the full pipeline for one application. Thread-safe — uses pool semaphore."""
-    # Update observatory state
-    with _pipeline_lock:
-        _pipeline_state[application_id] = {
-            'status': 'queued',
-            'application_id': application_id,
-            'queued_at': datetime.now(timezone.utc).isoformat(),
-            'started_at': None,
-            'completed_at': None,
-            'current_agent': None,
-            'agents_completed': [],
-            'agent_timings': {},
-            'error': None,
-            'batch_mode': batch_mode,
-        }
-
-    db.update_application_status(application_id, 'Processing')
-
-    _pool_semaphore.acquire()
-    try:
-        application = db.get_application(application_id)
-        if not application:
-            logger.error("Pipeline: application %d not found", application_id)
-            with _pipeline_lock:
-                _pipeline_state[application_id]['status'] = 'error'
-                _pipeline_state[application_id]['error'] = 'Application not found'
-            db.update_application_status(application_id, 'Uploaded')
-            return
+    """Run the full pipeline for one application. Thread-safe — uses pool semaphore.
 
+    Runs inside the application's cancel scope, so ``/api/pipeline/<id>/cancel``
+    reaches it while queued (it leaves the queue) or running.
+    """
+    with cancel_scope(application_id) as token:
+        # Update observatory state
         with _pipeline_lock:
-            _pipeline_state[application_id]['status'] = 'running'
-            _pipeline_state[application_id]['started_at'] = datetime.now(timezone.utc).isoformat()
-            _pipeline_state[application_id]['applicant_name'] = application.get('applicant_name', '')
-
-        # Create a FRESH orchestrator for this evaluation (not shared)
-        orchestrator = _create_orchestrator()
+            _pipeline_state[application_id] = {
+                'status': 'queued',
+                'application_id': application_id,
+                'queued_at': datetime.now(timezone.utc).isoformat(),
+                'started_at': None,
+                'completed_at': None,
+                'current_agent': None,
+                'agents_completed': [],
+                'agent_timings': {},
+                'error': None,
+                'batch_mode': batch_mode,
+            }
+
+        db.update_application_status(application_id, 'Processing')
+
+        if not acquire_unless_cancelled(_pool_semaphore, token):
+            # Cancelled while queued — never took a slot
+            _finish_cancelled_state(application_id)
+            return
+        try:
+            application = db.get_application(application_id)
+            if not application:
+                logger.error("Pipeline: application %d not found", application_id)
+                with _pipeline_lock:
+                    _pipeline_state[application_id]['status'] = 'error'
+                    _pipeline_state[application_id]['error'] = 'Application not found'
+                db.update_application_status(application_id, 'Uploaded')
+                return
 
-        # Wire progress callback to update observatory state
-        def _progress_cb(update):
             with _pipeline_lock:
-                state = _pipeline_state.get(application_id, {})
-                if update.get('type') == 'agent_progress':
-                    agent_id = update.get('agent_id', '')
-                    status = update.get('status', '')
-                    state['current_agent'] = agent_id if status in ('starting', 'processing') else state.get('current_agent')
-                    if status == 'completed' and agent_id not in state.get('agents_completed', []):
-                        state.setdefault('agents_completed', []).append(agent_id)
-
-        orchestrator._progress_callback = _progress_cb
-
-        eval_steps = ['application_reader', 'grade_reader', 'recommendation_reader',
-                      'school_context', 'data_scientist', 'student_evaluator', 'aurora']
-
-        start_time = time.time()
-        result = run_async(orchestrator.coordinate_evaluation(
-            application=application,
-            evaluation_steps=eval_steps
-        ))
-        elapsed = time.time() - start_time
-
-        result_status = result.get('status') if isinstance(result, dict) else 'unknown'
+                _pipeline_state[application_id]['status'] = 'running'
+                _pipeline_state[application_id]['started_at'] = datetime.now(timezone.utc).isoformat()
+                _pipeline_state[application_id]['applicant_name'] = application.get('applicant_name', '')
+
+            # Shared orchestrator: warm clients and caches, per-run EvaluationContext
+            orchestrator = get_orchestrator()
+
+            # Wire progress callback to update observatory state
+            def _progress_cb(update):
+                with _pipeline_lock:
+                    state = _pipeline_state.get(application_id, {})
+                    if update.get('type') == 'agent_progress':
+                        agent_id = update.get('agent_id', '')
+                        status = update.get('status', '')
+                        state['current_agent'] = agent_id if status in ('starting', 'processing') else state.get('current_agent')
+                        if status == 'completed' and agent_id not in state.get('agents_completed', []):
+                            state.setdefault('agents_completed', []).append(agent_id)
+
+            eval_steps = ['application_reader', 'grade_reader', 'recommendation_reader',
+                          'school_context', 'data_scientist', 'student_evaluator', 'aurora']
+
+            start_time = time.time()
+            result = run_async(orchestrator.coordinate_evaluation(
+                application=application,
+                evaluation_steps=eval_steps,
+                progress_callback=_progress_cb,
+            ))
+            elapsed = time.time() - start_time
+
+            result_status = result.get('status') if isinstance(result, dict) else 'unknown'
 
-        with _pipeline_lock:
-            _pipeline_state[application_id]['status'] = 'completed'
-            _pipeline_state[application_id]['completed_at'] = datetime.now(timezone.utc).isoformat()
-            _pipeline_state[application_id]['elapsed_seconds'] = round(elapsed, 1)
-            _pipeline_state[application_id]['result_status'] = result_status
-
-        if result_status == 'paused':
-            db.update_application_status(application_id, 'Needs Docs')
-        else:
-            db.update_application_status(application_id, 'Completed')
-
-        logger.info("Pipeline: %d completed in %.1fs (status=%s)",
-                    application_id, elapsed, result_status)
+            with _pipeline_lock:
+                _pipeline_state[application_id]['status'] = (
+                    'cancelled' if result_status == 'cancelled' else 'completed')
+                _pipeline_state[application_id]['completed_at'] = datetime.now(timezone.utc).isoformat()
+                _pipeline_state[application_id]['elapsed_seconds'] = round(elapsed, 1)
+                _pipeline_state[application_id]['result_status'] = result_status
+
+            if result_status == 'cancelled':
+                _finish_cancelled_state(application_id)
+            elif result_status == 'paused':
+                db.update_application_status(application_id, 'Needs Docs')
+            else:
+                db.update_application_status(application_id, 'Completed')
+
+            logger.info("Pipeline: %d completed in %.1fs (status=%s)",
+                        application_id, elapsed, result_status)
 
-    except Exception as e:
-        logger.error("Pipeline FAILED for %d: %s", application_id, e, exc_info=True)
-        with _pipeline_lock:
-            _pipeline_state[application_id]['status'] = 'error'
-            _pipeline_state[application_id]['error'] = str(e)[:200]
-            _pipeline_state[application_id]['completed_at'] = datetime.now(timezone.utc).isoformat()
-        db.update_application_status(application_id, 'Uploaded')
-    finally:
-        _pool_semaphore.release()
+        except Exception as e:
+            logger.error("Pipeline FAILED for %d: %s", application_id, e, exc_info=True)
+            with _pipeline_lock:
+                _pipeline_state[application_id]['status'] = 'error'
+                _pipeline_state[application_id]['error'] = str(e)[:200]
+                _pipeline_state[application_id]['completed_at'] = datetime.now(timezone.utc).isoformat()
+            db.update_application_status(application_id, 'Uploaded')
+        finally:
+            _pool_semaphore.release()
 
 
 # ---------------------------------------------------------------------------
@@ -235,7 +198,7 @@ def start_batch():
         # Skip if already running
         with _pipeline_lock:
             existing = _pipeline_state.get(app_id, {})
-            if existing.get('status') in ('running', 'queued'):
+            if existing.get('status') in ('running', 'queued', 'cancelling'):
                 continue
 
         threading.Thread(
@@ -296,9 +259,10 @@ def pipeline_status():
 
     # Summary counts
     summary = {
-        'active': len([e for e in entries if e.get('status') in ('running', 'queued')]),
+        'active': len([e for e in entries if e.get('status') in ('running', 'queued', 'cancelling')]),
         'completed': len([e for e in entries if e.get('status') == 'completed']),
         'failed': len([e for e in entries if e.get('status') == 'error']),
+        'cancelled': len([e for e in entries if e.get('status') == 'cancelled']),
         'queued': len([e for e in entries if e.get('status') == 'queued']),
         'max_concurrent': MAX_CONCURRENT,
         'pool_available': _pool_semaphore._value,
@@ -325,6 +289,37 @@ def pipeline_agents(application_id):
     return jsonify(state)
 
 
+@pipeline_bp.route('/api/pipeline/<int:application_id>/cancel', methods=['POST'])
+@csrf.exempt
+def pipeline_cancel(application_id):
+    """Cancel a queued or running evaluation (admin only).
+
+    The cancel is broadcast to every worker, so it works whichever process
+    is running the evaluation.  Completed steps keep their checkpoints; a
+    later run resumes from them.
+
+    Body (optional): {"reason": "..."}
+    """
+    if session.get('role') != 'admin':
+        return jsonify({'error': 'Admin only'}), 403
+
+    data = request.get_json(silent=True) or {}
+    reason = str(data.get('reason') or 'cancelled by user')[:200]
+    running_here = cancel(application_id, reason)
+
+    with _pipeline_lock:
+        state = _pipeline_state.get(application_id)
+        if state and state.get('status') in ('running', 'queued'):
+            state['status'] = 'cancelling'
+
+    return jsonify({
+        'application_id': application_id,
+        'cancelling': True,
+        'running_here': running_here,
+        'reason': reason,
+    }), 202
+
+
 @pipeline_bp.route('/api/pipeline/clear', methods=['POST'])
 @csrf.exempt
 def pipeline_clear():
@@ -335,7 +330,7 @@ def pipeline_clear():
     with _pipeline_lock:
         to_remove = [
             k for k, v in _pipeline_state.items()
-            if v.get('status') in ('completed', 'error')
+            if v.get('status') in ('completed', 'error', 'cancelled')
         ]
         for k in to_remove:
             del _pipeline_state[k]
@@ -17,6 +17,11 @@ from extensions import (
 from src.agents.pocahontas_cohort_analyst import PocahontasCohortAnalyst
 from src.config import config
 from src.database import db
+from src.job_store import latest_job, start_job
+from src.school_enrichment import (
+    SCHOOL_ENRICHMENT_MAX_BATCH, AcademicsLookupStep, NaveenMoanaStep,
+    SchoolEnrichmentEngine, import_academic_rows,
+)
 from src.storage import storage
 from src.telemetry import telemetry
 
@@ -24,6 +29,9 @@ logger = logging.getLogger(__name__)
 
 schools_bp = Blueprint('schools', __name__)
 
+SCHOOL_ENRICHMENT_JOB = 'school_enrichment'
+SEED_ACADEMICS_JOB = 'seed_academics'
+
 
 @schools_bp.route('/schools', methods=['GET'])
 def schools_dashboard():
@@ -713,23 +721,90 @@ def lookup_or_create_school():
 
 
 
+def _enrichment_job_status(kind, idle_message='No job running'):
+    """Poll response for a school enrichment job of *kind*."""
+    try:
+        job = latest_job(db, kind)
+    except Exception as e:
+        logger.error('Could not read %s status: %s', kind, e, exc_info=True)
+        return jsonify({'status': 'unknown'})
+    if not job:
+        return jsonify({'status': 'idle', 'message': idle_message})
+    if job['status'] == 'running':
+        return jsonify({**job['progress'], 'status': 'running',
+                        'elapsed_seconds': job['elapsed_seconds']})
+    if job['status'] == 'error':
+        return jsonify({**job['progress'], 'status': 'error', 'error': job.get('error')})
+    return jsonify(job['result'])
+
+
+def _naveen_moana_step(run_moana=True, dry_run=False, refresh=False):
+    """Naveen (workhorse tier) plus, optionally, Moana on the main deployment.
+
+    Unless *refresh*, schools whose input fingerprints match keep their
+    stored results.
+    """
+    from src.agents.naveen_school_data_scientist import NaveenSchoolDataScientist
+    scientist = NaveenSchoolDataScientist(
+        name='Naveen School Data Scientist',
+        client=None if dry_run else get_ai_client_mini(),
+        model=config.model_tier_workhorse  # Tier 2
+    )
+    if not run_moana:
+        return NaveenMoanaStep(db, scientist, run_moana=False, refresh=refresh)
+    model_main = config.foundry_model_name if config.model_provider == 'foundry' else config.deployment_name
+    return NaveenMoanaStep(db, scientist, moana_client=None if dry_run else get_ai_client(),
+                           moana_model=model_main, refresh=refresh)
+
+
+def _start_school_enrichment(schools, step, params):
+    """Run *step* over *schools* as the background school-enrichment job.
+
+    Returns the job, or None when one is already running.
+    """
+    job = start_job(db, SCHOOL_ENRICHMENT_JOB, params)
+    if job is None:
+        return None
+
+    def _run():
+        try:
+            job.finish(SchoolEnrichmentEngine(job=job).run(schools, step))
+        except Exception as e:
+            logger.error(f"School enrichment job error: {e}", exc_info=True)
+            job.fail('An internal error occurred')
+
+    threading.Thread(target=_run, daemon=True).start()
+    return job
+
+
+def _already_running():
+    return jsonify({
+        'status': 'already_running',
+        'message': 'School enrichment is already in progress.',
+        'poll_url': '/api/schools/batch-naveen-moana',
+    })
+
+
 @schools_bp.route('/api/schools/enrich-pending', methods=['POST'])
 def enrich_pending_schools():
     """Bulk-enrich schools that have analysis_status='pending'.
     
     Request body (optional):
-        { "limit": 10 }   -- max schools to enrich in this batch (default 5)
+        { "limit": 10, "dry_run": false, "refresh": false }   -- max schools to enrich (default 5)
     
-    Runs enrichment in background threads, returns immediately.
+    ``refresh`` re-analyzes schools whose input fingerprint is unchanged.
+    Runs Naveen over the schools concurrently in the background and
+    returns immediately; poll GET /api/schools/batch-naveen-moana.
     """
     try:
         data = request.get_json() or {}
-        limit = min(int(data.get('limit', 5)), 50)  # Cap at 50 per call
+        limit = min(int(data.get('limit', 5)), SCHOOL_ENRICHMENT_MAX_BATCH)
+        dry_run = bool(data.get('dry_run', False))
+        refresh = bool(data.get('refresh', False))
         
         # Find pending schools
         pending = db.execute_query(
-            "SELECT school_enrichment_id, school_name, school_district, state_code "
-            "FROM school_enriched_data WHERE analysis_status = 'pending' AND is_active = TRUE "
+            "SELECT * FROM school_enriched_data WHERE analysis_status = 'pending' AND is_active = TRUE "
             "ORDER BY school_enrichment_id LIMIT %s",
             (limit,)
         )
@@ -737,56 +812,21 @@ def enrich_pending_schools():
         if not pending:
             return jsonify({'status': 'success', 'message': 'No pending schools to enrich', 'queued': 0})
         
-        def background_batch_enrich(schools_to_enrich):
-            """Enrich schools sequentially in background."""
-            try:
-                from src.agents.naveen_school_data_scientist import NaveenSchoolDataScientist
-                from src.school_workflow import SchoolDataWorkflow
-                
-                client_mini = get_ai_client_mini()
-                scientist = NaveenSchoolDataScientist(
-                    name="Naveen School Data Scientist",
-                    client=client_mini,
-                    model=config.model_tier_workhorse  # Tier 2
-                )
-                workflow = SchoolDataWorkflow(db)
-                
-                for school in schools_to_enrich:
-                    try:
-                        sid = school['school_enrichment_id']
-                        name = school['school_name']
-                        logger.info(f"🔬 Enriching school {sid}: {name}")
-                        
-                        result = workflow.enrich_school_if_pending(
-                            school_id=sid,
-                            aurora_agent=scientist
-                        )
-                        
-                        status = result.get('analysis_status', 'unknown')
-                        score = result.get('opportunity_score', 0)
-                        logger.info(f"✓ Enriched {name}: status={status}, score={score}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error enriching school {school.get('school_name')}: {e}")
-                        continue
-                        
-            except Exception as e:
-                logger.error(f"Error in batch enrichment: {e}", exc_info=True)
+        pending = [dict(s) for s in pending]
+        step = _naveen_moana_step(run_moana=False, dry_run=dry_run, refresh=refresh)
+        if dry_run:
+            return jsonify(SchoolEnrichmentEngine().plan(pending, step))
         
-        # Start background thread
-        thread = threading.Thread(
-            target=background_batch_enrich,
-            args=([dict(s) for s in pending],)
-        )
-        thread.daemon = True
-        thread.start()
+        if _start_school_enrichment(pending, step, {'source': 'enrich_pending', 'limit': limit, 'refresh': refresh}) is None:
+            return _already_running()
         
         school_names = [s['school_name'] for s in pending]
         return jsonify({
             'status': 'success',
             'message': f'Queued {len(pending)} schools for enrichment',
             'queued': len(pending),
-            'schools': school_names
+            'schools': school_names,
+            'poll_url': '/api/schools/batch-naveen-moana',
         })
         
     except Exception as e:
@@ -800,22 +840,27 @@ def enrich_pending_schools():
 def batch_naveen_moana():
     """Batch-process up to N schools through Naveen analysis + Moana validation.
 
-    Picks schools that are missing Naveen analysis or Moana validation,
-    processes them sequentially in a background thread with delays to
-    manage Azure OpenAI capacity.
+    Picks schools that are missing Naveen analysis or Moana validation and
+    processes them concurrently in the background, paced by the model
+    deployments' rate limits (see ``src.school_enrichment``).
 
     Request body (optional):
-        { "limit": 10 }   -- max schools per batch (default 10, cap 20)
+        { "limit": 10, "dry_run": false, "refresh": false }   -- max schools per batch (default 10)
+
+    ``dry_run`` returns the schools, planned model calls and an estimated
+    duration without calling a model or writing anything. Schools whose
+    source data and prompts are unchanged since their last enrichment
+    keep their stored results unless ``refresh`` is set.
     """
     try:
         data = request.get_json() or {}
-        limit = min(int(data.get('limit', 10)), 20)
+        limit = min(int(data.get('limit', 10)), SCHOOL_ENRICHMENT_MAX_BATCH)
+        dry_run = bool(data.get('dry_run', False))
+        refresh = bool(data.get('refresh', False))
 
         # Find schools that need processing
         pending = db.execute_query(
-            """SELECT school_enrichment_id, school_name, school_district, state_code,
-                      analysis_status, moana_requirements_met
-               FROM school_enriched_data
+            """SELECT * FROM school_enriched_data
                WHERE is_active = TRUE
                  AND (analysis_status IS NULL
                       OR analysis_status = 'pending'
@@ -842,250 +887,14 @@ def batch_naveen_moana():
                 'queued': 0
             })
 
-        # Write initial state for progress tracking
-        _batch_state_file = os.path.join(tempfile.gettempdir(), 'batch_naveen_state.json')
-        with open(_batch_state_file, 'w') as _bf:
-            json.dump({'status': 'running', 'total': len(pending), 'completed': 0,
-                       'current': '', 'message': f'Starting batch of {len(pending)} schools...'}, _bf)
-
-        def background_batch(schools_to_process, state_path):
-            """Process each school through Naveen then Moana, sequentially."""
-            import time as _time
-            from src.agents.naveen_school_data_scientist import NaveenSchoolDataScientist
-            from src.school_workflow import SchoolDataWorkflow
-            from src.agents.base_agent import BaseAgent
-            from decimal import Decimal
-
-            def _update_batch_state(completed, current_name, error=None):
-                try:
-                    st = {'status': 'running', 'total': len(schools_to_process),
-                          'completed': completed, 'current': current_name,
-                          'message': f'Processing {current_name} ({completed}/{len(schools_to_process)})'}
-                    if error:
-                        st['last_error'] = str(error)
-                    with open(state_path, 'w') as sf:
-                        json.dump(st, sf)
-                except Exception:
-                    pass
-            import re as _re
-
-            client_mini = get_ai_client_mini()
-            client_main = get_ai_client()
-            model_main = config.foundry_model_name if config.model_provider == 'foundry' else config.deployment_name
-
-            scientist = NaveenSchoolDataScientist(
-                name='Naveen School Data Scientist',
-                client=client_mini,
-                model=config.model_tier_workhorse  # Tier 2
-            )
-            workflow = SchoolDataWorkflow(db)
-
-            total = len(schools_to_process)
-            for idx, sch in enumerate(schools_to_process):
-                sid = sch['school_enrichment_id']
-                name = sch['school_name']
-                _update_batch_state(idx, name)
-                logger.info(f"🔬 Batch [{idx+1}/{total}] Starting: {name} (id={sid})")
-
-                # ── Step 1: Naveen analysis (if needed) ──────────────
-                needs_naveen = sch.get('analysis_status') in (None, 'pending', 'csv_imported', 'error')
-                if needs_naveen:
-                    try:
-                        full_school = db.get_school_enriched_data(sid) or {}
-                        logger.info(f"  → Calling Naveen AI model for {name} (status={sch.get('analysis_status')})")
-
-                        result = scientist.analyze_school(
-                            school_name=name,
-                            school_district=sch.get('school_district', ''),
-                            state_code=sch.get('state_code', ''),
-                            existing_data=full_school
-                        )
-
-                        enriched = result.get('enriched_data', {})
-                        logger.info(f"  Naveen raw keys: {list(enriched.keys()) if isinstance(enriched, dict) else 'NOT DICT'}")
-                        logger.info(f"  Naveen academic_courses={enriched.get('academic_courses')}, "
-                                    f"ap_course_count={enriched.get('ap_course_count')}, "
-                                    f"honors_programs={enriched.get('honors_programs')}, "
-                                    f"graduation_rate={enriched.get('graduation_rate')}")
-
-                        def _dig(d, *keys):
-                            if not isinstance(d, dict):
-                                return None
-                            for k in keys:
-                                if k in d and d[k] is not None:
-                                    return d[k]
-                            for v in d.values():
-                                if isinstance(v, dict):
-                                    for k in keys:
-                                        if k in v and v[k] is not None:
-                                            return v[k]
-                            return None
-
-                        def _to_num(val, as_int=False):
-                            if val is None or val == '' or val is False:
-                                return 0
-                            if isinstance(val, (int, float)):
-                                return int(val) if as_int else float(val)
-                            if isinstance(val, Decimal):
-                                return int(val) if as_int else float(val)
-                            if isinstance(val, str):
-                                m = _re.search(r'[\d,]+\.?\d*', val.replace(',', ''))
-                                if m:
-                                    num = float(m.group())
-                                    return int(num) if as_int else num
-                            try:
-                                return int(float(val)) if as_int else float(val)
-                            except (ValueError, TypeError):
-                                return 0
-
-                        opp = _to_num(_dig(enriched, 'opportunity_score') or result.get('opportunity_score', 0))
-                        conf = _to_num(_dig(enriched, 'confidence_score') or result.get('confidence_score', 0))
-                        a_status = result.get('analysis_status', 'complete')
-                        tot = _to_num(_dig(enriched, 'total_enrollment', 'enrollment_size', 'total_students') or result.get('enrollment_size') or 0, True)
-                        grad = _to_num(_dig(enriched, 'graduation_rate') or result.get('graduation_rate') or 0)
-                        col = _to_num(_dig(enriched, 'college_acceptance_rate', 'college_placement_rate') or result.get('college_placement_rate') or 0)
-                        fl = _to_num(_dig(enriched, 'free_lunch_percentage') or result.get('free_lunch_percentage') or 0)
-                        ap = _to_num(_dig(enriched, 'academic_courses', 'ap_course_count', 'ap_classes_count', 'ap_courses') or result.get('ap_classes_count') or result.get('academic_courses') or 0, True)
-                        ap_p = _to_num(_dig(enriched, 'ap_exam_pass_rate', 'ap_pass_rate') or result.get('ap_exam_pass_rate') or 0)
-                        stem = bool(_dig(enriched, 'stem_programs', 'stem_program_available') or False)
-                        ib = bool(_dig(enriched, 'ib_program_available', 'ib_offerings', 'ib_program') or False)
-                        dual = bool(_dig(enriched, 'dual_enrollment_available', 'dual_enrollment') or False)
-                        hon = _to_num(_dig(enriched, 'honors_programs', 'honors_course_count', 'honors_courses_available', 'honors_courses') or 0, True)
-                        if not hon and _dig(enriched, 'honors_programs', 'honors_courses_available'):
-                            hon = 10  # Default: most schools offer ~10 honors courses
-                        inv = _dig(enriched, 'school_investment_level', 'funding_level') or result.get('school_investment_level') or 'medium'
-
-                        db.execute_non_query(
-                            """UPDATE school_enriched_data
-                            SET opportunity_score=%s, analysis_status=%s, data_confidence_score=%s,
-                                total_students=%s, graduation_rate=%s, college_acceptance_rate=%s,
-                                free_lunch_percentage=%s, ap_course_count=%s, ap_exam_pass_rate=%s,
-                                stem_program_available=%s, ib_program_available=%s, dual_enrollment_available=%s,
-                                honors_course_count=%s, school_investment_level=%s, updated_at=CURRENT_TIMESTAMP
-                            WHERE school_enrichment_id=%s""",
-                            (opp, a_status, conf, tot, grad, col, fl, ap, ap_p, stem, ib, dual, hon, inv, sid)
-                        )
-                        logger.info(f"  ✓ Naveen complete for {name}: score={opp}, AP={ap}, honors={hon}, grad={grad}, students={tot}, confidence={conf}")
-                    except Exception as e:
-                        logger.error(f"  ✗ Naveen failed for {name}: {e}", exc_info=True)
-                        try:
-                            db.execute_non_query(
-                                "UPDATE school_enriched_data SET analysis_status='error', updated_at=CURRENT_TIMESTAMP WHERE school_enrichment_id=%s",
-                                (sid,)
-                            )
-                        except Exception:
-                            pass
-                else:
-                    logger.info(f"  → Naveen skipped for {name} (already status={sch.get('analysis_status')})")
-
-                # ── Step 2: Moana validation (if school now has data) ─
-                try:
-                    fresh = db.get_school_enriched_data(sid) or {}
-                    fresh['ap_courses_available'] = fresh.get('ap_course_count', 0)
-                    # Ensure honors_course_count is populated — use a reasonable default
-                    # if Naveen found honors data but didn't return a numeric count
-                    if not fresh.get('honors_course_count'):
-                        fresh['honors_course_count'] = 10  # Most schools offer honors courses
-
-                    is_valid, missing_fields, vdetails = workflow.validate_school_requirements(fresh)
-
-                    # Save moana_requirements_met directly by ID for reliability
-                    try:
-                        db.execute_non_query(
-                            """UPDATE school_enriched_data
-                            SET moana_requirements_met = %s,
-                                last_moana_validation = CURRENT_TIMESTAMP,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE school_enrichment_id = %s""",
-                            (is_valid, sid)
-                        )
-                    except Exception as _mv_err:
-                        logger.warning(f"  Could not save moana_requirements_met for {name}: {_mv_err}")
-
-                    # Generate context summary if enough data
-                    ctx_summary = None
-                    if is_valid or len(missing_fields) <= 2:
-                        try:
-                            ctx_prompt = (
-                                f"You are Moana, the School Context Analyzer. "
-                                f"Based on the following school enrichment data, write a concise "
-                                f"school context summary (3-5 sentences).\n\n"
-                                f"School: {fresh.get('school_name')}\n"
-                                f"District: {fresh.get('school_district', 'N/A')}\n"
-                                f"State: {fresh.get('state_code', 'N/A')}\n"
-                                f"Students: {fresh.get('total_students', 'N/A')}\n"
-                                f"Graduation Rate: {fresh.get('graduation_rate', 'N/A')}%\n"
-                                f"College Rate: {fresh.get('college_acceptance_rate', 'N/A')}%\n"
-                                f"Free Lunch: {fresh.get('free_lunch_percentage', 'N/A')}%\n"
-                                f"AP Courses: {fresh.get('ap_course_count', 'N/A')}\n"
-                                f"Opportunity Score: {fresh.get('opportunity_score', 'N/A')}/100\n"
-                                f"STEM: {'Yes' if fresh.get('stem_program_available') else 'No'}\n"
-                                f"IB: {'Yes' if fresh.get('ib_program_available') else 'No'}\n"
-                                f"Dual Enrollment: {'Yes' if fresh.get('dual_enrollment_available') else 'No'}\n\n"
-                                f"Provide: 1) school environment description, 2) academic rigor context, "
-                                f"3) key insight about student opportunities."
-                            )
-
-                            class _BatchMoana(BaseAgent):
-                                async def process(self, message): return message
-
-                            moana = _BatchMoana(name='Moana Batch', client=client_main)
-                            moana.model = model_main
-
-                            resp = moana._create_chat_completion(
-                                operation='moana_batch_validation',
-                                model=model_main,
-                                messages=[
-                                    {'role': 'system', 'content': 'You are Moana, a school context analyzer. Provide concise, insightful school context summaries.'},
-                                    {'role': 'user', 'content': ctx_prompt}
-                                ],
-                                temperature=0.5,
-                                max_completion_tokens=500
-                            )
-
-                            if resp and hasattr(resp, 'choices') and resp.choices:
-                                ctx_summary = getattr(resp.choices[0].message, 'content', None) or ''
-                                ctx_summary = ctx_summary.strip()
-                        except Exception as e:
-                            logger.warning(f"  Moana summary generation failed for {name}: {e}")
-
-                    if ctx_summary:
-                        try:
-                            from datetime import datetime as _dt
-                            db.execute_non_query(
-                                """UPDATE school_enriched_data
-                                SET data_source_notes = COALESCE(data_source_notes, '') || %s,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE school_enrichment_id = %s""",
-                                (f"\n\n🌊 Moana Context Summary ({_dt.now().strftime('%Y-%m-%d %H:%M')}):\n{ctx_summary}", sid)
-                            )
-                        except Exception:
-                            pass
-
-                    logger.info(f"  ✓ Moana complete for {name}: valid={is_valid}, missing={len(missing_fields)}, summary={'yes' if ctx_summary else 'no'}")
-                except Exception as e:
-                    logger.error(f"  ✗ Moana failed for {name}: {e}", exc_info=True)
-
-                # ── Delay between schools to manage API capacity ──
-                if idx < total - 1:
-                    logger.info(f"  ⏳ Waiting 60s before next school...")
-                    _time.sleep(60)
+        pending = [dict(s) for s in pending]
+        step = _naveen_moana_step(dry_run=dry_run, refresh=refresh)
+        plan = SchoolEnrichmentEngine().plan(pending, step)
+        if dry_run:
+            return jsonify(plan)
 
-            logger.info(f"🏁 Batch Naveen+Moana complete: processed {total} schools")
-            try:
-                with open(state_path, 'w') as sf:
-                    json.dump({'status': 'completed', 'total': total, 'completed': total,
-                               'message': f'Batch complete: {total} schools processed'}, sf)
-            except Exception:
-                pass
-
-        # Launch background thread
-        thread = threading.Thread(
-            target=background_batch,
-            args=([dict(s) for s in pending], _batch_state_file)
-        )
-        thread.daemon = True
-        thread.start()
+        if _start_school_enrichment(pending, step, {'source': 'batch_naveen_moana', 'limit': limit, 'refresh': refresh}) is None:
+            return _already_running()
 
         school_names = [s['school_name'] for s in pending]
         return jsonify({
@@ -1093,7 +902,8 @@ def batch_naveen_moana():
             'message': f'Queued {len(pending)} schools for Naveen + Moana batch processing',
             'queued': len(pending),
             'schools': school_names,
-            'estimated_minutes': len(pending) * 2  # ~2 min per school (processing + delay)
+            'estimated_minutes': plan['estimated_minutes'],
+            'poll_url': '/api/schools/batch-naveen-moana',
         })
 
     except Exception as e:
@@ -1104,15 +914,8 @@ def batch_naveen_moana():
 
 @schools_bp.route('/api/schools/batch-naveen-moana', methods=['GET'])
 def batch_naveen_moana_status():
-    """Poll batch Naveen+Moana progress."""
-    state_file = os.path.join(tempfile.gettempdir(), 'batch_naveen_state.json')
-    if not os.path.isfile(state_file):
-        return jsonify({'status': 'idle'})
-    try:
-        with open(state_file, 'r') as f:
-            return jsonify(json.load(f))
-    except Exception:
-        return jsonify({'status': 'unknown'})
+    """Poll school enrichment progress (batch Naveen+Moana or enrich-pending)."""
+    return _enrichment_job_status(SCHOOL_ENRICHMENT_JOB)
 
 
 @schools_bp.route('/api/schools/clear', methods=['POST'])
@@ -1534,14 +1337,16 @@ def seed_school_academics():
     honors courses, etc. from its knowledge of public records. Results are
     written as supplemental data with provenance tracking.
 
+    Lookups run concurrently under the workhorse deployment's rate limit
+    (see ``src.school_enrichment``). Optional body:
+    ``{"limit": 0, "dry_run": false}``.
+
     Runs in background. Poll GET /api/schools/seed-academics for progress.
     """
-    import tempfile
-
     try:
         data = request.get_json() or {}
         limit = int(data.get('limit', 0))
-        delay = float(data.get('delay', 2.0))
+        dry_run = bool(data.get('dry_run', False))
 
         schools = db.execute_query(
             """SELECT school_enrichment_id, nces_id, school_name, school_district,
@@ -1555,7 +1360,7 @@ def seed_school_academics():
             return jsonify({'status': 'error', 'error': 'No GA schools found'})
 
         # Filter to schools that need academic data
-        needs_data = [s for s in schools
+        needs_data = [dict(s) for s in schools
                       if not s.get('ap_course_count') or int(s.get('ap_course_count', 0)) == 0
                       or not s.get('graduation_rate') or float(s.get('graduation_rate', 0)) == 0]
 
@@ -1565,154 +1370,35 @@ def seed_school_academics():
         if not needs_data:
             return jsonify({'status': 'success', 'message': 'All schools already have academic data', 'count': 0})
 
-        state_file = os.path.join(tempfile.gettempdir(), 'seed_academics_state.json')
-        state = {
-            'status': 'running',
-            'total': len(needs_data),
-            'processed': 0,
-            'updated': 0,
-            'errors': 0,
-            'current_school': '',
-        }
-        with open(state_file, 'w') as f:
-            json.dump(state, f)
+        model = config.model_tier_workhorse or config.foundry_model_name or config.deployment_name
+        if dry_run:
+            plan = SchoolEnrichmentEngine().plan(needs_data, AcademicsLookupStep(None, model))
+            return jsonify(plan)
+
+        job = start_job(db, SEED_ACADEMICS_JOB, {'limit': limit})
+        if job is None:
+            return jsonify({
+                'status': 'already_running',
+                'message': 'Academic data lookup is already in progress.',
+                'poll_url': '/api/schools/seed-academics',
+            })
 
-        def background_seed(schools_to_process, delay_sec, state_path):
-            import time as _time
+        def background_seed(schools_to_process):
             try:
                 # Ensure GOSA columns exist before importing
                 db.ensure_gosa_columns()
-                client = get_ai_client()
-                model = config.model_tier_workhorse or config.foundry_model_name or config.deployment_name
-                source_name = 'AI_Knowledge_GA_2025'
-                import csv as csv_mod
-                csv_path = os.path.join(tempfile.gettempdir(), 'ga_academics_seed.csv')
-
-                rows = []
-                for idx, sch in enumerate(schools_to_process):
-                    name = sch['school_name']
-                    state['current_school'] = name
-                    state['processed'] = idx
-
-                    try:
-                        prompt = (
-                            f"Look up this Georgia high school and provide its REAL academic data "
-                            f"from GOSA (Governor's Office of Student Achievement), GA DOE, and CollegeBoard.\n\n"
-                            f"School: {name}\n"
-                            f"District: {sch.get('school_district', '')}\n"
-                            f"NCES ID: {sch.get('nces_id', '')}\n"
-                            f"Enrollment: {sch.get('total_students', 0)}\n\n"
-                            f"Return JSON with ALL of these fields (use null if unknown):\n"
-                            f"- ap_course_count: int (AP courses offered)\n"
-                            f"- ap_students_tested: int (students taking AP exams)\n"
-                            f"- ap_exam_pass_rate: float (% of AP exams scoring 3+)\n"
-                            f"- honors_course_count: int\n"
-                            f"- graduation_rate: float (4-year cohort %)\n"
-                            f"- college_going_rate: float (% enrolled in college within 16 months, from GOSA C11 report)\n"
-                            f"- college_going_4yr_rate: float (% in 4-year institutions)\n"
-                            f"- act_composite_avg: float (school average ACT composite)\n"
-                            f"- sat_total_avg: int (school average SAT total, 400-1600 scale)\n"
-                            f"- hope_eligible_pct: float (% of graduates HOPE eligible)\n"
-                            f"- dropout_rate: float (9-12 annual dropout %)\n"
-                            f"- stem_program_available: bool\n"
-                            f"- ib_program_available: bool\n"
-                            f"- dual_enrollment_available: bool\n"
-                            f"- school_url: string (official school website)\n"
-                            f"Use the most recent data year available. Be precise."
-                        )
-                        resp = client.chat.completions.create(
-                            model=model,
-                            messages=[
-                                {"role": "system", "content": (
-                                    "You are a Georgia education data researcher with access to GOSA "
-                                    "(Governor's Office of Student Achievement) downloadable data, "
-                                    "GA DOE report cards, CollegeBoard AP data, and school profiles. "
-                                    "Provide real, publicly verifiable data for Georgia high schools. "
-                                    "Use data from the most recent school year available. "
-                                    "Only return data you are confident about. Use null for uncertain fields. "
-                                    "These data points are publicly available at gosa.georgia.gov."
-                                )},
-                                {"role": "user", "content": prompt},
-                            ],
-                            max_tokens=600,
-                            temperature=0.1,
-                            response_format={"type": "json_object"},
-                        )
-                        ai_data = json.loads(resp.choices[0].message.content)
-
-                        row = {'ncessch': sch.get('nces_id', '')}
-                        all_fields = [
-                            'ap_course_count', 'ap_students_tested', 'ap_exam_pass_rate',
-                            'honors_course_count', 'graduation_rate',
-                            'college_going_rate', 'college_going_4yr_rate',
-                            'act_composite_avg', 'sat_total_avg',
-                            'hope_eligible_pct', 'dropout_rate',
-                            'stem_program_available', 'ib_program_available',
-                            'dual_enrollment_available', 'school_url',
-                        ]
-                        for field in all_fields:
-                            val = ai_data.get(field)
-                            if val is True:
-                                row[field] = 'true'
-                            elif val is False:
-                                row[field] = 'false'
-                            elif val is not None:
-                                row[field] = str(val)
-                            else:
-                                row[field] = ''
-                        rows.append(row)
-                        state['updated'] += 1
-                        logger.info(f"  Seed [{idx+1}/{len(schools_to_process)}] {name}: AP={ai_data.get('ap_course_count')}, Grad={ai_data.get('graduation_rate')}")
-                    except Exception as e:
-                        state['errors'] += 1
-                        logger.warning(f"  Seed failed for {name}: {e}")
-
-                    with open(state_path, 'w') as f:
-                        json.dump(state, f)
-
-                    if idx < len(schools_to_process) - 1:
-                        _time.sleep(delay_sec)
-
-                # Write CSV and import
+                step = AcademicsLookupStep(get_ai_client(), model)
+                summary = SchoolEnrichmentEngine(job=job).run(schools_to_process, step)
+                rows = [outcome.pop('row') for outcome in summary['results']]
                 if rows:
-                    fieldnames = [
-                        'ncessch', 'ap_course_count', 'ap_students_tested', 'ap_exam_pass_rate',
-                        'honors_course_count', 'graduation_rate',
-                        'college_going_rate', 'college_going_4yr_rate',
-                        'act_composite_avg', 'sat_total_avg',
-                        'hope_eligible_pct', 'dropout_rate',
-                        'stem_program_available', 'ib_program_available',
-                        'dual_enrollment_available', 'school_url',
-                    ]
-                    with open(csv_path, 'w', newline='', encoding='utf-8') as cf:
-                        writer = csv_mod.DictWriter(cf, fieldnames=fieldnames)
-                        writer.writeheader()
-                        writer.writerows(rows)
-
-                    from src.csv_school_importer import import_supplemental_csv
-                    result = import_supplemental_csv(csv_path, db, source_name=source_name)
-                    logger.info(f"  Supplemental import: {result}")
-                    try:
-                        os.remove(csv_path)
-                    except Exception:
-                        pass
-
-                state['status'] = 'completed'
-                state['processed'] = len(schools_to_process)
+                    summary['import'] = import_academic_rows(db, rows, source_name='AI_Knowledge_GA_2025')
+                    logger.info(f"  Supplemental import: {summary['import']}")
+                job.finish(summary)
             except Exception as e:
-                state['status'] = 'error'
-                state['error'] = str(e)
                 logger.error(f"Seed academics failed: {e}", exc_info=True)
-            finally:
-                with open(state_path, 'w') as f:
-                    json.dump(state, f)
+                job.fail(str(e))
 
-        thread = threading.Thread(
-            target=background_seed,
-            args=(needs_data, delay, state_file),
-            daemon=True
-        )
-        thread.start()
+        threading.Thread(target=background_seed, args=(needs_data,), daemon=True).start()
 
         return jsonify({
             'status': 'started',
@@ -1729,15 +1415,7 @@ def seed_school_academics():
 @schools_bp.route('/api/schools/seed-academics', methods=['GET'])
 def seed_school_academics_progress():
     """Poll seed academics progress."""
-    import tempfile
-    state_file = os.path.join(tempfile.gettempdir(), 'seed_academics_state.json')
-    if not os.path.isfile(state_file):
-        return jsonify({'status': 'idle', 'message': 'No seed job running'})
-    try:
-        with open(state_file, 'r') as f:
-            return jsonify(json.load(f))
-    except Exception:
-        return jsonify({'status': 'unknown'})
+    return _enrichment_job_status(SEED_ACADEMICS_JOB, 'No seed job running')
 
 
 @schools_bp.route('/api/schools/purge', methods=['DELETE'])
@@ -2210,7 +1888,9 @@ def import_gosa_from_repo_status():
 def reset_schools_for_reanalysis():
     """Reset all complete schools back to csv_imported so Naveen re-analyzes them.
 
-    Use after improving Naveen's prompt to get better results.
+    The next batch re-analyzes only schools whose source data or Naveen
+    prompt changed since their last enrichment; the rest keep their stored
+    results. Pass ``"refresh": true`` to the batch to re-analyze them all.
     """
     try:
         count_rows = db.execute_query(
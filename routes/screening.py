@@ -17,6 +17,7 @@ from flask import Blueprint, jsonify, redirect, render_template, request, sessio
 from extensions import csrf, get_ai_client
 from src.config import config
 from src.database import db
+from src.token_budget import Section, input_budget, pack_sections
 
 logger = logging.getLogger(__name__)
 
@@ -111,21 +112,22 @@ def _screen_one(application_id: int, client, model: str) -> Dict[str, Any]:
     if not application:
         return {'application_id': application_id, 'status': 'error', 'error': 'Not found'}
 
-    # Gather ALL text
-    text_parts = []
-    for field in ('application_text', 'transcript_text', 'recommendation_text'):
+    # Gather ALL text; transcript tables outrank essay and letter pages
+    # when the packet is over the model's token budget.
+    sections = []
+    for field, priority in (('application_text', 2), ('transcript_text', 3), ('recommendation_text', 2)):
         val = application.get(field) or ''
         if val and len(val.strip()) > 20:
-            text_parts.append(f"=== {field.upper()} ===\n{val}")
+            sections.append(Section(field, f"=== {field.upper()} ===\n{val}", priority))
 
-    if not text_parts:
+    if not sections:
         # Fallback: use whatever text exists
         for key in ('applicationtext', 'ApplicationText', 'transcripttext', 'recommendationtext'):
             val = application.get(key) or ''
             if val and len(val.strip()) > 20:
-                text_parts.append(val)
+                sections.append(Section(key, val))
 
-    full_text = '\n\n'.join(text_parts)
+    full_text = '\n\n'.join(s.text for s in sections)
     if len(full_text.strip()) < 50:
         return {
             'application_id': application_id,
@@ -135,9 +137,7 @@ def _screen_one(application_id: int, client, model: str) -> Dict[str, Any]:
             'text_length': len(full_text),
         }
 
-    # Truncate to ~30K chars to stay within token limits
-    if len(full_text) > 30000:
-        full_text = full_text[:30000] + '\n\n[TRUNCATED — document exceeds 30K chars]'
+    full_text = pack_sections(sections, input_budget(model), model).text
 
     applicant_name = application.get('applicant_name') or application.get('applicantname') or 'Unknown'
 
@@ -206,6 +206,7 @@ def get_telemetry_status():
             'telemetry_events_table': telem_table_status,
             'telemetry_events_rows': telem_row_count,
             'in_memory_call_count': in_mem_calls,
+            'telemetry_sink': telemetry.sink_stats(),
             'observability': {
                 'configured': observability_status.get('configured'),
                 'azure_monitor_available': observability_status.get('azure_monitor_available'),
@@ -292,10 +292,12 @@ def upload_test_files():
 
                 student_id = storage.generate_student_id()
                 temp_id = uuid.uuid4().hex
-                temp_path = os.path.join(current_app.config['UPLOAD_FOLDER'], f"temp_{temp_id}_{cfilename}")
+                # Local-mode uploads are read in place; blobs are downloaded
+                local_path = storage.local_blob_path(blob_path, application_type='test')
+                temp_path = local_path or os.path.join(current_app.config['UPLOAD_FOLDER'], f"temp_{temp_id}_{cfilename}")
 
                 try:
-                    ok = storage.download_blob_to_file(
+                    ok = bool(local_path) or storage.download_blob_to_file(
                         blob_path=blob_path,
                         local_path=temp_path,
                         application_type='test',
@@ -321,10 +323,11 @@ def upload_test_files():
                             "extracted_data": {}
                         }
                 finally:
-                    try:
-                        os.remove(temp_path)
-                    except Exception:
-                        pass
+                    if not local_path:
+                        try:
+                            os.remove(temp_path)
+                        except Exception:
+                            pass
 
                 belle_student_info = doc_analysis.get('student_info', {})
                 student_name = belle_student_info.get('name') or extract_student_name(application_text)
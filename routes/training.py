@@ -11,6 +11,9 @@ from datetime import datetime, timezone
 
 from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
 
+from routes.applications import (
+    STUDENT_PAGE_SIZE, student_filters_from_request, student_page_from_request, student_page_urls,
+)
 from extensions import (
     csrf, limiter, run_async,
     get_ai_client, get_orchestrator, refresh_foundry_dataset_async,
@@ -19,6 +22,8 @@ from extensions import (
 from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
 from src.config import config
 from src.database import db
+from src.job_store import latest_job, start_job
+from src.milo_validation import InsightsError, run_validation
 from src.storage import storage
 from src.telemetry import telemetry
 
@@ -26,9 +31,7 @@ logger = logging.getLogger(__name__)
 
 training_bp = Blueprint('training', __name__)
 
-# --- Milo Validation state files (file-based for multi-worker compat) ---
-_VALIDATION_STATE_FILE = os.path.join(tempfile.gettempdir(), "milo_validation_state.json")
-_VALIDATION_RESULT_FILE = os.path.join(tempfile.gettempdir(), "milo_validation_result.json")
+MILO_VALIDATION_JOB = 'milo_validation'
 
 # --- Agent Evaluations state files ---
 _EVAL_STATE_FILE = os.path.join(tempfile.gettempdir(), "agent_evaluation_state.json")
@@ -37,17 +40,28 @@ _EVAL_RESULT_FILE = os.path.join(tempfile.gettempdir(), "agent_evaluation_result
 
 @training_bp.route('/training')
 def training():
-    """Training data management page - historical applications for agent learning."""
+    """Training data management page - historical applications for agent learning.
+
+    Students are listed one keyset page at a time (by high school, then
+    name, by default); the Schools tab loads from ``/api/training/schools``
+    when opened.
+    """
     try:
         search_query = request.args.get('search', '').strip()
         filter_selected = request.args.get('filter', '')
         
-        # Get formatted student list for training examples, sorted by last name
-        training_data = db.get_formatted_student_list(is_training=True, search_query=search_query if search_query else None)
+        try:
+            filters = student_filters_from_request()
+            page = student_page_from_request(is_training=True, default_sort='school')
+        except ValueError:
+            # Stale cursor or bad sort from an old link: start over
+            filters = {}
+            page = db.get_student_page(is_training=True, search_query=search_query or None,
+                                       sort='school', limit=STUDENT_PAGE_SIZE)
         
         # CRITICAL: Defensive filtering to ensure test data NEVER appears in training view
         filtered_training = []
-        for record in training_data:
+        for record in page['students']:
             is_test = record.get('is_test_data')
             # Training data should NEVER be marked as test data
             if is_test is None or is_test is False:
@@ -57,53 +71,28 @@ def training():
         
         training_data = filtered_training
         
-        # Apply filter if specified
-        if filter_selected == 'selected':
-            training_data = [t for t in training_data if t.get('was_selected')]
-        elif filter_selected == 'not_selected':
-            training_data = [t for t in training_data if not t.get('was_selected')]
-        
-        # Calculate statistics
-        total_count = len(training_data)
-        selected_count = len([t for t in training_data if t.get('was_selected')])
-        not_selected_count = total_count - selected_count
-        
-        # Count students with historical XLSX matches
-        matched_count = len([t for t in training_data if t.get('has_historical_match')])
-
-        # Re-sort training data by high school, then state (from school enrichment), then last name
-        def _sort_key(s):
-            hs = (s.get('high_school') or '').strip().lower()
-            ln = (s.get('last_name') or '').strip().lower()
-            fn = (s.get('first_name') or '').strip().lower()
-            return (hs == '', hs, ln, fn)  # blanks sort last
-        training_data.sort(key=_sort_key)
-
-        # Fetch school enrichment data for the Schools tab
-        school_data = db.get_all_schools_enriched(limit=5000)
-        school_data.sort(key=lambda s: (
-            (s.get('state_code') or '').lower(),
-            (s.get('school_name') or '').lower()
-        ))
-        school_count = len(school_data)
+        # Statistics come from one aggregate query, not the page
+        counts = db.get_student_list_counts(is_training=True, search_query=search_query or None,
+                                            filters=filters)
 
         return render_template('training.html',
                              training_data=training_data,
-                             school_data=school_data,
                              search_query=search_query,
                              filter_selected=filter_selected,
-                             total_count=total_count,
-                             selected_count=selected_count,
-                             not_selected_count=not_selected_count,
-                             matched_count=matched_count,
-                             school_count=school_count,
-                             is_training_view=True)
+                             list_sort=request.args.get('sort') or 'school',
+                             list_total=counts['total'],
+                             total_count=counts['total'],
+                             selected_count=counts['selected'],
+                             not_selected_count=counts['not_selected'],
+                             matched_count=counts['historical_match'],
+                             school_count=db.count_schools_enriched(),
+                             is_training_view=True,
+                             **student_page_urls(page))
     except Exception as e:
         logger.error('Error loading training data: %s', e, exc_info=True)
         flash('An error occurred while loading training data', 'error')
         return render_template('training.html', 
                              training_data=[], 
-                             school_data=[],
                              search_query='',
                              filter_selected='',
                              total_count=0,
@@ -112,6 +101,29 @@ def training():
                              school_count=0)
 
 
+# Columns the Schools tab renders
+_SCHOOL_TAB_FIELDS = (
+    'school_enrichment_id', 'school_name', 'nces_id', 'school_district', 'district',
+    'state_code', 'total_enrollment', 'enrollment', 'frpl_pct', 'free_reduced_lunch_pct',
+    'analysis_status',
+)
+
+
+@training_bp.route('/api/training/schools')
+def training_schools():
+    """School rows for the training page's Schools tab, fetched when the tab opens."""
+    try:
+        school_data = db.get_all_schools_enriched(limit=5000)
+    except Exception as e:
+        logger.error('Error loading schools: %s', e, exc_info=True)
+        return jsonify({'error': 'An internal error occurred'}), 500
+    school_data.sort(key=lambda s: (
+        (s.get('state_code') or '').lower(),
+        (s.get('school_name') or '').lower()
+    ))
+    return jsonify({'schools': [{k: s.get(k) for k in _SCHOOL_TAB_FIELDS} for s in school_data]})
+
+
 
 @training_bp.route('/training/<int:application_id>')
 def view_training_detail(application_id):
@@ -449,7 +461,7 @@ def reset_training_agent_outputs():
         for row in (app_ids or []):
             aid = row['application_id']
             for table in ('ai_evaluations', 'aurora_evaluations', 'merlin_evaluations',
-                          'agent_audit_logs'):
+                          'agent_audit_logs', 'evaluation_summary'):
                 try:
                     db.execute_non_query(f"DELETE FROM {table} WHERE application_id = %s", (aid,))
                 except Exception:
@@ -713,7 +725,8 @@ def overnight_reprocess():
             # Clear dependent agent tables
             for aid in app_ids_list:
                 for table in ('ai_evaluations', 'aurora_evaluations',
-                              'merlin_evaluations', 'agent_audit_logs'):
+                              'merlin_evaluations', 'agent_audit_logs',
+                              'evaluation_summary'):
                     try:
                         db.execute_non_query(f"DELETE FROM {table} WHERE application_id = %s", (aid,))
                     except Exception:
@@ -1261,23 +1274,32 @@ def milo_get_ranking():
 def milo_validate_model():
     """Start Milo model validation as a background job.
 
-    POST body: {"threshold": 65}
+    POST body: {"threshold": 65, "refresh": false}
+    ``refresh`` re-scores every student instead of reusing cached
+    evaluations from an earlier run on the same training data.
     Returns immediately. Poll GET /api/milo/validate for results.
     """
-    current = _read_validation_state()
-    if current.get("state") == "running":
+    body = request.get_json(silent=True) or {}
+    threshold = body.get('threshold', 65)
+    refresh = bool(body.get('refresh', False))
+
+    try:
+        job = start_job(db, MILO_VALIDATION_JOB, {'threshold': threshold, 'refresh': refresh})
+        current = latest_job(db, MILO_VALIDATION_JOB) if job is None else None
+    except Exception as e:
+        logger.error('Could not start Milo validation: %s', e, exc_info=True)
+        return jsonify({'status': 'error', 'error': 'An internal error occurred'}), 500
+
+    if job is None:
         return jsonify({
             'status': 'already_running',
             'message': 'Validation is already in progress. GET /api/milo/validate to check status.',
-            'progress': current.get('progress', ''),
+            'progress': (current or {}).get('progress', {}).get('progress', ''),
         })
 
-    body = request.get_json(silent=True) or {}
-    threshold = body.get('threshold', 65)
-
     thread = threading.Thread(
         target=_run_milo_validation_job,
-        args=(threshold,),
+        args=(job, threshold, refresh),
         daemon=True,
     )
     thread.start()
@@ -1292,34 +1314,39 @@ def milo_validate_model():
 
 @training_bp.route('/api/milo/validate', methods=['GET'])
 def milo_validate_status():
-    """Check the status/results of the Milo validation job."""
-    current = _read_validation_state()
-    state = current.get("state", "idle")
+    """Check the status/results of the Milo validation job.
 
-    if state == "idle":
+    While running, ``partial_metrics`` holds accuracy/precision/recall
+    over the students scored so far.
+    """
+    try:
+        job = latest_job(db, MILO_VALIDATION_JOB)
+    except Exception as e:
+        logger.error('Could not read Milo validation status: %s', e, exc_info=True)
+        return jsonify({'status': 'error', 'error': 'An internal error occurred'}), 500
+
+    if not job:
         return jsonify({
             'status': 'idle',
             'message': 'No validation has been run yet. POST /api/milo/validate to start one.',
         })
 
-    if state == "running":
-        elapsed = time.time() - current.get("started_at", time.time())
+    if job['status'] == 'running':
         return jsonify({
             'status': 'running',
-            'progress': current.get('progress', ''),
-            'elapsed_seconds': round(elapsed, 1),
+            'progress': job['progress'].get('progress', ''),
+            'partial_metrics': job['progress'].get('partial_metrics'),
+            'elapsed_seconds': job['elapsed_seconds'],
         })
 
-    if state == "error":
+    if job['status'] == 'error':
         return jsonify({
             'status': 'error',
-            'error': current.get('error', 'Unknown error'),
+            'error': job.get('error') or 'Unknown error',
         }), 500
 
-    # state == "done"
-    result = _read_validation_result()
-    if result:
-        return jsonify(result)
+    if job['result']:
+        return jsonify(job['result'])
 
     return jsonify({'status': 'error', 'error': 'Results not available'}), 500
 
@@ -1330,6 +1357,10 @@ def start_agent_evaluations():
     """Start agent quality evaluations as a background job.
 
     POST body (optional): {"agents": ["Merlin", "Tiana"], "max_students": 10}
+    To continue an interrupted run, pass {"resume_batch_id": "eval_..."} or
+    {"resume": true} for the most recent run that did not complete.
+    Unchanged outputs reuse their previous scores; {"full": true} re-scores
+    everything.
     Returns immediately. Poll GET /api/evaluations/status for progress.
     """
     current = _read_eval_state()
@@ -1343,10 +1374,17 @@ def start_agent_evaluations():
     body = request.get_json(silent=True) or {}
     agents = body.get('agents')  # None = all
     max_students = body.get('max_students', 0)
+    resume_batch_id = body.get('resume_batch_id')
+    incremental = not body.get('full', False)
+    if not resume_batch_id and body.get('resume'):
+        from src.evaluations.agent_evaluator import AgentEvaluator
+        resume_batch_id = AgentEvaluator(db).get_resumable_batch_id()
+        if not resume_batch_id:
+            return jsonify({'status': 'error', 'error': 'No incomplete evaluation run to resume'}), 404
 
     thread = threading.Thread(
         target=_run_agent_evaluation_job,
-        args=(agents, max_students),
+        args=(agents, max_students, resume_batch_id, incremental),
         daemon=True,
     )
     thread.start()
@@ -1354,6 +1392,7 @@ def start_agent_evaluations():
     return jsonify({
         'status': 'started',
         'message': 'Evaluation started. Poll GET /api/evaluations/status for progress.',
+        'resume_batch_id': resume_batch_id,
     })
 
 
@@ -1373,7 +1412,8 @@ def agent_evaluation_status():
             'status': 'running',
             'progress': current.get('progress', ''),
             'agent': current.get('agent', ''),
-            'student_index': current.get('student_index'),
+            'evaluations_done': current.get('evaluations_done'),
+            'evaluations_total': current.get('evaluations_total'),
             'total_students': current.get('total_students'),
             'elapsed_seconds': round(elapsed, 1),
         })
@@ -1435,201 +1475,28 @@ def agent_evaluation_history():
 
 
 
-def _write_validation_state(state: dict):
-    """Write validation state to a shared temp file (visible to all workers)."""
-    try:
-        with open(_VALIDATION_STATE_FILE, 'w') as f:
-            json.dump(state, f)
-    except Exception:
-        pass
-
-
-
-def _read_validation_state() -> dict:
-    """Read validation state from shared temp file."""
-    try:
-        with open(_VALIDATION_STATE_FILE, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {"state": "idle"}
-
-
-
-def _write_validation_result(result: dict):
-    """Write validation result to a shared temp file."""
-    try:
-        with open(_VALIDATION_RESULT_FILE, 'w') as f:
-            json.dump(result, f, default=str)
-    except Exception:
-        pass
-
-
-
-def _read_validation_result() -> dict:
-    """Read validation result from shared temp file."""
-    try:
-        with open(_VALIDATION_RESULT_FILE, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-
-
-def _run_milo_validation_job(threshold: int):
+def _run_milo_validation_job(job, threshold: int, refresh: bool = False):
     """Background thread: score all training students with Milo."""
-    import statistics
-
     try:
-        _write_validation_state({"state": "running", "started_at": time.time(), "progress": "initializing"})
-
         orchestrator = get_orchestrator()
         milo = orchestrator.agents.get('data_scientist') if orchestrator else None
         if not milo:
-            _write_validation_state({"state": "error", "error": "Milo agent not available"})
+            job.fail("Milo agent not available")
             return
 
-        # Step 1: Get training examples
         training = db.get_training_examples()
         if not training:
-            _write_validation_state({"state": "error", "error": "No training data found"})
+            job.fail("No training data found")
             return
 
-        total_students = len(training)
-        start_time = time.time()
-        _write_validation_state({"state": "running", "started_at": start_time,
-                                 "progress": f"building insights from {total_students} students"})
-
-        # Step 2: Build insights (may already be cached)
-        try:
-            insights = run_async(milo.analyze_training_insights())
-        except Exception as e:
-            _write_validation_state({"state": "error", "error": f"Insights failed: {e}"})
-            return
-
-        # Step 3: Evaluate in batches
-        from src.agents.milo_data_scientist import MAX_BATCH_SIZE
-        all_results = []
-        num_batches = (total_students + MAX_BATCH_SIZE - 1) // MAX_BATCH_SIZE
-        for batch_idx in range(0, total_students, MAX_BATCH_SIZE):
-            batch_num = batch_idx // MAX_BATCH_SIZE + 1
-            batch = training[batch_idx:batch_idx + MAX_BATCH_SIZE]
-            _write_validation_state({
-                "state": "running",
-                "started_at": start_time,
-                "progress": f"scoring batch {batch_num}/{num_batches} ({len(all_results)}/{total_students} done)",
-            })
-
-            try:
-                batch_results = run_async(milo._evaluate_batch(batch, insights))
-            except Exception as e:
-                logger.error(f"Milo validation batch {batch_num} failed: {e}")
-                batch_results = [
-                    {"nextgen_match": 0, "tier": "ERROR", "explanation": "Validation failed"}
-                    for _ in batch
-                ]
-
-            for j, result in enumerate(batch_results):
-                app_data = batch[j]
-                was_selected = app_data.get('was_selected', False)
-                if isinstance(was_selected, str):
-                    was_selected = was_selected.lower() in ('true', 'yes', '1', 'selected')
-                result['actual_selected'] = was_selected
-                result['application_id'] = app_data.get('application_id')
-                result['applicant_name'] = (
-                    app_data.get('applicant_name') or
-                    f"{app_data.get('first_name', '')} {app_data.get('last_name', '')}".strip()
-                )
-                all_results.append(result)
-
-        # Step 4: Compute metrics
-        accepted_scores = []
-        not_selected_scores = []
-        tp = fp = tn = fn = 0
-
-        for r in all_results:
-            score = r.get('nextgen_match', 0) or 0
-            actual = r.get('actual_selected', False)
-            predicted = score >= threshold
-
-            if actual:
-                accepted_scores.append(score)
-                if predicted:
-                    tp += 1
-                else:
-                    fn += 1
-            else:
-                not_selected_scores.append(score)
-                if predicted:
-                    fp += 1
-                else:
-                    tn += 1
-
-        total = len(all_results)
-        accuracy = (tp + tn) / total if total else 0
-        precision = tp / (tp + fp) if (tp + fp) else 0
-        recall = tp / (tp + fn) if (tp + fn) else 0
-        f1 = 2 * precision * recall / (precision + recall) if (precision + recall) else 0
-
-        accepted_mean = statistics.mean(accepted_scores) if accepted_scores else 0
-        not_selected_mean = statistics.mean(not_selected_scores) if not_selected_scores else 0
-        separation = accepted_mean - not_selected_mean
-
-        all_results.sort(key=lambda x: x.get('nextgen_match', 0), reverse=True)
-
-        validation_result = {
-            'status': 'success',
-            'agent': 'Milo Data Scientist',
-            'model_display': milo.model_display if hasattr(milo, 'model_display') else milo.model,
-            'threshold': threshold,
-            'total_training_students': total,
-            'accepted_count': len(accepted_scores),
-            'not_selected_count': len(not_selected_scores),
-            'metrics': {
-                'accuracy': round(accuracy, 3),
-                'precision': round(precision, 3),
-                'recall': round(recall, 3),
-                'f1_score': round(f1, 3),
-            },
-            'confusion_matrix': {
-                'true_positives': tp,
-                'false_positives': fp,
-                'true_negatives': tn,
-                'false_negatives': fn,
-            },
-            'score_distribution': {
-                'accepted_mean': round(accepted_mean, 1),
-                'accepted_min': round(min(accepted_scores), 1) if accepted_scores else 0,
-                'accepted_max': round(max(accepted_scores), 1) if accepted_scores else 0,
-                'accepted_median': round(statistics.median(accepted_scores), 1) if accepted_scores else 0,
-                'not_selected_mean': round(not_selected_mean, 1),
-                'not_selected_min': round(min(not_selected_scores), 1) if not_selected_scores else 0,
-                'not_selected_max': round(max(not_selected_scores), 1) if not_selected_scores else 0,
-                'not_selected_median': round(statistics.median(not_selected_scores), 1) if not_selected_scores else 0,
-                'separation': round(separation, 1),
-            },
-            'students': [
-                {
-                    'rank': i + 1,
-                    'name': r.get('applicant_name', 'Unknown'),
-                    'application_id': r.get('application_id'),
-                    'actual': 'ACCEPTED' if r.get('actual_selected') else 'NOT SELECTED',
-                    'score': r.get('nextgen_match', 0),
-                    'tier': r.get('tier', '?'),
-                    'predicted_correct': (
-                        (r.get('nextgen_match', 0) >= threshold) == r.get('actual_selected', False)
-                    ),
-                    'explanation': r.get('explanation', ''),
-                }
-                for i, r in enumerate(all_results)
-            ],
-            'elapsed_seconds': round(time.time() - start_time, 1),
-        }
-        _write_validation_result(validation_result)
-        _write_validation_state({"state": "done", "finished_at": time.time()})
+        job.progress(progress=f"building insights from {len(training)} students")
+        job.finish(run_validation(milo, training, threshold, job=job, use_cache=not refresh))
 
+    except InsightsError as e:
+        job.fail(str(e))
     except Exception as e:
         logger.error(f"Milo validation job error: {e}", exc_info=True)
-        _write_validation_state({"state": "error", "error": "An internal error occurred"})
+        job.fail("An internal error occurred")
 
 
 
@@ -1651,7 +1518,7 @@ def _read_eval_state() -> dict:
 
 
 
-def _run_agent_evaluation_job(agents=None, max_students=0):
+def _run_agent_evaluation_job(agents=None, max_students=0, resume_batch_id=None, incremental=True):
     """Background thread: run agent quality evaluations."""
     try:
         from src.evaluations.agent_evaluator import AgentEvaluator
@@ -1667,6 +1534,8 @@ def _run_agent_evaluation_job(agents=None, max_students=0):
             agents=agents,
             max_students=max_students,
             progress_callback=progress_cb,
+            resume_batch_id=resume_batch_id,
+            incremental=incremental,
         )
 
         # Persist result to temp file for polling
@@ -221,14 +221,16 @@ def upload():
                     if not blob_path:
                         continue
 
+                    # Local-mode uploads are read in place; blobs are downloaded
+                    local_path = storage.local_blob_path(blob_path, application_type=app_type)
                     temp_id = uuid.uuid4().hex
-                    temp_path = os.path.join(
+                    temp_path = local_path or os.path.join(
                         current_app.config['UPLOAD_FOLDER'],
                         f"temp_{temp_id}_{cfilename}"
                     )
 
                     try:
-                        ok = storage.download_blob_to_file(
+                        ok = bool(local_path) or storage.download_blob_to_file(
                             blob_path=blob_path,
                             local_path=temp_path,
                             application_type=app_type,
@@ -270,10 +272,11 @@ def upload():
                                 "agent_fields": {}
                             }
                     finally:
-                        try:
-                            os.remove(temp_path)
-                        except Exception:
-                            pass
+                        if not local_path:
+                            try:
+                                os.remove(temp_path)
+                            except Exception:
+                                pass
 
                     belle_student_info = doc_analysis.get('student_info', {})
                     extracted_name = belle_student_info.get('name') or extract_student_name(application_text)
@@ -648,6 +651,58 @@ def upload():
 
 
 # ── Chunked Video Upload API ─────────────────────────────────────────
+MAX_UPLOAD_CHUNKS = 500  # 500 chunks × 4 MB ≈ 2 GB
+# A commit still 'committing' after this long is presumed dead and re-claimable
+UPLOAD_COMMIT_STALE_SECONDS = int(os.getenv('UPLOAD_COMMIT_STALE_SECONDS', '900'))
+
+
+def _commit_chunked_upload(upload_id: str, filename: str, total_chunks: int,
+                           app_type: str, file_sha256: str = None,
+                           tracked: bool = True):
+    """Commit a chunked upload once every chunk has arrived.
+
+    Returns ``(payload, http_status)``.  With session tracking the commit is
+    claimed atomically, so when several out-of-order chunks complete the set
+    at once only one request commits; the others get ``committing``.
+    """
+    if tracked:
+        if not db.claim_upload_commit(upload_id, file_sha256, UPLOAD_COMMIT_STALE_SECONDS):
+            session_row = db.get_upload_session(upload_id) or {}
+            if session_row.get('status') == 'committed':
+                return {'complete': True, 'blob_path': session_row['blob_path'],
+                        'container': session_row['container']}, 200
+            return {'complete': False, 'committing': True}, 202
+        session_row = db.get_upload_session(upload_id) or {}
+        if session_row.get('missing'):
+            db.finish_upload_session(upload_id, False, error='Missing chunks')
+            return {'error': 'Upload incomplete', 'missing_chunks': session_row['missing']}, 409
+
+    try:
+        commit = storage.commit_chunked_upload(
+            upload_id=upload_id,
+            filename=filename,
+            total_chunks=total_chunks,
+            application_type=app_type,
+            file_checksum=file_sha256,
+        )
+    except Exception as e:
+        if tracked:
+            db.finish_upload_session(upload_id, False, error=str(e)[:500])
+        raise
+    if commit.get('success'):
+        if tracked:
+            db.finish_upload_session(upload_id, True, blob_path=commit['blob_path'],
+                                     container=commit['container'])
+        return {'complete': True, 'blob_path': commit['blob_path'],
+                'container': commit['container']}, 200
+
+    if tracked:
+        db.finish_upload_session(upload_id, False, error=commit.get('error'))
+    if commit.get('missing_chunks'):
+        return {'error': 'Upload incomplete', 'missing_chunks': commit['missing_chunks']}, 409
+    return {'error': 'Failed to commit file upload'}, 500
+
+
 @upload_bp.route('/api/file/upload-chunk', methods=['POST'])
 @upload_bp.route('/api/video/upload-chunk', methods=['POST'])  # backward compat
 @csrf.exempt
@@ -667,9 +722,17 @@ def file_upload_chunk():
       - total_chunks: total number of chunks
       - filename   : original file name
       - app_type   : "2026" | "training" | "test"
-
-    On the final chunk the staged blocks are committed and the response
-    includes ``blob_path`` and ``container`` for use in the form POST.
+      - chunk_size : (optional) fixed chunk length in bytes
+      - total_size : (optional) total file size in bytes
+      - chunk_sha256: (optional) SHA-256 hex of this chunk, verified server-side
+      - file_sha256: (optional) SHA-256 hex of the whole file
+
+    Chunks may be sent concurrently and in any order.  Each one is recorded
+    in ``upload_sessions``; the request that completes the set commits the
+    upload and its response includes ``blob_path`` and ``container`` for
+    use in the form POST.  When the database is unavailable the legacy
+    rule applies (commit on the last chunk index).  Without Azure Storage
+    the chunks are assembled on local disk.
     """
     chunk = request.files.get('chunk')
     if not chunk:
@@ -680,58 +743,147 @@ def file_upload_chunk():
     total_chunks = int(request.form.get('total_chunks', 1))
     filename = secure_filename(request.form.get('filename', 'file.bin'))
     app_type = request.form.get('app_type', '2026')
+    chunk_size = request.form.get('chunk_size', type=int)
+    total_size = request.form.get('total_size', type=int)
+    chunk_sha256 = request.form.get('chunk_sha256') or None
+    file_sha256 = request.form.get('file_sha256') or None
 
     if not upload_id:
         return jsonify({'error': 'upload_id is required'}), 400
 
-    # Guard against unbounded chunked uploads (max 500 chunks × 4 MB ≈ 2 GB)
-    if total_chunks > 500:
+    # Guard against unbounded chunked uploads
+    if total_chunks > MAX_UPLOAD_CHUNKS:
         return jsonify({'error': 'File too large (exceeds chunk limit)'}), 400
     if chunk_index < 0 or chunk_index >= total_chunks:
         return jsonify({'error': 'Invalid chunk_index'}), 400
 
+    chunk_data = chunk.read()
     try:
         ok = storage.stage_chunked_upload(
             upload_id=upload_id,
             filename=filename,
             chunk_index=chunk_index,
-            chunk_data=chunk.read(),
+            chunk_data=chunk_data,
             application_type=app_type,
+            total_chunks=total_chunks,
+            chunk_size=chunk_size,
+            total_size=total_size,
+            checksum=chunk_sha256,
         )
         if not ok:
             return jsonify({'error': 'Storage not available – could not stage chunk'}), 500
+    except ValueError as e:
+        logger.warning("File chunk %d rejected for %s: %s", chunk_index, upload_id, e)
+        return jsonify({'error': str(e), 'chunk_index': chunk_index}), 400
     except Exception as e:
         logger.error("File chunk %d upload failed: %s", chunk_index, e)
         logger.error('Request failed: %s', e, exc_info=True)
         return jsonify({'error': 'An internal error occurred'}), 500
 
+    # Record the chunk in the upload session (best-effort)
+    received = None
+    try:
+        db.open_upload_session(upload_id, filename, app_type, total_chunks,
+                               chunk_size=chunk_size, total_size=total_size)
+        received = db.record_upload_chunk(
+            upload_id, chunk_index,
+            chunk_sha256 or hashlib.sha256(chunk_data).hexdigest(),
+            len(chunk_data),
+        )
+    except Exception as e:
+        logger.warning("Upload session tracking unavailable for %s: %s", upload_id, e)
+
+    tracked = received is not None
     result = {
         'upload_id': upload_id,
         'chunk_index': chunk_index,
         'total_chunks': total_chunks,
-        'progress': round((chunk_index + 1) / total_chunks * 100, 1),
+        'received': received,
+        'progress': round((received if tracked else chunk_index + 1) / total_chunks * 100, 1),
     }
 
-    # Last chunk → commit all blocks
-    if chunk_index == total_chunks - 1:
+    should_commit = received >= total_chunks if tracked else chunk_index == total_chunks - 1
+    if should_commit:
         try:
-            commit = storage.commit_chunked_upload(
-                upload_id=upload_id,
-                filename=filename,
-                total_chunks=total_chunks,
-                application_type=app_type,
+            payload, status = _commit_chunked_upload(
+                upload_id, filename, total_chunks, app_type,
+                file_sha256=file_sha256, tracked=tracked,
             )
-            if commit.get('success'):
-                result['complete'] = True
-                result['blob_path'] = commit['blob_path']
-                result['container'] = commit['container']
-            else:
-                return jsonify({'error': 'Failed to commit file upload'}), 500
         except Exception as e:
             logger.error("File commit failed for %s: %s", upload_id, e)
             logger.error('Request failed: %s', e, exc_info=True)
             return jsonify({'error': 'An internal error occurred'}), 500
+        if status >= 400:
+            return jsonify(payload), status
+        result.update(payload)
 
     return jsonify(result)
 
 
+@upload_bp.route('/api/file/upload-status/<upload_id>', methods=['GET'])
+@csrf.exempt
+@limiter.limit("120 per minute")
+def file_upload_status(upload_id):
+    """Report which chunks of an upload have arrived so a client can resume.
+
+    Returns ``status`` (open / committing / committed / failed), the
+    ``received`` and ``missing`` chunk indices, and ``blob_path`` /
+    ``container`` once committed.
+    """
+    try:
+        session_row = db.get_upload_session(upload_id)
+    except Exception as e:
+        logger.error('Request failed: %s', e, exc_info=True)
+        return jsonify({'error': 'Upload session tracking unavailable'}), 503
+    if not session_row:
+        return jsonify({'error': 'Unknown upload_id'}), 404
+    return jsonify({
+        'upload_id': upload_id,
+        'status': session_row.get('status'),
+        'filename': session_row.get('filename'),
+        'total_chunks': session_row.get('total_chunks'),
+        'received': session_row['received'],
+        'missing': session_row['missing'],
+        'complete': session_row.get('status') == 'committed',
+        'blob_path': session_row.get('blob_path'),
+        'container': session_row.get('container'),
+        'error': session_row.get('error'),
+    })
+
+
+@upload_bp.route('/api/file/upload-commit', methods=['POST'])
+@csrf.exempt
+@limiter.limit("60 per minute")
+def file_upload_commit():
+    """Explicitly commit an upload whose chunks have all been sent.
+
+    Clients call this after sending every chunk when no chunk response
+    reported ``complete`` (e.g. after re-sending missing chunks).
+    Responds 409 with ``missing_chunks`` if the upload is still incomplete.
+    """
+    upload_id = request.form.get('upload_id', '')
+    if not upload_id:
+        return jsonify({'error': 'upload_id is required'}), 400
+    try:
+        session_row = db.get_upload_session(upload_id)
+    except Exception as e:
+        logger.error('Request failed: %s', e, exc_info=True)
+        return jsonify({'error': 'Upload session tracking unavailable'}), 503
+    if not session_row:
+        return jsonify({'error': 'Unknown upload_id'}), 404
+    if session_row.get('status') == 'committed':
+        return jsonify({'upload_id': upload_id, 'complete': True,
+                        'blob_path': session_row['blob_path'],
+                        'container': session_row['container']})
+    try:
+        payload, status = _commit_chunked_upload(
+            upload_id, session_row['filename'], session_row['total_chunks'],
+            session_row.get('application_type') or '2026',
+            file_sha256=request.form.get('file_sha256') or None,
+        )
+    except Exception as e:
+        logger.error("File commit failed for %s: %s", upload_id, e)
+        logger.error('Request failed: %s', e, exc_info=True)
+        return jsonify({'error': 'An internal error occurred'}), 500
+    payload['upload_id'] = upload_id
+    return jsonify(payload), status
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Utility script to backfill the ``evaluation_summary`` table.
+
+Startup migrations fill the table the first time they create it; after
+that every write of agent outputs keeps it current.  Run this script to
+rebuild every row, e.g. after changing how ``src.evaluation_summary``
+derives a column.  The process is idempotent and safe to repeat.
+
+Usage:
+
+    python scripts/backfill_evaluation_summary.py
+
+The script will print the number of rows it wrote.
+"""
+
+from src.database import db
+
+
+def main():
+    print("Starting evaluation_summary backfill...")
+    written = db.backfill_evaluation_summary()
+    print(f"Backfilled {written} application(s)")
+
+
+if __name__ == '__main__':
+    main()
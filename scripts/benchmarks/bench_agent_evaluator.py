@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""AgentEvaluator throughput: the serial loop vs the concurrent engine.
+
+Uses a stub judge that sleeps --judge-ms per call (standing in for one
+Azure AI Evaluation SDK request) and an in-memory database that sleeps
+--db-ms per round trip. Every configured agent has an output row for
+every student, so each run makes students x (evaluators per agent) judge
+calls. Reports evaluations/minute for:
+
+    legacy      the previous loop: one output query per student and agent,
+                judge calls one at a time, one INSERT per result
+    engine/N    run_batch_evaluation with N judge calls in flight, one
+                output query per agent table, multi-row inserts
+    rerun/N     the same run again with --changed percent of students'
+                outputs edited; unchanged fingerprints reuse stored scores
+
+No database or SDK needed.
+
+Usage:
+    python scripts/benchmarks/bench_agent_evaluator.py
+    python scripts/benchmarks/bench_agent_evaluator.py --students 50 --judge-ms 200 --concurrency 1 8 16
+    python scripts/benchmarks/bench_agent_evaluator.py --changed 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.evaluations.agent_evaluator import AGENT_EVAL_CONFIG, AgentEvaluator
+
+
+class _StubJudge:
+    def __init__(self, name, latency):
+        self.name = name
+        self.latency = latency
+
+    def __call__(self, query, response, context):
+        time.sleep(self.latency)
+        return {self.name: 4.0, f"{self.name}_reason": "stub"}
+
+
+class _BenchDB:
+    """Answers the evaluator's queries from memory, sleeping per round trip."""
+
+    def __init__(self, students, latency):
+        self.latency = latency
+        self.round_trips = 0
+        self.edited = set()
+        self.scores = {}
+        self.applications = [
+            {"application_id": i, "applicant_name": f"Student {i}", "was_selected": i % 2 == 0,
+             "application_text": "Essay text " * 200, "agent_results": None}
+            for i in range(students)
+        ]
+
+    def _output(self, app_id):
+        edit = " (revised)" if app_id in self.edited else ""
+        return {"application_id": app_id, "summary": "A detailed agent summary. " * 10 + edit,
+                "essay_summary": "Essay summary. " * 10, "rationale": "Rationale. " * 10,
+                "formatted_evaluation": "Formatted evaluation. " * 10, "parsed_json": None,
+                "overall_score": 70, "recommendation": "Admit"}
+
+    def execute_query(self, query, params=None):
+        time.sleep(self.latency)
+        self.round_trips += 1
+        if "FROM Applications" in query:
+            return [dict(a) for a in self.applications]
+        if "fingerprint = ANY(%s)" in query:
+            return [{"fingerprint": f, "score": self.scores[f], "reason": "stub"}
+                    for f in params[0] if f in self.scores]
+        if "ANY(%s)" in query:
+            return [self._output(app_id) for app_id in params[0]]
+        if "WHERE application_id = %s" in query:
+            return [self._output(params[0])]
+        return []
+
+    def execute_non_query(self, query, params=None):
+        time.sleep(self.latency)
+        self.round_trips += 1
+        if params and "INSERT INTO agent_evaluation_results" in query:
+            for i in range(0, len(params), 8):
+                self.scores[params[i + 6]] = params[i + 3]
+        return 1
+
+
+class _BenchEvaluator(AgentEvaluator):
+    def __init__(self, db, judge_latency, concurrency):
+        super().__init__(db, concurrency=concurrency)
+        self.sdk_available = True
+        self.judge_latency = judge_latency
+
+    def _get_evaluator(self, name):
+        return _StubJudge(name, self.judge_latency)
+
+    def compute_consistency_metrics(self):
+        return {}
+
+
+def legacy_run(evaluator, db):
+    """The previous run_batch_evaluation loop (SDK section only)."""
+    applications = db.execute_query("SELECT ... FROM Applications a")
+    count = 0
+    for agent_name, agent_cfg in AGENT_EVAL_CONFIG.items():
+        for app in applications:
+            app_id = app["application_id"]
+            rows = db.execute_query(
+                f"SELECT * FROM {agent_cfg['table']} WHERE application_id = %s "
+                "ORDER BY created_at DESC LIMIT 1", (app_id,))
+            row = rows[0] if rows else None
+            if not row:
+                continue
+            response_text = evaluator._build_response_text(row, agent_cfg["response_fields"])
+            context_text = evaluator._get_context_text(app, agent_cfg["context_source"])
+            for eval_name in agent_cfg["evaluators"]:
+                result = evaluator._evaluate_single(
+                    agent_name, eval_name, agent_cfg["query"], response_text, context_text)
+                if result:
+                    count += 1
+                    db.execute_query("INSERT INTO agent_evaluation_results VALUES (...)",
+                                     (app_id, agent_name, eval_name, result["score"]))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--judge-ms", type=float, default=50)
+    parser.add_argument("--db-ms", type=float, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--changed", type=float, default=10,
+                        help="Percent of students whose outputs change before the rerun")
+    args = parser.parse_args()
+
+    print(f"{'run':<12} {'evals':>6} {'seconds':>8} {'evals/min':>10} {'db trips':>9}")
+
+    def report(name, db, fn):
+        start = time.perf_counter()
+        evaluations = fn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {evaluations:>6} {elapsed:>8.2f} {evaluations / elapsed * 60:>10.0f} "
+              f"{db.round_trips:>9}")
+
+    db = _BenchDB(args.students, args.db_ms / 1000)
+    evaluator = _BenchEvaluator(db, args.judge_ms / 1000, concurrency=1)
+    report("legacy", db, lambda: legacy_run(evaluator, db))
+
+    for n in args.concurrency:
+        db = _BenchDB(args.students, args.db_ms / 1000)
+        evaluator = _BenchEvaluator(db, args.judge_ms / 1000, concurrency=n)
+        report(f"engine/{n}", db, lambda: evaluator.run_batch_evaluation()["total_evaluations"])
+
+    # Incremental rerun: only the edited students' outputs reach the judge
+    n = max(args.concurrency)
+    db.edited = set(range(0, args.students, max(1, round(100 / args.changed)))) if args.changed else set()
+    db.round_trips = 0
+    evaluator = _BenchEvaluator(db, args.judge_ms / 1000, concurrency=n)
+
+    def rerun():
+        summary = evaluator.run_batch_evaluation()
+        return summary["total_evaluations"] - summary["reused_evaluations"]
+
+    report(f"rerun/{n}", db, rerun)
+    print(f"(rerun: {len(db.edited)}/{args.students} students changed; evals = judge calls made)")
+
+
+if __name__ == "__main__":
+    main()
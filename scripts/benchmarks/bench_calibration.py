@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Calibration report build time: pure-Python loops vs the NumPy engine.
+
+Synthesizes N calibration rows shaped like ``Database.get_calibration_rows``
+output (human rubric 0-3 / 0-2, AI dimensions 0-100, Milo estimates on the
+rubric scale, ~15% of AI values missing), then times:
+
+    legacy      the previous route code: per-pair dicts, then _pearson /
+                _quadratic_weighted_kappa / _compute_dimension_correlations /
+                _compute_distribution loops (no confidence intervals)
+    engine      build_calibration_report without bootstrap intervals
+    engine+ci   build_calibration_report with --bootstrap resamples per
+                interval (16 intervals)
+    cached      load_calibration_report when the version stamp is unchanged
+
+No database needed.
+
+Usage:
+    python scripts/benchmarks/bench_calibration.py
+    python scripts/benchmarks/bench_calibration.py --pairs 1000 10000 50000 --bootstrap 1000
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src import calibration_stats
+from src.evaluation_summary import SCORE_COLUMNS
+
+
+def synthetic_rows(n, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        merit = rng.random()
+
+        def rubric(top):
+            return min(top, max(0, round(merit * top + rng.gauss(0, 0.7))))
+
+        row = {
+            'application_id': i, 'applicant_name': f'Student {i}', 'high_school': 'Lincoln High',
+            'human_academic': rubric(3), 'human_stem': rubric(3), 'human_essay': rubric(3),
+            'human_rec': rubric(2), 'human_bonus': rng.choice([0, 0, 1]),
+            'human_total': round(merit * 11 + rng.gauss(0, 1), 1),
+            'human_selected': merit > 0.6 if rng.random() < 0.9 else None, 'was_selected': None,
+            'ai_overall': round(min(100, max(0, merit * 100 + rng.gauss(0, 12))), 2),
+            'ai_recommendation': 'Admit' if merit > 0.5 else 'Waitlist',
+            'nextgen_match': round(merit * 100 + rng.gauss(0, 15), 2),
+        }
+        for col in SCORE_COLUMNS:
+            if rng.random() < 0.15:
+                value = None
+            elif col.startswith('milo'):
+                value = min(3, max(0, round(merit * 3 + rng.gauss(0, 0.8))))
+            else:
+                value = round(min(100, max(0, merit * 100 + rng.gauss(0, 15))), 2)
+            row[f'ai_{col}'] = value
+        rows.append(row)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Legacy implementation (the route code this engine replaced)
+# ---------------------------------------------------------------------------
+
+def _safe_float(val):
+    if val is None:
+        return None
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def _pearson(x, y):
+    n = min(len(x), len(y))
+    if n < 3:
+        return None
+    x, y = x[:n], y[:n]
+    mx = sum(x) / n
+    my = sum(y) / n
+    num = sum((xi - mx) * (yi - my) for xi, yi in zip(x, y))
+    dx = math.sqrt(sum((xi - mx) ** 2 for xi in x))
+    dy = math.sqrt(sum((yi - my) ** 2 for yi in y))
+    if dx == 0 or dy == 0:
+        return None
+    return round(num / (dx * dy), 3)
+
+
+def _quadratic_weighted_kappa(x, y, min_val=0, max_val=3):
+    if len(x) < 3 or len(y) < 3:
+        return None
+    n = min(len(x), len(y))
+    n_bins = int(max_val - min_val) + 1
+
+    def _bin(v):
+        return max(0, min(n_bins - 1, round((v - min_val) / (max_val - min_val) * (n_bins - 1))))
+
+    O = [[0] * n_bins for _ in range(n_bins)]
+    for xi, yi in zip(map(_bin, x[:n]), map(_bin, y[:n])):
+        O[xi][yi] += 1
+    row_sums = [sum(O[i]) for i in range(n_bins)]
+    col_sums = [sum(O[i][j] for i in range(n_bins)) for j in range(n_bins)]
+    E = [[row_sums[i] * col_sums[j] / n for j in range(n_bins)] for i in range(n_bins)]
+    W = [[(i - j) ** 2 / ((n_bins - 1) ** 2) for j in range(n_bins)] for i in range(n_bins)]
+    num = sum(W[i][j] * O[i][j] for i in range(n_bins) for j in range(n_bins))
+    den = sum(W[i][j] * E[i][j] for i in range(n_bins) for j in range(n_bins))
+    if den == 0:
+        return 1.0 if num == 0 else None
+    return round(1 - num / den, 3)
+
+
+def _distribution(values, label):
+    if not values:
+        return {'label': label, 'n': 0}
+    values = sorted(values)
+    n = len(values)
+    return {'label': label, 'n': n, 'min': round(min(values), 1), 'max': round(max(values), 1),
+            'mean': round(sum(values) / n, 1), 'median': round(values[n // 2], 1),
+            'p25': round(values[n // 4], 1) if n >= 4 else None,
+            'p75': round(values[3 * n // 4], 1) if n >= 4 else None}
+
+
+def legacy_report(rows):
+    pairs = []
+    for row in rows:
+        ai = {col: _safe_float(row.get(f'ai_{col}')) for col in SCORE_COLUMNS}
+        ai = {k: v for k, v in ai.items() if v is not None}
+        human = {field: _safe_float(row.get(key)) for field, key in calibration_stats.HUMAN_FIELDS}
+        was_selected = row.get('human_selected')
+        if was_selected is None:
+            was_selected = row.get('was_selected')
+        pairs.append({'human': human, 'ai': ai, 'was_selected': was_selected,
+                      'ai_overall': _safe_float(row.get('ai_overall')),
+                      'nextgen_match': _safe_float(row.get('nextgen_match')),
+                      'has_ai_scores': ai.get('tiana_readiness') is not None
+                      or ai.get('rapunzel_gpa') is not None})
+    with_ai = [p for p in pairs if p['has_ai_scores']]
+    dims = []
+    for dim in calibration_stats.DIMENSIONS:
+        hv, av = [], []
+        for p in with_ai:
+            h, a = p['human'].get(dim['human_field']), p['ai'].get(dim['ai_field'])
+            if h is not None and a is not None:
+                hv.append(h)
+                av.append(a)
+        entry = {'correlation': _pearson(hv, av)}
+        if dim['max_scale'] and hv:
+            entry['mae'] = round(sum(abs(h - a) for h, a in zip(hv, av)) / len(hv), 2)
+            entry['kappa'] = _quadratic_weighted_kappa(hv, av, 0, dim['max_scale'])
+        dims.append(entry)
+    totals = [p['human']['total_rating'] for p in with_ai]
+    overall = [p['ai_overall'] for p in with_ai]
+    return {'pairs': pairs, 'dimensions': dims, 'overall': _pearson(totals, overall),
+            'human_distribution': _distribution([p['human']['total_rating'] for p in pairs], 'human'),
+            'ai_distribution': _distribution(overall, 'ai')}
+
+
+class _StaticDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_calibration_version(self):
+        return 'v1'
+
+    def get_calibration_rows(self):
+        return self.rows
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pairs', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--bootstrap', type=int, default=calibration_stats.CALIBRATION_BOOTSTRAP_SAMPLES)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pairs':>7} {'build':<10} {'ms':>10}")
+    for n in args.pairs:
+        rows = synthetic_rows(n)
+        db = _StaticDB(rows)
+        calibration_stats.clear_calibration_cache()
+        calibration_stats.load_calibration_report(db)
+        cases = {
+            'legacy': lambda: legacy_report(rows),
+            'engine': lambda: calibration_stats.build_calibration_report(rows, bootstrap_samples=0),
+            'engine+ci': lambda: calibration_stats.build_calibration_report(rows, bootstrap_samples=args.bootstrap),
+            'cached': lambda: calibration_stats.load_calibration_report(db),
+        }
+        for name, fn in cases.items():
+            print(f"{n:>7} {name:<10} {timed(fn, args.repeat):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
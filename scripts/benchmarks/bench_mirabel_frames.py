@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark Mirabel frame extraction: seek-per-frame vs. FrameSampler.
+
+Compares three ways of pulling the same sample positions out of a video:
+
+* ``legacy``     — ``cap.set(POS_FRAMES)`` + ``read()`` + resize/encode inline
+  (the extractor ``MirabelVideoAnalyzer`` used before ``FrameSampler``)
+* ``sequential`` — ``grab()`` every frame, ``retrieve()`` only the samples
+* ``sampler``    — ``src.agents.mirabel_frame_sampler.FrameSampler``
+  (grab for nearby samples, seek for distant ones, dedupe, threaded encode)
+
+Each is run at Mirabel's default sampling (every 3 s, capped at 20 frames)
+and at a dense setting (every 0.5 s, up to 400 frames).
+
+Usage:
+    # Synthetic 10-minute 640x360 MP4 (generated with OpenCV, ~40 s):
+    python scripts/benchmarks/bench_mirabel_frames.py
+
+    # Shorter synthetic clip / real sample video:
+    python scripts/benchmarks/bench_mirabel_frames.py --minutes 2
+    python scripts/benchmarks/bench_mirabel_frames.py --video path/to/clip.mp4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+
+from src.agents.mirabel_frame_sampler import FrameSampler, _encode_frame, sample_indices
+
+MAX_DURATION = 600
+SETTINGS = (("default", 3.0, 20), ("dense", 0.5, 400))
+
+
+def _make_synthetic_video(path: str, minutes: float, fps: int = 30,
+                          size: tuple = (640, 360)) -> None:
+    """Write an MP4 of alternating 'slides' (static) and 'talking' (moving)
+    segments, switching every 15 s, so deduplication has something to do."""
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    rng = np.random.default_rng(7)
+    total = int(minutes * 60 * fps)
+    segment = 15 * fps
+    base = None
+    for i in range(total):
+        if i % segment == 0:
+            base = rng.integers(0, 255, (height // 8, width // 8, 3), dtype=np.uint8)
+            base = cv2.resize(base, (width, height), interpolation=cv2.INTER_NEAREST)
+        frame = base.copy()
+        if (i // segment) % 2:
+            x = int((i % segment) / segment * (width - 80))
+            cv2.circle(frame, (x + 40, height // 2), 40, (255, 255, 255), -1)
+        cv2.putText(frame, f"seg {i // segment}", (20, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        writer.write(frame)
+    writer.release()
+
+
+def _bench_legacy(path: str, interval: float, max_frames: int) -> tuple:
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    count = 0
+    for idx in sample_indices(total, fps, interval, max_frames, MAX_DURATION):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+        ok, frame = cap.read()
+        if ok and _encode_frame(frame, width, 1280, 85):
+            count += 1
+    cap.release()
+    return count, 0
+
+
+def _bench_sequential(path: str, interval: float, max_frames: int) -> tuple:
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    wanted = set(sample_indices(total, fps, interval, max_frames, MAX_DURATION))
+    last = max(wanted) if wanted else -1
+    count = 0
+    for idx in range(last + 1):
+        if not cap.grab():
+            break
+        if idx in wanted:
+            ok, frame = cap.retrieve()
+            if ok and _encode_frame(frame, width, 1280, 85):
+                count += 1
+    cap.release()
+    return count, 0
+
+
+def _bench_sampler(path: str, interval: float, max_frames: int) -> tuple:
+    frames, stats = FrameSampler(interval, max_frames, MAX_DURATION).sample(path)
+    return len(frames), stats["duplicates_skipped"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", help="Video file to benchmark (default: synthetic MP4)")
+    parser.add_argument("--minutes", type=float, default=10.0, help="Synthetic video length")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method (best time is kept)")
+    args = parser.parse_args()
+
+    path = args.video
+    tmp = None
+    if not path:
+        tmp = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+        tmp.close()
+        print(f"Generating {args.minutes:g}-minute synthetic video…")
+        t0 = time.perf_counter()
+        _make_synthetic_video(tmp.name, args.minutes)
+        print(f"  done in {time.perf_counter() - t0:.1f}s ({os.path.getsize(tmp.name) / 1e6:.1f} MB)")
+        path = tmp.name
+
+    methods = (("legacy", _bench_legacy), ("sequential", _bench_sequential), ("sampler", _bench_sampler))
+    try:
+        for name, interval, max_frames in SETTINGS:
+            print(f"\n{name}: every {interval:g}s, max {max_frames} frames")
+            print(f"  {'method':<11}  {'best ms':>8}  {'frames':>6}  {'dupes':>5}  {'vs legacy':>9}")
+            baseline = None
+            for method, fn in methods:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    frames, dupes = fn(path, interval, max_frames)
+                    best = min(best, time.perf_counter() - t0)
+                baseline = baseline or best
+                print(f"  {method:<11}  {best * 1000:>8.1f}  {frames:>6}  {dupes:>5}  {baseline / best:>8.2f}x")
+    finally:
+        if tmp:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
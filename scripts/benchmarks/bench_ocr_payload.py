@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark OCR page payloads: legacy 300 DPI PNG vs. the preprocessing stage.
+
+For every page it reports the bytes that would be uploaded to the vision
+model and the local render+encode time, for both the legacy renderer and
+``src.ocr_preprocessing.render_page_for_ocr``.
+
+Usage:
+    # Synthetic scans (no input files needed):
+    python scripts/benchmarks/bench_ocr_payload.py
+
+    # Real sample PDFs:
+    python scripts/benchmarks/bench_ocr_payload.py path/to/a.pdf path/to/b.pdf
+
+    # Compare output formats:
+    python scripts/benchmarks/bench_ocr_payload.py --format jpeg
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import fitz  # PyMuPDF
+
+from src.ocr_preprocessing import render_page_for_ocr, render_page_legacy
+
+_LOREM = (
+    "Course  Term  Grade  Credits\n"
+    "AP Calculus BC  Fall 2025  A  1.0\n"
+    "AP Chemistry  Fall 2025  A-  1.0\n"
+    "English Literature  Fall 2025  B+  1.0\n"
+)
+
+
+def _make_synthetic_scans(path: str) -> None:
+    """Write a PDF whose pages are raster images, like a scanner produces.
+
+    Page 1: letter-size transcript with wide margins.
+    Page 2: recommendation letter filling the page.
+    Page 3: tall 8.5x22in stitched transcript (exercises tile splitting).
+    """
+    out = fitz.open()
+    for width, height, margin, lines in ((612, 792, 110, 18), (612, 792, 50, 40), (612, 1584, 60, 80)):
+        src = fitz.open()
+        page = src.new_page(width=width, height=height)
+        page.draw_rect(page.rect, color=None, fill=(0.97, 0.96, 0.93))
+        y = margin + 20
+        for i in range(lines):
+            page.insert_text((margin, y), _LOREM.splitlines()[i % 4] + f"   row {i}", fontsize=10)
+            y += 16
+        # Rasterise at scanner resolution, JPEG-compressed like a real scan
+        scan = page.get_pixmap(dpi=200).tobytes("jpeg", jpg_quality=85)
+        target = out.new_page(width=width, height=height)
+        target.insert_image(target.rect, stream=scan)
+        src.close()
+    out.save(path)
+    out.close()
+
+
+def _bench_pdf(path: str, image_format: str) -> tuple:
+    doc = fitz.open(path)
+    totals = [0, 0.0, 0, 0.0]
+    print(f"\n{os.path.basename(path)}")
+    print(f"  {'page':>4}  {'legacy KB':>10}  {'legacy ms':>9}  {'new KB':>8}  {'new ms':>7}  {'tiles':>5}  {'dpi':>4}  {'saved':>6}")
+    for idx, page in enumerate(doc):
+        t0 = time.perf_counter()
+        legacy = render_page_legacy(page)
+        t1 = time.perf_counter()
+        segments = render_page_for_ocr(page, f"page {idx + 1}", image_format=image_format)
+        t2 = time.perf_counter()
+        new_bytes = sum(len(s.image_bytes) for s in segments)
+        saved = 1 - new_bytes / max(len(legacy), 1)
+        print(
+            f"  {idx + 1:>4}  {len(legacy) / 1024:>10.1f}  {(t1 - t0) * 1000:>9.1f}  "
+            f"{new_bytes / 1024:>8.1f}  {(t2 - t1) * 1000:>7.1f}  {len(segments):>5}  "
+            f"{segments[0].dpi:>4}  {saved:>6.0%}"
+        )
+        totals[0] += len(legacy)
+        totals[1] += t1 - t0
+        totals[2] += new_bytes
+        totals[3] += t2 - t1
+    doc.close()
+    return tuple(totals)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", help="PDF files to benchmark (default: synthetic scans)")
+    parser.add_argument("--format", default=None, choices=["auto", "jpeg", "webp", "png"],
+                        help="Override OCR_IMAGE_FORMAT")
+    args = parser.parse_args()
+
+    paths = list(args.pdfs)
+    tmp = None
+    if not paths:
+        tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+        tmp.close()
+        _make_synthetic_scans(tmp.name)
+        paths = [tmp.name]
+
+    grand = [0, 0.0, 0, 0.0]
+    try:
+        for path in paths:
+            for i, value in enumerate(_bench_pdf(path, args.format)):
+                grand[i] += value
+    finally:
+        if tmp:
+            os.unlink(tmp.name)
+
+    print(
+        f"\nTOTAL  legacy {grand[0] / 1024:.1f} KB in {grand[1] * 1000:.0f} ms  →  "
+        f"new {grand[2] / 1024:.1f} KB in {grand[3] * 1000:.0f} ms  "
+        f"({1 - grand[2] / max(grand[0], 1):.0%} fewer bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
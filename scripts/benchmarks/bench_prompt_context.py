@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Report prompt tokens per agent with and without the shared PromptContext.
+
+Applications come from ``TestDataGenerator`` (seeded, so runs are
+reproducible); agent results are synthetic but shaped like production
+output — raw model responses kept alongside the parsed fields, evidence
+lists, course tables.  Each application then goes through the same prompt
+assembly the pipeline does (Tiana's application text, Rapunzel's
+transcript, Mulan's letter, Smee's per-agent summaries, Gaston's
+interleaved checks and Merlin's synthesis context), recording the tokens
+of the legacy payload ("before") and of the PromptContext view ("after").
+
+Tokens are estimated at ~4 characters per token.
+
+Usage:
+    python scripts/benchmarks/bench_prompt_context.py
+    python scripts/benchmarks/bench_prompt_context.py --applications 20 --seed 7
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.agents.prompt_context import PromptContext
+from src.test_data_generator import TestDataGenerator
+
+REVIEWED = ('application_reader', 'grade_reader', 'recommendation_reader')
+MERLIN_NEEDS = ('application_reader', 'grade_reader', 'recommendation_reader',
+                'school_context', 'data_scientist', 'pocahontas')
+GASTON_CHECK_TOKENS = 1000
+MERLIN_CONTEXT_TOKENS = 12000
+
+
+def _sentences(text, n):
+    parts = [p.strip() for p in text.replace('\n', ' ').split('.') if len(p.strip()) > 20]
+    return [p + '.' for p in parts[:n]]
+
+
+def _with_raw(result):
+    """Attach the raw model response the way agents keep it next to parsed fields."""
+    result['raw_response'] = json.dumps(result, indent=2)
+    result['status'] = 'success'
+    result['model'] = 'gpt-5-mini'
+    return result
+
+
+def synthetic_results(student):
+    """Agent outputs sized like production results for *student*."""
+    essay = _sentences(student['application_text'], 12)
+    transcript_lines = [l.strip() for l in student['transcript_text'].splitlines() if l.strip()]
+    letter = _sentences(student['recommendation_text'], 10)
+    school = student['school_data']
+    return {
+        'application_reader': _with_raw({
+            'applicant_name': student['name'],
+            'essay_summary': ' '.join(essay[:5]),
+            'core_competencies': student['activities'] + [student['interest']],
+            'evidence': [f'Page 1: {s}' for s in essay],
+            'stem_interest_score': 2, 'essay_score': 2, 'readiness_score': 74.5,
+            'has_research_experience': True, 'underrepresented_background': False,
+        }),
+        'grade_reader': _with_raw({
+            'gpa': student['gpa'],
+            'courses': [{'line': l, 'rigor': 'AP' if 'AP' in l else 'standard'} for l in transcript_lines[:40]],
+            'ap_courses': student['ap_courses'],
+            'academic_record_score': 2,
+            'notes': ' '.join(transcript_lines[:15]),
+        }),
+        'recommendation_reader': _with_raw({
+            'recommender': student['recommender_name'],
+            'role': student['recommender_role'],
+            'evidence': letter,
+            'endorsement_strength': 7, 'specificity_score': 6, 'recommendation_score': 1,
+            'summary': ' '.join(letter[:3]),
+        }),
+        'school_context': _with_raw({
+            'school_name': school.get('name'),
+            'narrative': ' '.join(f'{k} is {v}.' for k, v in school.items()) * 3,
+            'opportunity_score': 62.25,
+            'signals': [f'{k}: {v}' for k, v in school.items()],
+        }),
+        'data_scientist': _with_raw({
+            'insights': [f'Selected applicants averaged {3.5 + i / 20:.2f} GPA in cohort {2015 + i}.' for i in range(25)],
+            'feature_importance': {f'feature_{i}': round(1 / (i + 1), 6) for i in range(30)},
+        }),
+        'pocahontas': _with_raw({'equity_tier': 2, 'context_multiplier': 1.1,
+                                 'reasons': ['Bottom-quartile AP access', 'High FRL share']}),
+    }
+
+
+def run_application(student, results):
+    application = {
+        'applicant_name': student['name'],
+        'application_text': student['application_text'],
+        'transcript_text': student['transcript_text'],
+        'recommendation_text': student['recommendation_text'],
+    }
+    application['_original_document_text'] = '\n\n'.join(
+        application[f] for f in ('application_text', 'transcript_text', 'recommendation_text'))
+    ctx = PromptContext.attach(application)
+
+    ctx.section('application_text', 2000, agent='Tiana')
+    ctx.section('transcript_text', agent='Rapunzel')
+    ctx.section('recommendation_text', agent='Mulan')
+    for agent_id in results:
+        ctx.digest_text(agent_id, results[agent_id], agent='Smee')
+    for agent_id in REVIEWED:
+        legacy = json.dumps(results[agent_id], default=str)[:4000]
+        ctx.digest_text(agent_id, results[agent_id], GASTON_CHECK_TOKENS, agent='Gaston', legacy=legacy)
+    merlin_context = ctx.digests(results, MERLIN_NEEDS, MERLIN_CONTEXT_TOKENS)
+    ctx.record('Merlin',
+               ''.join(json.dumps(results[k], default=str)[:15000] for k in merlin_context),
+               json.dumps(merlin_context, sort_keys=True, default=str))
+    return PromptContext.detach(application).report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=9)
+    parser.add_argument('--seed', type=int, default=35)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    generator = TestDataGenerator()
+    totals = {}
+    for i in range(args.applications):
+        student = generator.generate_student(('high', 'medium', 'low')[i % 3])
+        for agent, row in run_application(student, synthetic_results(student)).items():
+            agg = totals.setdefault(agent, {'calls': 0, 'tokens_before': 0, 'tokens_after': 0})
+            for key in agg:
+                agg[key] += row[key]
+
+    print(f"Prompt tokens over {args.applications} fixture applications (seed {args.seed})")
+    print(f"{'agent':<10} {'calls':>6} {'before':>9} {'after':>9} {'saved':>7}")
+    all_before = all_after = 0
+    for agent, row in totals.items():
+        before, after = row['tokens_before'], row['tokens_after']
+        all_before += before
+        all_after += after
+        print(f"{agent:<10} {row['calls']:>6} {before:>9} {after:>9} {100 * (before - after) / before:>6.1f}%")
+    print(f"{'total':<10} {'':>6} {all_before:>9} {all_after:>9} {100 * (all_before - all_after) / all_before:>6.1f}%")
+
+
+if __name__ == '__main__':
+    main()
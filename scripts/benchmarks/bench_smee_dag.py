@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Benchmark SmeeOrchestrator.coordinate_evaluation with mocked agents.
+
+Every agent is replaced by a stub that sleeps for a representative share of
+its real latency (scaled by ``--scale``), so the numbers isolate scheduling:
+
+* ``serial``  — the step graph with ``SMEE_STEP_CONCURRENCY=1``
+* ``legacy``  — the pre-graph schedule (Naveen → Tiana/Rapunzel/Mulan →
+  Moana → Pocahontas → Milo → Merlin → Gaston → Aurora), computed from the
+  measured step durations
+* ``gated``   — the graph with the Gaston quality check inline in each core
+  agent step (``SMEE_SPECULATIVE_GASTON=0``)
+* ``graph``   — the dependency-scheduled workflow as shipped, with Moana and
+  Pocahontas running speculatively while Gaston reviews
+
+``--reject`` makes the stub Gaston fail the named agents' output, so the
+revision and re-execution path is measured too.
+
+Usage:
+    python scripts/benchmarks/bench_smee_dag.py
+    python scripts/benchmarks/bench_smee_dag.py --scale 0.2 --runs 3
+    python scripts/benchmarks/bench_smee_dag.py --reject grade_reader
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import src.agents.smee_orchestrator as smee_module
+from src.agents.smee_orchestrator import SmeeOrchestrator
+from src.agents.step_graph import format_timeline
+
+# Seconds of (unscaled) latency per call, roughly what production traces show.
+LATENCY = {
+    'naveen': 4.0,
+    'application_reader': 6.0,
+    'grade_reader': 5.0,
+    'recommendation_reader': 4.0,
+    'school_context': 4.0,
+    'pocahontas': 3.0,
+    'milo_insights': 4.0,
+    'milo_alignment': 1.0,
+    'merlin': 8.0,
+    'gaston': 3.0,
+    'aurora': 2.0,
+    'human_summary': 1.0,
+    'quality_check': 1.0,
+}
+
+# Agents whose output the stub Gaston grades F (set from --reject)
+REJECT = set()
+
+
+class _Stub:
+    def __init__(self, name, scale):
+        self.name = name
+        self.model = 'stub'
+        self._scale = scale
+
+    async def _sleep(self, key):
+        await asyncio.sleep(LATENCY[key] * self._scale)
+
+    def _block(self, key):
+        time.sleep(LATENCY[key] * self._scale)
+
+
+class Tiana(_Stub):
+    async def parse_application(self, application):
+        await self._sleep('application_reader')
+        return {'overall_score': 80}
+
+
+class Rapunzel(_Stub):
+    async def parse_grades(self, transcript, name, school_context=None, application_id=None):
+        await self._sleep('grade_reader')
+        return {'grades': {'gpa': 3.9}}
+
+
+class Mulan(_Stub):
+    async def parse_recommendation(self, text, name, application_id=None):
+        await self._sleep('recommendation_reader')
+        return {'overall_score': 75}
+
+
+class Moana(_Stub):
+    async def analyze_student_school_context(self, **kwargs):
+        await self._sleep('school_context')
+        return {'narrative': 'rural school'}
+
+
+class Pocahontas(_Stub):
+    async def process(self, payload):
+        await self._sleep('pocahontas')
+        return {'equity_tier': 2, 'context_multiplier': 1.1}
+
+
+class Milo(_Stub):
+    async def analyze_training_insights(self):
+        await self._sleep('milo_insights')
+        return {'insights': []}
+
+    async def compute_alignment(self, application):
+        await self._sleep('milo_alignment')
+        return {'nextgen_match': 70}
+
+
+class Merlin(_Stub):
+    async def evaluate_student(self, application, context):
+        await self._sleep('merlin')
+        return {'overall_score': 82, 'recommendation': 'admit'}
+
+
+class Gaston(_Stub):
+    def audit_evaluation(self, merlin, results, scores, multiplier):
+        self._block('gaston')
+        return {'flag_count': 0, 'consistency_score': 90}
+
+    def _create_chat_completion(self, operation='', **kwargs):
+        self._block('quality_check')
+        if operation.rsplit('.', 1)[-1] in REJECT:
+            content = '{"grade": "F", "score": 40, "feedback": "Missing detail"}'
+        else:
+            content = '{"grade": "A", "score": 95, "feedback": ""}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class Aurora(_Stub):
+    def format_evaluation_report(self, results):
+        self._block('aurora')
+        return {'summary': 'ok'}
+
+
+def _build(scale):
+    smee = SmeeOrchestrator('Smee', client=None, model='stub')
+    for agent_id, cls in (('application_reader', Tiana), ('grade_reader', Rapunzel),
+                          ('recommendation_reader', Mulan), ('school_context', Moana),
+                          ('pocahontas', Pocahontas), ('data_scientist', Milo),
+                          ('student_evaluator', Merlin), ('gaston', Gaston), ('aurora', Aurora)):
+        smee.register_agent(agent_id, cls(agent_id, scale))
+
+    async def belle(document_text, document_name='', context=''):
+        return {'student_info': {'first_name': 'Ada', 'last_name': 'Lovelace',
+                                 'school_name': 'Lincoln High', 'state_code': 'GA'},
+                'agent_fields': {}}
+
+    async def enrich(**kwargs):
+        await asyncio.sleep(LATENCY['naveen'] * scale)
+        return {'school_name': 'Lincoln High', 'component_scores': {}}
+
+    def summary(*args, **kwargs):
+        time.sleep(LATENCY['human_summary'] * scale)
+        return 'summary'
+
+    smee._extract_data_with_belle = belle
+    smee._check_or_enrich_high_school = enrich
+    smee._create_chat_completion = summary
+    return smee
+
+
+def _application():
+    return {
+        'applicant_name': 'Ada Lovelace',
+        'application_text': 'Essay ' * 50,
+        'transcript_text': 'Transcript ' * 20,
+        'recommendation_text': 'Recommendation ' * 20,
+    }
+
+
+STEPS = ['application_reader', 'grade_reader', 'recommendation_reader', 'school_context',
+         'data_scientist', 'student_evaluator', 'aurora']
+
+
+def _legacy_ms(timeline):
+    d = {n: s['duration_ms'] for n, s in timeline['steps'].items()}
+    group1 = max(d.get('application_reader', 0), d.get('grade_reader', 0), d.get('recommendation_reader', 0))
+    return (d.get('school_enrichment', 0) + group1 + d.get('school_context', 0)
+            + d.get('persist_core_results', 0) + d.get('pocahontas', 0) + d.get('data_scientist', 0)
+            + d.get('normalize_scores', 0) + d.get('student_evaluator', 0) + d.get('gaston', 0)
+            + d.get('aurora', 0) + d.get('aurora_persist', 0))
+
+
+async def _run(scale, concurrency, speculative=True):
+    smee_module.STEP_CONCURRENCY = concurrency
+    smee_module.SPECULATIVE_GASTON = speculative
+    smee = _build(scale)
+    t0 = time.perf_counter()
+    result = await smee.coordinate_evaluation(_application(), list(STEPS))
+    return (time.perf_counter() - t0) * 1000, result['step_timeline'], result.get('speculation')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=0.05, help='Multiplier on LATENCY seconds')
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--reject', nargs='*', default=[],
+                        help='Core agents whose output Gaston rejects (e.g. grade_reader)')
+    args = parser.parse_args()
+    REJECT.update(args.reject)
+
+    logging.disable(logging.CRITICAL)
+    smee_module.STEP_DELAY = 0  # measure scheduling, not pacing
+
+    serial, gated, graph, legacy = [], [], [], []
+    timeline = speculation = None
+    for _ in range(args.runs):
+        ms, _tl, _spec = asyncio.run(_run(args.scale, 1))
+        serial.append(ms)
+        ms, gated_timeline, _spec = asyncio.run(_run(args.scale, 0, speculative=False))
+        gated.append(ms)
+        legacy.append(_legacy_ms(gated_timeline))
+        ms, timeline, speculation = asyncio.run(_run(args.scale, 0))
+        graph.append(ms)
+
+    best = min(graph)
+    print(f"scale {args.scale:g} (agent latencies ×{args.scale:g}), best of {args.runs}")
+    print(f"  serial  {min(serial):8.0f} ms")
+    print(f"  legacy  {min(legacy):8.0f} ms   (pre-graph schedule, from measured step durations)")
+    print(f"  gated   {min(gated):8.0f} ms   (graph, Gaston check inline)")
+    print(f"  graph   {best:8.0f} ms   {min(legacy) / best:.2f}x faster than legacy, "
+          f"{min(gated) - best:.0f} ms saved by the speculative gate")
+    if speculation:
+        print(f"  speculation: rejection rate {speculation['rejection_rate']:.0%}, "
+              f"re-ran {speculation['reexecuted_steps'] or 'nothing'}, "
+              f"estimated saving {speculation['latency_saved_ms']:.0f} ms")
+    print(f"\n  {format_timeline(timeline)}")
+    print(f"\n  {'step':<22} {'start':>7} {'end':>7}  depends on")
+    for name, info in sorted(timeline['steps'].items(), key=lambda kv: kv[1]['start_ms']):
+        print(f"  {name:<22} {info['start_ms']:>7.0f} {info['end_ms']:>7.0f}  {', '.join(info['depends_on'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Student list page-load time: the full list vs keyset pages.
+
+Seeds N applications into a scratch schema. Each row gets realistic
+``agent_results`` JSON (a Merlin rationale is a few KB), a small
+``student_summary``, a Moana school-context row for a third of
+applicants and historical-score matches for half of the training
+records.  ``evaluation_summary`` is left to Database's own migrations,
+which create and backfill it on first connect.  The script then times:
+
+    full     Database.get_formatted_student_list (every row + agent JSON)
+    first    get_student_page, first page (name sort)
+    deep     get_student_page, a page ~90% of the way through (name sort)
+    score    get_student_page, first page sorted by score
+    counts   get_student_list_counts (the header totals)
+
+Needs PostgreSQL: point DATABASE_URL at a database you may create a
+schema in.  The script works in schema ``bench_student_list`` and drops
+it afterwards unless --keep is given.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/benchmarks/bench_student_list.py
+    DATABASE_URL=postgresql://... python scripts/benchmarks/bench_student_list.py --sizes 5000 50000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+SCHEMA = "bench_student_list"
+FIRST = ["Ada", "Grace", "Alan", "Katherine", "Mae", "Jamal", "Priya", "Luis", "Mei", "Tariq"]
+LAST = ["Lovelace", "Hopper", "Turing", "Johnson", "Jemison", "Okafor", "Patel", "Garcia", "Chen", "Haddad"]
+SCHOOLS = [f"{town} High School" for town in ("Lincoln", "Decatur", "Macon", "Savannah", "Athens", "Rome")]
+
+
+def _scoped_url(url):
+    """DATABASE_URL with the benchmark schema first on the search_path."""
+    sep = '&' if '?' in url else '?'
+    return f"{url}{sep}options=-csearch_path%3D{SCHEMA}"
+
+
+def seed(conn, n):
+    """(Re)create the benchmark tables with *n* applications."""
+    rng = random.Random(n)
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        cur.execute(f"SET search_path TO {SCHEMA}")
+        cur.execute("""
+            CREATE TABLE applications (
+                application_id SERIAL PRIMARY KEY, applicant_name VARCHAR(255), email VARCHAR(255),
+                status VARCHAR(50), uploaded_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                was_selected BOOLEAN, is_training_example BOOLEAN DEFAULT FALSE,
+                is_test_data BOOLEAN DEFAULT FALSE, first_name VARCHAR(255), last_name VARCHAR(255),
+                high_school VARCHAR(500), nextgen_match NUMERIC(5,2), student_summary JSONB,
+                agent_results JSONB)
+        """)
+        cur.execute("CREATE TABLE student_school_context (context_id SERIAL PRIMARY KEY, "
+                    "application_id INTEGER, school_name VARCHAR(500))")
+        cur.execute("CREATE TABLE historical_scores (score_id SERIAL PRIMARY KEY, application_id INTEGER)")
+        cur.execute("CREATE TABLE merlin_evaluations (merlin_evaluation_id SERIAL PRIMARY KEY, "
+                    "application_id INTEGER, overall_score NUMERIC(5,2), recommendation VARCHAR(100))")
+        rationale = "The applicant demonstrates sustained initiative in laboratory research. " * 60
+        rows = []
+        for i in range(n):
+            first, last = rng.choice(FIRST), rng.choice(LAST)
+            score = round(rng.uniform(40, 99), 1)
+            agent_results = {
+                'merlin': {'overall_score': score, 'recommendation': 'Admit', 'rationale': rationale},
+                'milo_alignment': {'match_score': score - 3},
+                'school_context': {'school_name': rng.choice(SCHOOLS), 'narrative': rationale[:1500]},
+            }
+            rows.append((
+                f"{first} {last}", f"{first.lower()}.{last.lower()}{i}@example.org", 'Completed',
+                rng.random() < 0.5, i % 2 == 0, first, last,
+                rng.choice(SCHOOLS) if rng.random() < 0.6 else None, score - 3,
+                json.dumps({'overall_score': score}), json.dumps(agent_results),
+            ))
+        cur.executemany("""
+            INSERT INTO applications (applicant_name, email, status, was_selected, is_training_example,
+                                      first_name, last_name, high_school, nextgen_match, student_summary,
+                                      agent_results)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+        cur.execute("INSERT INTO student_school_context (application_id, school_name) "
+                    "SELECT application_id, 'Moana ' || high_school FROM applications WHERE application_id % 3 = 0")
+        cur.execute("INSERT INTO historical_scores (application_id) "
+                    "SELECT application_id FROM applications WHERE is_training_example AND application_id % 4 = 0")
+        cur.execute("CREATE INDEX ON student_school_context (application_id)")
+        cur.execute("CREATE INDEX ON historical_scores (application_id)")
+        cur.execute("""
+            CREATE INDEX ON applications (
+                LOWER(COALESCE(last_name, '') || ' ' || COALESCE(first_name, '') || ' ' || COALESCE(applicant_name, '')),
+                application_id)
+        """)
+        cur.execute("ANALYZE")
+    conn.commit()
+
+
+def deep_cursor(conn, db, n):
+    """A name-sort cursor positioned ~90% through the 2026 list."""
+    with conn.cursor() as cur:
+        cur.execute(f"SET search_path TO {SCHEMA}")
+        cur.execute("""
+            SELECT LOWER(COALESCE(last_name, '') || ' ' || COALESCE(first_name, '') || ' ' || COALESCE(applicant_name, '')),
+                   application_id
+            FROM applications WHERE NOT is_training_example
+            ORDER BY 1, 2 OFFSET %s LIMIT 1
+        """, (int(n / 2 * 0.9),))
+        key, app_id = cur.fetchone()
+    # End the read transaction so it can't block the app's lazy ALTER TABLEs.
+    conn.commit()
+    return db._encode_page_cursor('name', False, [key, app_id])
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:  # e.g. the pool's statement_timeout
+            return f"error: {str(e).splitlines()[0][:60]}", None
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 50000])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--keep', action='store_true', help='keep the benchmark schema')
+    args = parser.parse_args()
+
+    url = os.getenv('DATABASE_URL')
+    if not url:
+        sys.exit("DATABASE_URL must point at a scratch PostgreSQL database")
+    import psycopg
+    os.environ['DATABASE_URL'] = _scoped_url(url)
+    from src.database import Database
+
+    admin = psycopg.connect(url)
+    try:
+        print(f"{'rows':>7} {'query':<7} {'ms':>10} {'rows out':>9} {'payload KB':>11}")
+        for n in args.sizes:
+            seed(admin, n)
+            db = Database()
+            cursor = deep_cursor(admin, db, n)
+            cases = {
+                'full': lambda: db.get_formatted_student_list(),
+                'first': lambda: db.get_student_page(limit=args.page_size)['students'],
+                'deep': lambda: db.get_student_page(limit=args.page_size, after=cursor)['students'],
+                'score': lambda: db.get_student_page(sort='score', descending=True,
+                                                     limit=args.page_size)['students'],
+                'counts': lambda: [db.get_student_list_counts()],
+            }
+            for name, fn in cases.items():
+                ms, rows = timed(fn, args.repeat)
+                if rows is None:
+                    print(f"{n:>7} {name:<7} {ms:>10}")
+                    continue
+                payload = len(json.dumps(rows, default=str)) / 1024
+                print(f"{n:>7} {name:<7} {ms:>10.1f} {len(rows):>9} {payload:>11.1f}")
+    finally:
+        if not args.keep:
+            with admin.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            admin.commit()
+        admin.close()
+
+
+if __name__ == '__main__':
+    main()
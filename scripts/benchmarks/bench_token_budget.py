@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Fit large application packets to each model tier's token budget.
+
+Packets are assembled from seeded ``TestDataGenerator`` students: several
+applicants' essays, transcripts and letters concatenated into one
+page-marked document (like a batch PDF upload), with running headers and
+pagination footers on every page and a Belle-style page map.  For each
+packet size and tier the benchmark reports input tokens before and after
+``fit_document``, how many transcript pages survived intact, and how long
+fitting took.
+
+Usage:
+    python scripts/benchmarks/bench_token_budget.py
+    python scripts/benchmarks/bench_token_budget.py --students 2 4 8 16 --prefer transcript
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.test_data_generator import TestDataGenerator
+from src.token_budget import TIER_INPUT_BUDGETS, count_tokens, fit_document
+
+
+def build_packet(generator, students):
+    """Page-marked packet text plus Belle-style page map."""
+    pages, section_map = [], {}
+    for _ in range(students):
+        student = generator.generate_student('mixed')
+        header = f"{student['school']} — NextGen Application Packet — CONFIDENTIAL"
+        pages.append(('application', student['application_text']))
+        pages.append(('transcript', student['transcript_text']))
+        pages.extend(('recommendation', rec['text']) for rec in student['recommendations'])
+    total = len(pages) + 1
+    chunks = [f"--- PAGE 1 of {total} ---\nTable of Contents\nEssay 2\nTranscript 3\nLetters 4"]
+    section_map[1] = {'type': 'application', 'note': 'table of contents page'}
+    for number, (page_type, text) in enumerate(pages, start=2):
+        footer = f"Applicant - #{1800 + number}\n{number} of {total}"
+        chunks.append(f"--- PAGE {number} of {total} ---\n{header}\n{text}\n{footer}")
+        section_map[number] = {'type': page_type}
+    return '\n\n'.join(chunks), section_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, nargs='+', default=[1, 3, 6, 12])
+    parser.add_argument('--prefer', default='transcript')
+    parser.add_argument('--seed', type=int, default=36)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    generator = TestDataGenerator()
+    print(f"{'students':>8} {'pages':>6} {'tier':<12} {'budget':>7} {'before':>8} {'after':>7} "
+          f"{'transcripts kept':>17} {'fit ms':>7}")
+    for students in args.students:
+        text, section_map = build_packet(generator, students)
+        transcript_pages = [p for p, info in section_map.items() if info['type'] == 'transcript']
+        for tier, budget in TIER_INPUT_BUDGETS.items():
+            start = time.perf_counter()
+            result = fit_document(text, budget, section_map=section_map, prefer=args.prefer)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            kept = sum(1 for p in transcript_pages if f'page {p}' not in result.trimmed)
+            print(f"{students:>8} {len(section_map):>6} {tier:<12} {budget:>7} "
+                  f"{count_tokens(text):>8} {result.tokens_after:>7} "
+                  f"{kept:>8}/{len(transcript_pages):<8} {elapsed_ms:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Utility script to recompute the Trust & Governance snapshots.
+
+The dashboard recomputes a snapshot on its own when its source tables
+change or it outlives ``GOVERNANCE_SNAPSHOT_MAX_AGE``.  Schedule this
+script (e.g. nightly cron) to refresh them off the request path, or run it
+after bulk edits that bypass ``updated_at``.
+
+Usage:
+
+    python scripts/refresh_governance_snapshots.py [kind ...]
+
+With no arguments every snapshot (provenance, agent_report, oversight)
+is refreshed.
+"""
+
+import sys
+
+from src.database import db
+from src.governance_stats import refresh_snapshots
+
+
+def main():
+    kinds = sys.argv[1:] or None
+    print("Refreshing governance snapshots...")
+    refreshed = refresh_snapshots(db, kinds)
+    print(f"Refreshed {len(refreshed)} snapshot(s): {', '.join(refreshed)}")
+
+
+if __name__ == '__main__':
+    main()
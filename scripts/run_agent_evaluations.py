@@ -6,10 +6,14 @@ Usage:
     python scripts/run_agent_evaluations.py --agents Merlin Tiana
     python scripts/run_agent_evaluations.py --max-students 5   # Quick test
     python scripts/run_agent_evaluations.py --consistency-only  # No AI calls
+    python scripts/run_agent_evaluations.py --resume            # Continue the last unfinished run
+    python scripts/run_agent_evaluations.py --resume eval_ab12cd34ef56_1760000000
+    python scripts/run_agent_evaluations.py --full              # Re-score unchanged outputs too
 """
 
 import argparse
 import json
+import logging
 import sys
 import os
 import time
@@ -19,10 +23,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import config
 from src.database import db
-from src.logger import get_logger
-from src.evaluations.agent_evaluator import AgentEvaluator, AGENT_EVAL_CONFIG
+from src.evaluations.agent_evaluator import (
+    AgentEvaluator, AGENT_EVAL_CONFIG, AGENT_EVAL_CONCURRENCY,
+)
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
 
 
 def main():
@@ -44,6 +49,24 @@ def main():
         action="store_true",
         help="Only compute consistency metrics (no AI judge calls)",
     )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="BATCH_ID",
+        help="Resume an interrupted run (default: the most recent unfinished one)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Call the judge for every output, not only new or changed ones",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=AGENT_EVAL_CONCURRENCY,
+        help=f"Judge calls in flight at once (default: {AGENT_EVAL_CONCURRENCY})",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -51,7 +74,7 @@ def main():
     )
     args = parser.parse_args()
 
-    evaluator = AgentEvaluator(db)
+    evaluator = AgentEvaluator(db, concurrency=args.concurrency)
 
     if args.consistency_only:
         print("Computing consistency metrics (no AI calls)...")
@@ -62,26 +85,31 @@ def main():
             _print_consistency(metrics)
         return
 
+    resume_batch_id = args.resume
+    if resume_batch_id == "latest":
+        resume_batch_id = evaluator.get_resumable_batch_id()
+        if not resume_batch_id:
+            print("No unfinished evaluation run to resume.")
+            return
+
     print(f"Starting agent quality evaluation...")
+    if resume_batch_id:
+        print(f"  Resuming: {resume_batch_id}")
     print(f"  Agents: {', '.join(args.agents) if args.agents else 'ALL'}")
     print(f"  Max students: {args.max_students or 'ALL'}")
     print()
 
     def progress(state):
         prog = state.get("progress", "")
-        agent = state.get("agent", "")
-        idx = state.get("student_index", "")
-        total = state.get("total_students", "")
-        if idx and total:
-            print(f"  [{agent}] {idx}/{total} — {prog}", flush=True)
-        else:
-            print(f"  {prog}", flush=True)
+        print(f"  {prog}", flush=True)
 
     start = time.time()
     result = evaluator.run_batch_evaluation(
         agents=args.agents,
         max_students=args.max_students,
         progress_callback=progress,
+        resume_batch_id=resume_batch_id,
+        incremental=not args.full,
     )
     elapsed = time.time() - start
 
@@ -93,7 +121,8 @@ def main():
         print(f"  Batch ID: {result.get('batch_id', '—')}")
         print(f"  Status:   {result.get('status', '—')}")
         print(f"  Students: {result.get('total_students', 0)}")
-        print(f"  Evals:    {result.get('total_evaluations', 0)}")
+        print(f"  Evals:    {result.get('total_evaluations', 0)} "
+              f"({result.get('reused_evaluations', 0)} reused from earlier runs)")
         print()
 
         # Per-agent summary
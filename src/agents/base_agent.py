@@ -18,11 +18,19 @@ MODEL_CALL_TIMEOUT = 90  # 90s default, override per model tier
 MODEL_CALL_TIMEOUT_PREMIUM = 240  # gpt-5.4-pro, deep analysis
 MODEL_CALL_TIMEOUT_REASONING = 300  # o3, o3-pro
 from src.config import config
+from src.agents.evaluation_context import current_evaluation
+from src.agents.deadline import capped_timeout, nearly_exhausted, record_degradation
 from src.observability import get_tracer, should_capture_sensitive_data
 from opentelemetry.trace import SpanKind
 
 logger = logging.getLogger(__name__)
 
+
+def _is_slow_model(model: Optional[str]) -> bool:
+    """Premium and reasoning deployments (the tiers with the long call timeouts)."""
+    model = str(model or '')
+    return 'pro' in model or 'premium' in model or 'o3' in model or 'o4' in model
+
 # Foundry agent slug mapping — agents registered via install_foundry_agents.py
 # When an agent name matches, calls route through the Responses API with agent_reference
 # instead of raw chat.completions. Set NEXTGEN_USE_FOUNDRY_AGENTS=1 to enable.
@@ -59,10 +67,36 @@ class BaseAgent(ABC):
         """
         self.name = name
         self.client = client
-        self.conversation_history = []
-        self._trace_context = {}
+        # Used outside an evaluation; during one, history and trace
+        # attributes come from the active EvaluationContext so a single
+        # agent instance can serve concurrent evaluations.
+        self._conversation_history = []
+        self._instance_trace_context = {}
         self._conversation_key = None  # Sprint 4: for persistence
 
+    @property
+    def conversation_history(self) -> list:
+        """Chat history for the current evaluation (or this instance, outside one)."""
+        context = current_evaluation()
+        if context is None:
+            return self._conversation_history
+        return context.conversation(self.name)
+
+    @conversation_history.setter
+    def conversation_history(self, value: list) -> None:
+        context = current_evaluation()
+        if context is None:
+            self._conversation_history = value
+        else:
+            context.conversations[self.name] = value
+
+    @property
+    def _trace_context(self) -> dict:
+        context = current_evaluation()
+        if context is None:
+            return self._instance_trace_context
+        return context.trace_attributes()
+
     def set_conversation_key(self, key: str):
         """Sprint 4: Set a key for conversation persistence (e.g., application_id + agent_name)."""
         self._conversation_key = key
@@ -195,6 +229,22 @@ class BaseAgent(ABC):
         raw chat.completions. This gives agents their registered system
         prompts and model assignments from Foundry.
         """
+        # A cancelled evaluation makes no further model calls
+        evaluation = current_evaluation()
+        if evaluation is not None and evaluation.cancel_token is not None:
+            evaluation.cancel_token.raise_if_cancelled()
+
+        # Running out of the step's time budget: cut refinements and slow tiers
+        if nearly_exhausted():
+            if int(kwargs.get("refinements", 1)) > 1:
+                record_degradation("skip_refinements", operation)
+            kwargs["refinements"] = 1
+            requested = model or config.foundry_model_name or config.deployment_name
+            faster = config.model_tier_workhorse
+            if _is_slow_model(requested) and faster and faster != requested:
+                record_degradation("faster_tier", f"{requested} → {faster}")
+                model = faster
+
         # ── Foundry Agent Routing ──────────────────────────────────
         # When enabled, route through Responses API for registered agents
         if os.environ.get("NEXTGEN_USE_FOUNDRY_AGENTS", "").strip() in ("1", "true", "yes"):
@@ -447,6 +497,7 @@ class BaseAgent(ABC):
                         call_timeout = MODEL_CALL_TIMEOUT_PREMIUM
                     elif resolved_model and ('o3' in str(resolved_model) or 'o4' in str(resolved_model)):
                         call_timeout = MODEL_CALL_TIMEOUT_REASONING
+                    call_timeout = capped_timeout(call_timeout)
 
                     import concurrent.futures
                     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
@@ -792,14 +843,15 @@ class BaseAgent(ABC):
         student_id: Optional[Any] = None,
         applicant_name: Optional[str] = None
     ) -> None:
-        self._trace_context = {
+        """Trace attributes for calls made outside an evaluation."""
+        self._instance_trace_context = {
             "app.application_id": application_id,
             "app.student_id": student_id,
             "app.applicant_name": applicant_name
         }
 
     def clear_trace_context(self) -> None:
-        self._trace_context = {}
+        self._instance_trace_context = {}
     
     def clear_history(self):
         """Clear the conversation history."""
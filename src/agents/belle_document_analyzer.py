@@ -19,6 +19,7 @@ from src.agents.telemetry_helpers import agent_run, tool_call
 from src.config import config
 from src.services.content_processing_client import ContentProcessingClient
 from src.utils import safe_load_json
+from src.token_budget import fit_document, input_budget
 
 
 class BelleDocumentAnalyzer(BaseAgent):
@@ -76,7 +77,9 @@ class BelleDocumentAnalyzer(BaseAgent):
             "school_info": ["school district", "high school", "school name", "institution", "university", "college", "campus"]
         }
     
-    def _extract_structured_data_with_ai(self, text_content: str, original_filename: str) -> Dict[str, Any]:
+    def _extract_structured_data_with_ai(
+        self, text_content: str, original_filename: str, section_map: Optional[Dict[int, Any]] = None
+    ) -> Dict[str, Any]:
         """Use the AI model to perform deep structured extraction from the document.
         
         This is the PRIMARY extraction path.  It sends the full document text
@@ -89,16 +92,17 @@ class BelleDocumentAnalyzer(BaseAgent):
         import logging
         _logger = logging.getLogger(__name__)
 
-        # Determine how much text to send.  The workhorse model handles large
-        # context windows, but we cap at a sensible limit so the extraction
-        # stays focused and we don't burn excessive tokens.
-        max_chars = 30000
-        doc_text = text_content[:max_chars] if len(text_content) > max_chars else text_content
-        truncated = len(text_content) > max_chars
+        # Fit the document to the model tier's token budget.  Over budget,
+        # transcript pages (grades are what this call is for) are kept
+        # whole first and TOC/sparse pages are compressed first, using the
+        # page map from _detect_document_sections.
+        fitted = fit_document(text_content, input_budget(self.model), self.model, section_map)
+        doc_text = fitted.text
+        truncated = bool(fitted.trimmed)
 
         user_prompt = (
             f"Filename: {original_filename}\n"
-            f"{'[TRUNCATED — first ' + str(max_chars) + ' characters shown]' if truncated else ''}\n\n"
+            f"{'[CONDENSED to fit the token budget — ' + ', '.join(fitted.trimmed) + ' shortened]' if truncated else ''}\n\n"
             f"DOCUMENT CONTENT:\n{doc_text}\n\n"
             "Analyze this document and return the structured JSON described in your instructions. "
             "Extract ALL courses, grades, GPA, test scores, activities, and student info you can find. "
@@ -195,7 +199,9 @@ class BelleDocumentAnalyzer(BaseAgent):
         # Send the full document to the model with BELLE_ANALYZER_PROMPT.
         # This is where grades, courses, GPA, activities, and all structured
         # data actually get extracted.  Regex is the fallback, AI is the brain.
-        ai_result = self._extract_structured_data_with_ai(text_content, original_filename)
+        ai_result = self._extract_structured_data_with_ai(
+            text_content, original_filename, sections.get("section_map")
+        )
 
         if ai_result and isinstance(ai_result, dict):
             import logging as _ai_log
@@ -0,0 +1,173 @@
+"""Cancellation tokens for running evaluations.
+
+Every evaluation runs inside ``cancel_scope(application_id)``, which
+registers a ``CancelToken`` for it in this process.  Checking a token is
+an ``Event`` lookup, so the orchestrator polls it before every workflow
+step and agents before every model call — no database reads.
+
+``cancel`` sets the token and cancels the asyncio tasks bound to it, so an
+evaluation awaiting a model call in a worker thread stops waiting at once
+and its pool slot is released.  gunicorn runs several worker processes, so
+``cancel`` also publishes a PostgreSQL NOTIFY on ``CANCEL_CHANNEL``; each
+process LISTENs from one daemon thread (started with its first token) and
+cancels the evaluation if it is running there.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CANCEL_CHANNEL = "evaluation_cancel"
+# Set CANCEL_NOTIFY=0 to keep cancellation process-local (no LISTEN thread).
+CANCEL_NOTIFY = os.getenv("CANCEL_NOTIFY", "1") != "0"
+# How often a queued evaluation waiting for a pool slot re-checks its token.
+CANCEL_POLL_SECONDS = float(os.getenv("CANCEL_POLL_SECONDS", "0.25"))
+
+
+class EvaluationCancelled(Exception):
+    """Raised by ``CancelToken.raise_if_cancelled`` once an evaluation is cancelled."""
+
+
+class CancelToken:
+    """Thread-safe cancellation flag for one evaluation."""
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._tasks: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the evaluation and its bound tasks. False if it already was."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            tasks = list(self._tasks)
+        for loop, task in tasks:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # loop already closed
+        logger.info("🛑 Evaluation %s cancelled: %s", self.key, reason)
+        return True
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise EvaluationCancelled(self.reason or "cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or *timeout* passes; returns ``cancelled``."""
+        return self._event.wait(timeout)
+
+    @contextmanager
+    def bind_task(self) -> Iterator["CancelToken"]:
+        """Cancel the current asyncio task if this token is cancelled in the block."""
+        entry = (asyncio.get_running_loop(), asyncio.current_task())
+        with self._lock:
+            self._tasks.add(entry)
+            already = self._event.is_set()
+        if already:
+            entry[1].cancel()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._tasks.discard(entry)
+
+
+_tokens: Dict[str, CancelToken] = {}
+_tokens_lock = threading.Lock()
+_listener: Optional[threading.Thread] = None
+_listener_stop = threading.Event()
+
+
+@contextmanager
+def cancel_scope(key: Any = None) -> Iterator[CancelToken]:
+    """The token for evaluation *key*, registered for the enclosed block.
+
+    Nested scopes for the same key share one token, released by the
+    outermost.  With no key the token is private (it can't be cancelled
+    by id).
+    """
+    if key is None:
+        yield CancelToken()
+        return
+    key = str(key)
+    with _tokens_lock:
+        token = _tokens.get(key)
+        owner = token is None
+        if owner:
+            token = _tokens[key] = CancelToken(key)
+    _ensure_listener()
+    try:
+        yield token
+    finally:
+        if owner:
+            with _tokens_lock:
+                if _tokens.get(key) is token:
+                    del _tokens[key]
+
+
+def get_token(key: Any) -> Optional[CancelToken]:
+    """The registered token for *key* in this process, if it's running here."""
+    with _tokens_lock:
+        return _tokens.get(str(key))
+
+
+def cancel(key: Any, reason: str = "cancelled by user", broadcast: bool = True) -> bool:
+    """Cancel evaluation *key* here and, via NOTIFY, in every other worker.
+
+    Returns True if the evaluation is running (or queued) in this process.
+    """
+    token = get_token(key)
+    if token is not None:
+        token.cancel(reason)
+    if broadcast and CANCEL_NOTIFY:
+        from src.database import db
+        db.notify(CANCEL_CHANNEL, str(key))
+    return token is not None
+
+
+def acquire_unless_cancelled(semaphore: threading.Semaphore, token: CancelToken) -> bool:
+    """Wait for a slot on *semaphore*; False (holding nothing) if *token* is cancelled first."""
+    while not semaphore.acquire(timeout=CANCEL_POLL_SECONDS):
+        if token.cancelled:
+            return False
+    if token.cancelled:
+        semaphore.release()
+        return False
+    return True
+
+
+def _on_notify(payload: str) -> None:
+    token = get_token(payload)
+    if token is not None:
+        token.cancel("cancelled from another worker")
+
+
+def _ensure_listener() -> None:
+    """Start this process's LISTEN thread on first use (PostgreSQL only)."""
+    global _listener
+    if _listener is not None or not CANCEL_NOTIFY:
+        return
+    with _tokens_lock:
+        if _listener is not None:
+            return
+        from src.database import db
+        _listener = threading.Thread(
+            target=db.listen, args=(CANCEL_CHANNEL, _on_notify, _listener_stop),
+            name="cancel-listener", daemon=True,
+        )
+        _listener.start()
@@ -0,0 +1,184 @@
+"""Time budgets for evaluations.
+
+Model calls have their own timeouts (``MODEL_CALL_TIMEOUT*`` in
+``base_agent``), but an evaluation as a whole — retries, Gaston re-runs,
+refinement passes — is bounded only by ``run_async``'s timeout.  Each
+evaluation now gets an overall budget (``EVALUATION_BUDGET_SECONDS``) and
+each workflow step runs inside a slice of it (``step_budget``), capped by
+whatever is left of the overall budget.
+
+Budgets never abort work; they make it cheaper.  Once the active budget is
+nearly exhausted, ``BaseAgent`` skips refinement passes, drops premium and
+reasoning models to the workhorse tier and shortens call timeouts, and the
+orchestrator skips optional Gaston reviews.  Every such step is recorded
+with ``record_degradation`` and reported under ``results['budget']``.
+"""
+
+import contextvars
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from src.agents.evaluation_context import current_evaluation
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_BUDGET_SECONDS = float(os.getenv("EVALUATION_BUDGET_SECONDS", "900"))
+# Slice for a step without an entry in STEP_BUDGETS
+STEP_BUDGET_SECONDS = float(os.getenv("EVALUATION_STEP_BUDGET_SECONDS", "240"))
+# A budget is nearly exhausted once less than this fraction of it is left
+BUDGET_RESERVE_FRACTION = float(os.getenv("EVALUATION_BUDGET_RESERVE", "0.25"))
+# Shortest timeout a model call is given, however little budget is left
+MIN_CALL_SECONDS = float(os.getenv("EVALUATION_MIN_CALL_SECONDS", "15"))
+
+
+def _parse_step_budgets(spec: str) -> Dict[str, float]:
+    """Parse ``"student_evaluator=360,review=90"`` into a dict (bad entries skipped)."""
+    budgets: Dict[str, float] = {}
+    for item in spec.split(","):
+        name, _, seconds = item.partition("=")
+        try:
+            budgets[name.strip()] = float(seconds)
+        except ValueError:
+            continue
+    return budgets
+
+
+# Per-step slices in seconds; ``review`` covers every ``<agent>_review`` step.
+STEP_BUDGETS = {
+    "belle_extraction": 120.0,
+    "school_enrichment": 180.0,
+    "review": 60.0,
+    "student_evaluator": 360.0,
+    "gaston": 180.0,
+    **_parse_step_budgets(os.getenv("EVALUATION_STEP_BUDGETS", "")),
+}
+
+
+@dataclass
+class Budget:
+    """A wall-clock allowance, optionally nested inside a parent budget."""
+
+    name: str
+    seconds: float
+    parent: Optional["Budget"] = None
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def deadline(self) -> float:
+        own = self.started + self.seconds
+        return min(own, self.parent.deadline) if self.parent else own
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def nearly_exhausted(self) -> bool:
+        """True once this budget (or its parent) is down to its reserve."""
+        own = self.started + self.seconds - time.monotonic()
+        if own < self.seconds * BUDGET_RESERVE_FRACTION:
+            return True
+        return self.parent.nearly_exhausted() if self.parent else False
+
+
+_step: contextvars.ContextVar[Optional[Budget]] = contextvars.ContextVar("step_budget", default=None)
+
+
+def slice_seconds(step: str) -> float:
+    if step in STEP_BUDGETS:
+        return STEP_BUDGETS[step]
+    if step.endswith("_review"):
+        return STEP_BUDGETS.get("review", STEP_BUDGET_SECONDS)
+    return STEP_BUDGET_SECONDS
+
+
+def current_budget() -> Optional[Budget]:
+    """The running step's budget, else the evaluation's, else None."""
+    step = _step.get()
+    if step is not None:
+        return step
+    evaluation = current_evaluation()
+    return getattr(evaluation, "budget", None) if evaluation is not None else None
+
+
+@contextmanager
+def step_budget(step: str) -> Iterator[Optional[Budget]]:
+    """Run the enclosed block in *step*'s slice of the evaluation budget.
+
+    Outside an evaluation (or one without a budget) nothing is bound.
+    """
+    evaluation = current_evaluation()
+    parent = getattr(evaluation, "budget", None) if evaluation is not None else None
+    if parent is None:
+        yield None
+        return
+    budget = Budget(step, slice_seconds(step), parent=parent)
+    token = _step.set(budget)
+    try:
+        yield budget
+    finally:
+        _step.reset(token)
+
+
+def with_step_budget(step: str, run: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """Wrap a ``StepGraph`` step callable so it runs in its own budget slice."""
+    async def _run():
+        with step_budget(step):
+            return await run()
+    return _run
+
+
+def nearly_exhausted() -> bool:
+    budget = current_budget()
+    return budget is not None and budget.nearly_exhausted()
+
+
+def capped_timeout(timeout: float) -> float:
+    """*timeout*, shortened to what is left of the active budget (never below MIN_CALL_SECONDS)."""
+    budget = current_budget()
+    if budget is None:
+        return timeout
+    return min(timeout, max(budget.remaining(), MIN_CALL_SECONDS))
+
+
+def record_degradation(action: str, detail: str = "") -> None:
+    """Note that the running step cut a corner to stay within its budget."""
+    evaluation = current_evaluation()
+    if evaluation is None:
+        return
+    budget = current_budget()
+    step = budget.name if budget is not None else None
+    for entry in evaluation.degradations:
+        if entry["step"] == step and entry["action"] == action:
+            entry["count"] += 1
+            return
+    overall = evaluation.budget
+    evaluation.degradations.append({
+        "step": step,
+        "action": action,
+        "detail": detail,
+        "count": 1,
+        "at_seconds": round(overall.elapsed(), 1) if overall is not None else None,
+    })
+    logger.warning("⏳ Budget nearly exhausted in %s: %s %s", step, action, detail)
+
+
+def budget_report(evaluation: Any) -> Dict[str, Any]:
+    """The ``results['budget']`` entry for a finished evaluation."""
+    budget: Optional[Budget] = evaluation.budget
+    degradations: List[Dict[str, Any]] = list(evaluation.degradations)
+    if budget is None:
+        return {"degradations": degradations}
+    elapsed = budget.elapsed()
+    return {
+        "budget_seconds": budget.seconds,
+        "elapsed_seconds": round(elapsed, 1),
+        "exceeded": elapsed > budget.seconds,
+        "degraded": bool(degradations),
+        "degradations": degradations,
+    }
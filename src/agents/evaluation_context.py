@@ -0,0 +1,93 @@
+"""Per-evaluation state, kept off the (shared) agent instances.
+
+One ``SmeeOrchestrator`` and one set of agents serve every evaluation in
+the process.  Everything that belongs to a single evaluation — the
+application being evaluated, the results dict, the progress callback, the
+workflow span, each agent's conversation history — lives on an
+``EvaluationContext`` instead.  ``coordinate_evaluation`` binds a fresh
+context for the duration of the run via a ``ContextVar``, so concurrent
+evaluations on the shared event loop (each its own task) and the worker
+threads they spawn with ``asyncio.to_thread`` each see their own.
+
+Agents read the active context with ``current_evaluation()``; outside an
+evaluation it returns None and agents fall back to instance state (chat
+endpoints, ad-hoc calls from routes).
+"""
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_current: contextvars.ContextVar[Optional["EvaluationContext"]] = contextvars.ContextVar(
+    "evaluation_context", default=None
+)
+
+
+@dataclass
+class EvaluationContext:
+    """State for one ``coordinate_evaluation`` run."""
+
+    application_id: Optional[int] = None
+    student_id: Optional[str] = None
+    applicant_name: str = ""
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    workflow_state: str = "idle"  # idle, evaluating, complete
+    evaluation_results: Dict[str, Any] = field(default_factory=dict)
+    # Agent name -> chat messages exchanged during this evaluation
+    conversations: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    # Workflow-level OpenTelemetry span (agent_run context manager + span)
+    otel_ctx: Any = None
+    otel_span: Any = None
+    # CancelToken for this run (see src/agents/cancellation.py)
+    cancel_token: Any = None
+    # Overall time Budget and the corners cut to meet it (src/agents/deadline.py)
+    budget: Any = None
+    degradations: List[Dict[str, Any]] = field(default_factory=list)
+
+    def conversation(self, agent_name: str) -> List[Dict[str, Any]]:
+        """Conversation history of *agent_name* within this evaluation."""
+        return self.conversations.setdefault(agent_name, [])
+
+    def trace_attributes(self) -> Dict[str, Any]:
+        """Span attributes identifying the application under evaluation."""
+        return {
+            "app.application_id": self.application_id,
+            "app.student_id": self.student_id,
+            "app.applicant_name": self.applicant_name,
+        }
+
+
+def current_evaluation() -> Optional[EvaluationContext]:
+    """The evaluation bound to the running task/thread, if any."""
+    return _current.get()
+
+
+@contextmanager
+def evaluation_scope(context: EvaluationContext) -> Iterator[EvaluationContext]:
+    """Bind *context* as the current evaluation for the enclosed block."""
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+
+
+class ContextAttribute:
+    """Descriptor exposing an ``EvaluationContext`` field as an instance attribute.
+
+    The owner class provides ``_evaluation_context()``, returning the
+    context to read and write (the active one, or a fallback outside an
+    evaluation).
+    """
+
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return getattr(obj._evaluation_context(), self.field_name)
+
+    def __set__(self, obj, value) -> None:
+        setattr(obj._evaluation_context(), self.field_name, value)
@@ -238,22 +238,24 @@ class MerlinStudentEvaluator(BaseAgent):
     ) -> str:
         """Build the synthesis prompt from agent outputs."""
         # ── prepare data sections ──────────────────────────────────
-        outputs_json = json.dumps(agent_outputs, ensure_ascii=True, default=str)
-
+        # Milo's training insights are the same for every applicant, so they
+        # lead the prompt (a stable prefix for prompt caching), and they and
+        # the alignment/normalized scores are left out of the outputs JSON
+        # that follows rather than being sent twice.
         training_insights = agent_outputs.get("data_scientist") or {}
-        training_json = json.dumps(training_insights, ensure_ascii=True, default=str)
+        training_json = json.dumps(training_insights, ensure_ascii=True, sort_keys=True, default=str)
 
         milo_alignment = agent_outputs.get("milo_alignment") or {}
-        alignment_json = json.dumps(milo_alignment, ensure_ascii=True, default=str)
+        alignment_json = json.dumps(milo_alignment, ensure_ascii=True, sort_keys=True, default=str)
+
+        specialist_outputs = {
+            k: v for k, v in agent_outputs.items()
+            if k not in ("data_scientist", "milo_alignment", "_normalized_scores")
+        }
+        outputs_json = json.dumps(specialist_outputs, ensure_ascii=True, sort_keys=True, default=str)
 
         # ── build prompt ─────────────────────────────────────────────
         prompt_parts = [
-            "══════════════════════════════════════════════════════════════=",
-            "APPLICANT UNDER REVIEW",
-            "══════════════════════════════════════════════════════════════=",
-            f"Name: {applicant_name}",
-            "",
-
             "══════════════════════════════════════════════════════════════=",
             "MILO — TRAINING INSIGHTS (historical acceptance model)",
             "══════════════════════════════════════════════════════════════=",
@@ -265,6 +267,12 @@ class MerlinStudentEvaluator(BaseAgent):
             "override strong direct evidence.)",
             "",
 
+            "══════════════════════════════════════════════════════════════=",
+            "APPLICANT UNDER REVIEW",
+            "══════════════════════════════════════════════════════════════=",
+            f"Name: {applicant_name}",
+            "",
+
             "══════════════════════════════════════════════════════════════=",
             "MILO — INDIVIDUAL ALIGNMENT (this student vs. model)",
             "══════════════════════════════════════════════════════════════=",
@@ -279,7 +287,7 @@ class MerlinStudentEvaluator(BaseAgent):
             "  • Tiana    — Essay / video evaluation + STEM interest scoring",
             "  • Mulan    — Recommendation letter analysis",
             "  • Moana    — School context & opportunity assessment",
-            "  • Milo     — Data scientist training insights & alignment",
+            "  • Milo     — Alignment of this student with the training model (above)",
             "",
             outputs_json,
             "",
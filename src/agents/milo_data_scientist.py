@@ -26,6 +26,7 @@ from src.telemetry import get_tracer
 from src.agents.telemetry_helpers import agent_run
 from src.agents.naveen_school_data_scientist import NaveenSchoolDataScientist
 from src.utils import safe_load_json
+from src.token_budget import compress_text
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +126,29 @@ class MiloDataScientist(BaseAgent):
             _otel.__exit__(None, None, None)
             return cached
 
+        data = self._request_insights(samples, historical_data)
+
+        self._cached_insights = data
+        self._cached_signature = signature
+        self._cached_at = time.time()
+        _otel.__exit__(None, None, None)
+        return data
+
+    async def build_insights(self, training_examples: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a selection model from *training_examples* only.
+
+        Same analysis as ``analyze_training_insights`` but for a caller-chosen
+        subset (a cross-validation fold) and without touching the agent's
+        insight cache, so concurrent folds can share one Milo instance.
+        """
+        historical_data = self._load_historical_data()
+        samples = self._build_enriched_samples(training_examples)
+        return self._request_insights(samples, historical_data)
+
+    def _request_insights(
+        self, samples: Dict[str, Any], historical_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Ask the model for the patterns separating selected from rejected samples."""
         prompt = self._build_insight_prompt(samples, historical_data)
 
         try:
@@ -157,11 +181,6 @@ class MiloDataScientist(BaseAgent):
             })
         except Exception as e:
             data = self._error(str(e))
-
-        self._cached_insights = data
-        self._cached_signature = signature
-        self._cached_at = time.time()
-        _otel.__exit__(None, None, None)
         return data
 
     # -------------------------------------------------------------------
@@ -387,6 +406,7 @@ class MiloDataScientist(BaseAgent):
                             "Milo evaluation[%d] not a dict: %s", i, str(eval_data)[:200]
                         )
                         eval_data = {
+                            "status": "error",
                             "nextgen_match": 0,
                             "match_score": 0,
                             "tier": "DECLINE",
@@ -394,6 +414,7 @@ class MiloDataScientist(BaseAgent):
                         }
                 else:
                     eval_data = {
+                        "status": "error",
                         "nextgen_match": 0,
                         "match_score": 0,
                         "tier": "DECLINE",
@@ -420,6 +441,7 @@ class MiloDataScientist(BaseAgent):
             # Return zero-score fallbacks
             return [
                 {
+                    "status": "error",
                     "application_id": app.get("application_id"),
                     "applicant_name": app.get("applicant_name", "Unknown"),
                     "nextgen_match": 0,
@@ -1346,10 +1368,17 @@ class MiloDataScientist(BaseAgent):
         )
 
     def _truncate(self, text: Optional[str], limit: int = 1200) -> str:
+        """Fit *text* to roughly *limit* characters' worth of tokens.
+
+        Long fields are compressed (boilerplate dropped, head and tail kept)
+        rather than cut after the first *limit* characters.
+        """
         if not text:
             return ""
         text = str(text)
-        return text[:limit] + "..." if len(text) > limit else text
+        if len(text) <= limit:
+            return text
+        return compress_text(text, limit // 4, self.model)
 
     def _safe_float(self, val: Any) -> Optional[float]:
         if val is None:
@@ -0,0 +1,215 @@
+"""Frame sampling engine for Mirabel's video analysis.
+
+``MirabelVideoAnalyzer._extract_frames`` used to ``cap.set(POS_FRAMES)``
+before every sample, then resize and JPEG-encode on the decoding thread.
+This sampler:
+
+* decodes forward with ``grab()`` and only ``retrieve()``s (colour-converts)
+  the selected frames whenever the next sample is close enough that
+  decoding the gap is cheaper than a seek.  A seek re-decodes from the
+  previous keyframe, so which one wins depends on the keyframe interval;
+  the sampler times both on the video at hand and picks per sample.
+  Distant targets still seek, because grabbing through minutes of video
+  decodes far more frames than one seek does;
+* drops near-duplicate frames (static slides, talking head with no motion)
+  with a 64-bit difference hash, so the vision call gets distinct content;
+* hands resize + JPEG encoding to a worker thread, overlapping it with
+  decoding of the next sample.
+
+Sampling positions match the original extractor: every ``frame_interval``
+seconds up to ``max_duration``, evenly thinned to ``max_frames``.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Until seek and grab costs have been measured, targets further apart than
+# this many seconds are reached by seeking and closer ones by decoding
+# forward.  Phone/webcam encoders put a keyframe every 1-2 s.
+SEEK_GAP_SECONDS = float(os.getenv("MIRABEL_SEEK_GAP_SECONDS", "2.0"))
+# Hamming distance (out of 64 bits) at or below which frames are duplicates.
+DEDUP_HAMMING_THRESHOLD = int(os.getenv("MIRABEL_DEDUP_THRESHOLD", "3"))
+MAX_FRAME_WIDTH = 1280
+JPEG_QUALITY = 85
+
+
+def sample_indices(total_frames: int, fps: float, frame_interval: float,
+                   max_frames: int, max_duration: float) -> List[int]:
+    """Frame indices to sample (same policy as the original extractor)."""
+    duration = total_frames / fps if fps > 0 else 0
+    interval_frames = max(int(fps * frame_interval), 1)
+    max_frame_idx = int(min(duration, max_duration) * fps)
+    indices = list(range(0, max_frame_idx, interval_frames))
+    if len(indices) > max_frames:
+        step = len(indices) / max_frames
+        indices = [indices[int(i * step)] for i in range(max_frames)]
+    return indices
+
+
+def _ema(previous: Optional[float], sample: float, weight: float = 0.3) -> float:
+    return sample if previous is None else previous + weight * (sample - previous)
+
+
+def dhash(frame) -> int:
+    """64-bit difference hash of a BGR frame (9x8 grayscale gradient signs)."""
+    import cv2
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def _encode_frame(frame, width: int, max_width: int, quality: int) -> Optional[bytes]:
+    import cv2
+
+    if width > max_width:
+        scale = max_width / width
+        frame = cv2.resize(frame, (max_width, int(frame.shape[0] * scale)),
+                           interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes() if ok else None
+
+
+class FrameSampler:
+    """Sample, de-duplicate and encode frames from one video file."""
+
+    def __init__(self, frame_interval: float, max_frames: int, max_duration: float,
+                 dedupe: bool = True, seek_gap_seconds: float = SEEK_GAP_SECONDS,
+                 max_width: int = MAX_FRAME_WIDTH, jpeg_quality: int = JPEG_QUALITY):
+        self.frame_interval = frame_interval
+        self.max_frames = max_frames
+        self.max_duration = max_duration
+        self.dedupe = dedupe
+        self.seek_gap_seconds = seek_gap_seconds
+        self.max_width = max_width
+        self.jpeg_quality = jpeg_quality
+
+    def sample(self, video_path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return ``(frames, stats)``.
+
+        Each frame is ``{"image_bytes", "timestamp", "index"}`` (the format
+        ``_analyze_with_vision`` expects).  ``stats`` carries the video
+        properties plus decode counters (seeks, grabs, duplicates skipped,
+        decode/encode milliseconds).
+        """
+        import cv2
+
+        stats: Dict[str, Any] = {
+            "duration_seconds": 0, "total_frames": 0, "fps": 0,
+            "width": 0, "height": 0, "extracted_frame_count": 0,
+            "seeks": 0, "grabs": 0, "duplicates_skipped": 0,
+            "decode_ms": 0.0, "encode_ms": 0.0,
+        }
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            logger.error("❌ MIRABEL: Cannot open video file: %s", video_path)
+            return [], stats
+
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        duration = total_frames / fps if fps > 0 else 0
+        stats.update({
+            "duration_seconds": round(duration, 2),
+            "total_frames": total_frames,
+            "fps": round(fps, 2),
+            "width": width,
+            "height": height,
+        })
+        if duration > self.max_duration:
+            logger.warning(
+                "⚠️ MIRABEL: Video is %.0fs, exceeds %ds limit. Processing first %ds only.",
+                duration, self.max_duration, self.max_duration,
+            )
+
+        targets = sample_indices(total_frames, fps, self.frame_interval,
+                                 self.max_frames, self.max_duration)
+        seek_gap = max(int(fps * self.seek_gap_seconds), 1)
+
+        pending: List[Tuple[float, Future]] = []
+        last_hash: Optional[int] = None
+        position = 0  # index of the frame the next grab() will decode
+        seek_cost: Optional[float] = None  # seconds per seek
+        grab_cost: Optional[float] = None  # seconds per grabbed frame
+        decode_start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="mirabel-encode") as encoder:
+                for idx in targets:
+                    gap = idx - position
+                    if gap < 0 or (gap and not self._should_grab(gap, seek_gap, seek_cost, grab_cost)):
+                        t0 = time.perf_counter()
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+                        seek_cost = _ema(seek_cost, time.perf_counter() - t0)
+                        stats["seeks"] += 1
+                    elif gap:
+                        ok = True
+                        t0 = time.perf_counter()
+                        for _ in range(gap):
+                            ok = cap.grab()
+                            stats["grabs"] += 1
+                            if not ok:
+                                break
+                        if not ok:
+                            break
+                        grab_cost = _ema(grab_cost, (time.perf_counter() - t0) / gap)
+                    ok, frame = cap.read()
+                    position = idx + 1
+                    if not ok:
+                        continue
+
+                    if self.dedupe:
+                        h = dhash(frame)
+                        if last_hash is not None and bin(h ^ last_hash).count("1") <= DEDUP_HAMMING_THRESHOLD:
+                            stats["duplicates_skipped"] += 1
+                            continue
+                        last_hash = h
+
+                    pending.append((
+                        round(idx / fps, 2),
+                        encoder.submit(self._timed_encode, frame, width, stats),
+                    ))
+                stats["decode_ms"] = round((time.perf_counter() - decode_start) * 1000, 1)
+
+                frames: List[Dict[str, Any]] = []
+                for timestamp, future in pending:
+                    data = future.result()
+                    if data:
+                        frames.append({"image_bytes": data, "timestamp": timestamp, "index": len(frames)})
+        finally:
+            cap.release()
+
+        stats["extracted_frame_count"] = len(frames)
+        return frames, stats
+
+    @staticmethod
+    def _should_grab(gap: int, seek_gap: int, seek_cost: Optional[float],
+                     grab_cost: Optional[float]) -> bool:
+        """Decode forward through *gap* frames instead of seeking?
+
+        Seek cost depends on the keyframe interval, which OpenCV doesn't
+        expose, so both costs are measured on this video: the first jump
+        seeks, the next nearby one grabs, and from then on whichever is
+        cheaper wins.  ``seek_gap`` is only the prior used before that.
+        """
+        if seek_cost is None:
+            return False
+        if grab_cost is None:
+            return gap <= seek_gap
+        return gap * grab_cost <= seek_cost
+
+    def _timed_encode(self, frame, width: int, stats: Dict[str, Any]) -> Optional[bytes]:
+        start = time.perf_counter()
+        try:
+            return _encode_frame(frame, width, self.max_width, self.jpeg_quality)
+        finally:
+            stats["encode_ms"] = round(stats["encode_ms"] + (time.perf_counter() - start) * 1000, 1)
@@ -0,0 +1,178 @@
+"""Chunked, parallel audio transcription for Mirabel.
+
+Whisper latency grows with clip length, so a ten-minute submission sent as
+one request is the slowest step in ``MirabelVideoAnalyzer``.  This module
+splits the extracted 16 kHz mono WAV into ``AUDIO_CHUNK_SECONDS`` pieces —
+cutting at the quietest point near each boundary so words aren't split —
+transcribes the pieces concurrently and stitches the results back together
+with timestamps relative to the start of the video.
+
+The per-chunk transcription call is injected (``transcribe_chunk``), so the
+chunking and stitching work without an AI client.
+"""
+
+import logging
+import os
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CHUNK_SECONDS = float(os.getenv("MIRABEL_AUDIO_CHUNK_SECONDS", "90"))
+TRANSCRIBE_WORKERS = int(os.getenv("MIRABEL_TRANSCRIBE_WORKERS", "4"))
+
+# Look this far back from each nominal boundary for a quiet cut point.
+_SPLIT_SEARCH_SECONDS = 2.0
+_SPLIT_WINDOW_SECONDS = 0.05
+# A window counts as a pause when its energy is below this share of the median.
+_PAUSE_RATIO = 0.25
+# A final piece shorter than this is folded into the previous chunk.
+_MIN_TAIL_SECONDS = 10.0
+
+
+@dataclass
+class TranscriptSegment:
+    """A span of speech; times are seconds from the start of the video."""
+    start: float
+    end: float
+    text: str
+
+
+@dataclass
+class Transcript:
+    """Stitched transcript of a whole audio track."""
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    chunk_count: int = 1
+
+    @property
+    def text(self) -> str:
+        return " ".join(s.text for s in self.segments if s.text).strip()
+
+    @property
+    def timestamped_text(self) -> str:
+        """One ``[m:ss] text`` line per segment, for lining speech up with frames."""
+        return "\n".join(
+            f"[{format_timestamp(s.start)}] {s.text}" for s in self.segments if s.text
+        )
+
+
+# (audio_path) -> segments with times relative to that file
+ChunkTranscriber = Callable[[str], List[TranscriptSegment]]
+
+
+def format_timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}:{secs:02d}"
+
+
+def _quietest_frame(frames: bytes, sample_width: int, rate: int) -> int:
+    """Index (in samples) of the start of the quietest window in *frames*.
+
+    Returns the end of *frames* (i.e. the nominal boundary) when nothing
+    in the span is clearly quieter than its typical level.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return len(frames) // sample_width
+    if sample_width != 2:
+        return len(frames) // sample_width
+    samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)
+    window = max(int(rate * _SPLIT_WINDOW_SECONDS), 1)
+    usable = (len(samples) // window) * window
+    if not usable:
+        return len(samples)
+    energy = np.abs(samples[:usable]).reshape(-1, window).mean(axis=1)
+    quietest = int(energy.argmin())
+    if energy[quietest] > _PAUSE_RATIO * float(np.median(energy)):
+        return len(samples)
+    return quietest * window
+
+
+def split_wav(path: str, out_dir: str,
+              chunk_seconds: float = AUDIO_CHUNK_SECONDS) -> List[Tuple[str, float]]:
+    """Split a PCM WAV into chunk files; returns ``[(chunk_path, offset_s)]``.
+
+    Audio no longer than ``chunk_seconds + _MIN_TAIL_SECONDS`` is returned
+    as-is (a single entry pointing at *path*).
+    """
+    with wave.open(path, "rb") as src:
+        params = src.getparams()
+        rate, width, channels = params.framerate, params.sampwidth, params.nchannels
+        total = params.nframes
+        chunk_frames = int(chunk_seconds * rate)
+        if total <= chunk_frames + _MIN_TAIL_SECONDS * rate:
+            return [(path, 0.0)]
+
+        search = int(_SPLIT_SEARCH_SECONDS * rate)
+        frame_bytes = width * channels
+        data = src.readframes(total)
+
+    # Cut points: each nominal boundary pulled back to the quietest window
+    # (mono only — that's what the ffmpeg extraction produces).
+    cuts = [0]
+    while total - cuts[-1] > chunk_frames + _MIN_TAIL_SECONDS * rate:
+        nominal = cuts[-1] + chunk_frames
+        if channels != 1:
+            cuts.append(nominal)
+            continue
+        lo = max(nominal - search, cuts[-1] + 1)
+        cuts.append(lo + _quietest_frame(data[lo * frame_bytes:nominal * frame_bytes], width, rate))
+    cuts.append(total)
+
+    chunks: List[Tuple[str, float]] = []
+    for i, (begin, end) in enumerate(zip(cuts, cuts[1:])):
+        chunk_path = os.path.join(out_dir, f"chunk_{i:03d}.wav")
+        with wave.open(chunk_path, "wb") as dst:
+            dst.setnchannels(channels)
+            dst.setsampwidth(width)
+            dst.setframerate(rate)
+            dst.writeframes(data[begin * frame_bytes:end * frame_bytes])
+        chunks.append((chunk_path, begin / rate))
+    return chunks
+
+
+def transcribe_chunked(audio_path: str, transcribe_chunk: ChunkTranscriber,
+                       work_dir: str,
+                       chunk_seconds: float = AUDIO_CHUNK_SECONDS,
+                       max_workers: int = TRANSCRIBE_WORKERS,
+                       timings: Optional[Dict[str, float]] = None) -> Optional[Transcript]:
+    """Transcribe *audio_path* in parallel chunks and stitch the results.
+
+    A chunk that fails (``transcribe_chunk`` raises) is logged and left
+    out; ``None`` is returned only when every chunk fails or yields nothing.
+    ``timings`` (if given) receives ``audio_split_ms`` and
+    ``transcription_ms``.
+    """
+    start = time.perf_counter()
+    chunks = split_wav(audio_path, work_dir, chunk_seconds)
+    split_done = time.perf_counter()
+
+    def _run(chunk: Tuple[str, float]) -> List[TranscriptSegment]:
+        path, offset = chunk
+        try:
+            pieces = transcribe_chunk(path)
+        except Exception as e:
+            logger.warning("MIRABEL: Transcription of chunk at %.0fs failed: %s", offset, e)
+            return []
+        return [TranscriptSegment(p.start + offset, p.end + offset, p.text.strip()) for p in pieces]
+
+    if len(chunks) == 1:
+        results = [_run(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks))),
+                                thread_name_prefix="mirabel-whisper") as pool:
+            results = list(pool.map(_run, chunks))
+
+    if timings is not None:
+        timings["audio_split_ms"] = round((split_done - start) * 1000, 1)
+        timings["transcription_ms"] = round((time.perf_counter() - split_done) * 1000, 1)
+
+    segments = [s for chunk_segments in results for s in chunk_segments if s.text]
+    if not segments:
+        return None
+    logger.info("MIRABEL: Transcribed %d audio chunk(s) into %d segments", len(chunks), len(segments))
+    return Transcript(segments=segments, chunk_count=len(chunks))
@@ -5,8 +5,10 @@ this agent analyzes video submissions to extract structured data about applicant
 using GPT-4o vision (frame analysis) and audio transcription.
 
 Architecture:
-    1. Extract key frames from video using OpenCV (every N seconds)
-    2. Extract audio track and transcribe via Whisper / Azure Speech
+    1. Extract audio track and transcribe via Whisper in parallel chunks
+       (``mirabel_transcriber``), in the background while step 2 runs
+    2. Extract key frames from video using OpenCV (every N seconds, see
+       ``mirabel_frame_sampler``)
     3. Send frames + transcript to GPT-4o for structured extraction
     4. Output same agent_fields format as Belle for seamless pipeline integration
 """
@@ -21,9 +23,12 @@ import shutil
 import subprocess
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.agents.base_agent import BaseAgent
+from src.agents.mirabel_frame_sampler import FrameSampler
+from src.agents.mirabel_transcriber import Transcript, TranscriptSegment, transcribe_chunked
 from src.agents.system_prompts import MIRABEL_VIDEO_PROMPT
 from src.agents.telemetry_helpers import agent_run, tool_call
 from src.config import config
@@ -50,6 +55,10 @@ def _check_opencv() -> bool:
         return False
 
 
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+
 def _check_ffmpeg() -> bool:
     """Check if ffmpeg is available on the system."""
     return shutil.which('ffmpeg') is not None
@@ -97,6 +106,8 @@ class MirabelVideoAnalyzer(BaseAgent):
             os.getenv("MIRABEL_FRAME_INTERVAL", str(DEFAULT_FRAME_INTERVAL))
         )
         self.max_frames = int(os.getenv("MIRABEL_MAX_FRAMES", str(MAX_FRAMES)))
+        # Skip near-duplicate frames (static slides / no motion) before vision
+        self.dedupe_frames = os.getenv("MIRABEL_DEDUP_FRAMES", "1") != "0"
         self.has_opencv = _check_opencv()
         self.has_ffmpeg = _check_ffmpeg()
 
@@ -185,27 +196,47 @@ class MirabelVideoAnalyzer(BaseAgent):
                 "raw_extraction": None,
             }
 
-            # ── Step 1: Extract frames ──────────────────────────────────
-            frames, video_meta = self._extract_frames(video_path)
+            # ── Step 1: Audio (ffmpeg + Whisper) in the background ──────
+            # Independent of the frames, so it overlaps frame extraction.
+            timings: Dict[str, float] = {}
+            audio_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mirabel-audio")
+            audio_future = audio_pool.submit(self._extract_and_transcribe_audio, video_path, timings)
+            audio_pool.shutdown(wait=False)
+
+            # ── Step 2: Extract frames ──────────────────────────────────
+            stage_start = time.perf_counter()
+            try:
+                frames, video_meta = self._extract_frames(video_path)
+            except Exception as e:
+                logger.error("❌ MIRABEL: Frame extraction failed: %s", e, exc_info=True)
+                frames, video_meta = [], {}
+            timings["frame_extraction_ms"] = _elapsed_ms(stage_start)
             result["video_metadata"] = video_meta
 
-            if not frames:
+            if frames:
+                logger.info(
+                    "🔮 MIRABEL: Extracted %d frames from %s (%.1fs duration)",
+                    len(frames),
+                    original_filename,
+                    video_meta.get("duration_seconds", 0),
+                )
+            else:
+                # Still wait for the audio: its transcript is the fallback
                 logger.error("❌ MIRABEL: No frames extracted from %s", original_filename)
-                result["summary"] = "Failed to extract frames from video file."
-                return result
 
-            logger.info(
-                "🔮 MIRABEL: Extracted %d frames from %s (%.1fs duration)",
-                len(frames),
-                original_filename,
-                video_meta.get("duration_seconds", 0),
-            )
+            stage_start = time.perf_counter()
+            try:
+                transcript = audio_future.result()
+            except Exception as e:
+                logger.error("MIRABEL: Audio pipeline failed: %s", e)
+                transcript = None
+            timings["audio_wait_ms"] = _elapsed_ms(stage_start)
 
-            # ── Step 2: Extract and transcribe audio ────────────────────
-            audio_transcript = self._extract_and_transcribe_audio(video_path)
+            audio_transcript = transcript.text if transcript else None
             if audio_transcript:
                 result["video_metadata"]["has_audio_transcript"] = True
                 result["video_metadata"]["transcript_length"] = len(audio_transcript)
+                result["video_metadata"]["transcript_chunks"] = transcript.chunk_count
                 logger.info(
                     "🔮 MIRABEL: Transcribed %d chars of audio from %s",
                     len(audio_transcript),
@@ -216,7 +247,15 @@ class MirabelVideoAnalyzer(BaseAgent):
                 logger.info("🔮 MIRABEL: No audio transcript available for %s", original_filename)
 
             # ── Step 3: Analyze with GPT-4o vision ──────────────────────
-            analysis = self._analyze_with_vision(frames, audio_transcript, original_filename)
+            analysis = None
+            if frames:
+                stage_start = time.perf_counter()
+                analysis = self._analyze_with_vision(
+                    frames,
+                    transcript.timestamped_text if transcript else None,
+                    original_filename,
+                )
+                timings["vision_analysis_ms"] = _elapsed_ms(stage_start)
             if analysis:
                 result["confidence"] = analysis.get("confidence", 0.7)
                 result["student_info"] = analysis.get("student_info", {})
@@ -227,18 +266,24 @@ class MirabelVideoAnalyzer(BaseAgent):
                 # Build agent_fields for downstream routing
                 result["agent_fields"] = self._build_agent_fields(analysis, audio_transcript)
             else:
-                logger.warning("⚠️ MIRABEL: GPT-4o analysis returned no results")
+                if frames:
+                    logger.warning("⚠️ MIRABEL: GPT-4o analysis returned no results")
+                else:
+                    result["summary"] = "Failed to extract frames from video file."
                 # Fallback: use raw transcript as application text
                 if audio_transcript:
                     result["agent_fields"]["application_text"] = audio_transcript
-                    result["summary"] = "Video analysis failed; audio transcript available."
+                    failed = "Video analysis failed" if frames else "No frames extracted"
+                    result["summary"] = f"{failed}; audio transcript available."
 
             elapsed = time.time() - start
             result["video_metadata"]["processing_time_seconds"] = round(elapsed, 2)
+            result["video_metadata"]["stage_timings_ms"] = timings
             logger.info(
-                "✅ MIRABEL: Video analysis complete for %s in %.1fs",
+                "✅ MIRABEL: Video analysis complete for %s in %.1fs (%s)",
                 original_filename,
                 elapsed,
+                ", ".join(f"{k[:-3]}={v:.0f}ms" for k, v in timings.items()),
             )
             return result
 
@@ -248,6 +293,10 @@ class MirabelVideoAnalyzer(BaseAgent):
         """
         Extract key frames from a video file using OpenCV.
 
+        Delegates to ``FrameSampler``: sequential ``grab()`` decoding between
+        nearby samples, near-duplicate skipping, and JPEG encoding on a
+        worker thread.
+
         Returns:
             Tuple of (frames_list, video_metadata)
             Each frame: {"image_bytes": bytes, "timestamp": float, "index": int}
@@ -260,102 +309,55 @@ class MirabelVideoAnalyzer(BaseAgent):
             "height": 0,
             "extracted_frame_count": 0,
         }
-        frames: List[Dict[str, Any]] = []
 
         if not self.has_opencv:
             logger.error("❌ MIRABEL: OpenCV not available for frame extraction")
-            return frames, meta
+            return [], meta
 
         try:
-            import cv2
-
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                logger.error("❌ MIRABEL: Cannot open video file: %s", video_path)
-                return frames, meta
-
-            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            duration = total_frames / fps if fps > 0 else 0
-
-            meta.update({
-                "duration_seconds": round(duration, 2),
-                "total_frames": total_frames,
-                "fps": round(fps, 2),
-                "width": width,
-                "height": height,
-            })
-
-            # Enforce max duration
-            if duration > MAX_VIDEO_DURATION:
-                logger.warning(
-                    "⚠️ MIRABEL: Video is %.0fs, exceeds %ds limit. Processing first %ds only.",
-                    duration, MAX_VIDEO_DURATION, MAX_VIDEO_DURATION,
-                )
-                duration = MAX_VIDEO_DURATION
-
-            # Calculate frame indices to extract
-            interval_frames = int(fps * self.frame_interval)
-            max_frame_idx = int(min(duration, MAX_VIDEO_DURATION) * fps)
-            frame_indices = list(range(0, max_frame_idx, max(interval_frames, 1)))
-
-            # Limit total frames
-            if len(frame_indices) > self.max_frames:
-                # Evenly sample from available indices
-                step = len(frame_indices) / self.max_frames
-                frame_indices = [frame_indices[int(i * step)] for i in range(self.max_frames)]
-
-            for idx in frame_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame = cap.read()
-                if not ret:
-                    continue
-
-                # Resize if very large (keep aspect ratio, max 1280px width)
-                if width > 1280:
-                    scale = 1280 / width
-                    new_w = 1280
-                    new_h = int(height * scale)
-                    frame = cv2.resize(frame, (new_w, new_h))
-
-                # Encode as JPEG (smaller than PNG for transmission)
-                success, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                if success:
-                    frames.append({
-                        "image_bytes": buf.tobytes(),
-                        "timestamp": round(idx / fps, 2),
-                        "index": len(frames),
-                    })
-
-            cap.release()
-            meta["extracted_frame_count"] = len(frames)
+            sampler = FrameSampler(
+                frame_interval=self.frame_interval,
+                max_frames=self.max_frames,
+                max_duration=MAX_VIDEO_DURATION,
+                dedupe=self.dedupe_frames,
+            )
+            frames, stats = sampler.sample(video_path)
+            meta.update(stats)
+            if stats.get("duplicates_skipped"):
+                logger.info("🔮 MIRABEL: Skipped %d near-duplicate frames", stats["duplicates_skipped"])
             return frames, meta
 
         except Exception as e:
             logger.error("❌ MIRABEL: Frame extraction failed: %s", e, exc_info=True)
-            return frames, meta
+            return [], meta
 
     # ─── Audio Extraction & Transcription ───────────────────────────────
 
-    def _extract_and_transcribe_audio(self, video_path: str) -> Optional[str]:
+    def _extract_and_transcribe_audio(
+        self,
+        video_path: str,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> Optional[Transcript]:
         """
         Extract audio from video and transcribe it.
 
-        Uses ffmpeg to extract audio track, then transcribes via
-        OpenAI Whisper API (if available) or returns None.
+        Uses ffmpeg to extract audio track, then transcribes it via the
+        OpenAI Whisper API in parallel chunks (see ``mirabel_transcriber``).
+        Returns None when there is no audio, no ffmpeg or no Whisper model.
+        Stage durations are written to *timings* when given.
         """
         if not self.has_ffmpeg:
             logger.info("MIRABEL: ffmpeg not available, skipping audio transcription")
             return None
+        if not (self.whisper_model and (self.whisper_client or self.client)):
+            logger.info("MIRABEL: No Whisper model available, proceeding with frames-only analysis")
+            return None
+        timings = timings if timings is not None else {}
 
-        audio_path = None
+        work_dir = tempfile.mkdtemp(prefix="mirabel_audio_")
         try:
             # Extract audio to temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                audio_path = tmp.name
-
+            audio_path = os.path.join(work_dir, "audio.wav")
             cmd = [
                 "ffmpeg", "-y",
                 "-i", video_path,
@@ -365,11 +367,13 @@ class MirabelVideoAnalyzer(BaseAgent):
                 "-ac", "1",                # mono
                 audio_path,
             ]
+            stage_start = time.perf_counter()
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 timeout=120,
             )
+            timings["audio_extraction_ms"] = _elapsed_ms(stage_start)
 
             if result.returncode != 0:
                 stderr = result.stderr.decode("utf-8", errors="replace")
@@ -384,9 +388,7 @@ class MirabelVideoAnalyzer(BaseAgent):
                 logger.info("MIRABEL: Audio file too small or empty, skipping transcription")
                 return None
 
-            # Transcribe using available method
-            transcript = self._transcribe_audio(audio_path)
-            return transcript
+            return transcribe_chunked(audio_path, self._transcribe_chunk, work_dir, timings=timings)
 
         except subprocess.TimeoutExpired:
             logger.warning("MIRABEL: Audio extraction timed out")
@@ -395,45 +397,50 @@ class MirabelVideoAnalyzer(BaseAgent):
             logger.error("MIRABEL: Audio extraction failed: %s", e)
             return None
         finally:
-            if audio_path and os.path.exists(audio_path):
-                try:
-                    os.remove(audio_path)
-                except Exception:
-                    pass
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-    def _transcribe_audio(self, audio_path: str) -> Optional[str]:
+    def _transcribe_chunk(self, audio_path: str) -> List[TranscriptSegment]:
         """
-        Transcribe an audio file using the best available method.
+        Transcribe one audio file with Whisper.
 
-        Priority:
-        1. OpenAI Whisper API via Azure (if whisper model deployed)
-        2. GPT-4o audio analysis (send audio description to vision model)
-        3. Return None (frames-only analysis)
+        Asks for ``verbose_json`` to get segment timestamps; deployments that
+        only support plain text fall back to a single untimed segment.
+        Raises on API failure (``transcribe_chunked`` logs and skips it).
         """
-        # Method 1: OpenAI Whisper API
         whisper_client = self.whisper_client or self.client
-        if self.whisper_model and whisper_client:
+        with tool_call(self.name, "whisper_transcription"):
             try:
                 with open(audio_path, "rb") as audio_file:
-                    with tool_call(self.name, "whisper_transcription"):
-                        # The Azure OpenAI / Foundry client supports audio.transcriptions
-                        response = whisper_client.audio.transcriptions.create(
-                            model=self.whisper_model,
-                            file=audio_file,
-                            response_format="text",
-                            language="en",
-                        )
-                        transcript = str(response).strip()
-                        if transcript:
-                            logger.info("MIRABEL: Whisper transcribed %d chars", len(transcript))
-                            return transcript
+                    # The Azure OpenAI / Foundry client supports audio.transcriptions
+                    response = whisper_client.audio.transcriptions.create(
+                        model=self.whisper_model,
+                        file=audio_file,
+                        response_format="verbose_json",
+                        language="en",
+                    )
+                segments = []
+                for seg in getattr(response, "segments", None) or []:
+                    if not isinstance(seg, dict):
+                        seg = {k: getattr(seg, k, None) for k in ("start", "end", "text")}
+                    segments.append(TranscriptSegment(
+                        float(seg.get("start") or 0), float(seg.get("end") or 0), str(seg.get("text") or "")
+                    ))
+                if segments:
+                    return segments
+                text = str(getattr(response, "text", "") or "").strip()
+                return [TranscriptSegment(0.0, 0.0, text)] if text else []
             except Exception as e:
-                logger.warning("MIRABEL: Whisper transcription failed: %s", e)
-
-        # Method 2: Use GPT-4o to describe audio content from video context
-        # (Falls through to vision analysis which will note "no transcript available")
-        logger.info("MIRABEL: No Whisper model available, proceeding with frames-only analysis")
-        return None
+                logger.info("MIRABEL: verbose_json transcription unavailable (%s), retrying as text", e)
+
+            with open(audio_path, "rb") as audio_file:
+                response = whisper_client.audio.transcriptions.create(
+                    model=self.whisper_model,
+                    file=audio_file,
+                    response_format="text",
+                    language="en",
+                )
+            text = str(response).strip()
+            return [TranscriptSegment(0.0, 0.0, text)] if text else []
 
     # ─── GPT-4o Vision Analysis ─────────────────────────────────────────
 
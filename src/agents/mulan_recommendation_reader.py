@@ -7,6 +7,12 @@ from openai import AzureOpenAI
 from src.agents.base_agent import BaseAgent
 from src.agents.telemetry_helpers import agent_run
 from src.utils import safe_load_json
+from src.token_budget import fit_document
+
+# Token budget for the letter text in the extraction prompt.  Belle routes
+# only recommendation pages here; packets with several letters are fitted
+# page by page rather than cut after the first few.
+RECOMMENDATION_INPUT_TOKENS = 2000
 
 
 class MulanRecommendationReader(BaseAgent):
@@ -58,9 +64,9 @@ class MulanRecommendationReader(BaseAgent):
             prompt = self._build_prompt(applicant_name, recommendation_text)
 
             try:
-                # Use up to 8000 chars — Belle's section detection now routes only
-                # recommendation pages here, so the input is focused.
-                recommendation_input = recommendation_text[:8000]
+                recommendation_input = fit_document(
+                    recommendation_text, RECOMMENDATION_INPUT_TOKENS, self.model, prefer="recommendation"
+                ).text
                 query_messages = [
                     {"role": "system", "content": "You are an expert extractor of recommendation letters. Extract concise evidence snippets, recommender identity clues, and endorsement signals.\n\nIMPORTANT: The text may contain page markers like '--- PAGE N of M ---'. These indicate page boundaries from a multi-page PDF. Note which page each recommendation or endorsement comes from. If multiple recommendation letters span different pages, identify each recommender separately. Focus on recommendation content and ignore any transcript or essay sections if present."},
                     {"role": "user", "content": f"Recommendation for {applicant_name}:\n\n{recommendation_input}"}
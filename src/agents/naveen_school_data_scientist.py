@@ -43,6 +43,28 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Bump when the evaluation prompt or result parsing changes in a way that
+# should re-score schools whose source data has not changed.
+NAVEEN_PROMPT_VERSION = "1"
+
+# School record fields ``generate_school_features`` reads from source data
+# (NCES/CSV/GOSA imports, or earlier enrichment); Naveen's own scores
+# (opportunity_score, data_confidence_score, school_investment_level) are
+# outputs, not inputs.
+SCHOOL_FEATURE_INPUTS = (
+    'school_name', 'state_code', 'nces_id',
+    'total_students', 'student_teacher_ratio', 'graduation_rate', 'college_acceptance_rate',
+    'free_lunch_percentage', 'is_title_i', 'is_charter', 'is_magnet',
+    'district_poverty_pct', 'district_exp_per_pupil',
+    'ap_course_count', 'ap_exam_pass_rate', 'honors_course_count',
+    'stem_program_available', 'ib_program_available', 'dual_enrollment_available',
+    'act_composite_avg', 'sat_total_avg', 'college_going_rate',
+    'college_going_4yr_rate', 'hope_eligible_pct', 'dropout_rate',
+    'ap_students_tested', 'ap_tests_3plus',
+    'milestones_ela_proficient_pct', 'milestones_math_proficient_pct',
+    'instruction_expenditure_per_fte', 'inexperienced_teacher_pct',
+)
+
 
 def _sanitize_for_json(obj):
     """Recursively convert Decimal/datetime values so json.dumps works."""
@@ -0,0 +1,207 @@
+"""Per-evaluation cache of prompt segments shared by the agents.
+
+Tiana, Rapunzel and Mulan read the same application text; Smee's per-agent
+summaries, the interleaved Gaston check and Merlin all re-serialize the same
+upstream results.  ``PromptContext`` computes those shared segments once per
+evaluation and hands out token-budgeted views of them:
+
+* ``section`` — a document field (``application_text``,
+  ``_original_document_text``, ...) with whitespace normalized once and
+  fitted to a token budget page by page (``src/token_budget.py``);
+* ``digest`` — an agent result with bookkeeping fields (raw model responses,
+  status, agent name) dropped, long strings and lists shortened and keys
+  sorted, so the same result always serializes to the same text;
+* ``digests`` — several digests under one budget, for Merlin's synthesis.
+
+Digests are deterministic and serialized with sorted keys so repeated
+prompts share byte-identical prefixes, which is what provider-side prompt
+caching keys on.  Every use records prompt tokens before (what the agent
+used to send) and after; ``report`` returns the per-agent totals.
+
+Smee creates one context per evaluation and attaches it to the application
+dict under ``_prompt_context``; agents find it with ``PromptContext.of``.
+"""
+
+import json
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from src.token_budget import compress_text, count_tokens, fit_document, normalize_text
+
+CONTEXT_KEY = "_prompt_context"
+
+# Fields that carry no evidence for a downstream prompt.
+_DIGEST_DROP_KEYS = frozenset({
+    "raw_response", "raw", "agent", "status", "model", "model_used", "timestamp",
+    "prompt", "messages", "query_response", "parsed_json", "supplemental_output",
+    "human_summary", "_timing", "trace_id",
+})
+_DIGEST_MAX_STRING = 1200
+_DIGEST_MAX_LIST = 12
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count used for budgets and the before/after report."""
+    return count_tokens(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: Optional[int]) -> str:
+    """Compress *text* to about *max_tokens* (see ``token_budget.compress_text``)."""
+    if max_tokens is None or estimate_tokens(text) <= max_tokens:
+        return text
+    return compress_text(text, max_tokens)
+
+
+def compact_result(value: Any, max_string: int = _DIGEST_MAX_STRING,
+                   max_list: int = _DIGEST_MAX_LIST) -> Any:
+    """Evidence-preserving, deterministic reduction of an agent result."""
+    if isinstance(value, dict):
+        out = {}
+        for key in sorted(value, key=str):
+            if str(key) in _DIGEST_DROP_KEYS:
+                continue
+            item = compact_result(value[key], max_string, max_list)
+            if item in (None, "", [], {}):
+                continue
+            out[str(key)] = item
+        return out
+    if isinstance(value, (list, tuple)):
+        items = [compact_result(v, max_string, max_list) for v in value[:max_list]]
+        if len(value) > max_list:
+            items.append(f"[... {len(value) - max_list} more]")
+        return items
+    if isinstance(value, str):
+        text = normalize_text(value)
+        if len(text) > max_string:
+            return text[:max_string].rstrip() + f" [... {len(text) - max_string} more characters]"
+        return text
+    if isinstance(value, float):
+        return round(value, 3)
+    if value is None or isinstance(value, (int, bool)):
+        return value
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Canonical JSON for prompts: sorted keys, compact separators."""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class PromptContext:
+    """Shared prompt segments for one evaluation (see module docstring)."""
+
+    def __init__(self, application: Dict[str, Any]):
+        self.application = application
+        self._lock = threading.Lock()
+        self._sections: Dict[str, tuple] = {}  # field -> (source text, normalized)
+        self._digests: Dict[str, tuple] = {}  # key -> (source object, digest)
+        self._usage: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def attach(cls, application: Dict[str, Any]) -> "PromptContext":
+        """Create a context for *application* and store it on the dict."""
+        ctx = cls(application)
+        application[CONTEXT_KEY] = ctx
+        return ctx
+
+    @staticmethod
+    def detach(application: Dict[str, Any]) -> Optional["PromptContext"]:
+        """Remove the context from *application* and return it."""
+        ctx = PromptContext.of(application)
+        if ctx is not None:
+            del application[CONTEXT_KEY]
+        return ctx
+
+    @staticmethod
+    def of(application: Optional[Dict[str, Any]]) -> Optional["PromptContext"]:
+        """The context attached to *application*, if any."""
+        if isinstance(application, dict):
+            ctx = application.get(CONTEXT_KEY)
+            if isinstance(ctx, PromptContext):
+                return ctx
+        return None
+
+    # ── Segments ───────────────────────────────────────────────────────
+
+    def section(self, field: str, max_tokens: Optional[int] = None, agent: str = "",
+                prefer: Optional[str] = None, legacy: Optional[str] = None) -> str:
+        """Normalized ``application[field]``, fitted to *max_tokens* (None = whole).
+
+        Over budget, pages are kept by the type Belle detected for them,
+        with pages of type *prefer* first (see ``token_budget.fit_document``).
+        The normalized text is cached until the field is reassigned (Belle
+        rewrites the document fields with section-routed text).  *legacy*
+        is what the agent used to send, for the report (default: the raw
+        field).
+        """
+        raw = str(self.application.get(field) or "")
+        with self._lock:
+            cached = self._sections.get(field)
+            if cached is not None and cached[0] is raw:
+                text = cached[1]
+            else:
+                text = normalize_text(raw)
+                self._sections[field] = (raw, text)
+        view = text
+        if max_tokens is not None and estimate_tokens(text) > max_tokens:
+            view = fit_document(
+                text, max_tokens, section_map=self.application.get("_belle_section_map"), prefer=prefer
+            ).text
+        if agent:
+            self.record(agent, raw if legacy is None else legacy, view)
+        return view
+
+    def digest(self, key: str, result: Any) -> Any:
+        """Compact form of *result*, cached until a different object is stored under *key*."""
+        with self._lock:
+            cached = self._digests.get(key)
+            if cached is not None and cached[0] is result:
+                return cached[1]
+        value = compact_result(result)
+        with self._lock:
+            self._digests[key] = (result, value)
+        return value
+
+    def digest_text(self, key: str, result: Any, max_tokens: Optional[int] = None,
+                    agent: str = "", legacy: Optional[str] = None) -> str:
+        """``digest`` serialized canonically and cut to *max_tokens*."""
+        text = truncate_to_tokens(dumps(self.digest(key, result)), max_tokens)
+        if agent:
+            self.record(agent, legacy if legacy is not None else json.dumps(result, default=str), text)
+        return text
+
+    def digests(self, results: Dict[str, Any], keys: Iterable[str],
+                max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Digests of ``results[k]`` for each present key, within a shared budget.
+
+        Keys come back sorted.  While the total is over *max_tokens* the
+        largest digest is re-compacted with tighter string/list limits.
+        """
+        out = {k: self.digest(k, results[k]) for k in sorted(keys) if k in results}
+        if max_tokens is None:
+            return out
+        max_string, max_list = _DIGEST_MAX_STRING, _DIGEST_MAX_LIST
+        while estimate_tokens(dumps(out)) > max_tokens and max_string > 100:
+            max_string, max_list = max_string // 2, max(3, max_list // 2)
+            largest = max(out, key=lambda k: len(dumps(out[k])))
+            out[largest] = compact_result(results[largest], max_string, max_list)
+        return out
+
+    # ── Accounting ─────────────────────────────────────────────────────
+
+    def record(self, agent: str, before: str, after: str) -> None:
+        """Count prompt tokens an agent would have sent (*before*) vs. sends (*after*)."""
+        with self._lock:
+            usage = self._usage.setdefault(agent, {"calls": 0, "tokens_before": 0, "tokens_after": 0})
+            usage["calls"] += 1
+            usage["tokens_before"] += estimate_tokens(before)
+            usage["tokens_after"] += estimate_tokens(after)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent prompt-token totals before/after, plus the saving in percent."""
+        with self._lock:
+            usage = {k: dict(v) for k, v in self._usage.items()}
+        for row in usage.values():
+            before = row["tokens_before"]
+            row["saved_pct"] = round(100 * (before - row["tokens_after"]) / before, 1) if before else 0.0
+        return usage
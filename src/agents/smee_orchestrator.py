@@ -1,12 +1,14 @@
 """Smee - The orchestrator agent that coordinates all other agents."""
 
 import asyncio
+import functools
+import hashlib
 import json
 import time as _time
 from src.utils import safe_load_json
 import logging
 import os
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from src.config import config
 
 # Model-aware pacing (from Marge's playbook) — seconds between agent calls
@@ -18,6 +20,18 @@ MODEL_COOLDOWN = {
     "gpt-4o": 2,
 }
 STEP_DELAY = 3  # default between steps
+# Max workflow steps in flight at once (0 = as many as dependencies allow).
+STEP_CONCURRENCY = int(os.getenv("SMEE_STEP_CONCURRENCY", "0"))
+# Let Moana/Pocahontas start on ungated Tiana/Rapunzel/Mulan output while the
+# Gaston quality check runs; stale steps are re-run if Gaston rejects.
+SPECULATIVE_GASTON = os.getenv("SMEE_SPECULATIVE_GASTON", "1") != "0"
+# Prompt-token budgets for the result digests sent to Gaston's interleaved
+# check and to Merlin (see src/agents/prompt_context.py).
+GASTON_CHECK_TOKENS = int(os.getenv("SMEE_GASTON_CHECK_TOKENS", "1000"))
+MERLIN_CONTEXT_TOKENS = int(os.getenv("SMEE_MERLIN_CONTEXT_TOKENS", "12000"))
+# Checkpoint written once a workflow finishes; a later run without
+# ``rerun_steps`` then evaluates afresh instead of resuming.
+EVALUATION_COMPLETE_STEP = 'evaluation_complete'
 # Do not import `openai` at module import time. Accept the AI client as a runtime
 # object (Any) to avoid ModuleNotFoundError during application startup when the
 # `openai` package is not installed in the environment.
@@ -26,12 +40,28 @@ from src.agents.system_prompts import SMEE_ORCHESTRATOR_PROMPT
 from src.agents.agent_requirements import AgentRequirements
 from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
 from src.agents.agent_monitor import AgentStatus, get_agent_monitor
+from src.agents.step_graph import Step, StepGraph, format_timeline
+from src.agents.prompt_context import PromptContext
+from src.agents.cancellation import cancel_scope
+from src.agents.deadline import (
+    EVALUATION_BUDGET_SECONDS, Budget, budget_report, nearly_exhausted, record_degradation,
+    step_budget, with_step_budget,
+)
+from src.agents.evaluation_context import (
+    ContextAttribute, EvaluationContext, current_evaluation, evaluation_scope,
+)
+from src.token_budget import input_budget
 from src.telemetry import telemetry
 from src.agents.telemetry_helpers import agent_run
 
 logger = logging.getLogger(__name__)
 
 
+def _checkpoint_hash(output: Dict[str, Any]) -> str:
+    """Stable hash of a checkpointed step output."""
+    return hashlib.sha256(json.dumps(output, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
 class SmeeOrchestrator(BaseAgent):
     """
     Smee is the top-level orchestrator agent that manages and coordinates 
@@ -42,8 +72,23 @@ class SmeeOrchestrator(BaseAgent):
     - Manage the evaluation workflow
     - Synthesize results from specialized agents
     - Make final recommendations
+
+    One instance (with its registered agents) serves every evaluation in
+    the process.  Per-evaluation state lives on the ``EvaluationContext``
+    bound by ``coordinate_evaluation``; the attributes below are views
+    onto it.
     """
-    
+
+    evaluation_results = ContextAttribute('evaluation_results')
+    workflow_state = ContextAttribute('workflow_state')  # idle, evaluating, complete
+    _progress_callback = ContextAttribute('progress_callback')
+    _current_application_id = ContextAttribute('application_id')
+    _current_student_id = ContextAttribute('student_id')
+    _current_applicant_name = ContextAttribute('applicant_name')
+    _otel_ctx = ContextAttribute('otel_ctx')
+    _otel_span = ContextAttribute('otel_span')
+    _cancel_token = ContextAttribute('cancel_token')
+
     def __init__(
         self,
         name: str,
@@ -63,11 +108,15 @@ class SmeeOrchestrator(BaseAgent):
         self.model = model
         self.db = db_connection
         self.agents: Dict[str, BaseAgent] = {}
-        self.evaluation_results: Dict[str, Any] = {}
-        self.workflow_state = "idle"  # idle, screening, evaluating, complete
+        # Seen by status endpoints outside an evaluation: the last one to finish.
+        self._last_evaluation = EvaluationContext()
         self._agent_semaphores: Dict[str, asyncio.Semaphore] = {}
         self._max_concurrent_per_agent = self._resolve_max_concurrency()
 
+    def _evaluation_context(self) -> EvaluationContext:
+        """The evaluation running in this task, else the last finished one."""
+        return current_evaluation() or self._last_evaluation
+
     def _resolve_max_concurrency(self) -> int:
         value = os.getenv("NEXTGEN_AGENT_MAX_CONCURRENCY", "2")
         try:
@@ -230,7 +279,10 @@ class SmeeOrchestrator(BaseAgent):
             return
         
         try:
-            self.db.log_agent_interaction(
+            # Buffered: rows are batch-inserted off the orchestration path
+            # and flushed when the evaluation finishes (_flush_audit_trail).
+            log = getattr(self.db, 'queue_agent_interaction', None) or self.db.log_agent_interaction
+            log(
                 application_id=application_id,
                 agent_name=agent_name,
                 interaction_type=interaction_type,
@@ -244,6 +296,17 @@ class SmeeOrchestrator(BaseAgent):
         except Exception as e:
             logger.warning(f"Could not log interaction: {e}")
     
+    async def _flush_audit_trail(self) -> None:
+        """Wait for buffered audit rows to reach the database (end of evaluation)."""
+        flush = getattr(self.db, 'flush_agent_interactions', None)
+        if not flush:
+            return
+        try:
+            if not await asyncio.to_thread(flush):
+                logger.warning("Audit trail flush timed out; rows are still being written")
+        except Exception as e:
+            logger.warning(f"Could not flush audit trail: {e}")
+
     # =====================================================================
     # PHASE 2: Workflow Helper Methods
     # =====================================================================
@@ -362,8 +425,8 @@ class SmeeOrchestrator(BaseAgent):
             )
             
             # Log this extraction interaction if we have application context
-            if hasattr(self, '_current_application_id') and self._current_application_id:
-                self.db.log_agent_interaction(
+            if getattr(self, '_current_application_id', None):
+                self._log_interaction(
                     application_id=self._current_application_id,
                     agent_name='Belle',
                     interaction_type='data_extraction',
@@ -624,24 +687,91 @@ class SmeeOrchestrator(BaseAgent):
         logger.info(f"✅ Agent {agent_id} validation passed")
         return {'ready': True}
     
-    def _checkpoint_step(self, step_name: str, application_id: int = None):
-        """Sprint 1: Save checkpoint after a step completes successfully."""
+    def _checkpoint_step(self, step_name: str, application_id: int = None,
+                         output: Optional[Dict[str, Any]] = None):
+        """Record a completed step and upsert its ``evaluation_checkpoints`` row.
+
+        ``output`` holds the result keys the step wrote; a resumed run puts
+        them back instead of re-running the step.
+        """
         if step_name not in self.evaluation_results.get('completed_steps', []):
             self.evaluation_results.setdefault('completed_steps', []).append(step_name)
         try:
             if self.db and application_id:
-                existing = self.db.get_application(application_id) or {}
-                stored = existing.get('agent_results') or {}
-                if isinstance(stored, str):
-                    stored = safe_load_json(stored)
-                stored['_completed_steps'] = self.evaluation_results.get('completed_steps', [])
-                self.db.update_application(application_id=application_id, agent_results=json.dumps(stored))
-                logger.debug("Checkpoint saved: step=%s, total=%d", step_name, len(stored['_completed_steps']))
+                output = output or {}
+                self.db.save_evaluation_checkpoint(application_id, step_name, _checkpoint_hash(output), output)
+                logger.debug("Checkpoint saved: step=%s, total=%d", step_name,
+                             len(self.evaluation_results['completed_steps']))
         except Exception as e:
             logger.debug("Checkpoint save failed (non-fatal): %s", e)
 
-    def _pace(self, agent_id: str = None):
-        """Model-aware pacing between agent calls (from Marge's playbook)."""
+    def _load_checkpoints(self, application_id: Optional[int], document_hash: str,
+                          rerun_steps: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Checkpointed step outputs this run may restore, keyed by step.
+
+        Without ``rerun_steps`` this resumes an interrupted run: its
+        checkpoints are reused as long as the document is unchanged, while a
+        run that finished (or a new document) starts afresh and clears them.
+        With ``rerun_steps`` (incremental processing) every checkpoint but
+        those steps is reused; Belle's extraction only if the document is
+        unchanged.
+        """
+        if not (self.db and application_id):
+            return {}
+        try:
+            checkpoints = self.db.get_evaluation_checkpoints(application_id)
+            if not checkpoints:
+                return {}
+            belle = checkpoints.get('belle_extraction', {}).get('output') or {}
+            same_document = belle.get('document_hash') == document_hash
+            if rerun_steps is None and (EVALUATION_COMPLETE_STEP in checkpoints or not same_document):
+                self.db.clear_evaluation_checkpoints(application_id)
+                return {}
+            if EVALUATION_COMPLETE_STEP in checkpoints:
+                self.db.clear_evaluation_checkpoints(application_id, step=EVALUATION_COMPLETE_STEP)
+            skip = set(rerun_steps or ()) | {EVALUATION_COMPLETE_STEP}
+            if not same_document:
+                skip |= {'belle_extraction', 'student_match'}
+            return {step: cp['output'] for step, cp in checkpoints.items() if step not in skip}
+        except Exception as e:
+            logger.debug("Checkpoint load skipped: %s", e)
+            return {}
+
+    def _checkpointed(self, step: Step, saved: Optional[Dict[str, Any]],
+                      restore: Callable[[Dict[str, Any]], None],
+                      checkpoint_id: Optional[int]) -> Callable[[], Any]:
+        """Wrap a graph step: restore it from *saved* once, else run and checkpoint it.
+
+        Re-runs after the first call (speculation reconciliation) always
+        execute.  Outputs carrying an error are not checkpointed, so a
+        resumed run retries them.
+        """
+        run = step.run
+        # A review writes the revised result back under the agent's own key
+        keys = step.outputs + ((step.name[:-len('_review')],) if step.name.endswith('_review') else ())
+        pending = [saved] if saved is not None else []
+
+        async def _run():
+            if pending:
+                restore(pending.pop())
+                self.evaluation_results.setdefault('completed_steps', []).append(step.name)
+                self._report_progress({
+                    'type': 'agent_progress',
+                    'agent_id': step.name,
+                    'status': 'completed',
+                    'message': f'♻️ {step.name} restored from checkpoint'
+                })
+                return
+            await run()
+            results = self.evaluation_results['results']
+            output = {key: results[key] for key in keys if key in results}
+            if any(isinstance(v, dict) and (v.get('status') == 'error' or v.get('error'))
+                   for v in output.values()):
+                return
+            await asyncio.to_thread(self._checkpoint_step, step.name, checkpoint_id, output)
+        return _run
+
+    def _pace_delay(self, agent_id: str = None) -> float:
         delay = STEP_DELAY
         if agent_id and agent_id in self.agents:
             model = getattr(self.agents[agent_id], '_model', '') or ''
@@ -649,18 +779,20 @@ class SmeeOrchestrator(BaseAgent):
                 if model_prefix.lower() in str(model).lower():
                     delay = cooldown
                     break
-        _time.sleep(delay)
+        return delay
+
+    def _pace(self, agent_id: str = None):
+        """Model-aware pacing between agent calls (from Marge's playbook)."""
+        _time.sleep(self._pace_delay(agent_id))
+
+    async def _pace_async(self, agent_id: str = None):
+        """``_pace`` for graph steps — yields the loop so other steps keep running."""
+        await asyncio.sleep(self._pace_delay(agent_id))
 
     def _is_cancelled(self) -> bool:
-        """Check if the current job has been cancelled."""
-        app_id = self.evaluation_results.get('application_id')
-        if not app_id or not self.db:
-            return False
-        try:
-            app = self.db.get_application(app_id)
-            return app and app.get('status') == 'Cancelled'
-        except Exception:
-            return False
+        """Check if the current evaluation has been cancelled (no database read)."""
+        token = self._cancel_token
+        return bool(token and token.cancelled)
 
     def _record_usage(self, agent_id: str, start_time: float, end_time: float):
         """Track per-agent timing for cost/performance analysis."""
@@ -712,7 +844,8 @@ class SmeeOrchestrator(BaseAgent):
         return {'valid': len(issues) == 0, 'issues': issues}
 
     async def _gaston_interleaved_check(
-        self, agent_id: str, agent_result: Any, application_id: Optional[int] = None
+        self, agent_id: str, agent_result: Any, application_id: Optional[int] = None,
+        prompt_context: Optional[PromptContext] = None
     ) -> Dict[str, Any]:
         """
         Sprint 2: Run a lightweight Gaston quality check after a core agent.
@@ -730,6 +863,10 @@ class SmeeOrchestrator(BaseAgent):
         try:
             # Build a compact review payload
             result_text = json.dumps(agent_result, default=str)[:4000] if not isinstance(agent_result, str) else agent_result[:4000]
+            if prompt_context is not None and isinstance(agent_result, dict):
+                result_text = prompt_context.digest_text(
+                    agent_id, agent_result, GASTON_CHECK_TOKENS, agent='Gaston', legacy=result_text
+                )
 
             prompt = [
                 {"role": "system", "content": (
@@ -800,6 +937,7 @@ class SmeeOrchestrator(BaseAgent):
                 result = await agent.parse_application(application)
             elif agent_id == 'grade_reader':
                 transcript = application.get('transcript_text', '')
+                transcript_field = 'transcript_text'
                 # Fallback chain: transcript_text → _original_document_text → application_text
                 # Rapunzel is trained to find transcript data even in mixed documents
                 if not transcript or len(transcript.strip()) < 50:
@@ -810,6 +948,7 @@ class SmeeOrchestrator(BaseAgent):
                             f"falling back to _original_document_text ({len(fallback)} chars)"
                         )
                         transcript = fallback
+                        transcript_field = '_original_document_text'
                 if not transcript or len(transcript.strip()) < 50:
                     app_text = application.get('application_text', '')
                     if app_text and len(app_text.strip()) > 100:
@@ -819,6 +958,13 @@ class SmeeOrchestrator(BaseAgent):
                             f"grade extraction from mixed content"
                         )
                         transcript = app_text
+                        transcript_field = 'application_text'
+                prompt_context = PromptContext.of(application)
+                if prompt_context is not None:
+                    transcript = prompt_context.section(
+                        transcript_field, input_budget(getattr(agent, 'model', None)),
+                        agent=agent.name, prefer='transcript',
+                    )
                 result = await agent.parse_grades(
                     transcript,
                     application.get('applicant_name', ''),
@@ -839,12 +985,19 @@ class SmeeOrchestrator(BaseAgent):
                 # back to the full document text so Mulan can still attempt
                 # to find recommendation content within it.
                 recommendation = application.get('recommendation_text', '')
+                recommendation_field = 'recommendation_text'
                 if not recommendation or len(recommendation.strip()) < 30:
                     fallback = application.get('_original_document_text', '')
                     if fallback and len(fallback.strip()) > 100:
                         recommendation = fallback
+                        recommendation_field = '_original_document_text'
                         logger.info(f"[Mulan] Backfilled recommendation_text from _original_document_text ({len(recommendation)} chars)")
-                        logger.info(f"[Mulan] Backfilled recommendation_text from _original_document_text ({len(recommendation)} chars)")
+                prompt_context = PromptContext.of(application)
+                if prompt_context is not None:
+                    recommendation = prompt_context.section(
+                        recommendation_field, input_budget(getattr(agent, 'model', None)),
+                        agent=agent.name, prefer='recommendation',
+                    )
                 result = await agent.parse_recommendation(
                     recommendation,
                     application.get('applicant_name', ''),
@@ -863,6 +1016,9 @@ class SmeeOrchestrator(BaseAgent):
             try:
                 ctx = normalized_result if isinstance(normalized_result, (dict, list, str)) else str(normalized_result)
                 ctx_text = json.dumps(ctx, ensure_ascii=False) if not isinstance(ctx, str) else ctx
+                prompt_context = PromptContext.of(application)
+                if prompt_context is not None and isinstance(ctx, dict):
+                    ctx_text = prompt_context.digest_text(agent_id, ctx, agent='Smee', legacy=ctx_text)
                 prompt = [
                     {
                         "role": "user",
@@ -1054,7 +1210,9 @@ class SmeeOrchestrator(BaseAgent):
         self,
         application: Dict[str, Any],
         evaluation_steps: List[str],
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        context: Optional[EvaluationContext] = None,
+        rerun_steps: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         PHASE 2: 8-Step Workflow Orchestration (+ Step 2.5)
@@ -1069,15 +1227,58 @@ class SmeeOrchestrator(BaseAgent):
         Step 5: Run synthesis agents (MILO)
         Step 6: Run synthesis agent (MERLIN)
         Step 7: Run report generation (AURORA)
+
+        Steps 2.5-7 run on a ``StepGraph``: each starts as soon as the steps
+        it depends on finish (see the graph definition below), and the
+        per-step timeline with its critical path is returned under
+        ``step_timeline``.  Every completed step is checkpointed to
+        ``evaluation_checkpoints``; a later run of the same application
+        restores those outputs instead of re-running the steps (see
+        ``_load_checkpoints``).
         
         Args:
             application: The application data to evaluate
             evaluation_steps: List of agent_ids to use in order
             progress_callback: Optional callback function to report progress
+            context: Evaluation state to run in (a fresh one by default).
+                Concurrent calls on a shared orchestrator each get their own.
+                ``cancellation.cancel(application_id)`` stops the run.
+            rerun_steps: Incremental run — restore every checkpointed step
+                except these (and whatever depends on them).  None resumes
+                an interrupted run, or evaluates afresh.
             
         Returns:
             Dictionary with results from all agents
         """
+        context = context or EvaluationContext()
+        application_id = application.get('application_id') or application.get('ApplicationID')
+        try:
+            with evaluation_scope(context), cancel_scope(application_id) as token:
+                context.cancel_token = token
+                context.budget = Budget('evaluation', EVALUATION_BUDGET_SECONDS)
+                try:
+                    # Cancelling the token cancels this task: in-flight model
+                    # calls are abandoned and the step graph stops its steps.
+                    with token.bind_task():
+                        return await self._coordinate_evaluation(
+                            application, evaluation_steps, progress_callback, rerun_steps
+                        )
+                except asyncio.CancelledError:
+                    if not token.cancelled:
+                        raise
+                    asyncio.current_task().uncancel()
+                    return await self._finish_cancelled(application)
+        finally:
+            self._last_evaluation = context
+
+    async def _coordinate_evaluation(
+        self,
+        application: Dict[str, Any],
+        evaluation_steps: List[str],
+        progress_callback: Optional[callable] = None,
+        rerun_steps: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Body of ``coordinate_evaluation``; runs inside the evaluation's context."""
         import uuid
         
         self.workflow_state = "evaluating"
@@ -1089,7 +1290,7 @@ class SmeeOrchestrator(BaseAgent):
             application['student_id'] = f"student_{uuid.uuid4().hex[:16]}"
         
         student_id = application.get('student_id')
-        self._progress_callback = progress_callback
+        self._progress_callback = progress_callback or self._progress_callback
         self._current_application_id = application_id
         self._current_student_id = student_id
         self._current_applicant_name = applicant_name
@@ -1126,21 +1327,6 @@ class SmeeOrchestrator(BaseAgent):
             'completed_steps': [],  # Sprint 1: checkpoint tracking
         }
         
-        # Sprint 1: Resume support — load previous checkpoint if exists
-        _prior_results = {}
-        try:
-            if self.db and application_id:
-                _prior_app = self.db.get_application(application_id) or {}
-                _prior_raw = _prior_app.get('agent_results')
-                if _prior_raw:
-                    _prior_results = safe_load_json(_prior_raw) if isinstance(_prior_raw, str) else (_prior_raw or {})
-                    _completed = _prior_results.get('_completed_steps', [])
-                    if _completed:
-                        self.evaluation_results['completed_steps'] = _completed
-                        logger.info("Resuming from checkpoint: %d steps already completed: %s", len(_completed), _completed)
-        except Exception as _ckpt_err:
-            logger.debug("Checkpoint load skipped: %s", _ckpt_err)
-        
         # ===== STEP 1: BELLE - Extract data from document =====
         logger.info("📋 STEP 1: Extracting data from document with BELLE...")
         logger.info("📋 STEP 1: Extracting data from document with BELLE...")
@@ -1150,6 +1336,16 @@ class SmeeOrchestrator(BaseAgent):
                         application.get('transcript_text') or 
                         application.get('TranscriptText') or '')
         
+        # Resume support — step outputs from an interrupted (or incremental)
+        # run of this application, loaded in one query.  Restored steps are
+        # skipped; the rest run and are checkpointed as they complete.
+        checkpoint_id = application_id
+        document_hash = hashlib.sha256(document_text.encode('utf-8', 'ignore')).hexdigest()
+        checkpoints = self._load_checkpoints(checkpoint_id, document_hash, rerun_steps)
+        if checkpoints:
+            logger.info("♻️ Resuming from checkpoint: %d steps already completed: %s",
+                        len(checkpoints), sorted(checkpoints))
+        
         # ── Diagnostic: Log what text fields the DB record contains ──
         _text_field_report = {}
         for _tf in ('application_text', 'ApplicationText', 'transcript_text',
@@ -1173,6 +1369,9 @@ class SmeeOrchestrator(BaseAgent):
         original_full_text = '\n\n'.join(all_text_parts) if all_text_parts else document_text
         # ALWAYS set _original_document_text, even if it's just document_text
         application['_original_document_text'] = original_full_text or document_text or ''
+        # Shared prompt segments (normalized document text, result digests)
+        # are computed once per evaluation and reused by every agent.
+        PromptContext.attach(application)
         
         document_name = application.get('file_name', 'application_document')
 
@@ -1197,21 +1396,27 @@ class SmeeOrchestrator(BaseAgent):
         # matched student record) and cause agent results to be persisted to a
         # different application_id. Defer creating an application row until
         # after student matching so a single record is created/used.
-        belle_data = await self._extract_data_with_belle(document_text, document_name)
+        restored_belle = checkpoints.get('belle_extraction', {}).get('belle_extraction')
+        if restored_belle is not None:
+            belle_data = restored_belle
+            logger.info("♻️ STEP 1: Restored Belle extraction from checkpoint")
+        else:
+            with step_budget('belle_extraction'):
+                belle_data = await self._extract_data_with_belle(document_text, document_name)
+
+            # PHASE 5: Log STEP 1 extraction to audit trail
+            self._log_interaction(
+                application_id=application_id,
+                agent_name='Belle',
+                interaction_type='step_1_extraction',
+                question_text=f"Extract structured data from document: {document_name}",
+                file_name=document_name,
+                file_size=len(document_text),
+                file_type=application.get('file_type', 'text/unknown'),
+                extracted_data=belle_data
+            )
         self.evaluation_results['results']['belle_extraction'] = belle_data
         
-        # PHASE 5: Log STEP 1 extraction to audit trail
-        self._log_interaction(
-            application_id=application_id,
-            agent_name='Belle',
-            interaction_type='step_1_extraction',
-            question_text=f"Extract structured data from document: {document_name}",
-            file_name=document_name,
-            file_size=len(document_text),
-            file_type=application.get('file_type', 'text/unknown'),
-            extracted_data=belle_data
-        )
-        
         # Extract student info from BELLE extraction
         # BELLE returns nested structure: student_info, agent_fields, etc.
         belle_student_info = belle_data.get('student_info', {})
@@ -1325,7 +1530,7 @@ class SmeeOrchestrator(BaseAgent):
             'has_video': has_video,
             'has_school': has_school,
         }
-        self._checkpoint_step('phase_0_planning', application_id)
+        self._checkpoint_step('phase_0_planning', checkpoint_id)
         
         self._report_progress({
             'type': 'agent_progress',
@@ -1344,7 +1549,13 @@ class SmeeOrchestrator(BaseAgent):
         logger.info("🎓 STEP 2: SMEE + BELLE verifying student record (name + high school)...")
         logger.info("🎓 STEP 2: SMEE + BELLE verifying student record (name + high school)...")
         
-        if first_name and last_name and high_school:
+        restored_match = checkpoints.get('student_match', {}).get('application_id')
+        if restored_match:
+            application_id = restored_match
+            self._current_application_id = restored_match
+            application['application_id'] = restored_match
+            logger.info(f"♻️ STEP 2: Restored student record from checkpoint: application_id={restored_match}")
+        elif first_name and last_name and high_school:
             student_app_id = self._match_or_create_student_record(
                 first_name, last_name, high_school, state_code or "", application
             )
@@ -1401,170 +1612,113 @@ class SmeeOrchestrator(BaseAgent):
             except Exception as e:
                 logger.warning(f"Could not create application record after matching: {e}")
 
-        # ===== STEP 2.5/3/3.5: School enrichment via NAVEEN + MOANA =====
-        # Gate check: cancellation + pacing
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Step 2")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace()
-        school_enrichment = {}
-        if high_school and state_code:
-            logger.info(f"🏫 STEP 2.5: Checking school enrichment for {high_school}, {state_code}")
-            logger.info(f"🏫 STEP 2.5: Checking school enrichment for {high_school}, {state_code}")
-            self._report_progress({
-                'type': 'agent_progress',
-                'agent_id': 'naveen',
-                'agent': 'Naveen',
-                'status': 'starting',
-                'message': f'🧑‍🔬 Naveen is enriching school data for {high_school}...'
-            })
-            try:
-                school_enrichment = await self._check_or_enrich_high_school(
-                    high_school=high_school,
-                    state_code=state_code,
-                    school_district=application.get('school_district'),
-                    application_id=application_id
-                )
-                if school_enrichment and not school_enrichment.get('error'):
-                    logger.info(f"✅ School enrichment ready for {high_school}")
-                    logger.info(f"✅ School enrichment ready for {high_school}")
-                    self._report_progress({
-                        'type': 'agent_progress',
-                        'agent_id': 'naveen',
-                        'agent': 'Naveen',
-                        'status': 'completed',
-                        'message': f'🧑‍🔬 Naveen complete — school enrichment ready ✓'
-                    })
-                else:
-                    logger.warning(f"⚠️ School enrichment incomplete: {school_enrichment.get('error', 'unknown')}")
-                    logger.info(f"⚠️ School enrichment incomplete for {high_school}")
+        checkpoint_id = checkpoint_id or application_id
+        if 'belle_extraction' not in checkpoints:
+            self._checkpoint_step('belle_extraction', checkpoint_id,
+                                  {'document_hash': document_hash, 'belle_extraction': belle_data})
+        if 'student_match' not in checkpoints and application_id:
+            self._checkpoint_step('student_match', checkpoint_id, {'application_id': application_id})
+
+        # ===== STEPS 2.5–7: dependency-scheduled workflow =====
+        # Every remaining step is a node in a StepGraph that declares the
+        # result keys it reads and writes.  Steps start as soon as the steps
+        # producing their inputs finish, so e.g. Tiana, Mulan, Milo and the
+        # Naveen school enrichment all run at once.  Merlin-last and
+        # Gaston-after-Merlin are graph constraints rather than statement
+        # order; cancellation is checked before each step starts.
+        school_enrichment: Dict[str, Any] = {}
+        core_agents = ['application_reader', 'grade_reader', 'school_context', 'recommendation_reader']
+        quality_reviewable = {'application_reader', 'grade_reader', 'recommendation_reader'}
+        prior_results = {}
+
+        async def _step_school_enrichment():
+            """STEP 2.5/3/3.5: School enrichment via NAVEEN + MOANA."""
+            nonlocal school_enrichment
+            await self._pace_async()
+            if high_school and state_code:
+                logger.info(f"🏫 STEP 2.5: Checking school enrichment for {high_school}, {state_code}")
+                logger.info(f"🏫 STEP 2.5: Checking school enrichment for {high_school}, {state_code}")
+                self._report_progress({
+                    'type': 'agent_progress',
+                    'agent_id': 'naveen',
+                    'agent': 'Naveen',
+                    'status': 'starting',
+                    'message': f'🧑‍🔬 Naveen is enriching school data for {high_school}...'
+                })
+                try:
+                    school_enrichment = await self._check_or_enrich_high_school(
+                        high_school=high_school,
+                        state_code=state_code,
+                        school_district=application.get('school_district'),
+                        application_id=application_id
+                    )
+                    if school_enrichment and not school_enrichment.get('error'):
+                        logger.info(f"✅ School enrichment ready for {high_school}")
+                        logger.info(f"✅ School enrichment ready for {high_school}")
+                        self._report_progress({
+                            'type': 'agent_progress',
+                            'agent_id': 'naveen',
+                            'agent': 'Naveen',
+                            'status': 'completed',
+                            'message': f'🧑‍🔬 Naveen complete — school enrichment ready ✓'
+                        })
+                    else:
+                        logger.warning(f"⚠️ School enrichment incomplete: {school_enrichment.get('error', 'unknown')}")
+                        logger.info(f"⚠️ School enrichment incomplete for {high_school}")
+                        self._report_progress({
+                            'type': 'agent_progress',
+                            'agent_id': 'naveen',
+                            'agent': 'Naveen',
+                            'status': 'skipped',
+                            'message': f'School enrichment incomplete for {high_school}'
+                        })
+                        school_enrichment = {}
+                except Exception as e:
+                    logger.error(f"❌ School enrichment failed: {e}", exc_info=True)
+                    logger.info(f"❌ School enrichment failed: {e}")
                     self._report_progress({
                         'type': 'agent_progress',
                         'agent_id': 'naveen',
                         'agent': 'Naveen',
-                        'status': 'skipped',
-                        'message': f'School enrichment incomplete for {high_school}'
+                        'status': 'failed',
+                        'message': f'School enrichment failed: {str(e)[:80]}'
                     })
                     school_enrichment = {}
-            except Exception as e:
-                logger.error(f"❌ School enrichment failed: {e}", exc_info=True)
-                logger.info(f"❌ School enrichment failed: {e}")
+            else:
+                logger.warning(f"⚠️ No high school/state info available — skipping school enrichment")
+                logger.info(f"⚠️ No high school/state — skipping enrichment")
                 self._report_progress({
                     'type': 'agent_progress',
                     'agent_id': 'naveen',
                     'agent': 'Naveen',
-                    'status': 'failed',
-                    'message': f'School enrichment failed: {str(e)[:80]}'
+                    'status': 'skipped',
+                    'message': 'No school/state info — skipped'
                 })
-                school_enrichment = {}
-        else:
-            logger.warning(f"⚠️ No high school/state info available — skipping school enrichment")
-            logger.info(f"⚠️ No high school/state — skipping enrichment")
+
+            self.evaluation_results['results']['school_enrichment'] = school_enrichment
+
+        async def _validate_and_run_core_agent(agent_id, shared_prior):
+            """Validate, run, and persist a single core agent. Thread-safe for parallel use."""
+            if agent_id not in self.agents:
+                return agent_id, None, 'not_registered'
+
             self._report_progress({
                 'type': 'agent_progress',
-                'agent_id': 'naveen',
-                'agent': 'Naveen',
-                'status': 'skipped',
-                'message': 'No school/state info — skipped'
+                'agent_id': agent_id,
+                'agent': self.agents[agent_id].name,
+                'status': 'starting',
+                'message': f'{self.agents[agent_id].name} is starting...'
             })
 
-        self.evaluation_results['results']['school_enrichment'] = school_enrichment
-        
-        # Gate check: cancellation + pacing
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Step 3")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace()
-        
-        # ===== STEP 4: Core agents with per-agent validation =====
-        logger.info("🤖 STEP 4: Running core agents with PARALLEL execution...")
-        logger.info("🤖 STEP 4: Running core agents with PARALLEL execution...")
-        
-        core_agents = ['application_reader', 'grade_reader', 'school_context', 'recommendation_reader']
-        prior_results = {}
+            # Validation gate
+            readiness = await self._validate_agent_readiness(
+                agent_id, application, application_id, belle_data
+            )
+
+            if not readiness.get('ready'):
+                logger.warning(f"⚠️ Agent {agent_id} not ready: {readiness.get('missing')}")
+                logger.info(f"❌ {agent_id.upper()}: VALIDATION FAILED - Missing {readiness.get('missing', [])}")
 
-        # --- Parallel Group 1: Independent document readers ---
-        # Tiana (application), Rapunzel (transcript), Mulan (recommendations)
-        # These read independent document sections and have no cross-dependencies
-        parallel_group_1 = ['application_reader', 'grade_reader', 'recommendation_reader']
-        parallel_group_1 = [a for a in parallel_group_1 if a in self.agents]
-        
-        if parallel_group_1:
-            logger.info(f"⚡ PARALLEL GROUP 1: Running {parallel_group_1} concurrently...")
-            logger.info(f"⚡ PARALLEL GROUP 1: {[a.upper() for a in parallel_group_1]}")
-            
-            async def _validate_and_run_core_agent(agent_id, shared_prior):
-                """Validate, run, and persist a single core agent. Thread-safe for parallel use."""
-                if agent_id not in self.agents:
-                    return agent_id, None, 'not_registered'
-                
-                self._report_progress({
-                    'type': 'agent_progress',
-                    'agent_id': agent_id,
-                    'agent': self.agents[agent_id].name,
-                    'status': 'starting',
-                    'message': f'{self.agents[agent_id].name} is starting...'
-                })
-                
-                # Validation gate
-                readiness = await self._validate_agent_readiness(
-                    agent_id, application, application_id, belle_data
-                )
-                
-                if not readiness.get('ready'):
-                    logger.warning(f"⚠️ Agent {agent_id} not ready: {readiness.get('missing')}")
-                    logger.info(f"❌ {agent_id.upper()}: VALIDATION FAILED - Missing {readiness.get('missing', [])}")
-                    
-                    self._log_interaction(
-                        application_id=application_id,
-                        agent_name=agent_id.title(),
-                        interaction_type='step_4_5_validation',
-                        question_text=f"Validation gate for {agent_id}",
-                        extracted_data={
-                            'agent_id': agent_id,
-                            'validation_status': 'failed_gate_1',
-                            'missing_fields': readiness.get('missing', []),
-                            'gate_number': 1
-                        }
-                    )
-                    
-                    # Reactive BELLE call
-                    logger.info(f"📖 Reactively calling BELLE to fill {agent_id} gap...")
-                    belle_retry = await self._extract_data_with_belle(
-                        document_text, document_name,
-                        context=f"Focus on {', '.join(readiness.get('missing', []))}"
-                    )
-                    belle_data.update(belle_retry)
-                    
-                    readiness = await self._validate_agent_readiness(
-                        agent_id, application, application_id, belle_data
-                    )
-                    
-                    if not readiness.get('ready'):
-                        logger.warning(f"⚠️ {agent_id} still not ready after BELLE retry. SKIPPING.")
-                        self._log_interaction(
-                            application_id=application_id,
-                            agent_name=agent_id.title(),
-                            interaction_type='skip_insufficient_data',
-                            question_text=f"Agent {agent_id} skipped - insufficient data",
-                            extracted_data={
-                                'agent_id': agent_id,
-                                'reason': 'missing_required_documents',
-                                'validation_status': 'failed_gate_2_skipping',
-                                'missing_fields': readiness.get('missing', []),
-                                'gate_number': 2,
-                                'action': 'skipped_continue_workflow'
-                            }
-                        )
-                        self._report_progress({
-                            'type': 'agent_progress',
-                            'agent_id': agent_id,
-                            'agent': self.agents[agent_id].name,
-                            'status': 'skipped',
-                            'message': f'Skipped — missing {readiness.get("missing", [])}'
-                        })
-                        return agent_id, None, 'skipped'
-                
                 self._log_interaction(
                     application_id=application_id,
                     agent_name=agent_id.title(),
@@ -1572,730 +1726,682 @@ class SmeeOrchestrator(BaseAgent):
                     question_text=f"Validation gate for {agent_id}",
                     extracted_data={
                         'agent_id': agent_id,
-                        'validation_status': 'passed',
-                        'ready_to_execute': True
+                        'validation_status': 'failed_gate_1',
+                        'missing_fields': readiness.get('missing', []),
+                        'gate_number': 1
                     }
                 )
-                
-                # Run the agent
-                logger.info(f"🚀 Running {agent_id}...")
-                logger.info(f"▶️  RUNNING {agent_id.upper()}: {self.agents[agent_id].name}")
-                self._report_progress({
-                    'type': 'agent_progress',
-                    'agent_id': agent_id,
-                    'agent': self.agents[agent_id].name,
-                    'status': 'processing',
-                    'message': f'{self.agents[agent_id].name} is analyzing...'
-                })
-                
-                try:
-                    agent_result = await self._run_agent(
-                        agent_id, application, school_enrichment, shared_prior
-                    )
-                    normalized_result = self._normalize_agent_result(agent_result)
-
-                    # Sprint 2: Output validation
-                    validation = self._validate_agent_output(agent_id, normalized_result)
-                    if not validation['valid']:
-                        logger.warning("Output validation issues for %s: %s", agent_id, validation['issues'])
-
-                    # Sprint 2: Interleaved Gaston quality check
-                    quality_reviewable = {'application_reader', 'grade_reader', 'recommendation_reader'}
-                    if agent_id in quality_reviewable and isinstance(normalized_result, dict) and normalized_result.get('status') != 'error':
-                        gaston_check = await self._gaston_interleaved_check(agent_id, normalized_result, application_id)
-                        if not gaston_check['pass']:
-                            logger.info("🔄 Gaston grade %s for %s — re-running with feedback", gaston_check['grade'], agent_id)
-                            self._report_progress({
-                                'type': 'agent_progress',
-                                'agent_id': agent_id,
-                                'agent': self.agents[agent_id].name,
-                                'status': 'revision',
-                                'message': f'🔄 Quality check: grade {gaston_check["grade"]} — revising...'
-                            })
-                            # Inject Gaston feedback and re-run once
-                            application['_gaston_feedback'] = gaston_check['feedback']
-                            try:
-                                retry_result = await self._run_agent(
-                                    agent_id, application, school_enrichment, shared_prior
-                                )
-                                normalized_result = self._normalize_agent_result(retry_result)
-                                logger.info("✅ %s revision complete after Gaston feedback", agent_id)
-                            except Exception as _retry_err:
-                                logger.warning("Agent %s revision failed: %s", agent_id, _retry_err)
-                            finally:
-                                application.pop('_gaston_feedback', None)
-                    
-                    logger.info(f"✅ Agent {agent_id} completed")
-                    logger.info(f"✅ {agent_id.upper()}: COMPLETED")
-                    self._report_progress({
-                        'type': 'agent_progress',
-                        'agent_id': agent_id,
-                        'agent': self.agents[agent_id].name,
-                        'status': 'completed',
-                        'message': f'{self.agents[agent_id].name} complete ✓'
-                    })
-                    
-                    return agent_id, normalized_result, 'completed'
-                except Exception as agent_exec_error:
-                    logger.error(f"❌ {agent_id} execution error: {agent_exec_error}")
-                    logger.info(f"❌ {agent_id.upper()}: FAILED - {str(agent_exec_error)[:100]}")
-                    self._report_progress({
-                        'type': 'agent_progress',
-                        'agent_id': agent_id,
-                        'agent': self.agents[agent_id].name,
-                        'status': 'failed',
-                        'message': f'Error: {str(agent_exec_error)[:80]}'
-                    })
-                    return agent_id, {'error': str(agent_exec_error)}, 'error'
-            
-            # Run parallel group 1 concurrently
-            group1_tasks = [_validate_and_run_core_agent(aid, prior_results) for aid in parallel_group_1]
-            group1_results = await asyncio.gather(*group1_tasks, return_exceptions=True)
-            
-            # Collect results from parallel group 1
-            for item in group1_results:
-                if isinstance(item, Exception):
-                    logger.error(f"Parallel agent task failed: {item}")
-                    continue
-                aid, result, status = item
-                if result is not None:
-                    self.evaluation_results['results'][aid] = result
-                    prior_results[aid] = result
-            
-            logger.info(f"✅ PARALLEL GROUP 1 complete: {[a.upper() for a in parallel_group_1]}")
-            logger.info(f"✅ PARALLEL GROUP 1 DONE")
-        
-        # --- Sequential: Moana (school_context) - depends on Rapunzel grades ---
-        if 'school_context' in self.agents:
-            logger.info("🌊 Running Moana (depends on Rapunzel grades)...")
-            logger.info("🌊 RUNNING MOANA (sequential — needs Rapunzel grades)")
-            aid, result, status = await _validate_and_run_core_agent('school_context', prior_results)
-            if result is not None:
-                self.evaluation_results['results'][aid] = result
-                prior_results[aid] = result
-        
 
+                # Reactive BELLE call
+                logger.info(f"📖 Reactively calling BELLE to fill {agent_id} gap...")
+                belle_retry = await self._extract_data_with_belle(
+                    document_text, document_name,
+                    context=f"Focus on {', '.join(readiness.get('missing', []))}"
+                )
+                belle_data.update(belle_retry)
 
-        # --- Persist all core agent results to database ---
-        for agent_id in core_agents:
-            normalized_result = self.evaluation_results['results'].get(agent_id)
-            if not normalized_result or not isinstance(normalized_result, dict):
-                continue
-            try:
-                if self.db and application_id:
-                    # Persist to agent_results column
-                    stored = {}
-                    try:
-                        existing = self.db.get_application(application_id) or {}
-                        stored = existing.get('agent_results') or {}
-                        if isinstance(stored, str):
-                            stored = safe_load_json(stored)
-                    except Exception:
-                        stored = {}
-                    canonical_map = {
-                        'student_evaluator': 'merlin',
-                        'report_generator': 'aurora'
-                    }
-                    stored_key = canonical_map.get(agent_id, agent_id)
-                    stored[stored_key] = normalized_result
-                    self.db.update_application(
-                        application_id=application_id,
-                        agent_results=json.dumps(stored)
-                    )
-                    
-                    # Save agent audit
-                    try:
-                        self.db.save_agent_audit(application_id, self.agents[agent_id].name, None)
-                    except Exception:
-                        pass
+                readiness = await self._validate_agent_readiness(
+                    agent_id, application, application_id, belle_data
+                )
 
-                    # Extract scores for evaluation persistence
-                    overall_score = None
-                    try:
-                        overall_score = normalized_result.get('overall_score') or normalized_result.get('readiness_score') or normalized_result.get('score')
-                        if overall_score is not None:
-                            overall_score = float(overall_score)
-                    except Exception:
-                        overall_score = None
-                    
-                    model_used = getattr(self.agents[agent_id], 'model', None) or self.model
-                    processing_ms = int(normalized_result.get('processing_time_ms', 0)) if isinstance(normalized_result, dict) else 0
-                    detailed = None
-                    try:
-                        detailed = json.dumps(normalized_result, ensure_ascii=True)
-                    except Exception:
-                        try:
-                            detailed = str(normalized_result)
-                        except Exception:
-                            pass
-                    
-                    try:
-                        self.db.save_evaluation(
-                            application_id,
-                            self.agents[agent_id].name,
-                            overall_score or 0.0,
-                            0.0, 0.0, 0.0, 0.0,
-                            normalized_result.get('strengths', normalized_result.get('key_strengths', '')),
-                            normalized_result.get('weaknesses', normalized_result.get('key_risks', '')),
-                            normalized_result.get('recommendation', ''),
-                            detailed or '',
-                            '',
-                            model_used or '',
-                            processing_ms
-                        )
-                    except Exception as _eval_err:
-                        logger.warning(f"Could not persist evaluation for {agent_id}: {_eval_err}")
-                    
-                    # Log agent execution
+                if not readiness.get('ready'):
+                    logger.warning(f"⚠️ {agent_id} still not ready after BELLE retry. SKIPPING.")
                     self._log_interaction(
                         application_id=application_id,
                         agent_name=agent_id.title(),
-                        interaction_type='step_4_agent_execution',
-                        question_text=f"Execute core agent: {agent_id}",
+                        interaction_type='skip_insufficient_data',
+                        question_text=f"Agent {agent_id} skipped - insufficient data",
                         extracted_data={
                             'agent_id': agent_id,
-                            'execution_status': 'completed',
-                            'result_keys': list(normalized_result.keys()) if isinstance(normalized_result, dict) else []
+                            'reason': 'missing_required_documents',
+                            'validation_status': 'failed_gate_2_skipping',
+                            'missing_fields': readiness.get('missing', []),
+                            'gate_number': 2,
+                            'action': 'skipped_continue_workflow'
                         }
                     )
-            except Exception:
-                logger.debug(f"Skipping DB persistence for {agent_id}")
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': agent_id,
+                        'agent': self.agents[agent_id].name,
+                        'status': 'skipped',
+                        'message': f'Skipped — missing {readiness.get("missing", [])}'
+                    })
+                    return agent_id, None, 'skipped'
 
-        
-        # Gate check before Step 4.5
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Step 4")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace('pocahontas')
+            self._log_interaction(
+                application_id=application_id,
+                agent_name=agent_id.title(),
+                interaction_type='step_4_5_validation',
+                question_text=f"Validation gate for {agent_id}",
+                extracted_data={
+                    'agent_id': agent_id,
+                    'validation_status': 'passed',
+                    'ready_to_execute': True
+                }
+            )
 
-        # ===== STEP 4.5: POCAHONTAS - Equity Analysis =====
-        # Runs after Naveen (school scores) and Moana (school narrative) are complete
-        # Produces equity_tier and context_multiplier consumed by Merlin
-        logger.info("🪶 STEP 4.5: Running Pocahontas equity analysis...")
-        if 'pocahontas' in self.agents and school_enrichment:
-            pocahontas = self.agents['pocahontas']
+            # Run the agent
+            logger.info(f"🚀 Running {agent_id}...")
+            logger.info(f"▶️  RUNNING {agent_id.upper()}: {self.agents[agent_id].name}")
             self._report_progress({
                 'type': 'agent_progress',
-                'agent_id': 'pocahontas',
-                'agent': 'Pocahontas',
-                'status': 'starting',
-                'message': '🪶 Pocahontas is analyzing equity context...'
+                'agent_id': agent_id,
+                'agent': self.agents[agent_id].name,
+                'status': 'processing',
+                'message': f'{self.agents[agent_id].name} is analyzing...'
             })
-            try:
-                moana_result = self.evaluation_results['results'].get('school_context', {})
-                rapunzel_result = self.evaluation_results['results'].get('grade_reader', {})
-                naveen_scores = school_enrichment.get('component_scores', {})
-                if not naveen_scores:
-                    naveen_scores = school_enrichment.get('naveen_scores', {})
-
-                pocahontas_input = {
-                    'school_data': school_enrichment,
-                    'school_narrative': moana_result.get('narrative', '') if isinstance(moana_result, dict) else str(moana_result),
-                    'naveen_component_scores': naveen_scores,
-                    'grades': rapunzel_result.get('grades', {}) if isinstance(rapunzel_result, dict) else {},
-                    'activities': application.get('activities', []),
-                }
-
-                pocahontas_result = await pocahontas.process(pocahontas_input)
-                pocahontas_result = self._normalize_agent_result(pocahontas_result)
-                self.evaluation_results['results']['pocahontas'] = pocahontas_result
 
-                # Extract equity data for downstream agents (Merlin)
-                equity_tier = pocahontas_result.get('equity_tier', 3) if isinstance(pocahontas_result, dict) else 3
-                context_multiplier = pocahontas_result.get('context_multiplier', 1.0) if isinstance(pocahontas_result, dict) else 1.0
-                self.evaluation_results['results']['_context_multiplier'] = context_multiplier
-                self.evaluation_results['results']['_equity_tier'] = equity_tier
-
-                logger.info(
-                    "🪶 Pocahontas complete: equity_tier=%s, multiplier=%.2f, diamond=%s",
-                    equity_tier, context_multiplier,
-                    pocahontas_result.get('diamond_in_rough_flag', False) if isinstance(pocahontas_result, dict) else False
+            try:
+                agent_result = await self._run_agent(
+                    agent_id, application, school_enrichment, shared_prior
                 )
+                normalized_result = self._normalize_agent_result(agent_result)
 
-                # Persist to DB
-                try:
-                    if self.db and application_id:
-                        existing = {}
-                        try:
-                            rec = self.db.get_application(application_id) or {}
-                            existing = rec.get('agent_results') or {}
-                            if isinstance(existing, str):
-                                existing = safe_load_json(existing)
-                        except Exception:
-                            existing = {}
-                        existing['pocahontas'] = pocahontas_result
-                        try:
-                            self.db.update_application(
-                                application_id=application_id,
-                                agent_results=json.dumps(existing)
-                            )
-                        except Exception:
-                            logger.debug('Could not persist pocahontas to agent_results')
-                except Exception:
-                    pass
+                # Sprint 2: Output validation
+                validation = self._validate_agent_output(agent_id, normalized_result)
+                if not validation['valid']:
+                    logger.warning("Output validation issues for %s: %s", agent_id, validation['issues'])
 
+                # Sprint 2: Interleaved Gaston quality check (runs as its own
+                # graph step instead when the gate is speculative)
+                if not SPECULATIVE_GASTON:
+                    normalized_result, _check = await _gaston_review(agent_id, normalized_result, shared_prior)
+
+                logger.info(f"✅ Agent {agent_id} completed")
+                logger.info(f"✅ {agent_id.upper()}: COMPLETED")
                 self._report_progress({
                     'type': 'agent_progress',
-                    'agent_id': 'pocahontas',
-                    'agent': 'Pocahontas',
+                    'agent_id': agent_id,
+                    'agent': self.agents[agent_id].name,
                     'status': 'completed',
-                    'message': f'🪶 Pocahontas complete — Tier {equity_tier}, multiplier {context_multiplier:.2f} ✓'
+                    'message': f'{self.agents[agent_id].name} complete ✓'
                 })
-                self._checkpoint_step('step_4_5_equity', application_id)
-            except Exception as e:
-                logger.error(f"❌ Pocahontas equity analysis failed: {e}", exc_info=True)
+
+                return agent_id, normalized_result, 'completed'
+            except Exception as agent_exec_error:
+                logger.error(f"❌ {agent_id} execution error: {agent_exec_error}")
+                logger.info(f"❌ {agent_id.upper()}: FAILED - {str(agent_exec_error)[:100]}")
                 self._report_progress({
                     'type': 'agent_progress',
-                    'agent_id': 'pocahontas',
-                    'agent': 'Pocahontas',
+                    'agent_id': agent_id,
+                    'agent': self.agents[agent_id].name,
                     'status': 'failed',
-                    'message': f'Equity analysis failed: {str(e)[:80]}'
+                    'message': f'Error: {str(agent_exec_error)[:80]}'
                 })
-                # Non-blocking — pipeline continues with default equity (tier 3, multiplier 1.0)
-                self.evaluation_results['results']['_context_multiplier'] = 1.0
-                self.evaluation_results['results']['_equity_tier'] = 3
-        else:
-            if 'pocahontas' not in self.agents:
-                logger.info("🪶 Pocahontas not registered — skipping equity analysis")
-            elif not school_enrichment:
-                logger.info("🪶 No school data — skipping equity analysis (default tier 3)")
-            self.evaluation_results['results']['_context_multiplier'] = 1.0
-            self.evaluation_results['results']['_equity_tier'] = 3
-
-        # Gate check before Step 5
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Step 4.5")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace('data_scientist')
-        
-        # ===== STEP 5: MILO - training analysis =====
-        logger.info("📊 STEP 5: Running Milo training analysis...")
-        if 'data_scientist' in evaluation_steps and 'data_scientist' in self.agents:
-            milo = self.agents['data_scientist']
-            self._report_progress({
-                'type': 'agent_progress',
-                'agent_id': 'data_scientist',
-                'agent': 'Milo',
-                'status': 'starting',
-                'message': '📊 Milo is analyzing training data patterns...'
-            })
-            try:
-                milo_result = await milo.analyze_training_insights()
-                self.evaluation_results['results']['data_scientist'] = milo_result
+                return agent_id, {'error': str(agent_exec_error)}, 'error'
+
+        async def _gaston_review(agent_id, normalized_result, shared_prior):
+            """Gaston-grade one core result; re-run the agent once with feedback on a fail.
+
+            Returns ``(result, check)`` where ``result`` is the revised output
+            when Gaston rejected (or the original one), and ``check`` is
+            None for agents that aren't reviewed.
+            """
+            if agent_id not in quality_reviewable or not isinstance(normalized_result, dict) \
+                    or normalized_result.get('status') == 'error':
+                return normalized_result, None
+            if nearly_exhausted():
+                # The review is optional; the budget isn't
+                record_degradation('skip_gaston_review', agent_id)
+                return normalized_result, None
+            gaston_check = await self._gaston_interleaved_check(
+                agent_id, normalized_result, application_id, PromptContext.of(application)
+            )
+            if not gaston_check['pass']:
+                logger.info("🔄 Gaston grade %s for %s — re-running with feedback", gaston_check['grade'], agent_id)
+                self._report_progress({
+                    'type': 'agent_progress',
+                    'agent_id': agent_id,
+                    'agent': self.agents[agent_id].name,
+                    'status': 'revision',
+                    'message': f'🔄 Quality check: grade {gaston_check["grade"]} — revising...'
+                })
+                # Inject Gaston feedback and re-run once
+                application['_gaston_feedback'] = gaston_check['feedback']
+                try:
+                    retry_result = await self._run_agent(
+                        agent_id, application, school_enrichment, shared_prior
+                    )
+                    normalized_result = self._normalize_agent_result(retry_result)
+                    logger.info("✅ %s revision complete after Gaston feedback", agent_id)
+                except Exception as _retry_err:
+                    logger.warning("Agent %s revision failed: %s", agent_id, _retry_err)
+                finally:
+                    application.pop('_gaston_feedback', None)
+            return normalized_result, gaston_check
+
+        def _restore_outputs(outputs):
+            """Put a checkpointed step's result keys back in place of running it."""
+            nonlocal school_enrichment
+            self.evaluation_results['results'].update(outputs)
+            for key in core_agents:
+                if key in outputs:
+                    prior_results[key] = outputs[key]
+            if 'school_enrichment' in outputs:
+                school_enrichment = outputs['school_enrichment'] or {}
+
+        async def _step_core_agent(agent_id):
+            """STEP 4: one core agent (validation gate + run + Gaston check)."""
+            await self._pace_async()
+            aid, result, status = await _validate_and_run_core_agent(agent_id, prior_results)
+            if result is not None:
+                self.evaluation_results['results'][aid] = result
+                prior_results[aid] = result
 
-                # persist Milo output into the application record for downstream use
+        # --- Speculative Gaston gate ---
+        # The review of each Tiana/Rapunzel/Mulan result is a separate step,
+        # so Moana and Pocahontas start on the ungated output.  A rejected
+        # result is revised in place; ``_step_reconcile_speculation`` then
+        # re-runs only the consumers that started before the revision landed.
+        speculative_started: Dict[str, float] = {}
+        revision_landed: Dict[str, float] = {}
+        speculation = {'reviewed': [], 'rejected': [], 'reexecuted_steps': [], 'reexecution_ms': 0.0}
+
+        async def _step_gaston_review(agent_id):
+            result = self.evaluation_results['results'].get(agent_id)
+            revised, check = await _gaston_review(agent_id, result, prior_results)
+            if check is None:
+                return
+            speculation['reviewed'].append(agent_id)
+            if not check['pass']:
+                speculation['rejected'].append(agent_id)
+                self.evaluation_results['results'][agent_id] = revised
+                prior_results[agent_id] = revised
+                revision_landed[agent_id] = _time.perf_counter()
+
+        def _speculative(name, run):
+            async def _run():
+                speculative_started[name] = _time.perf_counter()
+                await run()
+            return _run
+
+        async def _step_reconcile_speculation():
+            """Re-run speculative steps that consumed a result Gaston rejected."""
+            if not revision_landed:
+                return
+            deps = graph.dependencies()
+            stale = set()
+            t0 = _time.perf_counter()
+            for name in graph.downstream(list(revision_landed)):
+                if name not in speculative_started:
+                    continue
+                read_stale_input = any(
+                    agent in deps[name] and speculative_started[name] < landed
+                    for agent, landed in revision_landed.items()
+                )
+                if read_stale_input or deps[name] & stale:
+                    logger.info("🔁 Re-running %s on Gaston-revised input", name)
+                    stale.add(name)
+                    await graph.step(name).run()
+            speculation['reexecuted_steps'] = sorted(stale)
+            speculation['reexecution_ms'] = round((_time.perf_counter() - t0) * 1000, 1)
+
+        async def _step_persist_core_results():
+            # --- Persist all core agent results to database ---
+            for agent_id in core_agents:
+                normalized_result = self.evaluation_results['results'].get(agent_id)
+                if not normalized_result or not isinstance(normalized_result, dict):
+                    continue
                 try:
                     if self.db and application_id:
-                        existing = {}
+                        # Persist to agent_results column
+                        stored = {}
                         try:
-                            rec = self.db.get_application(application_id) or {}
-                            existing = rec.get('agent_results') or {}
-                            if isinstance(existing, str):
-                                existing = safe_load_json(existing)
+                            existing = self.db.get_application(application_id) or {}
+                            stored = existing.get('agent_results') or {}
+                            if isinstance(stored, str):
+                                stored = safe_load_json(stored)
                         except Exception:
-                            existing = {}
-                        existing['data_scientist'] = milo_result
+                            stored = {}
+                        canonical_map = {
+                            'student_evaluator': 'merlin',
+                            'report_generator': 'aurora'
+                        }
+                        stored_key = canonical_map.get(agent_id, agent_id)
+                        stored[stored_key] = normalized_result
+                        self.db.update_application(
+                            application_id=application_id,
+                            agent_results=json.dumps(stored)
+                        )
+
+                        # Save agent audit
                         try:
-                            self.db.update_application(
-                                application_id=application_id,
-                                agent_results=json.dumps(existing)
-                            )
+                            self.db.save_agent_audit(application_id, self.agents[agent_id].name, None)
                         except Exception:
-                            logger.debug('Could not persist milo to agent_results')
-                except Exception:
-                    pass
+                            pass
+
+                        # Extract scores for evaluation persistence
+                        overall_score = None
+                        try:
+                            overall_score = normalized_result.get('overall_score') or normalized_result.get('readiness_score') or normalized_result.get('score')
+                            if overall_score is not None:
+                                overall_score = float(overall_score)
+                        except Exception:
+                            overall_score = None
+
+                        model_used = getattr(self.agents[agent_id], 'model', None) or self.model
+                        processing_ms = int(normalized_result.get('processing_time_ms', 0)) if isinstance(normalized_result, dict) else 0
+                        detailed = None
+                        try:
+                            detailed = json.dumps(normalized_result, ensure_ascii=True)
+                        except Exception:
+                            try:
+                                detailed = str(normalized_result)
+                            except Exception:
+                                pass
+
+                        try:
+                            self.db.save_evaluation(
+                                application_id,
+                                self.agents[agent_id].name,
+                                overall_score or 0.0,
+                                0.0, 0.0, 0.0, 0.0,
+                                normalized_result.get('strengths', normalized_result.get('key_strengths', '')),
+                                normalized_result.get('weaknesses', normalized_result.get('key_risks', '')),
+                                normalized_result.get('recommendation', ''),
+                                detailed or '',
+                                '',
+                                model_used or '',
+                                processing_ms
+                            )
+                        except Exception as _eval_err:
+                            logger.warning(f"Could not persist evaluation for {agent_id}: {_eval_err}")
 
+                        # Log agent execution
+                        self._log_interaction(
+                            application_id=application_id,
+                            agent_name=agent_id.title(),
+                            interaction_type='step_4_agent_execution',
+                            question_text=f"Execute core agent: {agent_id}",
+                            extracted_data={
+                                'agent_id': agent_id,
+                                'execution_status': 'completed',
+                                'result_keys': list(normalized_result.keys()) if isinstance(normalized_result, dict) else []
+                            }
+                        )
+                except Exception:
+                    logger.debug(f"Skipping DB persistence for {agent_id}")
+
+        async def _step_pocahontas():
+            await self._pace_async('pocahontas')
+            # ===== STEP 4.5: POCAHONTAS - Equity Analysis =====
+            # Runs after Naveen (school scores) and Moana (school narrative) are complete
+            # Produces equity_tier and context_multiplier consumed by Merlin
+            logger.info("🪶 STEP 4.5: Running Pocahontas equity analysis...")
+            if 'pocahontas' in self.agents and school_enrichment:
+                pocahontas = self.agents['pocahontas']
                 self._report_progress({
                     'type': 'agent_progress',
-                    'agent_id': 'data_scientist',
-                    'agent': 'Milo',
-                    'status': 'completed',
-                    'message': '📊 Milo complete — training patterns analyzed ✓'
+                    'agent_id': 'pocahontas',
+                    'agent': 'Pocahontas',
+                    'status': 'starting',
+                    'message': '🪶 Pocahontas is analyzing equity context...'
                 })
-
-                # Log STEP 5 MILO analysis
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Milo',
-                    interaction_type='step_5_milo_analysis',
-                    question_text='Analyze training examples to generate insights',
-                    extracted_data={
-                        'analysis_status': 'completed',
-                        'result_keys': list(milo_result.keys()) if isinstance(milo_result, dict) else [],
-                        'insights_generated': 'insights' in str(milo_result).lower() or 'analysis' in str(milo_result).lower()
+                try:
+                    moana_result = self.evaluation_results['results'].get('school_context', {})
+                    rapunzel_result = self.evaluation_results['results'].get('grade_reader', {})
+                    naveen_scores = school_enrichment.get('component_scores', {})
+                    if not naveen_scores:
+                        naveen_scores = school_enrichment.get('naveen_scores', {})
+
+                    pocahontas_input = {
+                        'school_data': school_enrichment,
+                        'school_narrative': moana_result.get('narrative', '') if isinstance(moana_result, dict) else str(moana_result),
+                        'naveen_component_scores': naveen_scores,
+                        'grades': rapunzel_result.get('grades', {}) if isinstance(rapunzel_result, dict) else {},
+                        'activities': application.get('activities', []),
                     }
-                )
 
-                # compute alignment for this application if the method exists
-                try:
-                    if hasattr(milo, 'compute_alignment'):
-                        alignment = await milo.compute_alignment(application)
-                        self.evaluation_results['results']['milo_alignment'] = alignment
-                        # also persist alignment so UI/tests can access it easily
+                    pocahontas_result = await pocahontas.process(pocahontas_input)
+                    pocahontas_result = self._normalize_agent_result(pocahontas_result)
+                    self.evaluation_results['results']['pocahontas'] = pocahontas_result
+
+                    # Extract equity data for downstream agents (Merlin)
+                    equity_tier = pocahontas_result.get('equity_tier', 3) if isinstance(pocahontas_result, dict) else 3
+                    context_multiplier = pocahontas_result.get('context_multiplier', 1.0) if isinstance(pocahontas_result, dict) else 1.0
+                    self.evaluation_results['results']['_context_multiplier'] = context_multiplier
+                    self.evaluation_results['results']['_equity_tier'] = equity_tier
+
+                    logger.info(
+                        "🪶 Pocahontas complete: equity_tier=%s, multiplier=%.2f, diamond=%s",
+                        equity_tier, context_multiplier,
+                        pocahontas_result.get('diamond_in_rough_flag', False) if isinstance(pocahontas_result, dict) else False
+                    )
+
+                    # Persist to DB
+                    try:
                         if self.db and application_id:
+                            existing = {}
                             try:
-                                existing = {}
                                 rec = self.db.get_application(application_id) or {}
                                 existing = rec.get('agent_results') or {}
                                 if isinstance(existing, str):
                                     existing = safe_load_json(existing)
-                                existing['milo_alignment'] = alignment
+                            except Exception:
+                                existing = {}
+                            existing['pocahontas'] = pocahontas_result
+                            try:
                                 self.db.update_application(
                                     application_id=application_id,
                                     agent_results=json.dumps(existing)
                                 )
                             except Exception:
-                                pass
-                except Exception as align_err:
-                    logger.debug(f"Milo compute_alignment failed during orchestration: {align_err}")
-            except Exception as e:
-                logger.error(f"❌ MILO analysis failed: {e}")
-                self.evaluation_results['results']['data_scientist'] = {'error': str(e)}
+                                logger.debug('Could not persist pocahontas to agent_results')
+                    except Exception:
+                        pass
+
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'pocahontas',
+                        'agent': 'Pocahontas',
+                        'status': 'completed',
+                        'message': f'🪶 Pocahontas complete — Tier {equity_tier}, multiplier {context_multiplier:.2f} ✓'
+                    })
+                except Exception as e:
+                    logger.error(f"❌ Pocahontas equity analysis failed: {e}", exc_info=True)
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'pocahontas',
+                        'agent': 'Pocahontas',
+                        'status': 'failed',
+                        'message': f'Equity analysis failed: {str(e)[:80]}'
+                    })
+                    # Non-blocking — pipeline continues with default equity (tier 3, multiplier 1.0)
+                    self.evaluation_results['results']['_context_multiplier'] = 1.0
+                    self.evaluation_results['results']['_equity_tier'] = 3
+            else:
+                if 'pocahontas' not in self.agents:
+                    logger.info("🪶 Pocahontas not registered — skipping equity analysis")
+                elif not school_enrichment:
+                    logger.info("🪶 No school data — skipping equity analysis (default tier 3)")
+                self.evaluation_results['results']['_context_multiplier'] = 1.0
+                self.evaluation_results['results']['_equity_tier'] = 3
+
+        async def _step_milo():
+            await self._pace_async('data_scientist')
+            # ===== STEP 5: MILO - training analysis =====
+            logger.info("📊 STEP 5: Running Milo training analysis...")
+            if 'data_scientist' in evaluation_steps and 'data_scientist' in self.agents:
+                milo = self.agents['data_scientist']
                 self._report_progress({
                     'type': 'agent_progress',
                     'agent_id': 'data_scientist',
                     'agent': 'Milo',
-                    'status': 'failed',
-                    'message': f'Milo failed: {str(e)[:80]}'
+                    'status': 'starting',
+                    'message': '📊 Milo is analyzing training data patterns...'
                 })
-                # still log failure for auditing
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Milo',
-                    interaction_type='step_5_milo_analysis',
-                    question_text='Analyze training examples to generate insights',
-                    extracted_data={
-                        'analysis_status': 'failed',
-                        'error': str(e)
-                    }
-                )
-        else:
-            # when the step isn't requested or the agent is missing we mark as skipped
-            self.evaluation_results['results']['data_scientist'] = {'skipped': True}
+                try:
+                    milo_result = await milo.analyze_training_insights()
+                    self.evaluation_results['results']['data_scientist'] = milo_result
 
-        # ===== STEP 5.5: SCORE NORMALIZATION + CONTEXT MULTIPLIER =====
-        logger.info("📊 STEP 5.5: Normalizing agent scores and loading context multiplier...")
-        normalized_scores = self._normalize_all_scores(self.evaluation_results['results'])
-        self.evaluation_results['results']['_normalized_scores'] = normalized_scores
+                    # persist Milo output into the application record for downstream use
+                    try:
+                        if self.db and application_id:
+                            existing = {}
+                            try:
+                                rec = self.db.get_application(application_id) or {}
+                                existing = rec.get('agent_results') or {}
+                                if isinstance(existing, str):
+                                    existing = safe_load_json(existing)
+                            except Exception:
+                                existing = {}
+                            existing['data_scientist'] = milo_result
+                            try:
+                                self.db.update_application(
+                                    application_id=application_id,
+                                    agent_results=json.dumps(existing)
+                                )
+                            except Exception:
+                                logger.debug('Could not persist milo to agent_results')
+                    except Exception:
+                        pass
 
-        # Load Pocahontas context multiplier for the student's school
-        context_multiplier_data = None
-        if school_enrichment and school_enrichment.get('school_enrichment_id'):
-            try:
-                from src.agents.pocahontas_cohort_analyst import PocahontasCohortAnalyst
-                context_multiplier_data = PocahontasCohortAnalyst.get_school_context_multiplier(
-                    school_enrichment['school_enrichment_id']
-                )
-            except Exception as e:
-                logger.debug(f"Could not load context multiplier: {e}")
-        if context_multiplier_data:
-            self.evaluation_results['results']['_context_multiplier'] = context_multiplier_data
-            logger.info(
-                f"📊 Context multiplier: {context_multiplier_data.get('multiplier', 1.0)}x "
-                f"({', '.join(context_multiplier_data.get('reasons', []))})"
-            )
-        else:
-            self.evaluation_results['results']['_context_multiplier'] = {
-                'multiplier': 1.0, 'reasons': [], 'school_name': high_school
-            }
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'data_scientist',
+                        'agent': 'Milo',
+                        'status': 'completed',
+                        'message': '📊 Milo complete — training patterns analyzed ✓'
+                    })
 
-        # Gate check before Step 6
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Step 5")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace('student_evaluator')
-        
-        # ===== STEP 6: MERLIN - Synthesis =====
-        logger.info("🧙 STEP 6: Synthesizing evaluation with MERLIN...")
-        
-        if 'student_evaluator' in evaluation_steps and 'student_evaluator' in self.agents:
-            merlin = self.agents['student_evaluator']
-            self._report_progress({
-                'type': 'agent_progress',
-                'agent_id': 'student_evaluator',
-                'agent': 'Merlin',
-                'status': 'starting',
-                'message': '🧙 Merlin is synthesizing all agent evaluations...'
-            })
-            try:
-                # Context routing: Merlin gets relevant agent outputs + equity context
-                _merlin_context = {}
-                _MERLIN_NEEDS = {'application_reader', 'grade_reader', 'recommendation_reader', 'school_context', 'data_scientist', 'milo', 'pocahontas'}
-                for _k, _v in self.evaluation_results['results'].items():
-                    if _k in _MERLIN_NEEDS or _k in ('_normalized_scores', '_context_multiplier', '_equity_tier'):
-                        # Cap per-agent context to 15K chars to prevent token overload
-                        if isinstance(_v, str) and len(_v) > 15000:
-                            _merlin_context[_k] = _v[:15000] + '\n[TRUNCATED]'
-                        elif isinstance(_v, dict):
-                            _serialized = json.dumps(_v)
-                            if len(_serialized) > 15000:
-                                _merlin_context[_k] = json.loads(_serialized[:15000] + '"}')  # rough truncate
-                            else:
-                                _merlin_context[_k] = _v
-                        else:
-                            _merlin_context[_k] = _v
-                logger.info("Merlin context routing: %d agents (of %d total), keys=%s", len(_merlin_context), len(self.evaluation_results['results']), list(_merlin_context.keys()))
-                merlin_result = await merlin.evaluate_student(
-                    application, _merlin_context
-                )
-                merlin_result = self._normalize_agent_result(merlin_result)
-                # store under both internal and canonical keys
-                self.evaluation_results['results']['student_evaluator'] = merlin_result
-                self.evaluation_results['results']['merlin'] = merlin_result
-                # Persist MERLIN into applications.agent_results for UI/backfill
-                try:
-                    if self.db and application_id:
-                        existing = {}
-                        try:
-                            rec = self.db.get_application(application_id) or {}
-                            existing = rec.get('agent_results') or {}
-                            if isinstance(existing, str):
-                                existing = safe_load_json(existing)
-                        except Exception:
-                            existing = {}
-                        existing_key = 'merlin'
-                        existing[existing_key] = merlin_result
-                        # also keep legacy key
-                        existing['student_evaluator'] = merlin_result
-                        try:
-                            self.db.update_application(application_id=application_id, agent_results=json.dumps(existing))
-                        except Exception:
-                            logger.debug('Could not persist merlin to agent_results')
-                except Exception:
-                    pass
-                
-                # ===== Persist Next Gen Match to application record =====
-                # Resolve nextgen_match from Merlin first, then fall back to Milo
-                nextgen_match = None
-                if isinstance(merlin_result, dict):
-                    nextgen_match = merlin_result.get('nextgen_match')
-                if nextgen_match is None:
-                    milo_align = self.evaluation_results['results'].get('milo_alignment', {})
-                    if isinstance(milo_align, dict):
-                        nextgen_match = milo_align.get('nextgen_match')
-                if nextgen_match is not None and self.db and application_id:
-                    try:
-                        self.db.update_application(
-                            application_id=application_id,
-                            nextgen_match=nextgen_match
-                        )
-                        logger.info(f"🎯 Next Gen Match persisted: {nextgen_match}% for application {application_id}")
-                    except Exception as ngm_err:
-                        logger.debug(f"Could not persist nextgen_match: {ngm_err}")
+                    # Log STEP 5 MILO analysis
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Milo',
+                        interaction_type='step_5_milo_analysis',
+                        question_text='Analyze training examples to generate insights',
+                        extracted_data={
+                            'analysis_status': 'completed',
+                            'result_keys': list(milo_result.keys()) if isinstance(milo_result, dict) else [],
+                            'insights_generated': 'insights' in str(milo_result).lower() or 'analysis' in str(milo_result).lower()
+                        }
+                    )
 
-                # PHASE 5: Log STEP 6 MERLIN synthesis
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Merlin',
-                    interaction_type='step_6_merlin_synthesis',
-                    question_text='Synthesize all agent evaluations into comprehensive assessment',
-                    extracted_data={
-                        'synthesis_status': 'completed',
-                        'result_keys': list(merlin_result.keys()) if isinstance(merlin_result, dict) else [],
-                        'has_overall_score': 'overall_score' in str(merlin_result).lower() or 'score' in str(merlin_result).lower(),
-                        'recommendations_generated': 'recommendation' in str(merlin_result).lower()
-                    }
+                    # compute alignment for this application if the method exists
+                    try:
+                        if hasattr(milo, 'compute_alignment'):
+                            alignment = await milo.compute_alignment(application)
+                            self.evaluation_results['results']['milo_alignment'] = alignment
+                            # also persist alignment so UI/tests can access it easily
+                            if self.db and application_id:
+                                try:
+                                    existing = {}
+                                    rec = self.db.get_application(application_id) or {}
+                                    existing = rec.get('agent_results') or {}
+                                    if isinstance(existing, str):
+                                        existing = safe_load_json(existing)
+                                    existing['milo_alignment'] = alignment
+                                    self.db.update_application(
+                                        application_id=application_id,
+                                        agent_results=json.dumps(existing)
+                                    )
+                                except Exception:
+                                    pass
+                    except Exception as align_err:
+                        logger.debug(f"Milo compute_alignment failed during orchestration: {align_err}")
+                except Exception as e:
+                    logger.error(f"❌ MILO analysis failed: {e}")
+                    self.evaluation_results['results']['data_scientist'] = {'error': str(e)}
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'data_scientist',
+                        'agent': 'Milo',
+                        'status': 'failed',
+                        'message': f'Milo failed: {str(e)[:80]}'
+                    })
+                    # still log failure for auditing
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Milo',
+                        interaction_type='step_5_milo_analysis',
+                        question_text='Analyze training examples to generate insights',
+                        extracted_data={
+                            'analysis_status': 'failed',
+                            'error': str(e)
+                        }
+                    )
+            else:
+                # when the step isn't requested or the agent is missing we mark as skipped
+                self.evaluation_results['results']['data_scientist'] = {'skipped': True}
+
+        async def _step_normalize_scores():
+            # ===== STEP 5.5: SCORE NORMALIZATION + CONTEXT MULTIPLIER =====
+            logger.info("📊 STEP 5.5: Normalizing agent scores and loading context multiplier...")
+            normalized_scores = self._normalize_all_scores(self.evaluation_results['results'])
+            self.evaluation_results['results']['_normalized_scores'] = normalized_scores
+
+            # Load Pocahontas context multiplier for the student's school
+            context_multiplier_data = None
+            if school_enrichment and school_enrichment.get('school_enrichment_id'):
+                try:
+                    from src.agents.pocahontas_cohort_analyst import PocahontasCohortAnalyst
+                    context_multiplier_data = PocahontasCohortAnalyst.get_school_context_multiplier(
+                        school_enrichment['school_enrichment_id']
+                    )
+                except Exception as e:
+                    logger.debug(f"Could not load context multiplier: {e}")
+            if context_multiplier_data:
+                self.evaluation_results['results']['_context_multiplier'] = context_multiplier_data
+                logger.info(
+                    f"📊 Context multiplier: {context_multiplier_data.get('multiplier', 1.0)}x "
+                    f"({', '.join(context_multiplier_data.get('reasons', []))})"
                 )
-                
-                logger.info("✅ MERLIN synthesis complete")
-                self._report_progress({
-                    'type': 'agent_progress',
-                    'agent_id': 'student_evaluator',
-                    'agent': 'Merlin',
-                    'status': 'completed',
-                    'message': '🧙 Merlin complete — final evaluation ready ✓'
-                })
-            except Exception as e:
-                logger.error(f"❌ MERLIN synthesis failed: {e}")
+            else:
+                self.evaluation_results['results']['_context_multiplier'] = {
+                    'multiplier': 1.0, 'reasons': [], 'school_name': high_school
+                }
+
+        async def _step_merlin():
+            await self._pace_async('student_evaluator')
+            # ===== STEP 6: MERLIN - Synthesis =====
+            logger.info("🧙 STEP 6: Synthesizing evaluation with MERLIN...")
+
+            if 'student_evaluator' in evaluation_steps and 'student_evaluator' in self.agents:
+                merlin = self.agents['student_evaluator']
                 self._report_progress({
                     'type': 'agent_progress',
                     'agent_id': 'student_evaluator',
                     'agent': 'Merlin',
-                    'status': 'failed',
-                    'message': f'Merlin failed: {str(e)[:80]}'
+                    'status': 'starting',
+                    'message': '🧙 Merlin is synthesizing all agent evaluations...'
                 })
-                # PHASE 5: Log STEP 6 MERLIN failure
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Merlin',
-                    interaction_type='step_6_merlin_synthesis',
-                    question_text='Synthesize all agent evaluations into comprehensive assessment',
-                    extracted_data={
-                        'synthesis_status': 'failed',
-                        'error': str(e)
-                    }
-                )
-        
-        # Gate check before Gaston
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Step 6")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace('gaston')
-        
-        # ===== STEP 6.5: GASTON - Post-Merlin audit =====
-        logger.info("💪 STEP 6.5: Gaston auditing Merlin's evaluation...")
-        merlin_out = self.evaluation_results['results'].get('merlin') or self.evaluation_results['results'].get('student_evaluator') or {}
-        if isinstance(merlin_out, dict) and merlin_out.get('status') != 'error' and 'gaston' in self.agents:
-            gaston = self.agents['gaston']
-            self._report_progress({
-                'type': 'agent_progress',
-                'agent_id': 'gaston',
-                'agent': 'Gaston',
-                'status': 'starting',
-                'message': '💪 Gaston is auditing the evaluation for consistency...'
-            })
-            try:
-                gaston_result = await asyncio.to_thread(
-                    gaston.audit_evaluation,
-                    merlin_out,
-                    self.evaluation_results['results'],
-                    self.evaluation_results['results'].get('_normalized_scores', {}),
-                    self.evaluation_results['results'].get('_context_multiplier'),
-                )
-                self.evaluation_results['results']['gaston'] = gaston_result
-                # Persist to agent_results
-                if self.db and application_id:
+                try:
+                    # Context routing: Merlin gets relevant agent outputs + equity context
+                    # Agent outputs go in as digests under one token budget;
+                    # the small derived entries (_normalized_scores, ...) as-is.
+                    _MERLIN_NEEDS = {'application_reader', 'grade_reader', 'recommendation_reader', 'school_context', 'data_scientist', 'milo', 'pocahontas'}
+                    _results = self.evaluation_results['results']
+                    _prompt_context = PromptContext.of(application) or PromptContext(application)
+                    _merlin_context = _prompt_context.digests(_results, _MERLIN_NEEDS, MERLIN_CONTEXT_TOKENS)
+                    _prompt_context.record(
+                        merlin.name,
+                        ''.join(json.dumps(_results[_k], default=str)[:15000] for _k in _merlin_context),
+                        json.dumps(_merlin_context, sort_keys=True, default=str),
+                    )
+                    for _k in ('_normalized_scores', '_context_multiplier', '_equity_tier'):
+                        if _k in _results:
+                            _merlin_context[_k] = _results[_k]
+                    logger.info("Merlin context routing: %d agents (of %d total), keys=%s", len(_merlin_context), len(self.evaluation_results['results']), list(_merlin_context.keys()))
+                    merlin_result = await merlin.evaluate_student(
+                        application, _merlin_context
+                    )
+                    merlin_result = self._normalize_agent_result(merlin_result)
+                    # store under both internal and canonical keys
+                    self.evaluation_results['results']['student_evaluator'] = merlin_result
+                    self.evaluation_results['results']['merlin'] = merlin_result
+                    # Persist MERLIN into applications.agent_results for UI/backfill
                     try:
-                        existing = {}
-                        try:
-                            rec = self.db.get_application(application_id) or {}
-                            existing = rec.get('agent_results') or {}
-                            if isinstance(existing, str):
-                                existing = safe_load_json(existing)
-                        except Exception:
+                        if self.db and application_id:
                             existing = {}
-                        existing['gaston'] = gaston_result
-                        self.db.update_application(application_id=application_id, agent_results=json.dumps(existing))
+                            try:
+                                rec = self.db.get_application(application_id) or {}
+                                existing = rec.get('agent_results') or {}
+                                if isinstance(existing, str):
+                                    existing = safe_load_json(existing)
+                            except Exception:
+                                existing = {}
+                            existing_key = 'merlin'
+                            existing[existing_key] = merlin_result
+                            # also keep legacy key
+                            existing['student_evaluator'] = merlin_result
+                            try:
+                                self.db.update_application(application_id=application_id, agent_results=json.dumps(existing))
+                            except Exception:
+                                logger.debug('Could not persist merlin to agent_results')
                     except Exception:
-                        logger.debug('Could not persist gaston to agent_results')
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Gaston',
-                    interaction_type='step_6_5_gaston_audit',
-                    question_text='Audit Merlin evaluation for consistency and bias',
-                    extracted_data={
-                        'flags': gaston_result.get('flag_count', 0),
-                        'consistency': gaston_result.get('consistency_score'),
-                        'override': gaston_result.get('override_suggestion'),
-                    }
-                )
-                logger.info(f"✅ Gaston audit complete: {gaston_result.get('flag_count', 0)} flags")
-                self._report_progress({
-                    'type': 'agent_progress',
-                    'agent_id': 'gaston',
-                    'agent': 'Gaston',
-                    'status': 'completed',
-                    'message': f'💪 Gaston complete — {gaston_result.get("flag_count", 0)} review flags ✓'
-                })
+                        pass
+
+                    # ===== Persist Next Gen Match to application record =====
+                    # Resolve nextgen_match from Merlin first, then fall back to Milo
+                    nextgen_match = None
+                    if isinstance(merlin_result, dict):
+                        nextgen_match = merlin_result.get('nextgen_match')
+                    if nextgen_match is None:
+                        milo_align = self.evaluation_results['results'].get('milo_alignment', {})
+                        if isinstance(milo_align, dict):
+                            nextgen_match = milo_align.get('nextgen_match')
+                    if nextgen_match is not None and self.db and application_id:
+                        try:
+                            self.db.update_application(
+                                application_id=application_id,
+                                nextgen_match=nextgen_match
+                            )
+                            logger.info(f"🎯 Next Gen Match persisted: {nextgen_match}% for application {application_id}")
+                        except Exception as ngm_err:
+                            logger.debug(f"Could not persist nextgen_match: {ngm_err}")
+
+                    # PHASE 5: Log STEP 6 MERLIN synthesis
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Merlin',
+                        interaction_type='step_6_merlin_synthesis',
+                        question_text='Synthesize all agent evaluations into comprehensive assessment',
+                        extracted_data={
+                            'synthesis_status': 'completed',
+                            'result_keys': list(merlin_result.keys()) if isinstance(merlin_result, dict) else [],
+                            'has_overall_score': 'overall_score' in str(merlin_result).lower() or 'score' in str(merlin_result).lower(),
+                            'recommendations_generated': 'recommendation' in str(merlin_result).lower()
+                        }
+                    )
 
-                # Sprint 2: Quality Gate — if Gaston flags ≥3 issues or consistency < 50,
-                # re-run Merlin with Gaston's feedback (up to 1 revision cycle)
-                _gaston_flags = gaston_result.get('flag_count', 0)
-                _gaston_consistency = gaston_result.get('consistency_score', 100)
-                if (_gaston_flags >= 3 or (_gaston_consistency is not None and _gaston_consistency < 50)) and 'student_evaluator' in self.agents:
-                    logger.info("🔄 Quality gate triggered: %d flags, consistency=%s — re-running Merlin with feedback", _gaston_flags, _gaston_consistency)
+                    logger.info("✅ MERLIN synthesis complete")
                     self._report_progress({
                         'type': 'agent_progress',
-                        'agent_id': 'merlin',
+                        'agent_id': 'student_evaluator',
                         'agent': 'Merlin',
-                        'status': 'revision',
-                        'message': f'🔄 Gaston flagged {_gaston_flags} issues — Merlin revising evaluation...'
+                        'status': 'completed',
+                        'message': '🧙 Merlin complete — final evaluation ready ✓'
                     })
-                    try:
-                        _feedback_msg = f"QUALITY REVIEW FEEDBACK from Gaston:\nFlags: {gaston_result.get('review_flags', [])}\nConsistency score: {_gaston_consistency}/100\nPlease revise your evaluation addressing these concerns."
-                        merlin_agent = self.agents['student_evaluator']
-                        _revision = await asyncio.to_thread(
-                            merlin_agent.process,
-                            _feedback_msg
-                        )
-                        if _revision:
-                            self.evaluation_results['results']['merlin_revision'] = _revision
-                            logger.info("✅ Merlin revision complete")
-                            # Re-run Gaston on revision
-                            try:
-                                _gaston_r2 = await asyncio.to_thread(
-                                    gaston.audit_evaluation,
-                                    _revision if isinstance(_revision, dict) else {'raw': _revision},
-                                    self.evaluation_results['results'],
-                                    self.evaluation_results['results'].get('_normalized_scores', {}),
-                                    self.evaluation_results['results'].get('_context_multiplier'),
-                                )
-                                self.evaluation_results['results']['gaston_revision'] = _gaston_r2
-                                logger.info("✅ Gaston re-audit: %d flags (was %d)", _gaston_r2.get('flag_count', 0), _gaston_flags)
-                            except Exception:
-                                pass
-                    except Exception as _rev_err:
-                        logger.warning("Merlin revision failed (non-blocking): %s", _rev_err)
-            except Exception as e:
-                logger.warning(f"Gaston audit failed (non-blocking): {e}")
-                self.evaluation_results['results']['gaston'] = {'status': 'error', 'error': str(e)}
+                except Exception as e:
+                    logger.error(f"❌ MERLIN synthesis failed: {e}")
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'student_evaluator',
+                        'agent': 'Merlin',
+                        'status': 'failed',
+                        'message': f'Merlin failed: {str(e)[:80]}'
+                    })
+                    # PHASE 5: Log STEP 6 MERLIN failure
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Merlin',
+                        interaction_type='step_6_merlin_synthesis',
+                        question_text='Synthesize all agent evaluations into comprehensive assessment',
+                        extracted_data={
+                            'synthesis_status': 'failed',
+                            'error': str(e)
+                        }
+                    )
 
-        # Gate check before Aurora
-        if self._is_cancelled():
-            logger.info("🛑 Pipeline cancelled after Gaston")
-            return {'status': 'cancelled', 'completed_steps': self.evaluation_results.get('completed_steps', [])}
-        self._pace('aurora')
-        
-        # ===== STEP 7: AURORA - Report generation =====
-        logger.info("📄 STEP 7: Generating report with AURORA...")
-        
-        if 'aurora' in evaluation_steps and 'aurora' in self.agents:
-            aurora = self.agents['aurora']
-            self._report_progress({
-                'type': 'agent_progress',
-                'agent_id': 'aurora',
-                'agent': 'Aurora',
-                'status': 'starting',
-                'message': '✨ Aurora is formatting the executive summary...'
-            })
-            try:
-                aurora_result = await asyncio.to_thread(
-                    aurora.format_evaluation_report,
-                    self.evaluation_results['results']
-                )
-                aurora_result = self._normalize_agent_result(aurora_result)
-                # store under both internal and canonical keys
-                self.evaluation_results['results']['report_generator'] = aurora_result
-                self.evaluation_results['results']['aurora'] = aurora_result
-                
-                # PHASE 5: Log STEP 7 AURORA report generation
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Aurora',
-                    interaction_type='step_7_aurora_report',
-                    question_text='Generate formatted evaluation report',
-                    extracted_data={
-                        'report_status': 'generated',
-                        'report_length': len(str(aurora_result)) if aurora_result else 0,
-                        'sections_included': list(aurora_result.keys()) if isinstance(aurora_result, dict) else [],
-                        'report_generated': True
-                    }
-                )
-                
-                # Save Aurora evaluation to database with student summary
-                if self.db and application_id:
-                    try:
-                        merlin_result = self.evaluation_results['results'].get('student_evaluator', {})
-                        merlin_result = self._normalize_agent_result(merlin_result)
-                        aurora_eval_id = self.db.save_aurora_evaluation(
-                            application_id=application_id,
-                            formatted_evaluation=aurora_result,
-                            merlin_score=merlin_result.get('overall_score'),
-                            merlin_recommendation=merlin_result.get('recommendation'),
-                            agents_completed=','.join(evaluation_steps)
-                        )
-                        logger.info(f"✅ Aurora evaluation saved: {aurora_eval_id}")
-                        
-                        # Create student summary from Aurora output
-                        # include every agent's raw output in the summary so
-                        # the row contains both high‑level and detailed
-                        # reasoning that can be surfaced later.
-                        student_summary = self._create_student_summary(
-                            aurora_result,
-                            merlin_result,
-                            all_agent_results=self.evaluation_results['results']
-                        )
-                        # Persist AURORA into applications.agent_results as well
+        async def _step_gaston():
+            await self._pace_async('gaston')
+            # ===== STEP 6.5: GASTON - Post-Merlin audit =====
+            logger.info("💪 STEP 6.5: Gaston auditing Merlin's evaluation...")
+            merlin_out = self.evaluation_results['results'].get('merlin') or self.evaluation_results['results'].get('student_evaluator') or {}
+            if isinstance(merlin_out, dict) and merlin_out.get('status') != 'error' and 'gaston' in self.agents:
+                if nearly_exhausted():
+                    record_degradation('skip_gaston_audit', 'post-Merlin audit')
+                    return
+                gaston = self.agents['gaston']
+                self._report_progress({
+                    'type': 'agent_progress',
+                    'agent_id': 'gaston',
+                    'agent': 'Gaston',
+                    'status': 'starting',
+                    'message': '💪 Gaston is auditing the evaluation for consistency...'
+                })
+                try:
+                    gaston_result = await asyncio.to_thread(
+                        gaston.audit_evaluation,
+                        merlin_out,
+                        self.evaluation_results['results'],
+                        self.evaluation_results['results'].get('_normalized_scores', {}),
+                        self.evaluation_results['results'].get('_context_multiplier'),
+                    )
+                    self.evaluation_results['results']['gaston'] = gaston_result
+                    # Persist to agent_results
+                    if self.db and application_id:
                         try:
                             existing = {}
                             try:
@@ -2305,52 +2411,286 @@ class SmeeOrchestrator(BaseAgent):
                                     existing = safe_load_json(existing)
                             except Exception:
                                 existing = {}
-                            existing_key = 'aurora'
-                            existing[existing_key] = aurora_result
-                            existing['report_generator'] = aurora_result
-                            try:
-                                self.db.update_application(application_id=application_id, agent_results=json.dumps(existing))
-                            except Exception:
-                                logger.debug('Could not persist aurora to agent_results')
+                            existing['gaston'] = gaston_result
+                            self.db.update_application(application_id=application_id, agent_results=json.dumps(existing))
                         except Exception:
-                            pass
-                        if student_summary and application_id:
-                            self.db.update_application(
-                                application_id=application_id,
-                                student_summary=json.dumps(student_summary)
+                            logger.debug('Could not persist gaston to agent_results')
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Gaston',
+                        interaction_type='step_6_5_gaston_audit',
+                        question_text='Audit Merlin evaluation for consistency and bias',
+                        extracted_data={
+                            'flags': gaston_result.get('flag_count', 0),
+                            'consistency': gaston_result.get('consistency_score'),
+                            'override': gaston_result.get('override_suggestion'),
+                        }
+                    )
+                    logger.info(f"✅ Gaston audit complete: {gaston_result.get('flag_count', 0)} flags")
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'gaston',
+                        'agent': 'Gaston',
+                        'status': 'completed',
+                        'message': f'💪 Gaston complete — {gaston_result.get("flag_count", 0)} review flags ✓'
+                    })
+
+                    # Sprint 2: Quality Gate — if Gaston flags ≥3 issues or consistency < 50,
+                    # re-run Merlin with Gaston's feedback (up to 1 revision cycle)
+                    _gaston_flags = gaston_result.get('flag_count', 0)
+                    _gaston_consistency = gaston_result.get('consistency_score', 100)
+                    _needs_revision = _gaston_flags >= 3 or (_gaston_consistency is not None and _gaston_consistency < 50)
+                    if _needs_revision and nearly_exhausted():
+                        record_degradation('skip_merlin_revision', f'{_gaston_flags} Gaston flags')
+                        _needs_revision = False
+                    if _needs_revision and 'student_evaluator' in self.agents:
+                        logger.info("🔄 Quality gate triggered: %d flags, consistency=%s — re-running Merlin with feedback", _gaston_flags, _gaston_consistency)
+                        self._report_progress({
+                            'type': 'agent_progress',
+                            'agent_id': 'merlin',
+                            'agent': 'Merlin',
+                            'status': 'revision',
+                            'message': f'🔄 Gaston flagged {_gaston_flags} issues — Merlin revising evaluation...'
+                        })
+                        try:
+                            _feedback_msg = f"QUALITY REVIEW FEEDBACK from Gaston:\nFlags: {gaston_result.get('review_flags', [])}\nConsistency score: {_gaston_consistency}/100\nPlease revise your evaluation addressing these concerns."
+                            merlin_agent = self.agents['student_evaluator']
+                            _revision = await asyncio.to_thread(
+                                merlin_agent.process,
+                                _feedback_msg
                             )
-                    except Exception as e:
-                        logger.warning(f"Could not save Aurora evaluation: {e}")
-                
-                logger.info("✅ AURORA report generation complete")
-                self._report_progress({
-                    'type': 'agent_progress',
-                    'agent_id': 'aurora',
-                    'agent': 'Aurora',
-                    'status': 'completed',
-                    'message': '✨ Aurora complete — executive summary ready ✓'
-                })
-            except Exception as e:
-                logger.error(f"❌ AURORA report generation failed: {e}")
+                            if _revision:
+                                self.evaluation_results['results']['merlin_revision'] = _revision
+                                logger.info("✅ Merlin revision complete")
+                                # Re-run Gaston on revision
+                                try:
+                                    _gaston_r2 = await asyncio.to_thread(
+                                        gaston.audit_evaluation,
+                                        _revision if isinstance(_revision, dict) else {'raw': _revision},
+                                        self.evaluation_results['results'],
+                                        self.evaluation_results['results'].get('_normalized_scores', {}),
+                                        self.evaluation_results['results'].get('_context_multiplier'),
+                                    )
+                                    self.evaluation_results['results']['gaston_revision'] = _gaston_r2
+                                    logger.info("✅ Gaston re-audit: %d flags (was %d)", _gaston_r2.get('flag_count', 0), _gaston_flags)
+                                except Exception:
+                                    pass
+                        except Exception as _rev_err:
+                            logger.warning("Merlin revision failed (non-blocking): %s", _rev_err)
+                except Exception as e:
+                    logger.warning(f"Gaston audit failed (non-blocking): {e}")
+                    self.evaluation_results['results']['gaston'] = {'status': 'error', 'error': str(e)}
+
+        async def _step_aurora():
+            await self._pace_async('aurora')
+            # ===== STEP 7: AURORA - Report generation =====
+            logger.info("📄 STEP 7: Generating report with AURORA...")
+
+            if 'aurora' in evaluation_steps and 'aurora' in self.agents:
+                aurora = self.agents['aurora']
                 self._report_progress({
                     'type': 'agent_progress',
                     'agent_id': 'aurora',
                     'agent': 'Aurora',
-                    'status': 'failed',
-                    'message': f'Aurora failed: {str(e)[:80]}'
+                    'status': 'starting',
+                    'message': '✨ Aurora is formatting the executive summary...'
                 })
-                # PHASE 5: Log STEP 7 AURORA failure
-                self._log_interaction(
-                    application_id=application_id,
-                    agent_name='Aurora',
-                    interaction_type='step_7_aurora_report',
-                    question_text='Generate formatted evaluation report',
-                    extracted_data={
-                        'report_status': 'failed',
-                        'error': str(e)
-                    }
-                )
-        
+                try:
+                    aurora_result = await asyncio.to_thread(
+                        aurora.format_evaluation_report,
+                        self.evaluation_results['results']
+                    )
+                    aurora_result = self._normalize_agent_result(aurora_result)
+                    # store under both internal and canonical keys
+                    self.evaluation_results['results']['report_generator'] = aurora_result
+                    self.evaluation_results['results']['aurora'] = aurora_result
+
+                    # PHASE 5: Log STEP 7 AURORA report generation
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Aurora',
+                        interaction_type='step_7_aurora_report',
+                        question_text='Generate formatted evaluation report',
+                        extracted_data={
+                            'report_status': 'generated',
+                            'report_length': len(str(aurora_result)) if aurora_result else 0,
+                            'sections_included': list(aurora_result.keys()) if isinstance(aurora_result, dict) else [],
+                            'report_generated': True
+                        }
+                    )
+
+                    logger.info("✅ AURORA report generation complete")
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'aurora',
+                        'agent': 'Aurora',
+                        'status': 'completed',
+                        'message': '✨ Aurora complete — executive summary ready ✓'
+                    })
+                except Exception as e:
+                    logger.error(f"❌ AURORA report generation failed: {e}")
+                    self._report_progress({
+                        'type': 'agent_progress',
+                        'agent_id': 'aurora',
+                        'agent': 'Aurora',
+                        'status': 'failed',
+                        'message': f'Aurora failed: {str(e)[:80]}'
+                    })
+                    # PHASE 5: Log STEP 7 AURORA failure
+                    self._log_interaction(
+                        application_id=application_id,
+                        agent_name='Aurora',
+                        interaction_type='step_7_aurora_report',
+                        question_text='Generate formatted evaluation report',
+                        extracted_data={
+                            'report_status': 'failed',
+                            'error': str(e)
+                        }
+                    )
+
+
+
+        async def _step_aurora_persist():
+            """Save Aurora's report + student summary once Gaston has also finished,
+            so the summary includes the audit (Aurora itself doesn't need it)."""
+            aurora_result = self.evaluation_results['results'].get('aurora')
+            if not aurora_result:
+                return
+            if self.db and application_id:
+                try:
+                    merlin_result = self.evaluation_results['results'].get('student_evaluator', {})
+                    merlin_result = self._normalize_agent_result(merlin_result)
+                    aurora_eval_id = self.db.save_aurora_evaluation(
+                        application_id=application_id,
+                        formatted_evaluation=aurora_result,
+                        merlin_score=merlin_result.get('overall_score'),
+                        merlin_recommendation=merlin_result.get('recommendation'),
+                        agents_completed=','.join(evaluation_steps)
+                    )
+                    logger.info(f"✅ Aurora evaluation saved: {aurora_eval_id}")
+
+                    # Create student summary from Aurora output
+                    # include every agent's raw output in the summary so
+                    # the row contains both high‑level and detailed
+                    # reasoning that can be surfaced later.
+                    student_summary = self._create_student_summary(
+                        aurora_result,
+                        merlin_result,
+                        all_agent_results=self.evaluation_results['results']
+                    )
+                    # Persist AURORA into applications.agent_results as well
+                    try:
+                        existing = {}
+                        try:
+                            rec = self.db.get_application(application_id) or {}
+                            existing = rec.get('agent_results') or {}
+                            if isinstance(existing, str):
+                                existing = safe_load_json(existing)
+                        except Exception:
+                            existing = {}
+                        existing_key = 'aurora'
+                        existing[existing_key] = aurora_result
+                        existing['report_generator'] = aurora_result
+                        try:
+                            self.db.update_application(application_id=application_id, agent_results=json.dumps(existing))
+                        except Exception:
+                            logger.debug('Could not persist aurora to agent_results')
+                    except Exception:
+                        pass
+                    if student_summary and application_id:
+                        self.db.update_application(
+                            application_id=application_id,
+                            student_summary=json.dumps(student_summary)
+                        )
+                except Exception as e:
+                    logger.warning(f"Could not save Aurora evaluation: {e}")
+
+        graph = StepGraph()
+        graph.add(Step('school_enrichment', _step_school_enrichment, outputs=('school_enrichment',)))
+        # Tiana and Mulan read only their document sections; Rapunzel uses
+        # the school context; Moana needs Rapunzel's grades.
+        for agent_id, inputs in (
+            ('application_reader', ()),
+            ('recommendation_reader', ()),
+            ('grade_reader', ('school_enrichment',)),
+            ('school_context', ('school_enrichment', 'grade_reader')),
+        ):
+            if agent_id in self.agents:
+                graph.add(Step(agent_id, functools.partial(_step_core_agent, agent_id),
+                               inputs=inputs, outputs=(agent_id,)))
+        reviews = [a for a in core_agents if SPECULATIVE_GASTON and a in quality_reviewable and a in graph]
+        for agent_id in reviews:
+            graph.add(Step(f'{agent_id}_review', functools.partial(_step_gaston_review, agent_id),
+                           inputs=(agent_id,), outputs=(f'{agent_id}_reviewed',)))
+        graph.add(Step('pocahontas', _step_pocahontas,
+                       inputs=('school_enrichment', 'school_context', 'grade_reader'),
+                       outputs=('pocahontas', '_equity_tier', '_context_multiplier')))
+        graph.add(Step('data_scientist', _step_milo, outputs=('data_scientist', 'milo_alignment')))
+        # Steps that may read an unreviewed result; the reconcile step waits
+        # for them and for every review before anything is persisted.
+        speculative_steps = [n for n in graph.downstream(reviews) if not n.endswith('_review')]
+        for name in speculative_steps:
+            step = graph.step(name)
+            step.run = _speculative(name, step.run)
+        graph.add(Step('reconcile_speculation', _step_reconcile_speculation,
+                       inputs=tuple(f'{a}_reviewed' for a in reviews),
+                       outputs=('_reviewed_core',), after=tuple(speculative_steps)))
+        graph.add(Step('persist_core_results', _step_persist_core_results,
+                       inputs=tuple(core_agents) + ('_reviewed_core',)))
+        graph.add(Step('normalize_scores', _step_normalize_scores,
+                       inputs=tuple(core_agents) + ('pocahontas', 'data_scientist', 'school_enrichment',
+                                                   '_reviewed_core'),
+                       outputs=('_normalized_scores', '_context_multiplier')))
+        # Merlin-last is a constraint on every step registered so far.
+        graph.add(Step('student_evaluator', _step_merlin,
+                       inputs=('_normalized_scores', '_context_multiplier', '_equity_tier', 'milo_alignment'),
+                       outputs=('student_evaluator', 'merlin'),
+                       after=tuple(graph.names)))
+        graph.add(Step('gaston', _step_gaston,
+                       inputs=('merlin', '_normalized_scores', '_context_multiplier'),
+                       outputs=('gaston', 'merlin_revision', 'gaston_revision')))
+        graph.add(Step('aurora', _step_aurora, inputs=('merlin',), outputs=('aurora', 'report_generator')))
+        graph.add(Step('aurora_persist', _step_aurora_persist, inputs=('aurora', 'merlin', 'gaston')))
+
+        # Steps checkpointed by an earlier run are restored rather than run,
+        # unless something they depend on has to run again.  A speculative
+        # consumer is only restored if the review it skipped ahead of is.
+        restored = set(graph.resumable(
+            [name for name in checkpoints if name in graph],
+            extra_deps={name: [f'{a}_review' for a in reviews if name in graph.downstream([a])]
+                        for name in speculative_steps},
+        ))
+        for name in graph.names:
+            step = graph.step(name)
+            step.run = with_step_budget(name, self._checkpointed(
+                step, checkpoints.get(name) if name in restored else None,
+                _restore_outputs, checkpoint_id))
+
+        step_timeline = await graph.run(
+            should_cancel=self._is_cancelled,
+            max_concurrency=STEP_CONCURRENCY or None,
+        )
+        self.evaluation_results['step_timeline'] = step_timeline
+        logger.info("🧭 Step timeline: %s", format_timeline(step_timeline))
+        self.evaluation_results['budget'] = budget_report(self._evaluation_context())
+        if self.evaluation_results['budget'].get('degraded'):
+            logger.info("⏳ Evaluation budget: %s", self.evaluation_results['budget'])
+        if reviews:
+            self.evaluation_results['speculation'] = self._speculation_metrics(
+                speculation, step_timeline, graph, reviews, speculative_steps)
+            logger.info("🎲 Speculative Gaston gate: %s", self.evaluation_results['speculation'])
+        prompt_context = PromptContext.detach(application)
+        if prompt_context is not None:
+            self.evaluation_results['prompt_tokens'] = prompt_context.report()
+            logger.info("✂️ Prompt tokens per agent (before → after): %s", {
+                agent: f"{row['tokens_before']} → {row['tokens_after']}"
+                for agent, row in self.evaluation_results['prompt_tokens'].items()
+            })
+        if step_timeline['cancelled']:
+            not_run = [n for n, info in step_timeline['steps'].items() if info['status'] == 'not_run']
+            logger.info("🛑 Pipeline cancelled before: %s", not_run)
+            return await self._finish_cancelled(application)
+
         # ===== Workflow complete =====
         logger.info("✅ 8-step workflow completed successfully")
         
@@ -2363,12 +2703,15 @@ class SmeeOrchestrator(BaseAgent):
             'message': '✅ 8-step evaluation workflow completed'
         })
         
+        await self._flush_audit_trail()
+
         # Mark application as complete in database
         if self.db and application_id:
             try:
                 self.db.update_application_status(application_id, 'Completed')
             except Exception as e:
                 logger.warning(f"Could not mark application as complete: {e}")
+        self._checkpoint_step(EVALUATION_COMPLETE_STEP, checkpoint_id)
         
         self.workflow_state = "complete"
         # Close the invoke_agent span
@@ -2378,6 +2721,83 @@ class SmeeOrchestrator(BaseAgent):
             pass
         return self.evaluation_results
 
+    async def _finish_cancelled(self, application: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap up a cancelled evaluation.
+
+        Completed steps keep their checkpoints (no completion marker is
+        written), so re-running the application resumes where it stopped.
+        """
+        token = self._cancel_token
+        PromptContext.detach(application)
+        self.workflow_state = "cancelled"
+        self._report_progress({
+            'type': 'workflow_cancelled',
+            'agent': 'Smee Orchestrator',
+            'agent_id': 'smee',
+            'status': 'cancelled',
+            'message': '🛑 Evaluation cancelled'
+        })
+        await self._flush_audit_trail()
+        try:
+            self._otel_ctx.__exit__(None, None, None)
+        except Exception:
+            pass
+        return {
+            'status': 'cancelled',
+            'reason': token.reason if token else None,
+            'completed_steps': self.evaluation_results.get('completed_steps', []),
+        }
+
+    # ── Speculative Gaston gate ──────────────────────────────────────
+
+    @staticmethod
+    def _speculation_metrics(speculation: Dict[str, Any], timeline: Dict[str, Any],
+                             graph: StepGraph, reviews: List[str],
+                             speculative_steps: List[str]) -> Dict[str, Any]:
+        """Rejection rate and estimated latency saved by the speculative gate.
+
+        Each speculative step's (first) run saved the time it overlapped
+        the Gaston reviews it would otherwise have waited for; re-running
+        stale steps after a rejection is subtracted.  Sequential consumers
+        (Moana → Pocahontas) add up correctly; parallel ones would be
+        counted twice, so treat this as an estimate.
+        """
+        steps = timeline.get('steps', {})
+        overlap_ms = 0.0
+        for name in speculative_steps:
+            info = steps.get(name, {})
+            if info.get('status') != 'completed':
+                continue
+            windows = [steps.get(f'{a}_review', {}) for a in reviews if name in graph.downstream([a])]
+            windows = [w for w in windows if w.get('status') == 'completed']
+            if not windows:
+                continue
+            start = max(info['start_ms'], min(w['start_ms'] for w in windows))
+            end = min(info['end_ms'], max(w['end_ms'] for w in windows))
+            overlap_ms += max(0.0, end - start)
+
+        reviewed = len(speculation['reviewed'])
+        rejected = len(speculation['rejected'])
+        metrics = {
+            'reviewed': list(speculation['reviewed']),
+            'rejected': list(speculation['rejected']),
+            'rejection_rate': round(rejected / reviewed, 3) if reviewed else 0.0,
+            'reexecuted_steps': list(speculation['reexecuted_steps']),
+            'reexecution_ms': speculation['reexecution_ms'],
+            'overlap_ms': round(overlap_ms, 1),
+            'latency_saved_ms': round(overlap_ms - speculation['reexecution_ms'], 1),
+        }
+        telemetry.track_event(
+            "smee_speculative_gaston",
+            properties={"rejected": ",".join(metrics['rejected'])},
+            metrics_data={
+                "reviewed": float(reviewed),
+                "rejected": float(rejected),
+                "latency_saved_ms": metrics['latency_saved_ms'],
+            },
+        )
+        return metrics
+
     # ── Score normalization ──────────────────────────────────────────
 
     @staticmethod
@@ -2825,12 +3245,19 @@ Return only the request sentence."""
             })
             return False
 
+    @staticmethod
+    async def _noop_step() -> None:
+        return None
+
     def _ensure_merlin_last(self, evaluation_steps: List[str]) -> List[str]:
         """Ensure Merlin runs after all other agents when present."""
-        steps = [step for step in evaluation_steps if step != 'student_evaluator']
+        graph = StepGraph()
+        for step in evaluation_steps:
+            if step != 'student_evaluator' and step not in graph:
+                graph.add(Step(step, self._noop_step))
         if 'student_evaluator' in evaluation_steps:
-            steps.append('student_evaluator')
-        return steps
+            graph.add(Step('student_evaluator', self._noop_step, after=tuple(graph.names)))
+        return graph.topological_order()
 
     def _order_evaluation_steps(
         self,
@@ -2840,31 +3267,30 @@ Return only the request sentence."""
         optional_agents: List[str],
         merlin_agent: str
     ) -> List[str]:
-        """Order the evaluation pipeline to match the desired workflow."""
-        steps = list(evaluation_steps or [])
-        ordered = []
-
-        def append_group(group: List[str]) -> None:
-            for agent_id in group:
-                if agent_id in steps and agent_id not in ordered:
-                    ordered.append(agent_id)
+        """Order the evaluation pipeline to match the desired workflow.
 
-        append_group(pre_core_agents)
-        append_group(core_agents)
-
-        for agent_id in steps:
-            if agent_id in ordered:
-                continue
-            if agent_id in optional_agents or agent_id == merlin_agent:
-                continue
-            ordered.append(agent_id)
-
-        append_group(optional_agents)
-
-        if merlin_agent in steps and merlin_agent not in ordered:
-            ordered.append(merlin_agent)
-
-        return ordered
+        Expressed as graph constraints: core agents run after pre-core
+        agents, optional agents after everything that isn't optional, and
+        Merlin after all of them.  Ties keep the caller's order.
+        """
+        steps = list(dict.fromkeys(evaluation_steps or []))
+        pre = [s for s in pre_core_agents if s in steps]
+        core = [s for s in core_agents if s in steps and s not in pre]
+        optional = [s for s in optional_agents if s in steps and s not in pre and s not in core]
+        rest = [s for s in steps if s not in pre and s not in core and s not in optional and s != merlin_agent]
+
+        graph = StepGraph()
+        for name in pre:
+            graph.add(Step(name, self._noop_step))
+        for name in core:
+            graph.add(Step(name, self._noop_step, after=tuple(pre)))
+        for name in rest:
+            graph.add(Step(name, self._noop_step, after=tuple(pre + core)))
+        for name in optional:
+            graph.add(Step(name, self._noop_step, after=tuple(pre + core + rest)))
+        if merlin_agent in steps:
+            graph.add(Step(merlin_agent, self._noop_step, after=tuple(graph.names)))
+        return graph.topological_order()
     
     def _report_progress(self, update: Dict[str, Any]) -> None:
         """Report progress via callback if registered."""
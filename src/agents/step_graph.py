@@ -0,0 +1,264 @@
+"""Dependency-graph scheduler for orchestrator workflow steps.
+
+Each ``Step`` declares the result keys it reads (``inputs``) and writes
+(``outputs``); a step depends on every registered step that produces one of
+its inputs, plus any step named in ``after`` (pure ordering constraints such
+as "Merlin runs after every other agent").  Inputs nobody produces are
+treated as already available — that is how optional agents drop out of the
+graph without special-casing their consumers.
+
+``StepGraph.run`` starts every step whose dependencies have finished, as
+soon as they have finished, and returns a timeline with the critical path —
+the chain of steps that actually determined end-to-end latency.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Step:
+    """One unit of work in a ``StepGraph``."""
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepRecord:
+    """Timing and outcome of one executed step (ms relative to graph start)."""
+    name: str
+    status: str = "pending"  # pending | completed | failed | cancelled | not_run
+    start_ms: float = 0.0
+    end_ms: float = 0.0
+    error: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.end_ms - self.start_ms, 1)
+
+
+class StepGraph:
+    """A set of ``Step``s plus the edges implied by their inputs/outputs."""
+
+    def __init__(self, steps: Sequence[Step] = ()):
+        self._steps: Dict[str, Step] = {}
+        for step in steps:
+            self.add(step)
+
+    def add(self, step: Step) -> "StepGraph":
+        if step.name in self._steps:
+            raise ValueError(f"Duplicate step name: {step.name}")
+        self._steps[step.name] = step
+        return self
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._steps
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._steps)
+
+    def step(self, name: str) -> Step:
+        return self._steps[name]
+
+    def downstream(self, names: Sequence[str]) -> List[str]:
+        """Every step that transitively depends on *names*, in dependency order."""
+        deps = self.dependencies()
+        reached: Set[str] = set()
+        frontier = set(names)
+        while frontier:
+            frontier = {n for n, d in deps.items() if d & frontier and n not in reached}
+            reached |= frontier
+        return [n for n in self.topological_order() if n in reached]
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Map of step name → names of the steps it waits for."""
+        producers: Dict[str, Set[str]] = {}
+        for step in self._steps.values():
+            for key in step.outputs:
+                producers.setdefault(key, set()).add(step.name)
+
+        deps: Dict[str, Set[str]] = {}
+        for step in self._steps.values():
+            needs: Set[str] = set()
+            for key in step.inputs:
+                needs |= producers.get(key, set())
+            needs |= {name for name in step.after if name in self._steps}
+            needs.discard(step.name)
+            deps[step.name] = needs
+        return deps
+
+    def resumable(self, done: Sequence[str],
+                  extra_deps: Optional[Dict[str, Sequence[str]]] = None) -> List[str]:
+        """Steps in *done* whose checkpointed outputs can stand in for a re-run.
+
+        A step is resumable only if every step it waits for is resumable
+        too, so anything downstream of a step that has to run again runs
+        again.  ``extra_deps`` adds edges the graph doesn't declare (e.g. a
+        speculative consumer on the review it skipped ahead of).
+        """
+        deps = self.dependencies()
+        for name, extra in (extra_deps or {}).items():
+            if name in deps:
+                deps[name] = deps[name] | set(extra)
+        keep = {name for name in done if name in self._steps}
+        changed = True
+        while changed:
+            stale = {name for name in keep if not deps[name] <= keep}
+            keep -= stale
+            changed = bool(stale)
+        return [name for name in self.topological_order() if name in keep]
+
+    def topological_order(self) -> List[str]:
+        """Steps in dependency order; ties keep registration order.
+
+        Raises:
+            ValueError: if the dependencies contain a cycle.
+        """
+        deps = self.dependencies()
+        position = {name: i for i, name in enumerate(self._steps)}
+        remaining = {name: set(d) for name, d in deps.items()}
+        order: List[str] = []
+        while remaining:
+            ready = sorted((n for n, d in remaining.items() if not d), key=position.__getitem__)
+            if not ready:
+                raise ValueError(f"Step graph has a cycle among: {sorted(remaining)}")
+            name = ready[0]
+            order.append(name)
+            del remaining[name]
+            for d in remaining.values():
+                d.discard(name)
+        return order
+
+    async def run(self, should_cancel: Optional[Callable[[], bool]] = None,
+                  max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Execute the graph and return its timeline (see ``timeline``).
+
+        A failing step is recorded and its dependents still run — workflow
+        steps already tolerate missing upstream results.  ``should_cancel``
+        is polled before each step starts; once it returns True no further
+        steps are started and the running ones are allowed to finish.
+        Cancelling the task running the graph cancels the steps in flight.
+        """
+        deps = self.dependencies()
+        order = self.topological_order()  # also validates acyclicity
+        records = {name: StepRecord(name, depends_on=sorted(deps[name])) for name in order}
+        pending = {name: set(deps[name]) for name in order}
+        running: Dict[asyncio.Task, str] = {}
+        cancelled = False
+        t0 = time.perf_counter()
+
+        def _now() -> float:
+            return round((time.perf_counter() - t0) * 1000, 1)
+
+        async def _execute(name: str) -> None:
+            record = records[name]
+            record.start_ms = _now()
+            try:
+                await self._steps[name].run()
+                record.status = "completed"
+            except asyncio.CancelledError:
+                record.status = "cancelled"
+                raise
+            except Exception as e:
+                record.status = "failed"
+                record.error = str(e)
+                logger.error("Step %s failed: %s", name, e, exc_info=True)
+            finally:
+                record.end_ms = _now()
+
+        try:
+            while pending or running:
+                ready = [n for n in order if n in pending and not pending[n]]
+                for name in ready:
+                    if max_concurrency and len(running) >= max_concurrency:
+                        break
+                    if should_cancel and should_cancel():
+                        cancelled = True
+                        break
+                    del pending[name]
+                    running[asyncio.create_task(_execute(name))] = name
+                if cancelled and not running:
+                    break
+                if not running:
+                    # Nothing can start: only possible after cancellation
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    finished = running.pop(task)
+                    for waiting in pending.values():
+                        waiting.discard(finished)
+                if cancelled:
+                    pending.clear()
+        except asyncio.CancelledError:
+            # The graph's own task was cancelled: stop the steps in flight
+            # before propagating, so none keeps running (or holding a slot).
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+
+        for name in pending:
+            records[name].status = "not_run"
+        for record in records.values():
+            if record.status == "pending":
+                record.status = "not_run"
+        return self.timeline(records, total_ms=_now(), cancelled=cancelled)
+
+    @staticmethod
+    def timeline(records: Dict[str, StepRecord], total_ms: float,
+                 cancelled: bool = False) -> Dict[str, Any]:
+        """Per-step timings plus the critical path.
+
+        The critical path is walked backwards from the step that finished
+        last, each time following the dependency that finished last (the one
+        the step was actually waiting on).
+        """
+        ran = {n: r for n, r in records.items() if r.status in ("completed", "failed")}
+        path: List[str] = []
+        if ran:
+            current: Optional[str] = max(ran, key=lambda n: ran[n].end_ms)
+            while current:
+                path.append(current)
+                upstream = [d for d in ran[current].depends_on if d in ran]
+                current = max(upstream, key=lambda n: ran[n].end_ms) if upstream else None
+            path.reverse()
+
+        busy_ms = sum(r.duration_ms for r in ran.values())
+        return {
+            "total_ms": total_ms,
+            "cancelled": cancelled,
+            "critical_path": path,
+            "critical_path_ms": round(sum(ran[n].duration_ms for n in path), 1),
+            "parallelism": round(busy_ms / total_ms, 2) if total_ms else 0.0,
+            "steps": {
+                n: {
+                    "status": r.status,
+                    "start_ms": r.start_ms,
+                    "end_ms": r.end_ms,
+                    "duration_ms": r.duration_ms if r.name in ran else 0.0,
+                    "depends_on": r.depends_on,
+                    **({"error": r.error} if r.error else {}),
+                }
+                for n, r in records.items()
+            },
+        }
+
+
+def format_timeline(timeline: Dict[str, Any]) -> str:
+    """One-line summary for logs: total, critical path and its share."""
+    steps = timeline.get("steps", {})
+    path = " → ".join(f"{n}({steps[n]['duration_ms']:.0f}ms)" for n in timeline.get("critical_path", []))
+    return (
+        f"total {timeline.get('total_ms', 0):.0f}ms, parallelism {timeline.get('parallelism', 0):.2f}x, "
+        f"critical path: {path or 'n/a'}"
+    )
@@ -4,6 +4,11 @@ import json
 from typing import Dict, Any, Optional, List
 from openai import AzureOpenAI
 from src.agents.base_agent import BaseAgent
+from src.agents.prompt_context import PromptContext
+from src.token_budget import fit_document
+
+# Token budget for the application/essay text in the extraction prompt.
+APPLICATION_INPUT_TOKENS = 2000
 from src.utils import safe_load_json
 from src.agents.telemetry_helpers import agent_run, tool_call
 
@@ -37,9 +42,19 @@ class TianaApplicationReader(BaseAgent):
             try:
                 # Two-step: first ask model to extract evidence and key facts,
                 # then ask it to format those findings into the strict JSON schema.
-                # Use up to 8000 chars — Belle's section detection now routes only
-                # application/essay pages here, so the input is focused.
-                application_input = application_text[:8000]
+                # Belle's section detection routes only application/essay pages
+                # here, so the input is focused; long packets are fitted page
+                # by page to APPLICATION_INPUT_TOKENS.
+                prompt_context = PromptContext.of(application)
+                if prompt_context is not None and application.get("application_text"):
+                    application_input = prompt_context.section(
+                        "application_text", APPLICATION_INPUT_TOKENS, agent=self.name,
+                        prefer="application", legacy=application_text[:8000],
+                    )
+                else:
+                    application_input = fit_document(
+                        application_text, APPLICATION_INPUT_TOKENS, self.model, prefer="application"
+                    ).text
                 query_messages = [
                     {"role": "system", "content": "You are a precise extractor. Read the user's application and return concise evidence bullets and facts useful for constructing a structured profile.\n\nIMPORTANT: The text may contain page markers like '--- PAGE N of M ---'. These indicate page boundaries from a multi-page PDF. Note which page each piece of evidence comes from (e.g., 'Page 3: student describes lab experience'). Focus on application/essay content and ignore any transcript or recommendation sections if present.\n\n2024 NEXTGEN SCORING RUBRIC — EXTRACT EVIDENCE FOR THESE DIMENSIONS:\n1. Interest/Enthusiasm for STEM career (0-3 Points): Look for passion for STEM, specific STEM interests, career goals in science/medicine/engineering/genetics, motivation statements.\n2. Personal Essay/Video quality (0-3 Points): Look for effort put into the application, clarity of writing, compelling personal narrative, depth of reflection, authenticity.\n3. Previous research experience: Flag any mentions of lab work, research programs, science fairs, independent projects.\n4. Underrepresented/under-resourced background signals (SES criteria): Note any mentions of socioeconomic challenges, first-generation status, limited resources, rural/urban underserved areas.\n5. Quick-pass signals: Does the student show DEEP interest in STEM? Did they put real EFFORT into this application? If neither is evident, flag that."},
                     {"role": "user", "content": f"Extract key facts and evidence from the application for: {applicant_name}.\n\nApplication text:\n{application_input}"}
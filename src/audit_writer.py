@@ -0,0 +1,179 @@
+"""Background, batched writer for audit-trail and telemetry rows.
+
+``Database.log_agent_interaction`` is one ``INSERT ... RETURNING`` round
+trip per call, and the orchestrator makes dozens of them per evaluation on
+its async path.  ``AuditWriter`` takes rows off that path: ``submit`` only
+appends to a bounded queue, and a daemon thread writes rows in batches when
+``AUDIT_BATCH_SIZE`` rows are waiting or ``AUDIT_FLUSH_INTERVAL`` seconds
+have passed — whichever comes first.
+
+When the queue is full, ``submit`` waits at most its ``timeout`` for room
+and then drops the row (both are counted) rather than stalling the caller; ``flush`` waits until everything submitted so far has been
+written, and ``close`` flushes and stops the thread (also run at exit).
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "5000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "50"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+
+
+class _FlushMarker:
+    """Queued behind pending rows; the worker sets ``done`` once it gets here."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Buffer rows and hand them to ``write_batch`` from a worker thread.
+
+    Args:
+        write_batch: Called with a list of row dicts; must write all of them
+            or raise.  A failed batch is retried row by row so one bad row
+            doesn't lose its neighbours.
+        name: Used for the thread name and log messages.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], Any],
+                 name: str = "audit", max_queue: int = AUDIT_QUEUE_MAX,
+                 batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval: float = AUDIT_FLUSH_INTERVAL):
+        self._write_batch = write_batch
+        self.name = name
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._counters = {"enqueued": 0, "written": 0, "dropped": 0, "throttled": 0,
+                          "failed": 0, "batches": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"{name}-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── Producer side ──────────────────────────────────────────────────
+
+    def submit(self, row: Dict[str, Any], timeout: float = 0.0) -> bool:
+        """Queue one row; returns False (and counts a drop) if the queue is full.
+
+        With a positive *timeout* a full queue first makes the caller wait
+        that long for room (counted as ``throttled``) before dropping.
+        """
+        if self._closed:
+            self._count("dropped")
+            return False
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            if timeout > 0:
+                self._count("throttled")
+                try:
+                    self._queue.put(row, timeout=timeout)
+                    self._count("enqueued")
+                    return True
+                except queue.Full:
+                    pass
+            self._count("dropped")
+            logger.warning("%s writer queue full (%d) — dropping row", self.name, self._queue.maxsize)
+            return False
+        self._count("enqueued")
+        return True
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every row submitted before this call is written.
+
+        Returns False if *timeout* expires first (rows keep being written).
+        """
+        if self._closed or not self._thread.is_alive():
+            return self._queue.empty()
+        marker = _FlushMarker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush outstanding rows and stop the worker thread."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters plus the current queue depth."""
+        with self._lock:
+            counters = dict(self._counters)
+        counters["queue_depth"] = self._queue.qsize()
+        return counters
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += n
+
+    # ── Worker side ────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        markers: List[_FlushMarker] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if isinstance(item, _FlushMarker):
+                markers.append(item)
+            elif item is not None and not stop:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if batch and (len(batch) >= self.batch_size or due or markers or stop):
+                self._write(batch)
+                batch = []
+                deadline = None
+            for marker in markers:
+                marker.done.set()
+            markers = []
+            if stop:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._write_batch(batch)
+            self._count("written", len(batch))
+            self._count("batches")
+            return
+        except Exception as e:
+            logger.warning("%s batch write of %d rows failed (%s); retrying row by row",
+                           self.name, len(batch), e)
+        for row in batch:
+            try:
+                self._write_batch([row])
+                self._count("written")
+            except Exception as e:
+                self._count("failed")
+                logger.warning("Could not write %s row: %s", self.name, e)
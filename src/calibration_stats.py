@@ -0,0 +1,449 @@
+"""Calibration statistics engine: AI vs. human rubric scores, vectorized.
+
+``Database.get_calibration_rows`` returns one row per training record
+that has a 2024 human rubric score, with the AI side read from the typed
+``evaluation_summary`` columns.  ``build_calibration_report`` loads those
+rows into NumPy arrays once, then computes every dimension at the same
+time: Pearson correlation, MAE, quadratic-weighted kappa with its
+confusion matrix, and a percentile bootstrap 95% confidence interval.
+Bootstrap resamples students once per block, and every interval's sums
+come from a single draw-count × feature matrix product.  It also builds the
+score distributions and selection accuracy.
+
+The report only changes when its inputs do.  ``load_calibration_report``
+caches it under ``Database.get_calibration_version``, an md5 over the
+joined rows computed in the database, so a repeat view costs one small
+query.
+"""
+
+import os
+import threading
+from operator import itemgetter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.evaluation_summary import SCORE_COLUMNS
+
+# Resamples per bootstrap confidence interval (0 disables the intervals)
+CALIBRATION_BOOTSTRAP_SAMPLES = int(os.getenv("CALIBRATION_BOOTSTRAP_SAMPLES", "1000"))
+
+# Resamples drawn per vectorized block; bounds memory at 10k+ pairs
+_BOOTSTRAP_BLOCK = 100
+_BOOTSTRAP_SEED = 42
+
+# Human rubric fields and the row keys they are read from
+HUMAN_FIELDS = (
+    ('academic_record', 'human_academic'),
+    ('stem_interest', 'human_stem'),
+    ('essay_video', 'human_essay'),
+    ('recommendation', 'human_rec'),
+    ('bonus', 'human_bonus'),
+    ('total_rating', 'human_total'),
+)
+
+# Human rubric dimension vs. the closest AI dimension.  ``max_scale`` is set
+# where both sides share the rubric scale (Milo's estimate), which enables
+# MAE and kappa.
+DIMENSIONS = (
+    {'human_field': 'academic_record', 'ai_field': 'rapunzel_gpa', 'label': 'Academic Record',
+     'human_scale': '0-3', 'ai_scale': '0-100 (normalized)', 'max_scale': None},
+    {'human_field': 'stem_interest', 'ai_field': 'tiana_stem', 'label': 'STEM Interest',
+     'human_scale': '0-3', 'ai_scale': '0-100 (normalized)', 'max_scale': None},
+    {'human_field': 'essay_video', 'ai_field': 'tiana_essay', 'label': 'Essay / Video',
+     'human_scale': '0-3', 'ai_scale': '0-100 (normalized)', 'max_scale': None},
+    {'human_field': 'recommendation', 'ai_field': 'mulan_recommendation', 'label': 'Recommendation',
+     'human_scale': '0-2', 'ai_scale': '0-100 (normalized)', 'max_scale': None},
+    {'human_field': 'academic_record', 'ai_field': 'milo_academic', 'label': 'Academic (Milo est.)',
+     'human_scale': '0-3', 'ai_scale': '0-3 (Milo estimated)', 'max_scale': 3.0},
+    {'human_field': 'stem_interest', 'ai_field': 'milo_stem', 'label': 'STEM (Milo est.)',
+     'human_scale': '0-3', 'ai_scale': '0-3 (Milo estimated)', 'max_scale': 3.0},
+    {'human_field': 'essay_video', 'ai_field': 'milo_essay', 'label': 'Essay (Milo est.)',
+     'human_scale': '0-3', 'ai_scale': '0-3 (Milo estimated)', 'max_scale': 3.0},
+    {'human_field': 'recommendation', 'ai_field': 'milo_rec', 'label': 'Rec (Milo est.)',
+     'human_scale': '0-2', 'ai_scale': '0-2 (Milo estimated)', 'max_scale': 2.0},
+)
+
+_HUMAN_INDEX = {field: i for i, (field, _) in enumerate(HUMAN_FIELDS)}
+_AI_INDEX = {col: i for i, col in enumerate(SCORE_COLUMNS)}
+
+
+def _safe_float(val) -> Optional[float]:
+    if val is None:
+        return None
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def _matrix(rows: List[Dict[str, Any]], keys: Tuple[str, ...]) -> np.ndarray:
+    """``rows[*][keys]`` as an (n, len(keys)) float array, NaN where missing or non-numeric."""
+    try:
+        get = itemgetter(*keys)
+        values = [get(row) for row in rows]
+    except KeyError:
+        values = [tuple(row.get(k) for k in keys) for row in rows]
+    try:
+        matrix = np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        matrix = np.array([[_safe_float(v) for v in row] for row in values], dtype=float)
+    return matrix.reshape(len(rows), len(keys))
+
+
+def _nullable(matrix: np.ndarray) -> List[list]:
+    """*matrix* as nested lists of floats, None where NaN."""
+    out = matrix.astype(object)
+    out[np.isnan(matrix)] = None
+    return out.tolist()
+
+
+def _maybe(value) -> Optional[float]:
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def _round(value, digits: int) -> Optional[float]:
+    value = _maybe(value)
+    return None if value is None else round(value, digits)
+
+
+# ---------------------------------------------------------------------------
+# Vectorized statistics
+# ---------------------------------------------------------------------------
+
+def masked_pearson(h: np.ndarray, a: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Column-wise Pearson r over pairwise-complete rows of two (n, d) arrays.
+
+    Returns ``(r, n)``; r is NaN for columns with fewer than 3 pairs.
+    """
+    mask = ~(np.isnan(h) | np.isnan(a))
+    n = mask.sum(axis=0)
+    safe_n = np.maximum(n, 1)
+    hm = np.where(mask, h, 0).sum(axis=0) / safe_n
+    am = np.where(mask, a, 0).sum(axis=0) / safe_n
+    hc = np.where(mask, h - hm, 0)
+    ac = np.where(mask, a - am, 0)
+    num = (hc * ac).sum(axis=0)
+    den = np.sqrt((hc * hc).sum(axis=0) * (ac * ac).sum(axis=0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = np.where((den > 0) & (n >= 3), num / np.where(den > 0, den, 1), np.nan)
+    return r, n
+
+
+def _bins(values: np.ndarray, min_val: float, max_val: float, n_bins: int) -> np.ndarray:
+    scaled = np.rint((values - min_val) / (max_val - min_val) * (n_bins - 1))
+    return np.clip(scaled, 0, n_bins - 1).astype(np.intp)
+
+
+def _kappa_from_confusion(observed: np.ndarray) -> np.ndarray:
+    """Quadratic-weighted kappa of (..., k, k) confusion matrices."""
+    k = observed.shape[-1]
+    n = observed.sum(axis=(-2, -1), keepdims=True)
+    expected = observed.sum(axis=-1, keepdims=True) * observed.sum(axis=-2, keepdims=True) / np.maximum(n, 1)
+    idx = np.arange(k)
+    weights = (idx[:, None] - idx[None, :]) ** 2 / max((k - 1) ** 2, 1)
+    num = (weights * observed).sum(axis=(-2, -1))
+    den = (weights * expected).sum(axis=(-2, -1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(den > 0, 1 - num / np.where(den > 0, den, 1), np.where(num == 0, 1.0, np.nan))
+
+
+def confusion_matrix(x: np.ndarray, y: np.ndarray, min_val: float = 0,
+                     max_val: float = 3, n_bins: int = 0) -> np.ndarray:
+    """(n_bins, n_bins) counts of human bin (rows) vs. AI bin (columns).
+
+    Rubric scores (0-3) round directly to integer bins; larger scales are
+    divided into *n_bins* equal bins.
+    """
+    if n_bins <= 0:
+        n_bins = int(max_val - min_val) + 1
+    xb = _bins(x, min_val, max_val, n_bins)
+    yb = _bins(y, min_val, max_val, n_bins)
+    return np.bincount(xb * n_bins + yb, minlength=n_bins * n_bins).reshape(n_bins, n_bins)
+
+
+def quadratic_weighted_kappa(x: np.ndarray, y: np.ndarray, min_val: float = 0,
+                             max_val: float = 3, n_bins: int = 0) -> Optional[float]:
+    """Quadratic-weighted Cohen's kappa for ordinal agreement (None below 3 pairs)."""
+    if len(x) < 3 or len(y) < 3:
+        return None
+    n = min(len(x), len(y))
+    kappa = _kappa_from_confusion(confusion_matrix(x[:n], y[:n], min_val, max_val, n_bins))
+    return _round(kappa, 3)
+
+
+def _pearson_features(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """(n, 6) per-row terms whose sums give Pearson r: 1, x, y, x², y², xy (0 if unpaired)."""
+    mask = ~(np.isnan(x) | np.isnan(y))
+    x0 = np.where(mask, x, 0.0)
+    y0 = np.where(mask, y, 0.0)
+    return np.column_stack([mask.astype(float), x0, y0, x0 * x0, y0 * y0, x0 * y0])
+
+
+def _pearson_from_sums(sums: np.ndarray) -> np.ndarray:
+    """Pearson r from (..., 6) sums of ``_pearson_features``; NaN below 3 pairs."""
+    n, sx, sy, sxx, syy, sxy = np.moveaxis(sums, -1, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vx = sxx - sx * sx / n
+        vy = syy - sy * sy / n
+        cov = sxy - sx * sy / n
+        ok = (n >= 3) & (vx > 1e-12 * np.maximum(sxx, 1)) & (vy > 1e-12 * np.maximum(syy, 1))
+        return np.where(ok, cov / np.sqrt(np.where(ok, vx * vy, 1)), np.nan)
+
+
+def _kappa_features(x: np.ndarray, y: np.ndarray, max_val: float) -> np.ndarray:
+    """(n, k²) one-hot confusion cell per paired row (all zero if unpaired)."""
+    k = int(max_val) + 1
+    mask = ~(np.isnan(x) | np.isnan(y))
+    cells = _bins(np.nan_to_num(x), 0, max_val, k) * k + _bins(np.nan_to_num(y), 0, max_val, k)
+    features = np.zeros((len(x), k * k))
+    features[np.flatnonzero(mask), cells[mask]] = 1.0
+    return features
+
+
+def bootstrap_sums(features: np.ndarray, samples: int, rng: np.random.Generator) -> np.ndarray:
+    """(samples, F) column sums of *features* over bootstrap resamples of its rows.
+
+    Each block of resamples becomes a (b, n) matrix of draw counts, so every
+    statistic's sums for every resample come from one matrix product.
+    """
+    n = features.shape[0]
+    blocks = []
+    for start in range(0, samples, _BOOTSTRAP_BLOCK):
+        b = min(_BOOTSTRAP_BLOCK, samples - start)
+        draws = rng.integers(0, n, size=(b, n)) + (np.arange(b) * n)[:, None]
+        counts = np.bincount(draws.ravel(), minlength=b * n).reshape(b, n)
+        blocks.append(counts.astype(float) @ features)
+    return np.concatenate(blocks)
+
+
+def _interval(draws: np.ndarray) -> Optional[List[float]]:
+    """Percentile 95% interval of the non-NaN *draws*."""
+    draws = draws[~np.isnan(draws)]
+    if draws.size == 0:
+        return None
+    lo, hi = np.percentile(draws, [2.5, 97.5])
+    return [round(float(lo), 3), round(float(hi), 3)]
+
+
+def distribution(values: np.ndarray, label: str) -> Dict[str, Any]:
+    """Basic distribution stats (order-statistic median and quartiles)."""
+    values = np.sort(values[~np.isnan(values)])
+    n = len(values)
+    if not n:
+        return {'label': label, 'n': 0}
+    return {
+        'label': label,
+        'n': n,
+        'min': round(float(values[0]), 1),
+        'max': round(float(values[-1]), 1),
+        'mean': round(float(values.mean()), 1),
+        'median': round(float(values[n // 2]), 1),
+        'p25': round(float(values[n // 4]), 1) if n >= 4 else None,
+        'p75': round(float(values[3 * n // 4]), 1) if n >= 4 else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+class CalibrationArrays:
+    """Calibration rows as aligned NumPy columns (NaN = missing)."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.n = len(rows)
+        keys = tuple(key for _, key in HUMAN_FIELDS) + tuple(f'ai_{col}' for col in SCORE_COLUMNS) \
+            + ('ai_overall', 'nextgen_match')
+        matrix = _matrix(rows, keys)
+        self.human = matrix[:, :len(HUMAN_FIELDS)]
+        self.ai = matrix[:, len(HUMAN_FIELDS):-2]
+        self.ai_overall = matrix[:, -2]
+        self.nextgen_match = matrix[:, -1]
+        selected = [row.get('human_selected') for row in rows]
+        selected = [s if s is not None else row.get('was_selected') for s, row in zip(selected, rows)]
+        self.selected_known = np.array([s is not None for s in selected], dtype=bool)
+        self.selected = np.array([bool(s) for s in selected], dtype=bool)
+        self.has_ai = ~(np.isnan(self.ai[:, _AI_INDEX['tiana_readiness']])
+                        & np.isnan(self.ai[:, _AI_INDEX['rapunzel_gpa']]))
+
+    def human_field(self, field: str) -> np.ndarray:
+        return self.human[:, _HUMAN_INDEX[field]]
+
+
+def build_pairs(rows: List[Dict[str, Any]], arrays: CalibrationArrays) -> List[Dict[str, Any]]:
+    """The per-student pairs the report lists (values from the decoded arrays)."""
+    human_fields = [field for field, _ in HUMAN_FIELDS]
+    human = _nullable(arrays.human)
+    ai = _nullable(arrays.ai)
+    overall = _nullable(arrays.ai_overall[:, None])
+    match = _nullable(arrays.nextgen_match[:, None])
+    has_ai = arrays.has_ai.tolist()
+    pairs = []
+    for i, row in enumerate(rows):
+        was_selected = row.get('human_selected')
+        if was_selected is None:
+            was_selected = row.get('was_selected')
+        pairs.append({
+            'application_id': row.get('application_id'),
+            'name': row.get('applicant_name', ''),
+            'school': row.get('high_school', ''),
+            'was_selected': was_selected,
+            'human': dict(zip(human_fields, human[i])),
+            'ai': {col: v for col, v in zip(SCORE_COLUMNS, ai[i]) if v is not None},
+            'ai_overall': overall[i][0],
+            'ai_recommendation': row.get('ai_recommendation'),
+            'nextgen_match': match[i][0],
+            'has_ai_scores': has_ai[i],
+        })
+    return pairs
+
+
+def dimension_stats(arrays: CalibrationArrays, rows_mask: np.ndarray,
+                    bootstrap_samples: int = CALIBRATION_BOOTSTRAP_SAMPLES) -> Dict[str, Any]:
+    """Every dimension's correlation, MAE and kappa over *rows_mask*, plus the overall r.
+
+    Bootstrap intervals resample students (rows of *rows_mask*) and share
+    the resamples across all statistics.  Returns ``{'dimensions': [...],
+    'overall_correlation': ..., 'overall_correlation_ci': ...}``.
+    """
+    h = np.column_stack([arrays.human_field(d['human_field']) for d in DIMENSIONS]
+                        + [arrays.human_field('total_rating')])[rows_mask]
+    a = np.column_stack([arrays.ai[:, _AI_INDEX[d['ai_field']]] for d in DIMENSIONS]
+                        + [arrays.ai_overall])[rows_mask]
+    r, n = masked_pearson(h, a)
+    valid = ~(np.isnan(h) | np.isnan(a))
+    mae = np.where(valid, np.abs(h - a), 0).sum(axis=0) / np.maximum(n, 1)
+
+    # Feature columns: 6 Pearson sums per comparison, then each kappa's cells
+    blocks = [_pearson_features(h[:, j], a[:, j]) for j in range(h.shape[1])]
+    kappa_slices = {}
+    offset = 6 * len(blocks)
+    for j, dim in enumerate(DIMENSIONS):
+        if dim['max_scale']:
+            cells = _kappa_features(h[:, j], a[:, j], dim['max_scale'])
+            kappa_slices[j] = slice(offset, offset + cells.shape[1])
+            offset += cells.shape[1]
+            blocks.append(cells)
+    draws = None
+    if bootstrap_samples > 0 and len(h) >= 3:
+        draws = bootstrap_sums(np.hstack(blocks), bootstrap_samples,
+                               np.random.default_rng(_BOOTSTRAP_SEED))
+
+    def correlation_ci(j):
+        if draws is None or np.isnan(r[j]):
+            return None
+        return _interval(_pearson_from_sums(draws[:, 6 * j:6 * j + 6]))
+
+    results = []
+    for j, dim in enumerate(DIMENSIONS):
+        entry = {
+            'label': dim['label'],
+            'human_scale': dim['human_scale'],
+            'ai_scale': dim['ai_scale'],
+            'n_pairs': int(n[j]),
+            'correlation': _round(r[j], 3),
+            'correlation_ci': correlation_ci(j),
+            'mae': None,
+            'kappa': None,
+        }
+        # For same-scale comparisons (Milo), compute MAE and kappa
+        if dim['max_scale'] and n[j]:
+            hv, av = h[valid[:, j], j], a[valid[:, j], j]
+            k = int(dim['max_scale']) + 1
+            entry['mae'] = round(float(mae[j]), 2)
+            entry['kappa'] = quadratic_weighted_kappa(hv, av, 0, dim['max_scale'])
+            entry['confusion_matrix'] = confusion_matrix(hv, av, 0, dim['max_scale']).tolist()
+            if entry['kappa'] is not None and draws is not None:
+                observed = draws[:, kappa_slices[j]].reshape(-1, k, k)
+                entry['kappa_ci'] = _interval(_kappa_from_confusion(observed))
+        results.append(entry)
+
+    overall = len(DIMENSIONS)
+    return {
+        'dimensions': results,
+        'overall_correlation': _round(r[overall], 3),
+        'overall_correlation_ci': correlation_ci(overall),
+    }
+
+
+def build_calibration_report(rows: List[Dict[str, Any]],
+                             bootstrap_samples: int = CALIBRATION_BOOTSTRAP_SAMPLES) -> Dict[str, Any]:
+    """The calibration report (``pairs`` and ``summary``) for *rows*."""
+    if not rows:
+        return {
+            'status': 'success',
+            'message': 'No matched training records with both AI and human scores',
+            'pairs': [],
+            'summary': {},
+        }
+    arrays = CalibrationArrays(rows)
+    with_ai = arrays.has_ai
+
+    summary: Dict[str, Any] = {
+        'total_paired': arrays.n,
+        'with_ai_scores': int(with_ai.sum()),
+        'without_ai_scores': int((~with_ai).sum()),
+        'selected_count': int((arrays.selected_known & arrays.selected).sum()),
+        'not_selected_count': int((arrays.selected_known & ~arrays.selected).sum()),
+    }
+
+    # Dimension-level correlations (AI vs human) and overall alignment
+    stats = dimension_stats(arrays, with_ai, bootstrap_samples)
+    summary['dimensions'] = stats['dimensions']
+
+    if with_ai.any():
+        if stats['overall_correlation'] is not None:
+            summary['overall_correlation'] = stats['overall_correlation']
+            summary['overall_correlation_ci'] = stats['overall_correlation_ci']
+
+        # Selection prediction accuracy (NextGen match >= 50 predicts selection)
+        known = with_ai & arrays.selected_known
+        total = int(known.sum())
+        if total:
+            predicted = np.nan_to_num(arrays.nextgen_match[known], nan=0.0) >= 50
+            summary['selection_accuracy'] = round(
+                float((predicted == arrays.selected[known]).mean()) * 100, 1)
+            summary['selection_total'] = total
+
+    # Score distribution
+    summary['human_distribution'] = distribution(arrays.human_field('total_rating'), 'human')
+    if with_ai.any():
+        summary['ai_distribution'] = distribution(arrays.ai_overall[with_ai], 'ai')
+
+    return {
+        'status': 'success',
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'pairs': build_pairs(rows, arrays),
+        'summary': summary,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+_cache_lock = threading.Lock()
+_cached: Tuple[Optional[str], Optional[Dict[str, Any]]] = (None, None)
+
+
+def load_calibration_report(db) -> Dict[str, Any]:
+    """The calibration report, rebuilt only when the data-version stamp changes."""
+    global _cached
+    version = db.get_calibration_version()
+    with _cache_lock:
+        cached_version, report = _cached
+    if version is not None and version == cached_version:
+        return report
+    report = build_calibration_report(db.get_calibration_rows())
+    if version is not None:
+        with _cache_lock:
+            _cached = (version, report)
+    return report
+
+
+def clear_calibration_cache() -> None:
+    global _cached
+    with _cache_lock:
+        _cached = (None, None)
@@ -1,6 +1,6 @@
 """Database connection and models for the application evaluation system - PostgreSQL."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable
 from datetime import datetime
 import sqlite3
 try:
@@ -26,11 +26,22 @@ try:
     from logger import app_logger as logger
 except Exception:
     from .logger import app_logger as logger
+import base64
 import json
+import os
+import threading
 import time
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse, quote
 from decimal import Decimal
 from src.utils import safe_load_json
+from src.evaluation_summary import SCORE_COLUMNS, SUMMARY_COLUMNS, summarize
+
+# applications columns evaluation_summary is derived from; writing any of
+# them through update_application refreshes the application's summary row
+EVALUATION_SUMMARY_SOURCES = frozenset({'agent_results', 'student_summary', 'nextgen_match'})
+
+# Guards the lazy start of Database.audit_writer
+_audit_writer_lock = threading.Lock()
 
 
 class Database:
@@ -48,17 +59,7 @@ class Database:
         training_col = self.get_training_example_column() or "is_training_example"
         test_col = self.get_test_data_column() or "is_test_data"
 
-        where_clauses = []
-        params = []
-        if is_training:
-            where_clauses.append(f"a.{training_col} = TRUE")
-            where_clauses.append(f"(a.{test_col} = FALSE OR a.{test_col} IS NULL)")
-        else:
-            where_clauses.append(f"(a.{training_col} = FALSE OR a.{training_col} IS NULL)")
-            where_clauses.append(f"(a.{test_col} = FALSE OR a.{test_col} IS NULL)")
-        if search_query:
-            where_clauses.append(f"(a.{applicant_col} ILIKE %s OR a.{email_col} ILIKE %s)")
-            params.extend([f"%{search_query}%", f"%{search_query}%"])
+        where_clauses, params = self._student_list_filters(is_training, search_query)
         where_clause = " AND ".join(where_clauses)
         # If the new student_summary column exists we can return it here and
         # later convert it to a Python object.  We don't attempt any JSON
@@ -178,6 +179,236 @@ class Database:
                     pass
 
         return rows
+
+
+    def _student_list_filters(self, is_training: bool, search_query: str = None) -> tuple:
+        """WHERE clauses (over alias ``a``) and params shared by the student list queries."""
+        applicant_col = self.get_applications_column("applicant_name") or "applicant_name"
+        email_col = self.get_applications_column("email") or "email"
+        training_col = self.get_training_example_column() or "is_training_example"
+        test_col = self.get_test_data_column() or "is_test_data"
+
+        where_clauses = []
+        params = []
+        if is_training:
+            where_clauses.append(f"a.{training_col} = TRUE")
+        else:
+            where_clauses.append(f"(a.{training_col} = FALSE OR a.{training_col} IS NULL)")
+        # Test data never appears in either list
+        where_clauses.append(f"(a.{test_col} = FALSE OR a.{test_col} IS NULL)")
+        if search_query:
+            where_clauses.append(f"(a.{applicant_col} ILIKE %s OR a.{email_col} ILIKE %s)")
+            params.extend([f"%{search_query}%", f"%{search_query}%"])
+        return where_clauses, params
+
+    @staticmethod
+    def _student_page_filters(is_training: bool, filters: Dict[str, Any]) -> tuple:
+        """WHERE clauses (over the projection ``p``) and params for the list filters."""
+        clauses = []
+        params = []
+        if filters.get('school'):
+            clauses.append("p.high_school ILIKE %s")
+            params.append(f"%{filters['school']}%")
+        if filters.get('selected') is not None:
+            clauses.append("COALESCE(p.was_selected, FALSE) = %s")
+            params.append(bool(filters['selected']))
+        if is_training and filters.get('historical_match') is not None:
+            clauses.append("p.has_historical_match = %s")
+            params.append(bool(filters['historical_match']))
+        if filters.get('min_score') is not None:
+            clauses.append("p.merlin_score >= %s")
+            params.append(float(filters['min_score']))
+        if filters.get('max_score') is not None:
+            clauses.append("p.merlin_score <= %s")
+            params.append(float(filters['max_score']))
+        return clauses, params
+
+    # Keyset sort orders for get_student_page: each maps to non-NULL
+    # expressions over the projection ``p`` (application_id breaks ties),
+    # with the cast used to bind cursor values back into the query.
+    STUDENT_PAGE_SORTS = {
+        'name': [("p.sort_name", "text")],
+        'school': [("CASE WHEN COALESCE(p.high_school, '') = '' THEN 1 ELSE 0 END", "int"),
+                   ("LOWER(COALESCE(p.high_school, ''))", "text"),
+                   ("p.sort_name", "text")],
+        'score': [("COALESCE(p.merlin_score, -1)", "numeric"), ("p.sort_name", "text")],
+        'selected': [("CASE WHEN p.was_selected THEN 1 ELSE 0 END", "int"), ("p.sort_name", "text")],
+        'uploaded': [("COALESCE(p.uploaded_date, TIMESTAMP 'epoch')::text", "text")],
+    }
+
+    def _student_projection_sql(self, is_training: bool) -> str:
+        """SELECT list + FROM for one student list row.
+
+        Score and fallback school come from ``evaluation_summary`` (kept
+        current on write), so no agent JSON is read or parsed here.
+        """
+        applications_table = self.get_table_name("applications")
+        app_id_col = self.get_applications_column("application_id") or "application_id"
+        applicant_col = self.get_applications_column("applicant_name") or "applicant_name"
+        email_col = self.get_applications_column("email") or "email"
+        status_col = self.get_applications_column("status") or "status"
+        uploaded_col = self.get_applications_column("uploaded_date") or "uploaded_date"
+        was_selected_col = self.get_applications_column("was_selected") or "was_selected"
+        training_col = self.get_training_example_column() or "is_training_example"
+        test_col = self.get_test_data_column() or "is_test_data"
+        self.ensure_evaluation_summary_table()
+
+        # Written with || (immutable) so idx_applications_sort_name can serve it
+        names = [f"a.{c}" for c in ('last_name', 'first_name') if self.has_applications_column(c)]
+        sort_name = "LOWER(" + " || ' ' || ".join(
+            f"COALESCE({c}, '')" for c in names + [f"a.{applicant_col}"]) + ")"
+        select_cols = [
+            f"a.{app_id_col} AS application_id",
+            f"a.{applicant_col} AS applicant_name",
+            f"a.{email_col} AS email",
+            f"a.{status_col} AS status",
+            f"a.{uploaded_col} AS uploaded_date",
+            f"a.{was_selected_col} AS was_selected",
+            f"a.{training_col} AS is_training_example",
+            f"a.{test_col} AS is_test_data",
+        ]
+        select_cols += [f"a.{c}" for c in ('first_name', 'last_name') if self.has_applications_column(c)]
+        own_school = "NULLIF(a.high_school, '')" if self.has_applications_column('high_school') else "NULL"
+        select_cols += [
+            f"COALESCE({own_school}, es.school_name) AS high_school",
+            "es.merlin_score AS merlin_score",
+            f"{sort_name} AS sort_name",
+        ]
+        if is_training:
+            select_cols.append(
+                f"EXISTS (SELECT 1 FROM historical_scores hs WHERE hs.application_id = a.{app_id_col})"
+                " AS has_historical_match"
+            )
+        return (
+            "SELECT " + ",\n                   ".join(select_cols) + f"""
+            FROM {applications_table} a
+            LEFT JOIN evaluation_summary es ON es.application_id = a.{app_id_col}"""
+        )
+
+    @staticmethod
+    def _encode_page_cursor(sort: str, descending: bool, keys: list) -> str:
+        raw = json.dumps({'s': sort, 'd': descending, 'k': keys}, default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_page_cursor(cursor: str, sort: str, descending: bool, width: int) -> list:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            keys = data['k']
+        except Exception:
+            raise ValueError("Malformed page cursor")
+        if data.get('s') != sort or bool(data.get('d')) != descending or len(keys) != width:
+            raise ValueError("Page cursor does not match the requested sort order")
+        return keys
+
+    def get_student_page(self, is_training: bool = False, search_query: str = None,
+                         sort: str = 'name', descending: bool = False,
+                         filters: Optional[Dict[str, Any]] = None,
+                         after: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """One keyset-paginated page of the student list.
+
+        Returns ``{'students': [...], 'next_cursor': str|None, 'has_more': bool}``.
+        Pass ``next_cursor`` back as ``after`` for the following page; pages
+        stay consistent while rows are added, and the cost of a page doesn't
+        grow with its depth.  Rows carry the same keys the list template
+        reads (``merlin_score``, ``high_school``, ...), computed in SQL.
+
+        Filters: ``school`` (substring), ``selected`` (bool),
+        ``historical_match`` (bool, training only), ``min_score``,
+        ``max_score``.
+
+        Raises:
+            ValueError: unknown sort or a cursor from another sort order.
+        """
+        if sort not in self.STUDENT_PAGE_SORTS:
+            raise ValueError(f"Unknown sort: {sort}")
+        if not self.get_table_name("applications"):
+            return {'students': [], 'next_cursor': None, 'has_more': False}
+        filters = filters or {}
+        limit = max(1, min(int(limit), 500))
+        keys = self.STUDENT_PAGE_SORTS[sort] + [("p.application_id", "bigint")]
+
+        where_clauses, params = self._student_list_filters(is_training, search_query)
+        outer_clauses, outer_params = self._student_page_filters(is_training, filters)
+        params.extend(outer_params)
+        if after:
+            values = self._decode_page_cursor(after, sort, descending, len(keys))
+            left = ", ".join(expr for expr, _ in keys)
+            right = ", ".join(f"%s::{cast}" for _, cast in keys)
+            outer_clauses.append(f"({left}) {'<' if descending else '>'} ({right})")
+            params.extend(values)
+
+        direction = "DESC" if descending else "ASC"
+        query = f"""
+            SELECT p.*, {", ".join(f"{expr} AS _k{i}" for i, (expr, _) in enumerate(keys))}
+            FROM ({self._student_projection_sql(is_training)}
+                  WHERE {" AND ".join(where_clauses)}) p
+            {"WHERE " + " AND ".join(outer_clauses) if outer_clauses else ""}
+            ORDER BY {", ".join(f"{expr} {direction}" for expr, _ in keys)}
+            LIMIT %s
+        """
+        params.append(limit + 1)
+        rows = self.execute_query(query, tuple(params))
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        for row in rows:
+            cursor_keys = [row.pop(f'_k{i}', None) for i in range(len(keys))]
+            row.pop('sort_name', None)
+            if row.get('merlin_score') is not None:
+                row['merlin_score'] = float(row['merlin_score'])
+        if has_more and rows:
+            next_cursor = self._encode_page_cursor(
+                sort, descending, [float(k) if isinstance(k, Decimal) else k for k in cursor_keys])
+        return {'students': rows, 'next_cursor': next_cursor, 'has_more': has_more}
+
+    def get_student_list_counts(self, is_training: bool = False, search_query: str = None,
+                                filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Totals for the list header, in one aggregate query (no rows fetched).
+
+        *filters* are ``get_student_page``'s, so the totals match the list.
+        """
+        applications_table = self.get_table_name("applications")
+        if not applications_table:
+            return {'total': 0, 'selected': 0, 'not_selected': 0, 'historical_match': 0}
+        app_id_col = self.get_applications_column("application_id") or "application_id"
+        was_selected_col = self.get_applications_column("was_selected") or "was_selected"
+        where_clauses, params = self._student_list_filters(is_training, search_query)
+        outer_clauses, outer_params = self._student_page_filters(is_training, filters or {})
+        if outer_clauses:
+            # Filters are over projected columns (score, fallback school)
+            matched = "COUNT(*) FILTER (WHERE p.has_historical_match)" if is_training else "0"
+            rows = self.execute_query(f"""
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE p.was_selected) AS selected,
+                       {matched} AS historical_match
+                FROM ({self._student_projection_sql(is_training)}
+                      WHERE {" AND ".join(where_clauses)}) p
+                WHERE {" AND ".join(outer_clauses)}
+            """, tuple(params + outer_params))
+        else:
+            matched = "0"
+            if is_training:
+                matched = (f"COUNT(*) FILTER (WHERE EXISTS (SELECT 1 FROM historical_scores hs"
+                           f" WHERE hs.application_id = a.{app_id_col}))")
+            rows = self.execute_query(f"""
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE a.{was_selected_col}) AS selected,
+                       {matched} AS historical_match
+                FROM {applications_table} a
+                WHERE {" AND ".join(where_clauses)}
+            """, tuple(params))
+        row = rows[0] if rows else {}
+        total = int(row.get('total') or 0)
+        selected = int(row.get('selected') or 0)
+        return {
+            'total': total,
+            'selected': selected,
+            'not_selected': total - selected,
+            'historical_match': int(row.get('historical_match') or 0),
+        }
     """Database connection and operations manager for PostgreSQL."""
     
     def __init__(self):
@@ -617,6 +848,10 @@ class Database:
     
     def close(self):
         """Close database connection(s) and pool."""
+        writer = getattr(self, '_audit_writer', None)
+        if writer is not None:
+            writer.close()
+            self._audit_writer = None
         if self._pool is not None:
             try:
                 self._pool.close()
@@ -1042,7 +1277,9 @@ class Database:
                             frpl_trend_json TEXT,
                             years_of_data INTEGER,
                             latest_school_year VARCHAR(10),
-                            csv_import_date TIMESTAMP
+                            csv_import_date TIMESTAMP,
+                            enrichment_fingerprint VARCHAR(64),
+                            moana_fingerprint VARCHAR(64)
                         )
                     """)
                     cursor.execute("CREATE INDEX IF NOT EXISTS idx_school_enriched_name ON school_enriched_data(school_name)")
@@ -1097,6 +1334,8 @@ class Database:
                     'years_of_data': 'INTEGER',
                     'latest_school_year': 'VARCHAR(10)',
                     'csv_import_date': 'TIMESTAMP',
+                    'enrichment_fingerprint': 'VARCHAR(64)',
+                    'moana_fingerprint': 'VARCHAR(64)',
                 }.items():
                     if col_name not in school_columns:
                         try:
@@ -1198,6 +1437,20 @@ class Database:
             
             conn.commit()
 
+            # Keyset order of the student list's default (name) sort
+            try:
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_applications_sort_name
+                    ON applications(
+                        LOWER(COALESCE(last_name, '') || ' ' || COALESCE(first_name, '') || ' ' || COALESCE(applicant_name, '')),
+                        application_id
+                    )
+                """)
+                conn.commit()
+            except Exception as idx_err:
+                conn.rollback()
+                logger.warning(f"Could not create student list sort index: {idx_err}")
+
             # ===== HISTORICAL SCORES TABLE =====
             try:
                 cursor.execute("""
@@ -1306,6 +1559,16 @@ class Database:
             except Exception as name_err:
                 logger.warning(f"Name backfill failed during migrations: {name_err}")
 
+            # Create evaluation_summary and fill it from existing agent
+            # outputs the first time; afterwards writes keep it current.
+            try:
+                if not self.has_table('evaluation_summary'):
+                    self.ensure_evaluation_summary_table()
+                    summary_rows = self.backfill_evaluation_summary()
+                    logger.info(f"★ Backfilled {summary_rows} evaluation_summary row(s)")
+            except Exception as summary_err:
+                logger.warning(f"Evaluation summary backfill failed during migrations: {summary_err}")
+
             cursor.close()
             logger.info("⭐ COMPREHENSIVE DATABASE MIGRATIONS COMPLETED")
             
@@ -1881,7 +2144,12 @@ class Database:
         results = self.execute_query(query, (application_id,))
         if not results:
             return None
-        result = results[0]
+        return self._hydrate_application_row(results[0], application_id)
+
+    def _hydrate_application_row(self, result: Dict[str, Any], application_id: int) -> Dict[str, Any]:
+        """Parse and promote an applications row the way ``get_application`` returns it."""
+        applications_table = self.get_table_name("applications")
+        app_id_col = self.get_applications_column("application_id")
 
         # parse any JSON columns that may be stored as TEXT
         try:
@@ -1961,6 +2229,129 @@ class Database:
 
         return result
 
+    # Agent tables shown on the student detail page: the latest row of each,
+    # except Mulan, where every recommendation is listed (newest first).
+    STUDENT_DETAIL_TABLES = (
+        ('tiana', 'tiana_applications'),
+        ('rapunzel', 'rapunzel_grades'),
+        ('moana', 'student_school_context'),
+        ('mulan', 'mulan_recommendations'),
+        ('merlin', 'merlin_evaluations'),
+        ('aurora', 'aurora_evaluations'),
+    )
+
+    def _student_detail_audit_sql(self) -> Optional[tuple]:
+        """(table, app_id, agent, source, created) columns for the reprocess-notice lookup."""
+        audit_table = self.get_table_name("agent_audit_logs")
+        if not audit_table or not self.has_table(audit_table):
+            return None
+        app_id = self.resolve_table_column("agent_audit_logs", ["application_id", "applicationid"])
+        agent = self.resolve_table_column("agent_audit_logs", ["agent_name", "agentname"])
+        source = self.resolve_table_column("agent_audit_logs", ["source_file_name", "sourcefilename"])
+        created = self.resolve_table_column("agent_audit_logs", ["created_at", "createdat"]) or "created_at"
+        if not (app_id and agent and source):
+            return None
+        return audit_table, app_id, agent, source, created
+
+    def _student_detail_school_join(self) -> Optional[str]:
+        """Join condition for the school_enriched_data row matching ``a``, if both sides exist."""
+        if not self.has_table('school_enriched_data'):
+            return None
+        if not (self.has_applications_column('school_name') and self.has_applications_column('state_code')):
+            return None
+        return "LOWER(x.school_name) = LOWER(a.school_name) AND x.state_code = a.state_code"
+
+    def get_student_detail_version(self, application_id: int) -> Optional[str]:
+        """Opaque stamp that changes whenever anything on the student detail page does.
+
+        Combines a hash of the applications row with the newest timestamp
+        (and row count) of every agent table, the evaluation summary, the
+        reprocess audit entry and the school enrichment row.  Index lookups
+        only — far cheaper than loading the page.  None if the application
+        doesn't exist.
+        """
+        applications_table = self.get_table_name("applications")
+        app_id_col = self.get_applications_column("application_id") or "application_id"
+        self.ensure_evaluation_summary_table()
+        parts = ["md5(a::text)", "es.updated_at::text"]
+        for _, table in self.STUDENT_DETAIL_TABLES:
+            if self.has_table(table):
+                parts.append(f"(SELECT COUNT(*) || '@' || COALESCE(MAX(x.created_at)::text, '') FROM {table} x"
+                             f" WHERE x.application_id = a.{app_id_col})")
+        audit = self._student_detail_audit_sql()
+        if audit:
+            table, app_id, agent, _, created = audit
+            parts.append(f"(SELECT MAX(x.{created})::text FROM {table} x"
+                         f" WHERE x.{app_id} = a.{app_id_col} AND x.{agent} = 'System')")
+        school = self._student_detail_school_join()
+        if school:
+            parts.append(f"(SELECT MAX(x.updated_at)::text FROM school_enriched_data x WHERE {school})")
+        rows = self.execute_query(f"""
+            SELECT concat_ws('|', {", ".join(parts)}) AS version
+            FROM {applications_table} a
+            LEFT JOIN evaluation_summary es ON es.application_id = a.{app_id_col}
+            WHERE a.{app_id_col} = %s
+        """, (application_id,))
+        return rows[0]['version'] if rows else None
+
+    def get_student_detail_rows(self, application_id: int) -> Optional[Dict[str, Any]]:
+        """Everything the student detail page shows, in one round trip.
+
+        Returns None if the application doesn't exist, else a dict with
+        ``application`` (as ``get_application`` returns it), the raw latest
+        row of each ``STUDENT_DETAIL_TABLES`` agent (``mulan`` is a list,
+        newest first), ``reprocess_audit`` and ``school_enrichment``.  Agent
+        rows arrive via ``to_jsonb``, so JSON columns stored as TEXT are
+        still strings; ``src.student_detail`` normalizes them.
+        """
+        applications_table = self.get_table_name("applications")
+        app_id_col = self.get_applications_column("application_id") or "application_id"
+
+        selects = ["a.*"]
+        joins = []
+        for agent, table in self.STUDENT_DETAIL_TABLES:
+            if not self.has_table(table):
+                continue
+            if agent == 'mulan':
+                body = (f"SELECT jsonb_agg(to_jsonb(x) ORDER BY x.created_at DESC) AS rows FROM {table} x"
+                        f" WHERE x.application_id = a.{app_id_col}")
+            else:
+                body = (f"SELECT to_jsonb(x) AS rows FROM {table} x WHERE x.application_id = a.{app_id_col}"
+                        " ORDER BY x.created_at DESC LIMIT 1")
+            joins.append(f"LEFT JOIN LATERAL ({body}) d_{agent} ON TRUE")
+            selects.append(f"d_{agent}.rows AS _detail_{agent}")
+        audit = self._student_detail_audit_sql()
+        if audit:
+            table, app_id, agent, source, created = audit
+            joins.append(f"""LEFT JOIN LATERAL (
+                SELECT jsonb_build_object('source_file_name', x.{source}, 'created_at', x.{created}) AS rows
+                FROM {table} x WHERE x.{app_id} = a.{app_id_col} AND x.{agent} = 'System'
+                ORDER BY x.{created} DESC LIMIT 1) d_audit ON TRUE""")
+            selects.append("d_audit.rows AS _detail_reprocess_audit")
+        school = self._student_detail_school_join()
+        if school:
+            joins.append(f"LEFT JOIN LATERAL (SELECT to_jsonb(x) AS rows FROM school_enriched_data x"
+                         f" WHERE {school} LIMIT 1) d_school ON TRUE")
+            selects.append("d_school.rows AS _detail_school_enrichment")
+
+        rows = self.execute_query(f"""
+            SELECT {", ".join(selects)}
+            FROM {applications_table} a
+            {" ".join(joins)}
+            WHERE a.{app_id_col} = %s
+        """, (application_id,))
+        if not rows:
+            return None
+        row = dict(rows[0])
+        detail = {key[len('_detail_'):]: safe_load_json(row.pop(key))
+                  for key in [k for k in row if k.startswith('_detail_')]}
+        if isinstance(detail.get('aurora'), dict):
+            detail['aurora'] = self._hydrate_aurora_row(detail['aurora'])
+        if isinstance(detail.get('school_enrichment'), dict):
+            detail['school_enrichment'] = self._add_school_field_aliases(detail['school_enrichment'])
+        detail['application'] = self._hydrate_application_row(row, application_id)
+        return detail
+
     def delete_student(self, application_id: int) -> Dict[str, Any]:
         """Delete a student and all related records across all agent tables.
 
@@ -2041,6 +2432,7 @@ class Database:
         cutoff_param = (retention_days,)
         targets = [
             ("telemetry_events", "created_at"),
+            ("telemetry_rollup_minute", "bucket_start"),
             ("agent_audit_logs", "created_at"),
             ("agent_evaluation_results", "created_at"),
             ("agent_interactions", "timestamp"),
@@ -2238,6 +2630,12 @@ class Database:
         """
         return self.execute_scalar(query, (application_id, agent_name, source_file_name))
 
+    _INTERACTION_COLUMNS = (
+        "application_id, agent_name, interaction_type, question_text, "
+        "user_response, file_name, file_size, file_type, extracted_data, "
+        "timestamp, sequence_number"
+    )
+
     def log_agent_interaction(
         self,
         application_id: int,
@@ -2261,39 +2659,129 @@ class Database:
         - Data extracted from documents
         - Interaction sequence
         """
-        query = """
+        query = f"""
             INSERT INTO agent_interactions
-            (application_id, agent_name, interaction_type, question_text,
-             user_response, file_name, file_size, file_type, extracted_data,
-             timestamp, sequence_number)
+            ({self._INTERACTION_COLUMNS})
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING interaction_id
         """
-        # Ensure extracted_data is JSON serializable (convert Decimal, datetime, etc.)
-        safe_extracted = None
-        if extracted_data is not None:
+        row = self._interaction_row(
+            application_id, agent_name, interaction_type, question_text, user_response,
+            file_name, file_size, file_type, extracted_data, sequence_number,
+        )
+        return self.execute_scalar(query, self._interaction_params(row))
+
+    @classmethod
+    def _interaction_row(cls, application_id, agent_name, interaction_type, question_text=None,
+                         user_response=None, file_name=None, file_size=None, file_type=None,
+                         extracted_data=None, sequence_number=None) -> Dict[str, Any]:
+        """Snapshot one agent_interactions row (extracted_data serialized now,
+        so later mutation of the caller's dict can't change the audit record)."""
+        return {
+            'application_id': application_id,
+            'agent_name': agent_name,
+            'interaction_type': interaction_type,
+            'question_text': question_text,
+            'user_response': user_response,
+            'file_name': file_name,
+            'file_size': file_size,
+            'file_type': file_type,
+            'extracted_data': cls._dumps_extracted(extracted_data),
+            'timestamp': datetime.now(),
+            'sequence_number': sequence_number,
+        }
+
+    @staticmethod
+    def _interaction_params(row: Dict[str, Any]) -> tuple:
+        return (
+            row['application_id'], row['agent_name'], row['interaction_type'],
+            row['question_text'], row['user_response'], row['file_name'],
+            row['file_size'], row['file_type'], row['extracted_data'],
+            row['timestamp'], row['sequence_number'],
+        )
+
+    @classmethod
+    def _dumps_extracted(cls, extracted_data: Any) -> Optional[str]:
+        """JSON-encode extracted_data (convert Decimal, datetime, etc.)."""
+        if extracted_data is None:
+            return None
+        try:
+            # Single C-level pass; only unusual payloads need the recursive sanitizer
+            return json.dumps(extracted_data, default=cls._json_default)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return json.dumps(cls._sanitize_for_json(extracted_data))
+        except Exception:
+            # Fallback: stringify the object
             try:
-                safe_extracted = json.dumps(self._sanitize_for_json(extracted_data))
+                return json.dumps(str(extracted_data))
             except Exception:
-                # Fallback: stringify the object
-                try:
-                    safe_extracted = json.dumps(str(extracted_data))
-                except Exception:
-                    safe_extracted = None
+                return None
 
-        return self.execute_scalar(query, (
-            application_id,
-            agent_name,
-            interaction_type,
-            question_text,
-            user_response,
-            file_name,
-            file_size,
-            file_type,
-            safe_extracted,
-            datetime.now(),
-            sequence_number
-        ))
+    @staticmethod
+    def _json_default(obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            try:
+                return float(obj)
+            except Exception:
+                return str(obj)
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        return str(obj)
+
+    def log_agent_interactions_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many ``_interaction_row`` rows with one multi-row INSERT."""
+        if not rows:
+            return 0
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(rows))
+        params: List[Any] = []
+        for row in rows:
+            params.extend(self._interaction_params(row))
+        query = f"INSERT INTO agent_interactions ({self._INTERACTION_COLUMNS}) VALUES {placeholders}"
+        return self.execute_non_query(query, tuple(params))
+
+    @property
+    def audit_writer(self):
+        """Lazily-started background writer for agent_interactions rows.
+
+        Start-up is locked so racing first callers share one writer (and
+        one flush thread) instead of each starting their own.
+        """
+        writer = getattr(self, '_audit_writer', None)
+        if writer is not None:
+            return writer
+        with _audit_writer_lock:
+            writer = getattr(self, '_audit_writer', None)
+            if writer is None:
+                from src.audit_writer import AuditWriter
+                writer = AuditWriter(self.log_agent_interactions_batch, name="agent_interactions")
+                self._audit_writer = writer
+            return writer
+
+    def queue_agent_interaction(self, application_id: int, agent_name: str,
+                                interaction_type: str, **fields: Any) -> bool:
+        """``log_agent_interaction`` without the round trip on the caller's path.
+
+        The row is buffered and written in a batch by ``audit_writer``;
+        call ``flush_agent_interactions`` when the rows must be visible.
+        Set ``AUDIT_ASYNC=0`` to write synchronously instead.
+        """
+        if os.getenv("AUDIT_ASYNC", "1") == "0":
+            self.log_agent_interaction(application_id, agent_name, interaction_type, **fields)
+            return True
+        row = self._interaction_row(application_id, agent_name, interaction_type, **fields)
+        return self.audit_writer.submit(row)
+
+    def audit_writer_stats(self) -> Optional[Dict[str, int]]:
+        """Queue depth and enqueued/written/dropped/failed counters (None until first use)."""
+        writer = getattr(self, '_audit_writer', None)
+        return writer.stats() if writer is not None else None
+
+    def flush_agent_interactions(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until all queued agent_interactions rows are written."""
+        writer = getattr(self, '_audit_writer', None)
+        return writer.flush(timeout) if writer is not None else True
 
     @staticmethod
     def _sanitize_for_json(obj: Any) -> Any:
@@ -2597,7 +3085,7 @@ class Database:
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 RETURNING context_id
                 """
-                return self.execute_scalar(insert_query, (
+                result = self.execute_scalar(insert_query, (
                     application_id,
                     agent_name,
                     school_name,
@@ -2609,26 +3097,27 @@ class Database:
                     contextual_summary,
                     parsed_json or '{}'
                 ))
-
-            insert_query = """
-            INSERT INTO student_school_context
-            (application_id, school_name, program_access_score,
-             program_participation_score, relative_advantage_score,
-             ap_courses_available, ap_courses_taken, comparison_notes, parsed_json)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING context_id
-            """
-            return self.execute_scalar(insert_query, (
-                application_id,
-                school_name,
-                program_access_score,
-                program_participation_score,
-                relative_advantage_score,
-                ap_courses_available,
-                ap_courses_taken,
-                contextual_summary,
-                parsed_json or '{}'
-            ))
+            else:
+                insert_query = """
+                INSERT INTO student_school_context
+                (application_id, school_name, program_access_score,
+                 program_participation_score, relative_advantage_score,
+                 ap_courses_available, ap_courses_taken, comparison_notes, parsed_json)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING context_id
+                """
+                result = self.execute_scalar(insert_query, (
+                    application_id,
+                    school_name,
+                    program_access_score,
+                    program_participation_score,
+                    relative_advantage_score,
+                    ap_courses_available,
+                    ap_courses_taken,
+                    contextual_summary,
+                    parsed_json or '{}'
+                ))
+        self.refresh_evaluation_summary(application_id)
         return result
 
     def save_merlin_evaluation(
@@ -2648,7 +3137,7 @@ class Database:
             VALUES (%s, %s, %s, %s, %s, %s, %s)
             RETURNING merlin_evaluation_id
         """
-        return self.execute_scalar(query, (
+        merlin_evaluation_id = self.execute_scalar(query, (
             application_id,
             agent_name,
             overall_score,
@@ -2657,6 +3146,8 @@ class Database:
             confidence,
             parsed_json
         ))
+        self.refresh_evaluation_summary(application_id)
+        return merlin_evaluation_id
     
     def get_student_school_context(
         self,
@@ -2723,27 +3214,31 @@ class Database:
         """
         results = self.execute_query(query, (application_id,))
         if results:
-            result = results[0]
-            # Parse the formatted_evaluation JSON if it's a string and create
-            # a second key without underscores so templates written against the
-            # old backup-style might still work.
-            formatted_eval_key = next((k for k in result.keys() if 'formatted' in k.lower()), None)
-            if formatted_eval_key:
-                val = result.get(formatted_eval_key)
-                if isinstance(val, str):
-                    try:
-                        parsed = safe_load_json(val)
-                        result[formatted_eval_key] = parsed
-                    except Exception:
-                        # leave original string if parsing fails
-                        pass
-                # normalize result to always contain both variants so templates
-                # can reference either key without worrying about missing data.
-                canon = result.get(formatted_eval_key)
-                result['formatted_evaluation'] = canon
-                result['formattedevaluation'] = canon
-            return result
+            return self._hydrate_aurora_row(results[0])
         return None
+
+    @staticmethod
+    def _hydrate_aurora_row(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse an aurora_evaluations row the way ``get_aurora_evaluation`` returns it."""
+        # Parse the formatted_evaluation JSON if it's a string and create
+        # a second key without underscores so templates written against the
+        # old backup-style might still work.
+        formatted_eval_key = next((k for k in result.keys() if 'formatted' in k.lower()), None)
+        if formatted_eval_key:
+            val = result.get(formatted_eval_key)
+            if isinstance(val, str):
+                try:
+                    parsed = safe_load_json(val)
+                    result[formatted_eval_key] = parsed
+                except Exception:
+                    # leave original string if parsing fails
+                    pass
+            # normalize result to always contain both variants so templates
+            # can reference either key without worrying about missing data.
+            canon = result.get(formatted_eval_key)
+            result['formatted_evaluation'] = canon
+            result['formattedevaluation'] = canon
+        return result
     
     def save_test_submission(self, session_id: str, student_count: int, application_ids: List[int]) -> str:
         """Save a test submission to database for persistence."""
@@ -3033,6 +3528,8 @@ class Database:
         query = f"UPDATE {applications_table} SET {', '.join(updates)} WHERE application_id = %s"
         values.append(application_id)
         self.execute_non_query(query, tuple(values))
+        if EVALUATION_SUMMARY_SOURCES.intersection(fields):
+            self.refresh_evaluation_summary(application_id)
 
     def get_application_match_candidates(self, is_training: bool, is_test_data: bool, search_query: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get potential application matches for a given upload type.
@@ -3712,6 +4209,17 @@ class Database:
             logger.error(f"Error deleting school enrichment {school_id}: {e}")
             return False
 
+    def count_schools_enriched(self) -> int:
+        """Number of active enriched schools (for tab badges; no rows fetched)."""
+        try:
+            if not self.has_table("school_enriched_data"):
+                return 0
+            return int(self.execute_scalar(
+                "SELECT COUNT(*) FROM school_enriched_data WHERE is_active = TRUE") or 0)
+        except Exception as e:
+            logger.error(f"Error counting enriched schools: {e}")
+            return 0
+
     def get_all_schools_enriched(self, filters: Optional[Dict[str, Any]] = None, 
                                 limit: int = 5000) -> List[Dict[str, Any]]:
         """Get all enriched schools with optional filters."""
@@ -4238,6 +4746,669 @@ class Database:
             logger.error(f"Error updating file upload review: {e}")
             return False
 
+    # =====================================================================
+    # Chunked Upload Sessions — resumable, out-of-order chunk tracking
+    # =====================================================================
+
+    def ensure_upload_session_tables(self) -> None:
+        """Create the upload_sessions / upload_session_chunks tables if missing."""
+        if getattr(self, '_upload_session_tables_ready', False):
+            return
+        if self.has_table('upload_sessions') and self.has_table('upload_session_chunks'):
+            self._upload_session_tables_ready = True
+            return
+        self.execute_non_query("""
+            CREATE TABLE IF NOT EXISTS upload_sessions (
+                upload_id VARCHAR(64) PRIMARY KEY,
+                filename VARCHAR(500) NOT NULL,
+                application_type VARCHAR(20) DEFAULT '2026',
+                total_chunks INTEGER NOT NULL,
+                chunk_size INTEGER,
+                total_size BIGINT,
+                file_sha256 VARCHAR(64),
+                status VARCHAR(20) DEFAULT 'open',
+                blob_path VARCHAR(1000),
+                container VARCHAR(255),
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                committed_at TIMESTAMP
+            )
+        """)
+        self.execute_non_query("""
+            CREATE TABLE IF NOT EXISTS upload_session_chunks (
+                upload_id VARCHAR(64) NOT NULL
+                    REFERENCES upload_sessions(upload_id) ON DELETE CASCADE,
+                chunk_index INTEGER NOT NULL,
+                chunk_sha256 VARCHAR(64),
+                chunk_bytes INTEGER,
+                received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (upload_id, chunk_index)
+            )
+        """)
+        self.execute_non_query(
+            "CREATE INDEX IF NOT EXISTS idx_upload_sessions_status ON upload_sessions(status, updated_at)"
+        )
+        self._table_names_cache = None
+        self._upload_session_tables_ready = True
+        logger.info("Created upload_sessions tables")
+
+    def open_upload_session(self, upload_id: str, filename: str, application_type: str,
+                            total_chunks: int, chunk_size: Optional[int] = None,
+                            total_size: Optional[int] = None) -> None:
+        """Register an upload session (idempotent — concurrent first chunks are fine)."""
+        self.ensure_upload_session_tables()
+        self.execute_non_query(
+            """
+            INSERT INTO upload_sessions
+                (upload_id, filename, application_type, total_chunks, chunk_size, total_size)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (upload_id) DO UPDATE SET
+                chunk_size = COALESCE(upload_sessions.chunk_size, EXCLUDED.chunk_size),
+                total_size = COALESCE(upload_sessions.total_size, EXCLUDED.total_size),
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (upload_id, filename, application_type, total_chunks, chunk_size, total_size),
+        )
+
+    def record_upload_chunk(self, upload_id: str, chunk_index: int,
+                            chunk_sha256: Optional[str], chunk_bytes: int) -> int:
+        """Record a staged chunk and return how many distinct chunks have arrived.
+
+        The session row is locked (``FOR UPDATE``) for the insert and the
+        count, so concurrent chunks are counted one after another and the
+        last of them to arrive always sees the complete set.
+        """
+        conn = None
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM upload_sessions WHERE upload_id = %s FOR UPDATE", (upload_id,))
+            cursor.execute(
+                """
+                INSERT INTO upload_session_chunks (upload_id, chunk_index, chunk_sha256, chunk_bytes)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (upload_id, chunk_index) DO UPDATE SET
+                    chunk_sha256 = EXCLUDED.chunk_sha256,
+                    chunk_bytes = EXCLUDED.chunk_bytes,
+                    received_at = CURRENT_TIMESTAMP
+                """,
+                (upload_id, chunk_index, chunk_sha256, chunk_bytes),
+            )
+            cursor.execute("SELECT COUNT(*) FROM upload_session_chunks WHERE upload_id = %s", (upload_id,))
+            received = cursor.fetchone()[0]
+            conn.commit()
+            cursor.close()
+            self._putconn(conn)
+            conn = None
+            return received or 0
+        except Exception:
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                self._putconn(conn)
+            self.connection = None
+            raise
+
+    def get_upload_session(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session row plus ``received`` / ``missing`` chunk indices."""
+        self.ensure_upload_session_tables()
+        rows = self.execute_query("SELECT * FROM upload_sessions WHERE upload_id = %s", (upload_id,))
+        if not rows:
+            return None
+        session_row = rows[0]
+        chunks = self.execute_query(
+            "SELECT chunk_index, chunk_sha256, chunk_bytes FROM upload_session_chunks "
+            "WHERE upload_id = %s ORDER BY chunk_index",
+            (upload_id,),
+        )
+        received = {c['chunk_index'] for c in chunks}
+        session_row['received'] = sorted(received)
+        session_row['missing'] = [i for i in range(session_row['total_chunks']) if i not in received]
+        session_row['chunk_checksums'] = {c['chunk_index']: c['chunk_sha256'] for c in chunks}
+        return session_row
+
+    def claim_upload_commit(self, upload_id: str, file_sha256: Optional[str] = None,
+                            stale_seconds: int = 900) -> bool:
+        """Atomically move a session from open → committing.  Only one caller wins,
+        so chunks that complete the set concurrently don't double-commit.
+
+        A session left ``committing`` for more than *stale_seconds* (its
+        worker died mid-commit) can be claimed again.
+        """
+        claimed = self.execute_scalar(
+            """
+            UPDATE upload_sessions
+               SET status = 'committing',
+                   file_sha256 = COALESCE(%s, file_sha256),
+                   updated_at = CURRENT_TIMESTAMP
+             WHERE upload_id = %s
+               AND (status IN ('open', 'failed')
+                    OR (status = 'committing'
+                        AND updated_at < CURRENT_TIMESTAMP - make_interval(secs => %s)))
+            RETURNING upload_id
+            """,
+            (file_sha256, upload_id, stale_seconds),
+        )
+        return bool(claimed)
+
+    def finish_upload_session(self, upload_id: str, success: bool,
+                              blob_path: Optional[str] = None,
+                              container: Optional[str] = None,
+                              error: Optional[str] = None) -> None:
+        """Record the commit outcome.  A failed commit reopens the session so
+        the client can re-send missing chunks and try again."""
+        self.execute_non_query(
+            """
+            UPDATE upload_sessions
+               SET status = %s, blob_path = COALESCE(%s, blob_path),
+                   container = COALESCE(%s, container), error = %s,
+                   committed_at = CASE WHEN %s THEN CURRENT_TIMESTAMP ELSE committed_at END,
+                   updated_at = CURRENT_TIMESTAMP
+             WHERE upload_id = %s
+            """,
+            ('committed' if success else 'failed', blob_path, container, error, success, upload_id),
+        )
+
+    # =====================================================================
+    # Evaluation Checkpoints — per-step outputs for resumable evaluations
+    # =====================================================================
+
+    def ensure_evaluation_checkpoints_table(self) -> None:
+        """Create the evaluation_checkpoints table if it doesn't exist."""
+        if getattr(self, '_evaluation_checkpoints_ready', False):
+            return
+        if not self.has_table('evaluation_checkpoints'):
+            self.execute_non_query("""
+                CREATE TABLE IF NOT EXISTS evaluation_checkpoints (
+                    application_id INTEGER NOT NULL
+                        REFERENCES Applications(application_id) ON DELETE CASCADE,
+                    step VARCHAR(100) NOT NULL,
+                    output_hash VARCHAR(64),
+                    output JSONB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (application_id, step)
+                )
+            """)
+            self._table_names_cache = None
+            logger.info("Created evaluation_checkpoints table")
+        self._evaluation_checkpoints_ready = True
+
+    def save_evaluation_checkpoint(self, application_id: int, step: str,
+                                   output_hash: Optional[str], output: Any) -> None:
+        """Upsert the checkpoint for one completed workflow step."""
+        self.ensure_evaluation_checkpoints_table()
+        self.execute_non_query(
+            """
+            INSERT INTO evaluation_checkpoints (application_id, step, output_hash, output)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (application_id, step) DO UPDATE SET
+                output_hash = EXCLUDED.output_hash,
+                output = EXCLUDED.output,
+                created_at = CURRENT_TIMESTAMP
+            """,
+            (application_id, step, output_hash, self._dumps_extracted(output)),
+        )
+
+    def get_evaluation_checkpoints(self, application_id: int) -> Dict[str, Dict[str, Any]]:
+        """All checkpoints for an application in one query, keyed by step."""
+        self.ensure_evaluation_checkpoints_table()
+        rows = self.execute_query(
+            "SELECT step, output_hash, output, created_at FROM evaluation_checkpoints "
+            "WHERE application_id = %s ORDER BY created_at",
+            (application_id,),
+        )
+        checkpoints = {}
+        for row in rows:
+            output = row.get('output')
+            if isinstance(output, str):
+                output = safe_load_json(output)
+            checkpoints[row['step']] = {
+                'output_hash': row.get('output_hash'),
+                'output': output if output is not None else {},
+                'created_at': row.get('created_at'),
+            }
+        return checkpoints
+
+    def clear_evaluation_checkpoints(self, application_id: int, step: Optional[str] = None) -> int:
+        """Delete an application's checkpoints (or just *step*). Returns rows deleted."""
+        self.ensure_evaluation_checkpoints_table()
+        if step:
+            return self.execute_non_query(
+                "DELETE FROM evaluation_checkpoints WHERE application_id = %s AND step = %s",
+                (application_id, step),
+            )
+        return self.execute_non_query(
+            "DELETE FROM evaluation_checkpoints WHERE application_id = %s", (application_id,)
+        )
+
+    # =====================================================================
+    # Evaluation Summary — typed columns derived from agent outputs
+    # =====================================================================
+
+    def ensure_evaluation_summary_table(self) -> None:
+        """Create the evaluation_summary table if it doesn't exist."""
+        if getattr(self, '_evaluation_summary_ready', False):
+            return
+        if not self.has_table('evaluation_summary'):
+            scores = ",\n                    ".join(
+                f"{col} {'INTEGER' if col == 'gaston_flags' else 'NUMERIC(5,2)'}"
+                for col in SCORE_COLUMNS
+            )
+            self.execute_non_query(f"""
+                CREATE TABLE IF NOT EXISTS evaluation_summary (
+                    application_id INTEGER PRIMARY KEY
+                        REFERENCES Applications(application_id) ON DELETE CASCADE,
+                    merlin_score NUMERIC(5,2),
+                    recommendation VARCHAR(100),
+                    school_name VARCHAR(500),
+                    tier VARCHAR(50),
+                    nextgen_match NUMERIC(5,2),
+                    {scores},
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            self.execute_non_query(
+                "CREATE INDEX IF NOT EXISTS idx_evaluation_summary_score "
+                "ON evaluation_summary(merlin_score)"
+            )
+            self.execute_non_query(
+                "CREATE INDEX IF NOT EXISTS idx_evaluation_summary_match "
+                "ON evaluation_summary(nextgen_match)"
+            )
+            self._table_names_cache = None
+            logger.info("Created evaluation_summary table")
+        self._evaluation_summary_ready = True
+
+    def refresh_evaluation_summary(self, application_id: int) -> bool:
+        """Re-derive one application's evaluation_summary row from its stored outputs.
+
+        Called after every write of ``agent_results``, ``student_summary``,
+        ``nextgen_match``, a Merlin evaluation or a Moana school context.
+        A failure is logged and never fails the write that triggered it;
+        the backfill repairs any row left behind.  Returns True on success.
+        """
+        try:
+            self.ensure_evaluation_summary_table()
+            applications_table = self.get_table_name('applications') or 'applications'
+            sources = [
+                f"a.{col}" if self.has_applications_column(col) else f"NULL AS {col}"
+                for col in sorted(EVALUATION_SUMMARY_SOURCES)
+            ]
+            rows = self.execute_query(f"""
+                SELECT {", ".join(sources)},
+                       (SELECT ssc.school_name FROM student_school_context ssc
+                        WHERE ssc.application_id = a.application_id
+                        ORDER BY ssc.context_id DESC LIMIT 1) AS moana_school_name,
+                       (SELECT me.overall_score FROM merlin_evaluations me
+                        WHERE me.application_id = a.application_id
+                        ORDER BY me.merlin_evaluation_id DESC LIMIT 1) AS merlin_overall_score,
+                       (SELECT me.recommendation FROM merlin_evaluations me
+                        WHERE me.application_id = a.application_id
+                        ORDER BY me.merlin_evaluation_id DESC LIMIT 1) AS merlin_recommendation
+                FROM {applications_table} a
+                WHERE a.application_id = %s
+            """, (application_id,))
+            if not rows:
+                return False
+            row = rows[0]
+            summary = summarize(
+                row.get('agent_results'), row.get('student_summary'),
+                nextgen_match=row.get('nextgen_match'),
+                school_name=row.get('moana_school_name'),
+                merlin_row={'overall_score': row.get('merlin_overall_score'),
+                            'recommendation': row.get('merlin_recommendation')},
+            )
+            self.upsert_evaluation_summary(application_id, summary)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not refresh evaluation summary for application {application_id}: {e}")
+            return False
+
+    def upsert_evaluation_summary(self, application_id: int, summary: Dict[str, Any]) -> None:
+        """Write one evaluation_summary row (keys outside SUMMARY_COLUMNS are ignored)."""
+        self.ensure_evaluation_summary_table()
+        columns = ", ".join(SUMMARY_COLUMNS)
+        placeholders = ", ".join(["%s"] * (len(SUMMARY_COLUMNS) + 1))
+        updates = ",\n                ".join(f"{col} = EXCLUDED.{col}" for col in SUMMARY_COLUMNS)
+        self.execute_non_query(
+            f"""
+            INSERT INTO evaluation_summary (application_id, {columns})
+            VALUES ({placeholders})
+            ON CONFLICT (application_id) DO UPDATE SET
+                {updates},
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (application_id, *(summary.get(col) for col in SUMMARY_COLUMNS)),
+        )
+
+    def backfill_evaluation_summary(self, batch_size: int = 200) -> int:
+        """Derive evaluation_summary rows for every application (one-time job).
+
+        Walks applications in ``application_id`` order, *batch_size* ids at
+        a time.  Idempotent; rows that already exist are rewritten from the
+        current agent outputs.  Returns the number of rows written.
+        """
+        self.ensure_evaluation_summary_table()
+        applications_table = self.get_table_name('applications') or 'applications'
+        written = 0
+        last_id = 0
+        while True:
+            rows = self.execute_query(
+                f"SELECT application_id FROM {applications_table} "
+                "WHERE application_id > %s ORDER BY application_id LIMIT %s",
+                (last_id, batch_size),
+            )
+            if not rows:
+                break
+            for row in rows:
+                if self.refresh_evaluation_summary(row['application_id']):
+                    written += 1
+            last_id = rows[-1]['application_id']
+        logger.info(f"backfill_evaluation_summary: wrote {written} rows")
+        return written
+
+    # =====================================================================
+    # Governance snapshots — shared, stamped report payloads
+    # =====================================================================
+
+    def ensure_governance_snapshots_table(self) -> None:
+        """Create the governance_snapshots table if it doesn't exist."""
+        if getattr(self, '_governance_snapshots_ready', False):
+            return
+        if not self.has_table('governance_snapshots'):
+            self.execute_non_query("""
+                CREATE TABLE IF NOT EXISTS governance_snapshots (
+                    kind VARCHAR(50) PRIMARY KEY,
+                    payload JSONB NOT NULL,
+                    source_version TEXT,
+                    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            self._table_names_cache = None
+            logger.info("Created governance_snapshots table")
+        self._governance_snapshots_ready = True
+
+    def _governance_source_stamp(self, source: str) -> str:
+        """SQL expression that changes whenever *source*'s governance inputs do.
+
+        ``schools`` is ``school_enriched_data``; ``audit`` is
+        ``agent_audit_logs``; ``evaluations`` is the applications row count
+        plus ``evaluation_summary``, which every agent_results write refreshes.
+        Row counts catch deletes; missing tables stamp as ``-``.
+        """
+        if source == 'schools' and self.has_table('school_enriched_data'):
+            return ("(SELECT COUNT(*) || '@' || COALESCE(MAX(updated_at)::text, '') "
+                    "FROM school_enriched_data)")
+        if source == 'audit' and self.has_table('agent_audit_logs'):
+            return ("(SELECT COUNT(*) || '@' || COALESCE(MAX(audit_id), 0) "
+                    "FROM agent_audit_logs)")
+        if source == 'evaluations':
+            applications_table = self.get_table_name('applications')
+            if applications_table:
+                self.ensure_evaluation_summary_table()
+                return (f"(SELECT COUNT(*) FROM {applications_table})::text || '@' || "
+                        "(SELECT COUNT(*) || '@' || COALESCE(MAX(updated_at)::text, '') "
+                        "FROM evaluation_summary)")
+        return "'-'"
+
+    def get_governance_snapshot(self, kind: str, sources: Iterable[str]) -> Dict[str, Any]:
+        """Stored snapshot for *kind* and the current stamp of *sources*, in one query.
+
+        Returns ``payload``, ``source_version`` and ``age_seconds`` (all None
+        when nothing is stored yet) plus ``current_version``.
+        """
+        self.ensure_governance_snapshots_table()
+        stamps = ", ".join(self._governance_source_stamp(source) for source in sources)
+        rows = self.execute_query(f"""
+            SELECT g.payload, g.source_version,
+                   EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - g.computed_at)) AS age_seconds,
+                   concat_ws('|', {stamps}) AS current_version
+            FROM (SELECT %s::text AS kind) k
+            LEFT JOIN governance_snapshots g ON g.kind = k.kind
+        """, (kind,))
+        return rows[0]
+
+    def save_governance_snapshot(self, kind: str, payload: str, source_version: str) -> None:
+        """Store *payload* (JSON text) as the snapshot for *kind*."""
+        self.ensure_governance_snapshots_table()
+        self.execute_non_query("""
+            INSERT INTO governance_snapshots (kind, payload, source_version, computed_at)
+            VALUES (%s, %s::jsonb, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (kind) DO UPDATE SET
+                payload = EXCLUDED.payload,
+                source_version = EXCLUDED.source_version,
+                computed_at = EXCLUDED.computed_at
+        """, (kind, payload, source_version))
+
+    # =====================================================================
+    # Calibration — training records paired with human rubric scores
+    # =====================================================================
+
+    def _calibration_from_sql(self) -> Optional[str]:
+        """FROM/WHERE shared by the calibration rows and their version stamp."""
+        applications_table = self.get_table_name('applications')
+        if not applications_table or not self.has_table('historical_scores'):
+            return None
+        self.ensure_evaluation_summary_table()
+        training_col = self.get_training_example_column()
+        app_id_col = self.get_applications_column('application_id')
+        return f"""
+            FROM {applications_table} a
+            JOIN historical_scores hs ON hs.application_id = a.{app_id_col}
+            LEFT JOIN evaluation_summary es ON es.application_id = a.{app_id_col}
+            WHERE a.{training_col} = TRUE
+              AND hs.total_rating IS NOT NULL"""
+
+    def get_calibration_rows(self) -> List[Dict[str, Any]]:
+        """Every training record with a human rubric score, AI side from evaluation_summary."""
+        from_sql = self._calibration_from_sql()
+        if not from_sql:
+            return []
+        app_id_col = self.get_applications_column('application_id')
+        score_cols = ",\n                ".join(f"es.{col} AS ai_{col}" for col in SCORE_COLUMNS)
+        return self.execute_query(f"""
+            SELECT
+                a.{app_id_col} as application_id,
+                a.applicant_name,
+                COALESCE(NULLIF(a.high_school, ''), es.school_name) as high_school,
+                a.state_code,
+                es.merlin_score as ai_overall,
+                es.recommendation as ai_recommendation,
+                COALESCE(a.nextgen_match, es.nextgen_match) as nextgen_match,
+                {score_cols},
+                a.was_selected,
+                hs.academic_record as human_academic,
+                hs.stem_interest as human_stem,
+                hs.essay_video as human_essay,
+                hs.recommendation as human_rec,
+                hs.bonus as human_bonus,
+                hs.total_rating as human_total,
+                hs.was_selected as human_selected,
+                hs.status as human_status,
+                hs.preliminary_score as human_prelim,
+                hs.quick_notes
+            {from_sql}
+            ORDER BY hs.total_rating DESC
+        """)
+
+    def get_calibration_version(self) -> Optional[str]:
+        """Stamp that changes whenever any calibration row would.
+
+        An md5 over the joined rows' inputs — the application columns the
+        report reads, the whole historical_scores row and the summary row's
+        ``updated_at`` — computed in the database, so only the stamp
+        crosses the wire.  None when calibration has no source tables.
+        """
+        from_sql = self._calibration_from_sql()
+        if not from_sql:
+            return None
+        app_id_col = self.get_applications_column('application_id')
+        return self.execute_scalar(f"""
+            SELECT COUNT(*) || ':' || COALESCE(md5(string_agg(
+                concat_ws(',', a.{app_id_col}, a.applicant_name, a.high_school, a.state_code,
+                          a.nextgen_match, a.was_selected, hs::text, es.updated_at),
+                '|' ORDER BY hs.score_id)), '')
+            {from_sql}
+        """)
+
+    # =====================================================================
+    # Background jobs — shared progress and results for long-running work
+    # =====================================================================
+
+    def ensure_background_jobs_table(self) -> None:
+        """Create the background_jobs table if it doesn't exist."""
+        if getattr(self, '_background_jobs_ready', False):
+            return
+        if not self.has_table('background_jobs'):
+            self.execute_non_query("""
+                CREATE TABLE IF NOT EXISTS background_jobs (
+                    job_id VARCHAR(64) PRIMARY KEY,
+                    kind VARCHAR(100) NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'running',
+                    params JSONB,
+                    progress JSONB,
+                    result JSONB,
+                    error TEXT,
+                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            """)
+            self.execute_non_query(
+                "CREATE INDEX IF NOT EXISTS idx_background_jobs_kind "
+                "ON background_jobs(kind, started_at DESC)"
+            )
+            # At most one running job per kind, across every worker
+            self.execute_non_query(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_running "
+                "ON background_jobs(kind) WHERE status = 'running'"
+            )
+            self._table_names_cache = None
+            logger.info("Created background_jobs table")
+        self._background_jobs_ready = True
+
+    def create_background_job(self, job_id: str, kind: str, params: Dict[str, Any],
+                              stale_seconds: int) -> bool:
+        """Register a running *kind* job; False if one is already running.
+
+        A running job whose ``updated_at`` is older than *stale_seconds*
+        (its worker died) is marked abandoned first so it cannot block the
+        new one.
+        """
+        self.ensure_background_jobs_table()
+        self.execute_non_query("""
+            UPDATE background_jobs
+            SET status = 'error', error = 'Abandoned: no progress reported',
+                finished_at = CURRENT_TIMESTAMP
+            WHERE kind = %s AND status = 'running'
+              AND updated_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+        """, (kind, stale_seconds))
+        created = self.execute_scalar("""
+            INSERT INTO background_jobs (job_id, kind, params, progress)
+            VALUES (%s, %s, %s::jsonb, '{}'::jsonb)
+            ON CONFLICT (kind) WHERE status = 'running' DO NOTHING
+            RETURNING job_id
+        """, (job_id, kind, json.dumps(params or {}, default=str)))
+        return created is not None
+
+    def update_background_job(self, job_id: str, status: Optional[str] = None,
+                              progress: Optional[Dict[str, Any]] = None,
+                              result: Optional[Dict[str, Any]] = None,
+                              error: Optional[str] = None) -> None:
+        """Record progress (replaces the stored dict), a result, or a final status."""
+        self.ensure_background_jobs_table()
+        set_parts = ["updated_at = CURRENT_TIMESTAMP"]
+        params: List[Any] = []
+        if progress is not None:
+            set_parts.append("progress = %s::jsonb")
+            params.append(json.dumps(progress, default=str))
+        if result is not None:
+            set_parts.append("result = %s::jsonb")
+            params.append(json.dumps(result, default=str))
+        if error is not None:
+            set_parts.append("error = %s")
+            params.append(error)
+        if status is not None:
+            set_parts.append("status = %s")
+            params.append(status)
+            if status != 'running':
+                set_parts.append("finished_at = CURRENT_TIMESTAMP")
+        params.append(job_id)
+        self.execute_non_query(
+            f"UPDATE background_jobs SET {', '.join(set_parts)} WHERE job_id = %s",
+            tuple(params),
+        )
+
+    def get_latest_background_job(self, kind: str) -> Optional[Dict[str, Any]]:
+        """The most recently started *kind* job, with ``elapsed_seconds``
+        and (once finished) ``finished_seconds_ago``."""
+        self.ensure_background_jobs_table()
+        rows = self.execute_query("""
+            SELECT job_id, kind, status, params, progress, result, error,
+                   started_at, finished_at,
+                   EXTRACT(EPOCH FROM (COALESCE(finished_at, CURRENT_TIMESTAMP) - started_at))
+                       AS elapsed_seconds,
+                   EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - finished_at)) AS finished_seconds_ago
+            FROM background_jobs
+            WHERE kind = %s
+            ORDER BY started_at DESC
+            LIMIT 1
+        """, (kind,))
+        return rows[0] if rows else None
+
+    # =====================================================================
+    # LISTEN / NOTIFY — cross-worker signals (PostgreSQL only)
+    # =====================================================================
+
+    def notify(self, channel: str, payload: str) -> bool:
+        """Publish a NOTIFY on *channel*. Returns False if it could not be sent."""
+        if not PSYCOPG_AVAILABLE or self._using_sqlite_fallback:
+            return False
+        try:
+            self.execute_query("SELECT pg_notify(%s, %s)", (channel, payload))
+            return True
+        except Exception as e:
+            logger.debug("NOTIFY %s failed: %s", channel, e)
+            return False
+
+    def listen(self, channel: str, callback: Callable[[str], Any],
+               stop: threading.Event, poll_timeout: float = 5.0) -> None:
+        """Call ``callback(payload)`` for every NOTIFY on *channel* until *stop* is set.
+
+        Blocks, so run it on a daemon thread.  Uses its own autocommit
+        connection (a pooled one can't sit in LISTEN) and reconnects with
+        backoff when that connection drops.  *channel* must be a plain
+        identifier — it is interpolated, not bound.
+        """
+        if not PSYCOPG_AVAILABLE or self._using_sqlite_fallback:
+            return
+        backoff = 1.0
+        while not stop.is_set():
+            params = self._build_connection_params()
+            if not params:
+                return
+            try:
+                if 'conninfo' in params:
+                    conn = psycopg.connect(params['conninfo'], autocommit=True)
+                else:
+                    conn = psycopg.connect(autocommit=True, **params)
+                with conn:
+                    conn.execute(f"LISTEN {channel}")
+                    backoff = 1.0
+                    while not stop.is_set():
+                        for note in conn.notifies(timeout=poll_timeout):
+                            try:
+                                callback(note.payload)
+                            except Exception:
+                                logger.debug("LISTEN %s callback failed", channel, exc_info=True)
+            except Exception as e:
+                logger.warning("LISTEN %s connection lost (%s); retrying in %.0fs", channel, e, backoff)
+                stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
     # =====================================================================
     # Historical Scores - 2024 cohort human-assigned rubric data
     # =====================================================================
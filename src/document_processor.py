@@ -8,6 +8,8 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from docx import Document
 
+from .ocr_preprocessing import render_page_for_ocr
+
 logger = logging.getLogger(__name__)
 
 # Minimum characters on a page before it's considered "image-based"
@@ -34,9 +36,10 @@ class DocumentProcessor:
         
         Uses PyMuPDF (fitz) for text extraction.  When a page yields fewer
         than _IMAGE_PAGE_TEXT_THRESHOLD characters **and** contains an
-        embedded image, the page is rendered to a PNG and passed to
-        *ocr_callback* (if provided) so the caller can use an AI vision
-        model to OCR it.
+        embedded image, the page is rendered by ``ocr_preprocessing``
+        (adaptive DPI, grayscale JPEG/PNG, margin crop, tall-page tiles)
+        and each image is passed to *ocr_callback* (if provided) so the
+        caller can use an AI vision model to OCR it.
         
         Args:
             file_path: Path to the PDF file.
@@ -56,7 +59,7 @@ class DocumentProcessor:
             ocr_pages: List[int] = []
             
             # First pass: extract text and identify pages needing OCR
-            pages_needing_ocr = []  # (page_idx, page_text, img_bytes, page_label)
+            pages_needing_ocr = []  # (page_idx, page_text, segments, page_label, eff_len)
             page_texts = {}  # page_idx → text
             
             for page_idx in range(total_pages):
@@ -99,11 +102,14 @@ class DocumentProcessor:
                     should_ocr = bool(images) or effective_text_len < 20 or is_pagination_only
                     if should_ocr:
                         try:
-                            pix = page.get_pixmap(dpi=300)
-                            img_bytes = pix.tobytes("png")
                             page_label = f"page {page_num} of {total_pages}"
-                            pages_needing_ocr.append((page_idx, page_text, img_bytes, page_label, effective_text_len))
-                            logger.info(f"🔍 Page {page_num}/{total_pages}: queued for OCR ({len(page_text)} chars, images={len(images) if images else 0})")
+                            segments = render_page_for_ocr(page, page_label)
+                            pages_needing_ocr.append((page_idx, page_text, segments, page_label, effective_text_len))
+                            logger.info(
+                                f"🔍 Page {page_num}/{total_pages}: queued for OCR ({len(page_text)} chars, "
+                                f"images={len(images) if images else 0}, segments={len(segments)}, "
+                                f"payload={sum(len(s.image_bytes) for s in segments) // 1024} KB)"
+                            )
                         except Exception as e:
                             logger.warning(f"Failed to render page {page_num} for OCR: {e}")
                             page_texts[page_idx] = page_text
@@ -138,9 +144,11 @@ class DocumentProcessor:
                 from concurrent.futures import ThreadPoolExecutor, as_completed
                 
                 def _ocr_page(args):
-                    pidx, ptext, img_bytes, plabel, eff_len = args
+                    pidx, ptext, segments, plabel, eff_len = args
                     try:
-                        ocr_text = ocr_callback(img_bytes, plabel)
+                        # Tall pages arrive as several tiles, top to bottom
+                        parts = [ocr_callback(seg.image_bytes, seg.label) for seg in segments]
+                        ocr_text = "\n".join(p.strip() for p in parts if p and p.strip())
                         if ocr_text and len(ocr_text.strip()) > eff_len:
                             return pidx, ocr_text.strip(), True
                         return pidx, ptext, False
@@ -0,0 +1,168 @@
+"""Typed summary of an application's evaluation outputs.
+
+The student lists, the calibration report and Milo's ranking all need the
+same handful of values — Merlin's score and recommendation, the school
+Moana resolved, Milo's tier and Next Gen Match — plus the per-agent scores
+the calibration report compares against human rubric scores.  They used to
+re-derive them from the nested ``agent_results`` / ``student_summary`` JSON
+on every read.
+
+``summarize`` derives them once, with the fallback chains those readers
+used, and ``Database.refresh_evaluation_summary`` stores the result in the
+``evaluation_summary`` table whenever agent outputs are persisted.  Readers
+join that table and read plain columns.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+from src.utils import safe_load_json
+
+# Per-agent scores compared against human rubric scores (calibration report)
+SCORE_COLUMNS = (
+    'tiana_readiness', 'tiana_stem', 'tiana_essay',
+    'rapunzel_rigor', 'rapunzel_gpa',
+    'mulan_endorsement', 'mulan_recommendation',
+    'moana_opportunity',
+    'milo_match', 'milo_academic', 'milo_stem', 'milo_essay', 'milo_rec', 'milo_bonus',
+    'gaston_flags',
+)
+
+SUMMARY_COLUMNS = ('merlin_score', 'recommendation', 'school_name', 'tier', 'nextgen_match') + SCORE_COLUMNS
+
+# NUMERIC(5,2) columns hold at most 999.99; anything larger is not a score
+_MAX_SCORE = 1000
+
+
+def _float(val: Any) -> Optional[float]:
+    if val is None or isinstance(val, bool):
+        return None
+    try:
+        number = float(val)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number) or abs(number) >= _MAX_SCORE:
+        return None
+    return number
+
+
+def _first_float(*values: Any) -> Optional[float]:
+    for val in values:
+        number = _float(val)
+        if number is not None:
+            return number
+    return None
+
+
+def _section(agent_results: Dict[str, Any], *keys: str) -> Dict[str, Any]:
+    """The first of *keys* in *agent_results* that holds a dict, else ``{}``."""
+    for key in keys:
+        value = agent_results.get(key)
+        if isinstance(value, dict) and value:
+            return value
+    return {}
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    if isinstance(value, (str, bytes)):
+        value = safe_load_json(value)
+    return value if isinstance(value, dict) else {}
+
+
+def ai_scores(agent_results: Dict[str, Any]) -> Dict[str, float]:
+    """Per-agent scores from *agent_results*, keyed by ``SCORE_COLUMNS``.
+
+    Normalized scores (Smee's step 5.5) win over the agents' raw outputs.
+    Scores an agent did not produce are left out.
+    """
+    scores: Dict[str, Optional[float]] = {}
+
+    norm = _section(agent_results, '_normalized_scores')
+    scores['tiana_readiness'] = _float(norm.get('tiana_readiness'))
+    scores['tiana_stem'] = _float(norm.get('tiana_stem_interest'))
+    scores['tiana_essay'] = _float(norm.get('tiana_essay'))
+    scores['rapunzel_rigor'] = _float(norm.get('rapunzel_rigor'))
+    scores['rapunzel_gpa'] = _float(norm.get('rapunzel_gpa_normalized'))
+    scores['mulan_endorsement'] = _float(norm.get('mulan_endorsement'))
+    scores['mulan_recommendation'] = _float(norm.get('mulan_recommendation'))
+    scores['moana_opportunity'] = _float(norm.get('moana_opportunity'))
+
+    tiana = _section(agent_results, 'application_reader', 'tiana')
+    if scores['tiana_readiness'] is None:
+        scores['tiana_readiness'] = _float(tiana.get('readiness_score'))
+    if scores['tiana_stem'] is None:
+        scores['tiana_stem'] = _float(tiana.get('stem_interest_score'))
+    if scores['tiana_essay'] is None:
+        scores['tiana_essay'] = _float(tiana.get('essay_score'))
+
+    rapunzel = _section(agent_results, 'grade_reader', 'rapunzel')
+    if rapunzel and scores['rapunzel_gpa'] is None:
+        parsed = _as_dict(rapunzel.get('parsed_json')) or rapunzel
+        gpa = _float(parsed.get('gpa'))
+        if gpa is not None:
+            scores['rapunzel_gpa'] = min(gpa / 4.0 * 100, 100)
+
+    mulan = _section(agent_results, 'recommendation_reader', 'mulan')
+    if scores['mulan_endorsement'] is None:
+        scores['mulan_endorsement'] = _float(mulan.get('endorsement_strength'))
+    if scores['mulan_recommendation'] is None:
+        scores['mulan_recommendation'] = _float(mulan.get('recommendation_score'))
+
+    milo = _section(agent_results, 'milo_alignment', 'data_scientist')
+    if milo:
+        scores['milo_match'] = _first_float(milo.get('nextgen_match'), milo.get('match_score'))
+        rubric = milo.get('rubric_scores')
+        if isinstance(rubric, dict):
+            scores['milo_academic'] = _float(rubric.get('academic_record'))
+            scores['milo_stem'] = _float(rubric.get('stem_interest'))
+            scores['milo_essay'] = _float(rubric.get('essay'))
+            scores['milo_rec'] = _float(rubric.get('recommendation'))
+            scores['milo_bonus'] = _float(rubric.get('bonus'))
+
+    gaston = agent_results.get('gaston')
+    if isinstance(gaston, dict):
+        flags = gaston.get('flags') or gaston.get('issues') or []
+        scores['gaston_flags'] = len(flags) if isinstance(flags, list) else 0
+
+    return {k: v for k, v in scores.items() if v is not None}
+
+
+def summarize(agent_results: Any, student_summary: Any = None,
+              nextgen_match: Any = None, school_name: Optional[str] = None,
+              merlin_row: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """The ``evaluation_summary`` row for one application (every column present).
+
+    *agent_results* and *student_summary* may be dicts or JSON text.
+    *nextgen_match* is the applications column, *school_name* the latest
+    ``student_school_context`` school and *merlin_row* the latest
+    ``merlin_evaluations`` row; each wins over (or backs up) the JSON the
+    same way the old readers did.
+    """
+    agents = _as_dict(agent_results)
+    summary = _as_dict(student_summary)
+    merlin = _section(agents, 'merlin', 'student_evaluator')
+    milo = _section(agents, 'milo_alignment', 'data_scientist')
+    ranking = _section(agents, 'milo_ranking')
+    moana = _section(agents, 'moana', 'school_context')
+    merlin_row = merlin_row or {}
+
+    row: Dict[str, Any] = dict.fromkeys(SUMMARY_COLUMNS)
+    row.update(ai_scores(agents))
+    row['merlin_score'] = _first_float(
+        summary.get('overall_score'), summary.get('score'),
+        merlin.get('overall_score'), merlin.get('overallscore'), merlin.get('score'),
+        merlin_row.get('overall_score'),
+        milo.get('match_score'), milo.get('nextgen_match'),
+    )
+    recommendation = (summary.get('recommendation') or merlin.get('recommendation')
+                      or merlin_row.get('recommendation'))
+    row['recommendation'] = str(recommendation)[:100] if recommendation else None
+    school = school_name or moana.get('school_name') or moana.get('school')
+    row['school_name'] = str(school)[:500] if school else None
+    tier = milo.get('tier') or ranking.get('tier')
+    row['tier'] = str(tier)[:50] if tier else None
+    row['nextgen_match'] = _first_float(
+        nextgen_match, merlin.get('nextgen_match'),
+        milo.get('nextgen_match'), milo.get('match_score'),
+    )
+    return row
@@ -4,28 +4,53 @@ Runs groundedness, coherence, relevance, and fluency evaluators against stored
 agent outputs.  Also computes outcome accuracy against the ``was_selected``
 ground truth.
 
+Judge calls fan out over a bounded thread pool; agent outputs are fetched
+with one query per agent table and results are written in multi-row
+inserts.  A run that stops part-way can be resumed by ``batch_id``: only
+the (student, agent, evaluator) triples it has no stored result for are
+evaluated again.
+
+Runs are incremental by default: each evaluation is fingerprinted over its
+query, response and context text and the judge (evaluator, SDK version,
+deployment).  A fingerprint already scored by an earlier run has its score
+copied into the new batch instead of calling the judge again, so every
+batch still holds a complete result set.
+
 Usage:
     evaluator = AgentEvaluator(db)
     results = evaluator.run_batch_evaluation()    # returns summary dict
+    results = evaluator.run_batch_evaluation(resume_batch_id="eval_...")
     results = evaluator.get_latest_results()      # returns stored results
 """
 
+import hashlib
 import json
 import logging
+import os
 import statistics
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.config import config
-from src.logger import get_logger
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
+
+# Judge calls in flight at once (each SDK evaluator call is a blocking HTTP request)
+AGENT_EVAL_CONCURRENCY = int(os.getenv("AGENT_EVAL_CONCURRENCY", "8"))
+# Evaluation results buffered before one multi-row INSERT
+AGENT_EVAL_WRITE_BATCH = int(os.getenv("AGENT_EVAL_WRITE_BATCH", "50"))
+# Bump to invalidate every stored fingerprint (e.g. after changing how
+# response or context text is built)
+EVAL_FINGERPRINT_VERSION = "1"
 
 # ---------------------------------------------------------------------------
 # SDK availability — graceful fallback
 # ---------------------------------------------------------------------------
 _SDK_AVAILABLE = False
+_SDK_VERSION = "none"
 try:
     from azure.ai.evaluation import (
         GroundednessEvaluator,
@@ -35,6 +60,8 @@ try:
         SimilarityEvaluator,
     )
     _SDK_AVAILABLE = True
+    from importlib.metadata import version as _dist_version
+    _SDK_VERSION = _dist_version("azure-ai-evaluation")
 except ImportError:
     logger.warning(
         "azure-ai-evaluation SDK not installed — SDK-based evaluators "
@@ -94,13 +121,17 @@ _REC_NEGATIVE = {"waitlist", "reconsider", "deny", "reject", "do not recommend"}
 class AgentEvaluator:
     """Orchestrates AI quality evaluations for agent outputs."""
 
-    def __init__(self, db):
+    def __init__(self, db, concurrency: int = AGENT_EVAL_CONCURRENCY):
         """
         Args:
             db: Database helper instance (src.database.DatabaseHelper)
+            concurrency: Max judge calls in flight at once
         """
         self.db = db
+        self.concurrency = max(1, concurrency)
+        self.sdk_available = _SDK_AVAILABLE
         self._evaluators: Dict[str, Any] = {}
+        self._evaluators_lock = threading.Lock()
         self._model_config: Optional[Dict[str, str]] = None
 
     # ------------------------------------------------------------------
@@ -116,7 +147,7 @@ class AgentEvaluator:
         # Prefer the workhorse tier (4.1-mini) to balance quality vs cost.
         endpoint = config.azure_openai_endpoint or config.foundry_project_endpoint
         api_key = config.azure_openai_api_key or config.foundry_api_key
-        deployment = config.model_tier_workhorse or config.deployment_name
+        deployment = self._judge_deployment()
 
         if not endpoint or not api_key:
             raise RuntimeError(
@@ -132,13 +163,29 @@ class AgentEvaluator:
         }
         return self._model_config
 
+    @staticmethod
+    def _judge_deployment() -> Optional[str]:
+        return config.model_tier_workhorse or config.deployment_name
+
+    def _fingerprint(self, evaluator_name: str, query: str, response: str, context: str) -> str:
+        """Identifies one judge call: same fingerprint, same expected score."""
+        judge = f"{EVAL_FINGERPRINT_VERSION}|{evaluator_name}|{_SDK_VERSION}|{self._judge_deployment()}"
+        digest = hashlib.sha256()
+        for part in (judge, query, response, context):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
     def _get_evaluator(self, name: str):
         """Lazily create and cache an SDK evaluator instance."""
         if not _SDK_AVAILABLE:
             return None
-        if name in self._evaluators:
+        with self._evaluators_lock:
+            if name not in self._evaluators:
+                self._evaluators[name] = self._create_evaluator(name)
             return self._evaluators[name]
 
+    def _create_evaluator(self, name: str):
         mc = self._get_model_config()
         cls_map = {
             "groundedness": GroundednessEvaluator,
@@ -153,9 +200,7 @@ class AgentEvaluator:
             return None
 
         try:
-            evaluator = cls(model_config=mc)
-            self._evaluators[name] = evaluator
-            return evaluator
+            return cls(model_config=mc)
         except Exception as exc:
             logger.error(f"Failed to create {name} evaluator: {exc}")
             return None
@@ -175,14 +220,22 @@ class AgentEvaluator:
         """
         return self.db.execute_query(query) or []
 
-    def _get_agent_output(self, table: str, application_id: int) -> Optional[Dict[str, Any]]:
-        """Fetch agent output row for a specific application."""
+    def _get_agent_outputs(self, table: str, application_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch the latest agent output row per application, in one query."""
+        if not application_ids:
+            return {}
         try:
-            query = f"SELECT * FROM {table} WHERE application_id = %s ORDER BY created_at DESC LIMIT 1"
-            rows = self.db.execute_query(query, (application_id,))
-            return rows[0] if rows else None
-        except Exception:
-            return None
+            query = f"""
+                SELECT DISTINCT ON (application_id) *
+                FROM {table}
+                WHERE application_id = ANY(%s)
+                ORDER BY application_id, created_at DESC
+            """
+            rows = self.db.execute_query(query, (list(application_ids),)) or []
+            return {row["application_id"]: row for row in rows}
+        except Exception as exc:
+            logger.warning(f"Could not load {table} outputs: {exc}")
+            return {}
 
     def _build_response_text(self, row: Dict[str, Any], fields: List[str]) -> str:
         """Build a response string from agent output fields."""
@@ -270,6 +323,9 @@ class AgentEvaluator:
         applications = self._get_training_applications()
         if not applications:
             return metrics
+        merlin_rows = self._get_agent_outputs(
+            "merlin_evaluations", [app.get("application_id") for app in applications]
+        )
 
         # ── Outcome accuracy (Merlin score vs was_selected) ──
         merlin_scores: List[float] = []
@@ -287,7 +343,7 @@ class AgentEvaluator:
             was_selected = app.get("was_selected")
 
             # Merlin
-            merlin_row = self._get_agent_output("merlin_evaluations", app_id)
+            merlin_row = merlin_rows.get(app_id)
             merlin_score = None
             merlin_rec = None
             if merlin_row:
@@ -380,23 +436,38 @@ class AgentEvaluator:
         evaluator_names: Optional[List[str]] = None,
         max_students: int = 0,
         progress_callback=None,
+        resume_batch_id: Optional[str] = None,
+        incremental: bool = True,
     ) -> Dict[str, Any]:
         """Run a full batch evaluation on training students.
 
         Args:
-            agents: List of agent names to evaluate (default: all configured)
+            agents: List of agent names to evaluate (default: all configured,
+                or the resumed run's agents)
             evaluator_names: List of evaluator names to use (default: per agent config)
             max_students: Max students to evaluate (0 = all)
             progress_callback: Optional callable(state_dict) for progress updates
+            resume_batch_id: Continue this earlier run, keeping its stored
+                results and evaluating only what is missing
+            incremental: Reuse scores from earlier runs for unchanged
+                fingerprints (False re-scores everything)
 
         Returns:
             Summary dict with aggregate scores, per-agent breakdown, and consistency.
         """
-        batch_id = f"eval_{uuid.uuid4().hex[:12]}_{int(time.time())}"
+        batch_id = resume_batch_id or f"eval_{uuid.uuid4().hex[:12]}_{int(time.time())}"
         started_at = time.time()
 
+        # Ensure eval tables exist
+        self._ensure_tables()
+
+        done: Dict[Tuple[int, str, str], float] = {}
+        if resume_batch_id:
+            done = self._get_saved_scores(batch_id)
+            agents = agents or self._get_run_agents(batch_id)
+
         target_agents = agents or list(AGENT_EVAL_CONFIG.keys())
-        sdk_available = _SDK_AVAILABLE
+        sdk_available = self.sdk_available
 
         summary = {
             "batch_id": batch_id,
@@ -407,16 +478,15 @@ class AgentEvaluator:
             "evaluators_used": [],
             "total_students": 0,
             "total_evaluations": 0,
+            "resumed_evaluations": len(done),
+            "reused_evaluations": 0,
             "per_agent": {},
             "consistency": {},
             "errors": [],
         }
 
-        # Ensure eval tables exist
-        self._ensure_tables()
-
-        # Save run record
-        self._save_run_record(batch_id, "running")
+        # Save run record (a resumed run goes back to 'running')
+        self._save_run_record(batch_id, "running", target_agents)
 
         try:
             if progress_callback:
@@ -436,64 +506,27 @@ class AgentEvaluator:
 
             # ── SDK evaluations ──
             if sdk_available:
+                scores, summary["reused_evaluations"] = self._run_sdk_evaluations(
+                    batch_id, target_agents, evaluator_names, applications,
+                    done, progress_callback, incremental,
+                )
                 all_evaluators_used = set()
                 for agent_name in target_agents:
-                    agent_cfg = AGENT_EVAL_CONFIG.get(agent_name)
-                    if not agent_cfg:
+                    if agent_name not in scores:
                         continue
-
-                    evals = evaluator_names or agent_cfg["evaluators"]
-                    agent_scores: Dict[str, List[float]] = {e: [] for e in evals}
-                    agent_results_count = 0
-
-                    for idx, app in enumerate(applications):
-                        app_id = app.get("application_id")
-                        if progress_callback:
-                            progress_callback({
-                                "state": "running",
-                                "progress": f"Evaluating {agent_name} — student {idx + 1}/{len(applications)}",
-                                "agent": agent_name,
-                                "student_index": idx + 1,
-                                "total_students": len(applications),
-                            })
-
-                        # Get agent output
-                        row = self._get_agent_output(agent_cfg["table"], app_id)
-                        if not row:
-                            continue
-
-                        response_text = self._build_response_text(row, agent_cfg["response_fields"])
-                        if not response_text or len(response_text.strip()) < 20:
-                            continue
-
-                        context_text = self._get_context_text(app, agent_cfg["context_source"])
-                        query_text = agent_cfg["query"]
-
-                        for eval_name in evals:
-                            result = self._evaluate_single(
-                                agent_name, eval_name, query_text, response_text, context_text
-                            )
-                            if result:
-                                agent_scores[eval_name].append(result["score"])
-                                agent_results_count += 1
-                                all_evaluators_used.add(eval_name)
-                                self._save_result(
-                                    batch_id, app_id, agent_name, eval_name,
-                                    result["score"], result.get("reason"),
-                                )
-
                     # Agent-level aggregates
-                    agent_summary = {"evaluations": agent_results_count}
-                    for eval_name, scores in agent_scores.items():
-                        if scores:
+                    agent_summary = {"evaluations": sum(len(v) for v in scores[agent_name].values())}
+                    for eval_name, eval_scores in scores[agent_name].items():
+                        if eval_scores:
+                            all_evaluators_used.add(eval_name)
                             agent_summary[eval_name] = {
-                                "avg": round(statistics.mean(scores), 2),
-                                "min": round(min(scores), 2),
-                                "max": round(max(scores), 2),
-                                "count": len(scores),
+                                "avg": round(statistics.mean(eval_scores), 2),
+                                "min": round(min(eval_scores), 2),
+                                "max": round(max(eval_scores), 2),
+                                "count": len(eval_scores),
                             }
                     summary["per_agent"][agent_name] = agent_summary
-                    summary["total_evaluations"] += agent_results_count
+                    summary["total_evaluations"] += agent_summary["evaluations"]
 
                 summary["evaluators_used"] = sorted(all_evaluators_used)
             else:
@@ -520,6 +553,107 @@ class AgentEvaluator:
         self._update_run_record(batch_id, summary)
         return summary
 
+    def _run_sdk_evaluations(
+        self,
+        batch_id: str,
+        target_agents: List[str],
+        evaluator_names: Optional[List[str]],
+        applications: List[Dict[str, Any]],
+        done: Dict[Tuple[int, str, str], float],
+        progress_callback=None,
+        incremental: bool = True,
+    ) -> Tuple[Dict[str, Dict[str, List[float]]], int]:
+        """Fan judge calls out over the pool.
+
+        Returns scores per agent and evaluator, and how many of them were
+        reused from earlier runs.  Scores already stored for a resumed
+        batch are included without re-evaluating; with *incremental*,
+        unchanged fingerprints are copied from their latest stored score.
+        Results are written every ``AGENT_EVAL_WRITE_BATCH`` rows, so an
+        interrupted run loses at most one buffer.
+        """
+        app_ids = [app.get("application_id") for app in applications]
+        scores: Dict[str, Dict[str, List[float]]] = {}
+        tasks = []
+        for agent_name in target_agents:
+            agent_cfg = AGENT_EVAL_CONFIG.get(agent_name)
+            if not agent_cfg:
+                continue
+
+            evals = evaluator_names or agent_cfg["evaluators"]
+            scores[agent_name] = {e: [] for e in evals}
+            rows = self._get_agent_outputs(agent_cfg["table"], app_ids)
+
+            for app in applications:
+                app_id = app.get("application_id")
+                row = rows.get(app_id)
+                if not row:
+                    continue
+
+                response_text = self._build_response_text(row, agent_cfg["response_fields"])
+                if not response_text or len(response_text.strip()) < 20:
+                    continue
+
+                context_text = self._get_context_text(app, agent_cfg["context_source"])
+                for eval_name in evals:
+                    key = (app_id, agent_name, eval_name)
+                    if key in done:
+                        scores[agent_name][eval_name].append(done[key])
+                    else:
+                        fingerprint = self._fingerprint(
+                            eval_name, agent_cfg["query"], response_text, context_text)
+                        tasks.append((key, fingerprint, agent_cfg["query"], response_text, context_text))
+
+        pending_rows: List[Tuple] = []
+
+        def _record(key, fingerprint, score, reason, reused):
+            nonlocal pending_rows
+            app_id, agent_name, eval_name = key
+            scores[agent_name][eval_name].append(score)
+            pending_rows.append((app_id, agent_name, eval_name, score, reason, batch_id,
+                                 fingerprint, reused))
+            if len(pending_rows) >= AGENT_EVAL_WRITE_BATCH:
+                self._save_results(pending_rows)
+                pending_rows = []
+
+        previous = self._get_scores_by_fingerprint([t[1] for t in tasks]) if incremental else {}
+        reused = [t for t in tasks if t[1] in previous]
+        tasks = [t for t in tasks if t[1] not in previous]
+        for key, fingerprint, *_ in reused:
+            _record(key, fingerprint, *previous[fingerprint], True)
+
+        # Create the evaluators up front rather than racing on first use
+        for eval_name in {key[2] for key, *_ in tasks}:
+            self._get_evaluator(eval_name)
+
+        completed = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = {
+                    pool.submit(self._evaluate_single, key[1], key[2], query, response, context):
+                        (key, fingerprint)
+                    for key, fingerprint, query, response, context in tasks
+                }
+                for future in as_completed(futures):
+                    key, fingerprint = futures[future]
+                    _, agent_name, eval_name = key
+                    result = future.result()
+                    completed += 1
+                    if result:
+                        _record(key, fingerprint, result["score"], result.get("reason"), False)
+                    if progress_callback:
+                        progress_callback({
+                            "state": "running",
+                            "progress": f"Evaluated {completed}/{len(tasks)} — {agent_name} {eval_name}",
+                            "agent": agent_name,
+                            "evaluations_done": completed,
+                            "evaluations_total": len(tasks),
+                            "total_students": len(applications),
+                        })
+        finally:
+            self._save_results(pending_rows)
+        return scores, len(reused)
+
     # ------------------------------------------------------------------
     # Results retrieval
     # ------------------------------------------------------------------
@@ -544,7 +678,8 @@ class AgentEvaluator:
                        AVG(score) as avg_score,
                        MIN(score) as min_score,
                        MAX(score) as max_score,
-                       COUNT(*) as eval_count
+                       COUNT(*) as eval_count,
+                       COUNT(*) FILTER (WHERE reused) as reused_count
                 FROM agent_evaluation_results
                 WHERE batch_id = %s
                 GROUP BY agent_name, evaluator_name
@@ -563,6 +698,7 @@ class AgentEvaluator:
                     "min": round(float(row["min_score"]), 2) if row["min_score"] else None,
                     "max": round(float(row["max_score"]), 2) if row["max_score"] else None,
                     "count": row["eval_count"],
+                    "reused": row.get("reused_count") or 0,
                 }
 
             return {
@@ -637,9 +773,22 @@ class AgentEvaluator:
                     score NUMERIC(5,2),
                     reason TEXT,
                     batch_id VARCHAR(100),
+                    fingerprint VARCHAR(64),
+                    reused BOOLEAN DEFAULT FALSE,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Tables created before incremental runs lack the fingerprint columns
+            self.db.execute_non_query(
+                "ALTER TABLE agent_evaluation_results ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(64)"
+            )
+            self.db.execute_non_query(
+                "ALTER TABLE agent_evaluation_results ADD COLUMN IF NOT EXISTS reused BOOLEAN DEFAULT FALSE"
+            )
+            self.db.execute_non_query(
+                "CREATE INDEX IF NOT EXISTS idx_agent_eval_results_fingerprint "
+                "ON agent_evaluation_results(fingerprint, created_at DESC)"
+            )
             self.db.execute_query("""
                 CREATE TABLE IF NOT EXISTS agent_evaluation_runs (
                     run_id SERIAL PRIMARY KEY,
@@ -668,38 +817,101 @@ class AgentEvaluator:
         except Exception as exc:
             logger.warning(f"Could not ensure evaluation tables: {exc}")
 
-    def _save_result(
-        self,
-        batch_id: str,
-        application_id: int,
-        agent_name: str,
-        evaluator_name: str,
-        score: float,
-        reason: Optional[str],
-    ):
-        """Persist a single evaluation result."""
+    def _save_results(self, rows: List[Tuple]):
+        """Persist evaluation results in one multi-row INSERT.
+
+        Each row is (application_id, agent_name, evaluator_name, score,
+        reason, batch_id, fingerprint, reused).
+        """
+        if not rows:
+            return
         try:
-            self.db.execute_query(
-                """
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(rows))
+            self.db.execute_non_query(
+                f"""
                 INSERT INTO agent_evaluation_results
-                    (application_id, agent_name, evaluator_name, score, reason, batch_id)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                    (application_id, agent_name, evaluator_name, score, reason, batch_id,
+                     fingerprint, reused)
+                VALUES {placeholders}
                 """,
-                (application_id, agent_name, evaluator_name, score, reason, batch_id),
+                tuple(value for row in rows for value in row),
             )
         except Exception as exc:
-            logger.warning(f"Failed to save eval result: {exc}")
+            logger.warning(f"Failed to save {len(rows)} eval results: {exc}")
+
+    def _get_saved_scores(self, batch_id: str) -> Dict[Tuple[int, str, str], float]:
+        """Stored scores of a batch, keyed by (application_id, agent, evaluator)."""
+        try:
+            rows = self.db.execute_query(
+                """
+                SELECT application_id, agent_name, evaluator_name, score
+                FROM agent_evaluation_results
+                WHERE batch_id = %s AND score IS NOT NULL
+                """,
+                (batch_id,),
+            ) or []
+        except Exception as exc:
+            logger.warning(f"Could not load results of {batch_id}: {exc}")
+            return {}
+        return {
+            (row["application_id"], row["agent_name"], row["evaluator_name"]): float(row["score"])
+            for row in rows
+        }
+
+    def _get_scores_by_fingerprint(self, fingerprints: List[str]) -> Dict[str, Tuple[float, Optional[str]]]:
+        """Latest stored (score, reason) for each known fingerprint, in one query."""
+        if not fingerprints:
+            return {}
+        try:
+            rows = self.db.execute_query(
+                """
+                SELECT DISTINCT ON (fingerprint) fingerprint, score, reason
+                FROM agent_evaluation_results
+                WHERE fingerprint = ANY(%s) AND score IS NOT NULL
+                ORDER BY fingerprint, created_at DESC
+                """,
+                (list(set(fingerprints)),),
+            ) or []
+        except Exception as exc:
+            logger.warning(f"Could not look up previous evaluation scores: {exc}")
+            return {}
+        return {row["fingerprint"]: (float(row["score"]), row.get("reason")) for row in rows}
+
+    def _get_run_agents(self, batch_id: str) -> Optional[List[str]]:
+        """Agents recorded for an earlier run, if any."""
+        try:
+            rows = self.db.execute_query(
+                "SELECT agents_evaluated FROM agent_evaluation_runs WHERE batch_id = %s",
+                (batch_id,),
+            )
+        except Exception:
+            return None
+        agents = (rows[0].get("agents_evaluated") or "") if rows else ""
+        return [a.strip() for a in agents.split(",") if a.strip()] or None
+
+    def get_resumable_batch_id(self) -> Optional[str]:
+        """The most recent run that did not complete, if any."""
+        try:
+            rows = self.db.execute_query("""
+                SELECT batch_id FROM agent_evaluation_runs
+                WHERE status IN ('running', 'failed')
+                ORDER BY created_at DESC LIMIT 1
+            """)
+        except Exception as exc:
+            logger.warning(f"Could not look up resumable evaluation runs: {exc}")
+            return None
+        return rows[0]["batch_id"] if rows else None
 
-    def _save_run_record(self, batch_id: str, status: str):
-        """Create a run record."""
+    def _save_run_record(self, batch_id: str, status: str, agents: Optional[List[str]] = None):
+        """Create a run record, or mark an existing one (being resumed) as *status*."""
         try:
             self.db.execute_query(
                 """
-                INSERT INTO agent_evaluation_runs (batch_id, status)
-                VALUES (%s, %s)
-                ON CONFLICT (batch_id) DO NOTHING
+                INSERT INTO agent_evaluation_runs (batch_id, status, agents_evaluated)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (batch_id) DO UPDATE SET status = EXCLUDED.status
                 """,
-                (batch_id, status),
+                (batch_id, status, ", ".join(agents or [])),
             )
         except Exception as exc:
             logger.warning(f"Failed to save run record: {exc}")
@@ -0,0 +1,385 @@
+"""Governance stats engine: computed once, stored as shared snapshots.
+
+The Trust & Governance endpoints used to recompute on every request — one
+``COUNT(*) FILTER`` scan of ``school_enriched_data`` per provenance field
+(46 of them), plus a process-local one-week dict cache for the agent
+report that each gunicorn worker rebuilt on its own.
+
+Now each report is a *kind* (``provenance``, ``agent_report``,
+``oversight``) computed by one function here and stored as JSON in the
+``governance_snapshots`` table, so every worker serves the same numbers.
+A snapshot is recomputed when
+
+* the stamp of its source tables (``Database.get_governance_snapshot``
+  returns it with the stored row, in the same round trip) no longer
+  matches the one it was computed from — i.e. the data changed;
+* it is older than ``GOVERNANCE_SNAPSHOT_MAX_AGE`` — the schedule, which
+  also catches writers that bypass ``updated_at``;
+* the caller forces it (``?refresh=1`` or
+  ``scripts/refresh_governance_snapshots.py`` from cron).
+
+Provenance coverage for every field comes from a single grouped scan.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils import safe_load_json
+
+logger = logging.getLogger(__name__)
+
+# Seconds a snapshot is served before it is recomputed even if its source
+# stamp is unchanged
+GOVERNANCE_SNAPSHOT_MAX_AGE = int(os.getenv("GOVERNANCE_SNAPSHOT_MAX_AGE", str(6 * 60 * 60)))
+
+# Bump when a compute function's output changes shape so stored snapshots
+# from the previous release are not served
+STATS_VERSION = '1'
+
+# Fields that are authoritative only when sourced from GOSA CSV import
+GOSA_FIELDS = [
+    'act_composite_avg', 'act_english_avg', 'act_math_avg',
+    'act_reading_avg', 'act_science_avg', 'act_students_tested',
+    'sat_total_avg', 'sat_ebrw_avg', 'sat_math_avg', 'sat_students_tested',
+    'college_going_rate', 'college_going_2yr_rate', 'college_going_4yr_rate',
+    'hope_eligible_pct', 'dropout_rate',
+    'milestones_ela_proficient_pct', 'milestones_math_proficient_pct',
+    'ap_students_tested', 'ap_tests_administered', 'ap_tests_3plus',
+    'instruction_expenditure_per_fte', 'inexperienced_teacher_pct',
+    'school_ppe', 'fesr_star_rating', 'fesr_academic_score',
+]
+
+# Fields from NCES CCD CSV import
+NCES_FIELDS = [
+    'total_students', 'graduation_rate', 'free_lunch_percentage',
+    'reduced_lunch_percentage', 'direct_certification_pct',
+    'student_teacher_ratio', 'teachers_fte',
+    'is_title_i', 'is_charter', 'is_magnet', 'locale_code',
+    'district_exp_per_pupil', 'district_rev_per_pupil',
+]
+
+# Fields that may be AI-estimated by Naveen
+AI_ESTIMATED_FIELDS = [
+    'opportunity_score', 'community_sentiment_score',
+    'parent_satisfaction_score', 'school_investment_level',
+    'ap_course_count', 'honors_course_count', 'ap_exam_pass_rate',
+    'college_acceptance_rate',
+]
+
+# Sources whose stamp invalidates each kind (see
+# Database._governance_source_stamp)
+SNAPSHOT_SOURCES = {
+    'provenance': ('schools',),
+    'agent_report': ('audit', 'evaluations'),
+    'oversight': ('schools', 'evaluations'),
+}
+
+
+def _field_category(field: str) -> str:
+    if field in GOSA_FIELDS:
+        return 'gosa_authoritative'
+    if field in NCES_FIELDS:
+        return 'nces_authoritative'
+    return 'ai_estimated'
+
+
+def coverage_query(fields: Iterable[str]) -> str:
+    """One grouped scan counting, per import status, rows and non-null *fields*."""
+    counts = "".join(f",\n               COUNT({field}) AS {field}" for field in fields)
+    return f"""
+        SELECT analysis_status,
+               COUNT(*) AS cnt{counts}
+        FROM school_enriched_data
+        WHERE is_active = TRUE
+        GROUP BY analysis_status
+    """
+
+
+def _evaluation_scope(db) -> Tuple[Optional[str], str]:
+    """(applications table, WHERE clause) for real — not training/test — applications."""
+    applications_table = db.get_table_name('applications')
+    if not applications_table:
+        return None, ''
+    training_col = db.get_training_example_column()
+    test_col = db.get_test_data_column()
+    where = f"WHERE {training_col} = FALSE"
+    if db.has_applications_column(test_col):
+        where += f" AND ({test_col} = FALSE OR {test_col} IS NULL)"
+    return applications_table, where
+
+
+def compute_provenance(db) -> Dict[str, Any]:
+    """School data provenance: per-field authoritative vs. AI-estimated vs. missing."""
+    if not db.has_table('school_enriched_data'):
+        return {'status': 'success', 'total_schools': 0, 'fields': {}}
+
+    all_fields = sorted(set(GOSA_FIELDS + NCES_FIELDS + AI_ESTIMATED_FIELDS))
+    columns = db._get_table_columns('school_enriched_data')
+    present = [f for f in all_fields if f in columns] if columns else all_fields
+
+    rows = db.execute_query(coverage_query(present))
+    total = sum(r['cnt'] for r in rows)
+    if total == 0:
+        return {'status': 'success', 'total_schools': 0, 'fields': {}}
+    source_counts = {r['analysis_status']: r['cnt'] for r in rows}
+
+    field_stats = {}
+    for field in all_fields:
+        if field not in present:
+            # Column may not exist yet
+            field_stats[field] = {'category': 'unknown', 'has_value': 0,
+                                  'missing': total, 'coverage_pct': 0}
+            continue
+        has_value = sum(r[field] for r in rows)
+        field_stats[field] = {
+            'category': _field_category(field),
+            'has_value': has_value,
+            'missing': total - has_value,
+            'coverage_pct': round(has_value / total * 100, 1),
+        }
+
+    return {
+        'status': 'success',
+        'total_schools': total,
+        'source_counts': source_counts,
+        'summary': {
+            'gosa_fields_with_data': sum(1 for f in GOSA_FIELDS if field_stats[f]['has_value'] > 0),
+            'gosa_fields_total': len(GOSA_FIELDS),
+            'nces_fields_with_data': sum(1 for f in NCES_FIELDS if field_stats[f]['has_value'] > 0),
+            'nces_fields_total': len(NCES_FIELDS),
+            'ai_estimated_fields': len(AI_ESTIMATED_FIELDS),
+        },
+        'fields': field_stats,
+    }
+
+
+def _agent_outcomes(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-agent success/error/skipped counts over sampled ``agent_results``."""
+    agent_stats: Dict[str, Dict[str, int]] = {}
+    total_evaluations = 0
+    for row in rows:
+        ar = safe_load_json(row.get('agent_results'))
+        if not isinstance(ar, dict):
+            continue
+        total_evaluations += 1
+        for agent_name, agent_data in ar.items():
+            if agent_name.startswith('_'):
+                continue
+            counts = agent_stats.setdefault(agent_name, {'success': 0, 'error': 0, 'skipped': 0})
+            if isinstance(agent_data, dict):
+                if agent_data.get('error'):
+                    counts['error'] += 1
+                elif agent_data.get('skipped'):
+                    counts['skipped'] += 1
+                else:
+                    counts['success'] += 1
+            elif agent_data is not None:
+                counts['success'] += 1
+    return {
+        'total_evaluations_sampled': total_evaluations,
+        'agents': {
+            name: {
+                **counts,
+                'success_rate': round(counts['success'] / max(sum(counts.values()), 1) * 100, 1),
+            }
+            for name, counts in sorted(agent_stats.items())
+        },
+    }
+
+
+def _gaston_audit(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Gaston flag rate and flag types over sampled ``agent_results``."""
+    flagged_count = 0
+    total_audited = 0
+    flag_types: Dict[str, int] = {}
+    for row in rows:
+        ar = safe_load_json(row.get('agent_results'))
+        if not isinstance(ar, dict):
+            continue
+        gaston = ar.get('gaston') or ar.get('Gaston') or {}
+        if not (isinstance(gaston, dict) and gaston):
+            continue
+        total_audited += 1
+        flags = gaston.get('flags') or gaston.get('issues') or []
+        if flags:
+            flagged_count += 1
+            for flag in (flags if isinstance(flags, list) else [flags]):
+                flag_type = flag.get('type', 'unknown') if isinstance(flag, dict) else str(flag)
+                flag_types[flag_type] = flag_types.get(flag_type, 0) + 1
+    return {
+        'total_audited': total_audited,
+        'flagged': flagged_count,
+        'flag_rate_pct': round(flagged_count / max(total_audited, 1) * 100, 1),
+        'flag_types': flag_types,
+    }
+
+
+def compute_agent_report(db) -> Dict[str, Any]:
+    """Agent activity from the audit log and outcomes from recent ``agent_results``."""
+    report: Dict[str, Any] = {'status': 'success'}
+
+    if db.has_table('agent_audit_logs'):
+        agent_rows = db.execute_query("""
+            SELECT
+                agent_name,
+                COUNT(*) as total_runs,
+                MIN(created_at) as first_run,
+                MAX(created_at) as last_run
+            FROM agent_audit_logs
+            GROUP BY agent_name
+            ORDER BY total_runs DESC
+        """)
+        report['agent_activity'] = [
+            {
+                'agent': r['agent_name'],
+                'total_runs': r['total_runs'],
+                'first_run': r['first_run'].isoformat() if r.get('first_run') else None,
+                'last_run': r['last_run'].isoformat() if r.get('last_run') else None,
+            }
+            for r in agent_rows
+        ]
+    else:
+        report['agent_activity'] = []
+
+    applications_table, where = _evaluation_scope(db)
+    if applications_table:
+        eval_rows = db.execute_query(f"""
+            SELECT agent_results
+            FROM {applications_table}
+            {where}
+              AND agent_results IS NOT NULL
+            ORDER BY uploaded_date DESC
+            LIMIT 500
+        """)
+        report['evaluation_stats'] = _agent_outcomes(eval_rows)
+
+        # Gaston audit flags (post-Merlin checks)
+        gaston_rows = db.execute_query(f"""
+            SELECT agent_results
+            FROM {applications_table}
+            {where}
+              AND agent_results IS NOT NULL
+              AND agent_results::text LIKE '%gaston%'
+            ORDER BY uploaded_date DESC
+            LIMIT 500
+        """)
+        report['gaston_audit'] = _gaston_audit(gaston_rows)
+
+    return report
+
+
+def compute_oversight(db) -> Dict[str, Any]:
+    """School review statuses, recent reviews, and evaluation counts."""
+    result: Dict[str, Any] = {'status': 'success'}
+
+    if db.has_table('school_enriched_data'):
+        review_rows = db.execute_query("""
+            SELECT
+                human_review_status,
+                COUNT(*) as cnt
+            FROM school_enriched_data
+            WHERE is_active = TRUE
+            GROUP BY human_review_status
+        """)
+        result['school_reviews'] = {
+            r['human_review_status'] or 'unset': r['cnt']
+            for r in review_rows
+        }
+
+        recent_reviews = db.execute_query("""
+            SELECT school_name, state_code, human_review_status,
+                   reviewed_by, reviewed_date
+            FROM school_enriched_data
+            WHERE reviewed_date IS NOT NULL AND is_active = TRUE
+            ORDER BY reviewed_date DESC
+            LIMIT 20
+        """)
+        result['recent_reviews'] = [
+            {
+                'school': r['school_name'],
+                'state': r['state_code'],
+                'status': r['human_review_status'],
+                'reviewer': r['reviewed_by'],
+                'date': r['reviewed_date'].isoformat() if r.get('reviewed_date') else None,
+            }
+            for r in recent_reviews
+        ]
+    else:
+        result['school_reviews'] = {}
+        result['recent_reviews'] = []
+
+    result['evaluations'] = {'total': 0, 'evaluated': 0, 'pending': 0}
+    applications_table, where = _evaluation_scope(db)
+    if applications_table:
+        count_rows = db.execute_query(f"""
+            SELECT
+                COUNT(*) as total,
+                COUNT(*) FILTER (WHERE LOWER(status) != 'pending') as evaluated,
+                COUNT(*) FILTER (WHERE LOWER(status) = 'pending') as pending
+            FROM {applications_table}
+            {where}
+        """)
+        if count_rows:
+            result['evaluations'] = {
+                'total': count_rows[0]['total'],
+                'evaluated': count_rows[0]['evaluated'],
+                'pending': count_rows[0]['pending'],
+            }
+
+    return result
+
+
+_COMPUTE = {
+    'provenance': compute_provenance,
+    'agent_report': compute_agent_report,
+    'oversight': compute_oversight,
+}
+
+
+def _served(payload: Dict[str, Any], computed_at: float) -> Dict[str, Any]:
+    """The payload as the dashboard reads it (``_cached_at`` drives its badge)."""
+    return {**payload, '_cached_at': computed_at}
+
+
+def get_snapshot(db, kind: str, force: bool = False) -> Dict[str, Any]:
+    """Return the *kind* report, recomputing and storing it only when stale.
+
+    A failure to read or write the snapshot table is logged and the report
+    is computed live, so the dashboard never depends on the snapshot.
+    """
+    compute = _COMPUTE[kind]
+    sources = SNAPSHOT_SOURCES[kind]
+    current_version = None
+    try:
+        stored = db.get_governance_snapshot(kind, sources)
+        current_version = f"{STATS_VERSION}|{stored['current_version']}"
+        age = stored.get('age_seconds')
+        if (not force and stored.get('payload') is not None
+                and stored.get('source_version') == current_version
+                and age is not None and float(age) < GOVERNANCE_SNAPSHOT_MAX_AGE):
+            return _served(safe_load_json(stored['payload']), time.time() - float(age))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read governance snapshot '{kind}': {e}")
+
+    payload = compute(db)
+    payload['generated_at'] = datetime.now(timezone.utc).isoformat()
+    computed_at = time.time()
+    if current_version is not None:
+        try:
+            db.save_governance_snapshot(kind, json.dumps(payload, default=str), current_version)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not store governance snapshot '{kind}': {e}")
+    return _served(payload, computed_at)
+
+
+def refresh_snapshots(db, kinds: Optional[Iterable[str]] = None) -> List[str]:
+    """Recompute and store every (or each named) snapshot; returns the kinds refreshed."""
+    refreshed = []
+    for kind in (kinds or _COMPUTE):
+        get_snapshot(db, kind, force=True)
+        refreshed.append(kind)
+    return refreshed
@@ -0,0 +1,78 @@
+"""Shared store for long-running background jobs.
+
+Jobs run in a thread on whichever worker received the request; their
+status, progress and result live in the ``background_jobs`` table so any
+worker can answer a poll. A unique index allows one running job per kind,
+which replaces the per-route "already running?" checks against temp files.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from src.utils import safe_load_json
+
+logger = logging.getLogger(__name__)
+
+# A running job that reports nothing for this long is treated as abandoned
+# (its worker was recycled) and no longer blocks a new run of the same kind.
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "900"))
+
+
+class Job:
+    """Handle a worker thread uses to report on one background job.
+
+    Progress fields are merged, so callers report only what changed.
+    Store errors are logged and swallowed: a lost progress update must
+    never kill the job itself.
+    """
+
+    def __init__(self, db, job_id: str, kind: str):
+        self.db = db
+        self.job_id = job_id
+        self.kind = kind
+        self._progress: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def progress(self, **fields: Any) -> None:
+        with self._lock:
+            self._progress.update(fields)
+            self._write(progress=dict(self._progress))
+
+    def finish(self, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._write(status='done', result=result)
+
+    def fail(self, error: str) -> None:
+        with self._lock:
+            self._write(status='error', error=error)
+
+    def _write(self, **fields: Any) -> None:
+        try:
+            self.db.update_background_job(self.job_id, **fields)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update {self.kind} job {self.job_id}: {e}")
+
+
+def start_job(db, kind: str, params: Optional[Dict[str, Any]] = None) -> Optional[Job]:
+    """Register a running *kind* job, or return None if one is already running."""
+    job_id = uuid.uuid4().hex
+    if not db.create_background_job(job_id, kind, params or {}, JOB_STALE_SECONDS):
+        return None
+    return Job(db, job_id, kind)
+
+
+def latest_job(db, kind: str) -> Optional[Dict[str, Any]]:
+    """The most recent *kind* job row (status, progress, result, error, elapsed_seconds)."""
+    job = db.get_latest_background_job(kind)
+    if not job:
+        return None
+    job = dict(job)
+    for key in ('params', 'progress', 'result'):
+        value = safe_load_json(job.get(key))
+        job[key] = value if isinstance(value, dict) else {}
+    if job.get('elapsed_seconds') is not None:
+        job['elapsed_seconds'] = round(float(job['elapsed_seconds']), 1)
+    return job
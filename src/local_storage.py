@@ -0,0 +1,220 @@
+"""Local filesystem backend for chunked uploads (no Azure required).
+
+Mirrors the Azure Block Blob flow used by ``StorageManager``:
+
+* ``stage``  — writes one chunk at ``chunk_index * chunk_size`` into a
+  preallocated ``.partial`` file with ``os.pwrite``.  Chunks may arrive
+  concurrently and out of order (from several gunicorn workers, even);
+  each accepted chunk leaves a tiny marker file holding its SHA-256.
+* ``commit`` — checks every marker is present, optionally verifies the
+  whole-file SHA-256, fsyncs and atomically renames the file into place.
+
+Committed files live at ``<root>/<container>/<blob_path>`` so callers can
+hand the path straight to ``DocumentProcessor`` instead of copying it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", os.path.join("uploads", "blob-store"))
+
+_HASH_READ_SIZE = 1024 * 1024
+
+
+def _fsync_dir(path: str) -> None:
+    """fsync a directory so a rename inside it is durable (no-op on Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LocalChunkedUploadStore:
+    """Assemble chunked uploads on local disk with the ``StorageManager`` API."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or LOCAL_STORAGE_DIR)
+
+    # ── Paths ──────────────────────────────────────────────────────────
+
+    def path_for(self, container: str, blob_path: str) -> str:
+        """Absolute path of a (committed) blob, refusing path traversal."""
+        path = os.path.abspath(os.path.join(self.root, container, blob_path))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Blob path escapes storage root: {blob_path}")
+        return path
+
+    def _staging_dir(self, container: str, blob_path: str) -> str:
+        return self.path_for(container, blob_path) + ".chunks"
+
+    def _partial_path(self, container: str, blob_path: str) -> str:
+        return self.path_for(container, blob_path) + ".partial"
+
+    def exists(self, container: str, blob_path: str) -> bool:
+        try:
+            return os.path.isfile(self.path_for(container, blob_path))
+        except ValueError:
+            return False
+
+    # ── Staging ────────────────────────────────────────────────────────
+
+    def stage(self, container: str, blob_path: str, chunk_index: int,
+              chunk_data: bytes, total_chunks: int,
+              chunk_size: Optional[int] = None,
+              total_size: Optional[int] = None,
+              checksum: Optional[str] = None) -> Dict[str, Any]:
+        """Write one chunk at its offset and record its checksum.
+
+        ``chunk_size`` is the client's fixed chunk length (every chunk but
+        the last).  When the client doesn't send it, it is learned from
+        the first non-final chunk, which is why the client must send the
+        final chunk last in that case.
+        """
+        digest = hashlib.sha256(chunk_data).hexdigest()
+        if checksum and checksum.lower() != digest:
+            raise ValueError(f"Checksum mismatch for chunk {chunk_index}")
+
+        staging = self._staging_dir(container, blob_path)
+        os.makedirs(staging, exist_ok=True)
+        meta_path = os.path.join(staging, "meta.json")
+
+        meta = self._read_meta(staging)
+        if not meta:
+            learned = chunk_size or (len(chunk_data) if chunk_index < total_chunks - 1 else None)
+            meta = {"chunk_size": learned, "total_size": total_size, "total_chunks": total_chunks}
+            if learned or total_chunks == 1:
+                self._write_json_atomic(meta_path, meta)
+
+        size = chunk_size or meta.get("chunk_size")
+        if size is None and total_chunks > 1:
+            raise ValueError("chunk_size is unknown — send chunk_size or a non-final chunk first")
+        offset = chunk_index * (size or 0)
+
+        partial = self._partial_path(container, blob_path)
+        fd = os.open(partial, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if total_size and os.fstat(fd).st_size < total_size:
+                self._preallocate(fd, total_size)
+            view = memoryview(chunk_data)
+            written = 0
+            while written < len(view):
+                written += os.pwrite(fd, view[written:], offset + written)
+        finally:
+            os.close(fd)
+
+        self._write_json_atomic(
+            os.path.join(staging, f"{chunk_index:06d}.json"),
+            {"sha256": digest, "offset": offset, "length": len(chunk_data)},
+        )
+        logger.debug("Staged local chunk %d for %s/%s at offset %d", chunk_index, container, blob_path, offset)
+        return {"chunk_index": chunk_index, "sha256": digest, "offset": offset}
+
+    @staticmethod
+    def _preallocate(fd: int, size: int) -> None:
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, size)
+
+    @staticmethod
+    def _read_meta(staging: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(staging, "meta.json"), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_json_atomic(path: str, payload: Dict[str, Any]) -> None:
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp, path)
+
+    def received_chunks(self, container: str, blob_path: str) -> Dict[int, Dict[str, Any]]:
+        """Map of chunk_index → marker (sha256/offset/length) for staged chunks."""
+        staging = self._staging_dir(container, blob_path)
+        received: Dict[int, Dict[str, Any]] = {}
+        try:
+            names = os.listdir(staging)
+        except OSError:
+            return received
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext != ".json" or not stem.isdigit():
+                continue
+            try:
+                with open(os.path.join(staging, name), "r", encoding="utf-8") as fh:
+                    received[int(stem)] = json.load(fh)
+            except (OSError, ValueError):
+                continue
+        return received
+
+    # ── Commit ─────────────────────────────────────────────────────────
+
+    def commit(self, container: str, blob_path: str, total_chunks: int,
+               file_checksum: Optional[str] = None) -> Dict[str, Any]:
+        """Validate and finalise a staged upload."""
+        received = self.received_chunks(container, blob_path)
+        missing = [i for i in range(total_chunks) if i not in received]
+        if missing:
+            return {"success": False, "error": "Missing chunks", "missing_chunks": missing}
+
+        partial = self._partial_path(container, blob_path)
+        expected_size = max(m["offset"] + m["length"] for m in received.values())
+        meta = self._read_meta(self._staging_dir(container, blob_path))
+        if meta.get("total_size") and meta["total_size"] != expected_size:
+            return {"success": False, "error": "Size mismatch",
+                    "expected_size": meta["total_size"], "actual_size": expected_size}
+
+        fd = os.open(partial, os.O_RDWR)
+        try:
+            if os.fstat(fd).st_size != expected_size:
+                os.ftruncate(fd, expected_size)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        sha256 = None
+        if file_checksum:
+            sha256 = file_sha256(partial)
+            if sha256 != file_checksum.lower():
+                return {"success": False, "error": "File checksum mismatch", "sha256": sha256}
+
+        final = self.path_for(container, blob_path)
+        os.replace(partial, final)
+        _fsync_dir(os.path.dirname(final))
+        shutil.rmtree(self._staging_dir(container, blob_path), ignore_errors=True)
+        logger.info("✅ Local chunked upload committed: %s/%s (%d chunks, %d bytes)",
+                    container, blob_path, total_chunks, expected_size)
+        return {"success": True, "local_path": final, "size": expected_size, "sha256": sha256}
+
+    def copy_to(self, container: str, blob_path: str, local_path: str) -> bool:
+        """Copy a committed blob to *local_path* (``download_blob_to_file`` parity)."""
+        src = self.path_for(container, blob_path)
+        if not os.path.isfile(src):
+            return False
+        shutil.copyfile(src, local_path)
+        return True
@@ -0,0 +1,396 @@
+"""Milo validation and k-fold cross-validation.
+
+Both jobs score training students whose selection outcome is known and
+compare Milo's ``nextgen_match`` against it. ``CrossValidationRunner``
+does the scoring:
+
+- folds run concurrently, sharing one pool of at most
+  ``MILO_VALIDATION_CONCURRENCY`` in-flight model calls (insight builds
+  and evaluation batches alike);
+- insights are cached per *training signature* (a hash of the training
+  records and Milo's model and prompts), and each student's evaluation is
+  cached under (signature, student, record hash), so rerunning with the
+  same training data re-scores only students whose data changed;
+- every finished batch reports progress and metrics-so-far through the
+  shared job store, so a poll on any worker sees partial results.
+
+The caches are per process and bounded by ``MILO_VALIDATION_CACHE_SIZE``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.agents.milo_data_scientist import MAX_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Concurrent model calls across all folds of one run
+MILO_VALIDATION_CONCURRENCY = int(os.getenv("MILO_VALIDATION_CONCURRENCY", "4"))
+# Cached Milo evaluations (per student, per training signature) kept per process
+MILO_VALIDATION_CACHE_SIZE = int(os.getenv("MILO_VALIDATION_CACHE_SIZE", "4096"))
+
+CV_SEED = 42
+
+
+class InsightsError(RuntimeError):
+    """Milo could not build insights for a fold's training set."""
+
+
+class _LRUCache:
+    """Small thread-safe LRU map."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_insights_cache = _LRUCache(64)
+_evaluation_cache = _LRUCache(MILO_VALIDATION_CACHE_SIZE)
+
+
+def clear_validation_cache() -> None:
+    """Drop cached insights and evaluations (e.g. after a prompt change)."""
+    _insights_cache.clear()
+    _evaluation_cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Records, folds and metrics
+# ---------------------------------------------------------------------------
+
+def was_selected(record: Dict[str, Any]) -> bool:
+    value = record.get('was_selected', False)
+    if isinstance(value, str):
+        return value.lower() in ('true', 'yes', '1', 'selected')
+    return bool(value)
+
+
+def applicant_name(record: Dict[str, Any]) -> str:
+    return (record.get('applicant_name')
+            or f"{record.get('first_name', '')} {record.get('last_name', '')}".strip())
+
+
+def fold_split(records: Sequence[Dict[str, Any]], k: int,
+               seed: int = CV_SEED) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """Deterministic (train, holdout) pairs; the last fold takes the remainder."""
+    recs = list(records)
+    random.Random(seed).shuffle(recs)
+    fold_size = len(recs) // k
+    folds = []
+    for fold_idx in range(k):
+        start = fold_idx * fold_size
+        end = start + fold_size if fold_idx < k - 1 else len(recs)
+        folds.append((recs[:start] + recs[end:], recs[start:end]))
+    return folds
+
+
+def classification_metrics(results: Sequence[Dict[str, Any]], threshold: float) -> Dict[str, Any]:
+    """Confusion counts and rates for results with ``score`` and ``actual_selected``.
+
+    Results whose score is None (the model call failed) are left out.
+    """
+    tp = fp = tn = fn = 0
+    for r in results:
+        score = r.get('score')
+        if score is None:
+            continue
+        predicted = score >= threshold
+        if r.get('actual_selected'):
+            tp += predicted
+            fn += not predicted
+        else:
+            fp += predicted
+            tn += not predicted
+    total = tp + fp + tn + fn
+    precision = tp / (tp + fp) if (tp + fp) else 0
+    recall = tp / (tp + fn) if (tp + fn) else 0
+    return {
+        'accuracy': (tp + tn) / total if total else 0,
+        'precision': precision,
+        'recall': recall,
+        'f1_score': 2 * precision * recall / (precision + recall) if (precision + recall) else 0,
+        'true_positives': tp,
+        'false_positives': fp,
+        'true_negatives': tn,
+        'false_negatives': fn,
+        'total_evaluated': total,
+    }
+
+
+def _rounded(metrics: Dict[str, Any], scale: float = 1, digits: int = 3) -> Dict[str, Any]:
+    rates = ('accuracy', 'precision', 'recall', 'f1_score')
+    return {k: round(v * scale, digits) if k in rates else v for k, v in metrics.items()}
+
+
+# ---------------------------------------------------------------------------
+# Cache keys
+# ---------------------------------------------------------------------------
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def record_fingerprint(record: Dict[str, Any]) -> str:
+    return _digest(json.dumps(record, sort_keys=True, default=str))
+
+
+def training_signature(milo, train: Sequence[Dict[str, Any]]) -> str:
+    """Identifies the insights Milo would build from *train*."""
+    prompts = f"{milo.model}\n{milo._system_prompt_insights()}\n{milo._system_prompt_evaluate()}"
+    members = sorted((str(r.get('application_id')), record_fingerprint(r)) for r in train)
+    return _digest(_digest(prompts) + json.dumps(members))
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class CrossValidationRunner:
+    """Scores the holdout of each (train, holdout) fold with fold-trained insights."""
+
+    def __init__(self, milo, job=None, threshold: float = 65,
+                 concurrency: int = MILO_VALIDATION_CONCURRENCY, use_cache: bool = True):
+        self.milo = milo
+        self.job = job
+        self.threshold = threshold
+        self.concurrency = max(1, concurrency)
+        self.use_cache = use_cache
+        self._lock = threading.Lock()
+        self._scored: List[Dict[str, Any]] = []
+        self._batches_done = 0
+        self._total_batches = 0
+        self._folds_done = 0
+        self.cache_hits = 0
+
+    def run(self, folds: Sequence[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+            ) -> List[List[Dict[str, Any]]]:
+        """Per-fold result lists, each in holdout order."""
+        plans = [self._plan(fold_idx, train, holdout)
+                 for fold_idx, (train, holdout) in enumerate(folds, start=1)]
+        self._total_batches = sum(len(p['batches']) for p in plans)
+        self._report(f"Batch 0/{self._total_batches} ({len(self._scored)} students scored)")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency,
+                                thread_name_prefix='milo-cv-model') as model_pool, \
+                ThreadPoolExecutor(max_workers=max(1, len(plans)),
+                                   thread_name_prefix='milo-cv-fold') as fold_pool:
+            futures = [fold_pool.submit(self._run_fold, plan, model_pool) for plan in plans]
+            return [future.result() for future in futures]
+
+    def _plan(self, fold_idx: int, train, holdout) -> Dict[str, Any]:
+        signature = training_signature(self.milo, train)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(holdout)
+        pending = []
+        for i, record in enumerate(holdout):
+            key = (signature, record.get('application_id'), record_fingerprint(record))
+            cached = _evaluation_cache.get(key) if self.use_cache else None
+            if cached is not None:
+                results[i] = self._annotate(dict(cached), record, fold_idx)
+                self._scored.append(results[i])
+                self.cache_hits += 1
+            else:
+                pending.append((i, record, key))
+        batches = [pending[i:i + MAX_BATCH_SIZE] for i in range(0, len(pending), MAX_BATCH_SIZE)]
+        return {'fold': fold_idx, 'train': train, 'signature': signature,
+                'results': results, 'batches': batches}
+
+    def _run_fold(self, plan: Dict[str, Any], model_pool: ThreadPoolExecutor) -> List[Dict[str, Any]]:
+        if plan['batches']:
+            insights = model_pool.submit(self._insights, plan['train'], plan['signature']).result()
+            futures = {model_pool.submit(self._score_batch, batch, insights): batch
+                       for batch in plan['batches']}
+            for future in as_completed(futures):
+                batch_results = []
+                for (i, record, key), result in zip(futures[future], future.result()):
+                    if self.use_cache and result.get('status') != 'error':
+                        _evaluation_cache.put(key, dict(result))
+                    plan['results'][i] = self._annotate(result, record, plan['fold'])
+                    batch_results.append(plan['results'][i])
+                with self._lock:
+                    self._scored.extend(batch_results)
+                    self._batches_done += 1
+                    self._report(f"Batch {self._batches_done}/{self._total_batches} "
+                                 f"({len(self._scored)} students scored)")
+        with self._lock:
+            self._folds_done += 1
+            self._report(completed_folds=self._folds_done)
+        return plan['results']
+
+    def _insights(self, train, signature: str) -> Dict[str, Any]:
+        insights = _insights_cache.get(signature) if self.use_cache else None
+        if insights is None:
+            insights = asyncio.run(self.milo.build_insights(train))
+            if insights.get('status') == 'error':
+                raise InsightsError(f"Insights failed: {insights.get('error', 'unknown error')}")
+            _insights_cache.put(signature, insights)
+        return insights
+
+    def _score_batch(self, batch, insights: Dict[str, Any]) -> List[Dict[str, Any]]:
+        records = [record for _, record, _ in batch]
+        try:
+            results = asyncio.run(self.milo._evaluate_batch(records, insights))
+        except Exception as e:
+            logger.error(f"Milo validation batch failed: {e}")
+            results = []
+        results = [r if isinstance(r, dict) else {} for r in results[:len(records)]]
+        results += [{"status": "error", "nextgen_match": 0, "tier": "ERROR",
+                     "explanation": "Validation failed"}] * (len(records) - len(results))
+        return [dict(r) for r in results]
+
+    def _annotate(self, result: Dict[str, Any], record: Dict[str, Any], fold: int) -> Dict[str, Any]:
+        result['application_id'] = record.get('application_id')
+        result['applicant_name'] = applicant_name(record)
+        result['actual_selected'] = was_selected(record)
+        result['fold'] = fold
+        return result
+
+    def _report(self, progress: Optional[str] = None, **fields: Any) -> None:
+        if not self.job:
+            return
+        if progress is not None:
+            fields['progress'] = progress
+            fields['partial_metrics'] = _rounded(
+                classification_metrics(self._scored_view(), self.threshold))
+        self.job.progress(**fields)
+
+    def _scored_view(self) -> List[Dict[str, Any]]:
+        return [{'score': _score(r), 'actual_selected': r['actual_selected']} for r in self._scored]
+
+
+def _score(result: Dict[str, Any]) -> Optional[float]:
+    if result.get('status') == 'error':
+        return None
+    try:
+        return float(result.get('nextgen_match'))
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+def run_validation(milo, records: List[Dict[str, Any]], threshold: float = 65,
+                   job=None, **runner_kwargs) -> Dict[str, Any]:
+    """Score every training student with insights built from all of them."""
+    start_time = time.time()
+    runner = CrossValidationRunner(milo, job=job, threshold=threshold, **runner_kwargs)
+    all_results = runner.run([(records, records)])[0]
+
+    scored = [{'score': r.get('nextgen_match', 0) or 0, 'actual_selected': r['actual_selected']}
+              for r in all_results]
+    metrics = classification_metrics(scored, threshold)
+    accepted_scores = [s['score'] for s in scored if s['actual_selected']]
+    not_selected_scores = [s['score'] for s in scored if not s['actual_selected']]
+    accepted_mean = statistics.mean(accepted_scores) if accepted_scores else 0
+    not_selected_mean = statistics.mean(not_selected_scores) if not_selected_scores else 0
+
+    def _spread(prefix, scores, mean):
+        return {
+            f'{prefix}_mean': round(mean, 1),
+            f'{prefix}_min': round(min(scores), 1) if scores else 0,
+            f'{prefix}_max': round(max(scores), 1) if scores else 0,
+            f'{prefix}_median': round(statistics.median(scores), 1) if scores else 0,
+        }
+
+    all_results.sort(key=lambda x: x.get('nextgen_match', 0) or 0, reverse=True)
+    return {
+        'status': 'success',
+        'agent': 'Milo Data Scientist',
+        'model_display': getattr(milo, 'model_display', None) or milo.model,
+        'threshold': threshold,
+        'total_training_students': len(all_results),
+        'accepted_count': len(accepted_scores),
+        'not_selected_count': len(not_selected_scores),
+        'metrics': {k: round(metrics[k], 3) for k in ('accuracy', 'precision', 'recall', 'f1_score')},
+        'confusion_matrix': {k: metrics[k] for k in (
+            'true_positives', 'false_positives', 'true_negatives', 'false_negatives')},
+        'score_distribution': {
+            **_spread('accepted', accepted_scores, accepted_mean),
+            **_spread('not_selected', not_selected_scores, not_selected_mean),
+            'separation': round(accepted_mean - not_selected_mean, 1),
+        },
+        'students': [
+            {
+                'rank': i + 1,
+                'name': r.get('applicant_name') or 'Unknown',
+                'application_id': r.get('application_id'),
+                'actual': 'ACCEPTED' if r['actual_selected'] else 'NOT SELECTED',
+                'score': r.get('nextgen_match', 0),
+                'tier': r.get('tier', '?'),
+                'predicted_correct': ((r.get('nextgen_match', 0) or 0) >= threshold) == r['actual_selected'],
+                'explanation': r.get('explanation', ''),
+            }
+            for i, r in enumerate(all_results)
+        ],
+        'cache_hits': runner.cache_hits,
+        'elapsed_seconds': round(time.time() - start_time, 1),
+    }
+
+
+def run_cross_validation(milo, records: List[Dict[str, Any]], k: int, threshold: float = 50,
+                         job=None, **runner_kwargs) -> Dict[str, Any]:
+    """k-fold CV: each holdout is scored with insights built from the other folds."""
+    start_time = time.time()
+    runner = CrossValidationRunner(milo, job=job, threshold=threshold, **runner_kwargs)
+    fold_results = runner.run(fold_split(records, k))
+
+    predictions = []
+    for results in fold_results:
+        for r in results:
+            score = _score(r)
+            predictions.append({
+                'application_id': r['application_id'],
+                'name': r['applicant_name'],
+                'actual_selected': r['actual_selected'],
+                'predicted_score': score,
+                'predicted_selected': score >= threshold if score is not None else None,
+                'fold': r['fold'],
+            })
+
+    metrics = classification_metrics(
+        [{'score': p['predicted_score'], 'actual_selected': p['actual_selected']} for p in predictions],
+        threshold)
+    valid = metrics['total_evaluated']
+    return {
+        'status': 'completed',
+        'folds': k,
+        'threshold': threshold,
+        'total_records': len(records),
+        'completed_folds': k,
+        'metrics': _rounded(metrics, scale=100, digits=1) if valid
+        else {'error': 'No predictions available — Milo could not score any holdout student'},
+        'predictions': predictions,
+        'cache_hits': runner.cache_hits,
+        'elapsed_seconds': round(time.time() - start_time, 1),
+        'message': f'Cross-validation complete: {valid} predictions',
+    }
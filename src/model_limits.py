@@ -0,0 +1,78 @@
+"""Shared request pacing for model deployments.
+
+Each model tier is provisioned with a requests-per-minute quota (see the
+deployment notes in ``extensions.get_orchestrator``). Background jobs
+that fan model calls out over many workers take a slot from the
+deployment's limiter before each request, so all of a process's workers
+together stay under the quota instead of each sleeping a fixed delay.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from src.token_budget import model_tier
+
+# Provisioned requests/minute per tier; override with MODEL_RPM_<TIER>.
+TIER_RPM = {
+    'orchestrator': 500,
+    'reasoning': 100,
+    'premium': 160,
+    'merlin': 100,
+    'workhorse': 500,
+    'fast': 200,
+    'lightweight': 200,
+}
+# Deployments that are not a configured tier (MODEL_RPM_DEFAULT)
+DEFAULT_RPM = 100
+
+_limiters: Dict[str, 'RateLimiter'] = {}
+_limiters_lock = threading.Lock()
+
+
+def rpm_limit(model: Optional[str]) -> int:
+    """Requests/minute budget for *model*'s deployment."""
+    tier = model_tier(model)
+    if tier is None:
+        return max(1, int(os.getenv('MODEL_RPM_DEFAULT', DEFAULT_RPM)))
+    return max(1, int(os.getenv(f'MODEL_RPM_{tier.upper()}', TIER_RPM[tier])))
+
+
+class RateLimiter:
+    """Spaces request starts evenly at *rpm* per minute, across threads and loops."""
+
+    def __init__(self, rpm: int):
+        self.rpm = rpm
+        self.interval = 60.0 / rpm
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next request slot; returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            return start - now
+
+    def wait(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def limiter_for(model: Optional[str]) -> RateLimiter:
+    """The process-wide limiter for *model*'s deployment."""
+    key = model or ''
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(rpm_limit(model))
+        return limiter
@@ -0,0 +1,205 @@
+"""OCR page preprocessing — turns a PDF page into compact vision-model payloads.
+
+``DocumentProcessor.extract_text_from_pdf`` used to render every OCR
+candidate at a fixed 300 DPI as an RGB PNG.  For a letter-size scan that is
+a 2550x3300 image of several megabytes, most of which the vision endpoint
+downscales away (``detail: high`` caps images at 2048px on the long edge).
+
+This module renders each page so that:
+
+* the render DPI is chosen from the page (or tile) dimensions so the long
+  edge lands near ``OCR_TARGET_LONG_EDGE`` pixels,
+* pixels are grayscale and encoded as JPEG/WebP (or PNG when smaller),
+* blank scanner margins are cropped before the full-resolution render,
+* very tall pages (legal scans, stitched transcripts) are split into
+  overlapping tiles when fitting them into one image would drop below
+  ``OCR_MIN_LEGIBLE_DPI``.
+
+Everything here is pure PyMuPDF; OpenCV is used only for WebP output when
+it is installed.
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Long-edge pixel target for each rendered image.  2048 matches the largest
+# dimension the OpenAI/Azure vision ``detail: high`` path keeps.
+OCR_TARGET_LONG_EDGE = int(os.getenv("OCR_TARGET_LONG_EDGE", "2048"))
+OCR_MIN_DPI = int(os.getenv("OCR_MIN_DPI", "100"))
+OCR_MAX_DPI = int(os.getenv("OCR_MAX_DPI", "200"))
+
+# auto | jpeg | webp | png — "auto" keeps whichever of JPEG/PNG is smaller
+# (PNG wins on clean digital pages, JPEG on noisy scans).
+OCR_IMAGE_FORMAT = os.getenv("OCR_IMAGE_FORMAT", "auto").lower()
+OCR_JPEG_QUALITY = int(os.getenv("OCR_JPEG_QUALITY", "75"))
+
+# Regions that would render below this DPI at the target size are tiled.
+OCR_MIN_LEGIBLE_DPI = int(os.getenv("OCR_MIN_LEGIBLE_DPI", "140"))
+_TILE_OVERLAP = 0.04  # fraction of tile height shared with the next tile
+
+# Margin cropping: gray level at or above which a pixel counts as paper.
+_BLANK_LEVEL = 235
+_CROP_PROBE_DPI = 24
+_CROP_PADDING_PT = 12.0
+# Don't bother cropping unless it removes at least this share of the area.
+_MIN_CROP_GAIN = 0.08
+
+# Legacy renderer settings, kept for the benchmark comparison.
+LEGACY_DPI = 300
+
+# Translation table: dark pixel → 0x01, paper → 0x00 (for bytes.find).
+_INK_TABLE = bytes(1 if v < _BLANK_LEVEL else 0 for v in range(256))
+
+
+@dataclass
+class OcrSegment:
+    """One image to send to the OCR callback."""
+    image_bytes: bytes
+    mime_type: str
+    label: str
+    width: int
+    height: int
+    dpi: int
+
+
+def image_mime_type(data: bytes) -> str:
+    """Sniff the MIME type of an encoded image from its magic bytes."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def choose_render_dpi(width_pt: float, height_pt: float) -> int:
+    """Pick a DPI so the long edge of a *width_pt* x *height_pt* region
+    renders at about ``OCR_TARGET_LONG_EDGE`` pixels."""
+    long_edge_in = max(width_pt, height_pt, 1.0) / 72.0
+    dpi = int(OCR_TARGET_LONG_EDGE / long_edge_in)
+    return max(OCR_MIN_DPI, min(OCR_MAX_DPI, dpi))
+
+
+def find_content_rect(page):
+    """Return the page rect shrunk to its non-blank content (plus padding).
+
+    Renders a tiny grayscale probe and scans it for ink, so it works on
+    scanned pages where the whole page is a single embedded image.
+    Returns the full page rect when nothing worth cropping is found.
+    """
+    import fitz
+
+    full = page.rect
+    try:
+        probe = page.get_pixmap(dpi=_CROP_PROBE_DPI, colorspace=fitz.csGRAY, alpha=False)
+    except Exception:
+        return full
+
+    w, h, stride = probe.width, probe.height, probe.stride
+    samples = probe.samples
+    top = bottom = None
+    left, right = w, -1
+    for y in range(h):
+        row = samples[y * stride:y * stride + w].translate(_INK_TABLE)
+        first = row.find(b"\x01")
+        if first < 0:
+            continue
+        if top is None:
+            top = y
+        bottom = y
+        left = min(left, first)
+        right = max(right, row.rfind(b"\x01"))
+
+    if top is None:
+        return full  # blank page — let the caller render it as-is
+
+    scale = 72.0 / _CROP_PROBE_DPI
+    rect = fitz.Rect(
+        full.x0 + left * scale - _CROP_PADDING_PT,
+        full.y0 + top * scale - _CROP_PADDING_PT,
+        full.x0 + (right + 1) * scale + _CROP_PADDING_PT,
+        full.y0 + (bottom + 1) * scale + _CROP_PADDING_PT,
+    ) & full
+
+    if rect.is_empty or rect.get_area() > full.get_area() * (1 - _MIN_CROP_GAIN):
+        return full
+    return rect
+
+
+def split_tall_rect(rect) -> list:
+    """Split *rect* into overlapping horizontal bands, each short enough to
+    render at ``OCR_MIN_LEGIBLE_DPI`` within ``OCR_TARGET_LONG_EDGE``."""
+    import fitz
+
+    max_band_pt = OCR_TARGET_LONG_EDGE / OCR_MIN_LEGIBLE_DPI * 72.0
+    if rect.height <= max_band_pt or rect.width >= rect.height:
+        return [rect]
+    count = math.ceil(rect.height / max_band_pt)
+    band = rect.height / count
+    overlap = band * _TILE_OVERLAP
+    tiles = []
+    for i in range(count):
+        y0 = rect.y0 + i * band - (overlap if i else 0)
+        y1 = rect.y0 + (i + 1) * band + (overlap if i < count - 1 else 0)
+        tiles.append(fitz.Rect(rect.x0, y0, rect.x1, y1))
+    return tiles
+
+
+def _encode_webp(pix) -> Optional[bytes]:
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        return None
+    arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    ok, buf = cv2.imencode(".webp", arr, [cv2.IMWRITE_WEBP_QUALITY, OCR_JPEG_QUALITY])
+    return buf.tobytes() if ok else None
+
+
+def encode_pixmap(pix, image_format: Optional[str] = None) -> Tuple[bytes, str]:
+    """Encode a grayscale pixmap according to ``OCR_IMAGE_FORMAT``."""
+    fmt = (image_format or OCR_IMAGE_FORMAT).lower()
+    if fmt == "png":
+        return pix.tobytes("png"), "image/png"
+    if fmt == "webp":
+        data = _encode_webp(pix)
+        if data:
+            return data, "image/webp"
+        fmt = "jpeg"  # OpenCV missing — JPEG is the next best thing
+    jpeg = pix.tobytes("jpeg", jpg_quality=OCR_JPEG_QUALITY)
+    if fmt == "auto":
+        png = pix.tobytes("png")
+        if len(png) < len(jpeg):
+            return png, "image/png"
+    return jpeg, "image/jpeg"
+
+
+def render_page_for_ocr(page, page_label: str, image_format: Optional[str] = None) -> List[OcrSegment]:
+    """Render one PDF page into one or more compact OCR segments.
+
+    Args:
+        page: A PyMuPDF page.
+        page_label: Human label such as ``"page 3 of 12"``; tiles get a
+            ``", part i of n"`` suffix so the model knows it's a fragment.
+        image_format: Override for ``OCR_IMAGE_FORMAT``.
+    """
+    import fitz
+
+    tiles = split_tall_rect(find_content_rect(page))
+    segments: List[OcrSegment] = []
+    for i, tile in enumerate(tiles, start=1):
+        dpi = choose_render_dpi(tile.width, tile.height)
+        pix = page.get_pixmap(dpi=dpi, clip=tile, colorspace=fitz.csGRAY, alpha=False)
+        data, mime = encode_pixmap(pix, image_format)
+        label = page_label if len(tiles) == 1 else f"{page_label}, part {i} of {len(tiles)}"
+        segments.append(OcrSegment(data, mime, label, pix.width, pix.height, dpi))
+    return segments
+
+
+def render_page_legacy(page) -> bytes:
+    """The pre-preprocessing renderer (fixed DPI, RGB PNG), for comparisons."""
+    return page.get_pixmap(dpi=LEGACY_DPI).tobytes("png")
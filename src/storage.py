@@ -1,10 +1,12 @@
 """Azure Storage utilities for managing student files."""
 
+import os
 import uuid
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 import logging
 from src.config import config
+from src.local_storage import LocalChunkedUploadStore
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +37,17 @@ class StorageManager:
         }
         if self._prefix:
             logger.info("📦 Storage container prefix: '%s' → %s", self._prefix, list(self.CONTAINERS.values()))
+
+        # Filesystem backend for chunked uploads when there is no blob client
+        # (or when forced with STORAGE_BACKEND=local for single-box load tests)
+        self.local = LocalChunkedUploadStore()
+        force_local = os.getenv("STORAGE_BACKEND", "").lower() == "local"
         
         # Initialize blob service client
-        if self.account_name:
+        if force_local:
+            logger.info("ℹ STORAGE_BACKEND=local — chunked uploads stored under %s", self.local.root)
+            self.client = None
+        elif self.account_name:
             try:
                 from azure.storage.blob import BlobServiceClient
                 from azure.identity import DefaultAzureCredential
@@ -291,13 +301,34 @@ class StorageManager:
 
     def stage_chunked_upload(self, upload_id: str, filename: str,
                              chunk_index: int, chunk_data: bytes,
-                             application_type: str = "2026") -> bool:
-        """Stage one block of a chunked file upload (any file type)."""
+                             application_type: str = "2026",
+                             total_chunks: Optional[int] = None,
+                             chunk_size: Optional[int] = None,
+                             total_size: Optional[int] = None,
+                             checksum: Optional[str] = None) -> bool:
+        """Stage one block of a chunked file upload (any file type).
+
+        Without a blob client the chunk is written into the local
+        filesystem backend instead.  When *checksum* (SHA-256 hex) is given
+        the chunk is verified first and ``ValueError`` raised on mismatch.
+        """
+        if not self.client:
+            container_name = self._get_container_name(application_type)
+            blob_path = f"chunked-uploads/{upload_id}/{filename}"
+            self.local.stage(
+                container_name, blob_path, chunk_index, chunk_data,
+                total_chunks=total_chunks or chunk_index + 1,
+                chunk_size=chunk_size, total_size=total_size, checksum=checksum,
+            )
+            return True
         info = self._chunked_blob_client(upload_id, filename, application_type)
         if not info:
             return False
         blob_client, _, _ = info
         import base64
+        import hashlib
+        if checksum and hashlib.sha256(chunk_data).hexdigest() != checksum.lower():
+            raise ValueError(f"Checksum mismatch for chunk {chunk_index}")
         block_id = base64.b64encode(f"block-{chunk_index:06d}".encode()).decode()
         blob_client.stage_block(block_id=block_id, data=chunk_data)
         logger.debug("Staged block %d for upload %s (%s)", chunk_index, upload_id, filename)
@@ -315,8 +346,29 @@ class StorageManager:
 
     def commit_chunked_upload(self, upload_id: str, filename: str,
                               total_chunks: int,
-                              application_type: str = "2026") -> Dict[str, Any]:
-        """Commit all staged blocks, finalising the blob (any file type)."""
+                              application_type: str = "2026",
+                              file_checksum: Optional[str] = None) -> Dict[str, Any]:
+        """Commit all staged blocks, finalising the blob (any file type).
+
+        In local mode the assembled file is validated (all chunks present,
+        optional whole-file SHA-256), fsynced and moved into place.
+        """
+        if not self.client:
+            container_name = self._get_container_name(application_type)
+            blob_path = f"chunked-uploads/{upload_id}/{filename}"
+            result = self.local.commit(container_name, blob_path, total_chunks,
+                                       file_checksum=file_checksum)
+            if not result.get('success'):
+                return result
+            return {
+                'success': True,
+                'blob_path': blob_path,
+                'blob_url': f"file://{result['local_path']}",
+                'container': container_name,
+                'upload_id': upload_id,
+                'filename': filename,
+                'sha256': result.get('sha256'),
+            }
         info = self._chunked_blob_client(upload_id, filename, application_type)
         if not info:
             return {'success': False, 'error': 'Storage not available'}
@@ -325,11 +377,25 @@ class StorageManager:
         import base64
         from azure.storage.blob import BlobBlock, ContentSettings
 
-        block_list = [
-            BlobBlock(block_id=base64.b64encode(
-                f"block-{i:06d}".encode()).decode())
+        block_ids = [
+            base64.b64encode(f"block-{i:06d}".encode()).decode()
             for i in range(total_chunks)
         ]
+        # Validate that every block is actually staged before committing, so
+        # a dropped chunk comes back as a resumable "missing" list rather
+        # than an opaque InvalidBlockList error.
+        try:
+            _, uncommitted = blob_client.get_block_list('uncommitted')
+            staged = {b.id for b in (uncommitted or [])}
+            missing = [i for i, bid in enumerate(block_ids) if bid not in staged]
+        except Exception as e:
+            logger.debug("Could not list uncommitted blocks for %s: %s", blob_path, e)
+            missing = []
+        if missing:
+            logger.warning("Chunked upload %s missing %d block(s)", blob_path, len(missing))
+            return {'success': False, 'error': 'Missing chunks', 'missing_chunks': missing}
+
+        block_list = [BlobBlock(block_id=bid) for bid in block_ids]
         blob_client.commit_block_list(
             block_list=block_list,
             content_settings=ContentSettings(
@@ -358,7 +424,11 @@ class StorageManager:
                               application_type: str = "2026") -> bool:
         """Stream a blob to a local file (any file type)."""
         if not self.client:
-            return False
+            try:
+                return self.local.copy_to(self._get_container_name(application_type), blob_path, local_path)
+            except Exception as e:
+                logger.error("Error copying local blob %s: %s", blob_path, e)
+                return False
         try:
             container_name = self._get_container_name(application_type)
             container_client = self.client.get_container_client(container_name)
@@ -377,6 +447,19 @@ class StorageManager:
     def download_video_to_file(self, *a, **kw):
         return self.download_blob_to_file(*a, **kw)
 
+    def local_blob_path(self, blob_path: str,
+                        application_type: str = "2026") -> Optional[str]:
+        """Path of a committed blob on local disk, or None when it must be
+        downloaded.  Lets callers open local-mode uploads in place instead
+        of copying them through ``download_blob_to_file``.  The returned
+        file is owned by storage — callers must not delete it."""
+        if self.client:
+            return None
+        container_name = self._get_container_name(application_type)
+        if not self.local.exists(container_name, blob_path):
+            return None
+        return self.local.path_for(container_name, blob_path)
+
 
 # Global storage manager instance
 storage = StorageManager()
@@ -0,0 +1,459 @@
+"""Student detail view: one query, one normalization pass, cached.
+
+The detail page used to run a ``SELECT *`` per agent table (Tiana,
+Rapunzel, Moana, Mulan twice, Merlin twice, Aurora twice), then the school
+enrichment and audit lookups, and decode each row's nested ``parsed_json``
+/ ``content`` JSON with its own copy of the key-promotion rules.
+
+Now ``Database.get_student_detail_rows`` fetches everything in one round
+trip, ``normalize_agent_row`` applies the promotion rules for every agent
+in one place, and ``build_student_detail`` assembles the template context.
+``load_student_detail`` caches that context per application under
+``Database.get_student_detail_version``, a cheap stamp that changes with
+any write the page would show, so repeat views during committee review
+cost one small query.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils import safe_load_json
+
+logger = logging.getLogger(__name__)
+
+# Assembled detail views kept per process (least recently viewed evicted)
+STUDENT_DETAIL_CACHE_SIZE = int(os.getenv("STUDENT_DETAIL_CACHE_SIZE", "256"))
+
+# Keys promoted from Merlin's parsed output onto the Merlin record
+_MERLIN_KEYS = ('overall_score', 'match_score', 'nextgen_match', 'recommendation',
+                'rationale', 'confidence', 'key_strengths', 'key_risks',
+                'decision_drivers', 'top_risk', 'context_factors', 'evidence_used',
+                'executive_summary')
+_MERLIN_CONTENT_KEYS = ('overall_score', 'recommendation', 'rationale', 'confidence',
+                        'key_strengths', 'key_risks', 'executive_summary')
+
+# Underscore-free aliases the templates read, per agent
+_ALIASES = {
+    'tiana': (('essay_summary', 'essaysummary'), ('readiness_score', 'readinessscore'),
+              ('confidence', 'conf')),
+    'mulan': (('recommender_name', 'recommendername'), ('recommender_role', 'recommenderrole'),
+              ('endorsement_strength', 'endorsementstrength')),
+}
+
+
+def _as_dict(value: Any) -> Optional[Dict[str, Any]]:
+    value = safe_load_json(value)
+    return value if isinstance(value, dict) else None
+
+
+def _inner_content(parsed: Dict[str, Any], keys: Iterable[str] = ('content', 'text', 'body')) -> Optional[Dict[str, Any]]:
+    """The stringified JSON many agents nest under ``content``, decoded."""
+    for key in keys:
+        content = parsed.get(key)
+        if content:
+            if isinstance(content, str) and content.strip():
+                try:
+                    inner = json.loads(content)
+                except ValueError:
+                    return None
+                return inner if isinstance(inner, dict) else None
+            return None
+    return None
+
+
+def _fill_missing(record: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """Copy keys *record* doesn't have at all."""
+    for key, value in source.items():
+        record.setdefault(key, value)
+
+
+def _fill_empty(record: Dict[str, Any], source: Dict[str, Any], skip: Tuple[str, ...] = ()) -> None:
+    """Copy keys *record* lacks or holds an empty value for."""
+    for key, value in source.items():
+        if key not in skip and not record.get(key):
+            record[key] = value
+
+
+def _alias(agent: str, record: Dict[str, Any]) -> None:
+    for source, alias in _ALIASES.get(agent, ()):
+        value = record.get(source)
+        if (value is not None if source.endswith(('_score', '_strength')) else value) and not record.get(alias):
+            record[alias] = value
+
+
+def normalize_agent_row(agent: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """A copy of one agent table row with its parsed output promoted for the templates."""
+    record = dict(row)
+    parsed = _as_dict(record.get('parsed_json')) if record.get('parsed_json') else None
+
+    if agent == 'tiana':
+        if parsed is not None:
+            record.setdefault('parsed_data', parsed)
+        parsed_data = record.get('parsed_data')
+        inner = _inner_content(parsed_data) if isinstance(parsed_data, dict) else None
+        if inner:
+            for source, alias in _ALIASES['tiana']:
+                if inner.get(source) is not None and not record.get(alias):
+                    record[alias] = inner[source]
+            _fill_missing(record, inner)
+
+    elif agent in ('rapunzel', 'moana'):
+        if parsed is not None:
+            _fill_empty(record, parsed, skip=(agent, 'agent_results'))
+            inner = _inner_content(parsed)
+            if inner:
+                _fill_empty(record, inner)
+        if agent == 'rapunzel':
+            if not record.get('human_summary'):
+                if record.get('summary'):
+                    record['human_summary'] = record['summary']
+                elif record.get('full_analysis'):
+                    record['human_summary'] = str(record['full_analysis'])[:500]
+            if not record.get('overall_score') and record.get('gpa'):
+                record['overall_score'] = f"GPA: {record['gpa']}"
+
+    elif agent == 'mulan':
+        if parsed is not None:
+            _fill_missing(record, _inner_content(parsed, ('content', 'text')) or parsed)
+
+    elif agent == 'merlin' and record.get('parsed_json'):
+        parsed = parsed or {}
+        # Message-object-shaped output from the Foundry adapter: unwrap content
+        if 'role' in parsed and 'refusal' in parsed:
+            content = parsed.get('content', '')
+            if isinstance(content, dict):
+                parsed = content
+            elif isinstance(content, str) and content.strip():
+                parsed = _as_dict(content) or parsed
+        record['parsed_data'] = parsed
+        for key in _MERLIN_KEYS:
+            if parsed.get(key) is not None and not record.get(key):
+                record[key] = parsed[key]
+        if not record.get('human_summary'):
+            summary = parsed.get('executive_summary') or parsed.get('summary') or parsed.get('rationale')
+            if summary:
+                record['human_summary'] = summary
+        inner = _inner_content(parsed, ('content',))
+        if inner:
+            for key in _MERLIN_CONTENT_KEYS:
+                if inner.get(key) is not None and not record.get(key):
+                    record[key] = inner[key]
+            if not record.get('human_summary'):
+                record['human_summary'] = inner.get('executive_summary') or inner.get('summary') or inner.get('rationale')
+
+    _alias(agent, record)
+    return record
+
+
+def _has_merlin_content(merlin: Dict[str, Any], summary_key: str) -> bool:
+    return bool(merlin.get('overall_score') is not None or merlin.get('recommendation')
+                or merlin.get('executive_summary') or merlin.get(summary_key))
+
+
+def merge_stored_agent_results(agent_results: Dict[str, Any], stored: Any) -> None:
+    """Fold ``applications.agent_results`` into the per-table agent records.
+
+    Per-table rows win; agents only in the stored JSON are added.  An empty
+    ``merlin_evaluations`` row gives way to stored Merlin output that has
+    content, and a populated one picks up the stored keys it lacks.
+    """
+    if not isinstance(stored, dict):
+        return
+    for key, value in stored.items():
+        if key not in agent_results:
+            agent_results[key] = value
+        elif key == 'merlin' and isinstance(value, dict):
+            existing = agent_results['merlin']
+            if _has_merlin_content(existing, 'human_summary'):
+                _fill_empty(existing, value)
+            elif _has_merlin_content(value, 'applicant_summary'):
+                logger.info("Merlin: preferring applications.agent_results (has content) over empty merlin_evaluations row")
+                agent_results['merlin'] = value
+
+
+def _school_context(school: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not school:
+        return None
+    return {
+        'school_name': school.get('school_name'),
+        'state_code': school.get('state_code'),
+        'school_district': school.get('school_district'),
+        'enrollment_size': school.get('enrollment_size'),
+        'diversity_index': school.get('diversity_index'),
+        'socioeconomic_level': school.get('socioeconomic_level'),
+        'academic_programs': school.get('academic_programs'),
+        'graduation_rate': school.get('graduation_rate'),
+        'college_placement_rate': school.get('college_placement_rate'),
+        'opportunity_score': school.get('opportunity_score'),
+        'analysis_date': school.get('updated_at') or school.get('analysis_date'),
+    }
+
+
+def _reprocess_notice(audit: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    source = (audit or {}).get('source_file_name') or ''
+    if not source.startswith('reprocess:'):
+        return None
+    message = source.replace('reprocess:', '').strip()
+    if message.startswith('new_upload:'):
+        message = message.replace('new_upload:', 'New upload: ', 1).strip()
+    return {'message': message, 'created_at': audit.get('created_at')}
+
+
+def _derived_summary(agent_results: Dict[str, Any]) -> Dict[str, Any]:
+    """A student_summary for records that only have per-table agent rows."""
+    merlin = agent_results.get('merlin') or {}
+    aurora = agent_results.get('aurora') or {}
+    parsed = merlin.get('parsed_data') if isinstance(merlin.get('parsed_data'), dict) else {}
+    return {
+        'status': 'completed',
+        'overall_score': merlin.get('overallscore') or merlin.get('overall_score'),
+        'recommendation': merlin.get('recommendation'),
+        'rationale': merlin.get('rationale') or merlin.get('parsedjson', ''),
+        'key_strengths': parsed.get('key_strengths', []),
+        'key_risks': parsed.get('considerations', []),
+        'confidence': merlin.get('confidence'),
+        'agents_completed': list(agent_results.keys()),
+        'formatted_by_aurora': bool(aurora),
+        'aurora_sections': list(aurora.keys()) if isinstance(aurora, dict) else [],
+        'agent_details': agent_results,
+    }
+
+
+def _milo(stored: Any, agent_results: Dict[str, Any]) -> Tuple[Dict[str, Any], Any, Optional[float]]:
+    """(insights, alignment, alignment_score) from persisted Milo output — no live AI calls."""
+    insights: Dict[str, Any] = {}
+    alignment = None
+    if isinstance(stored, dict):
+        data_scientist = stored.get('data_scientist')
+        alignment = stored.get('milo_alignment') or (
+            data_scientist.get('computed_alignment') if isinstance(data_scientist, dict) else None)
+        if isinstance(data_scientist, dict) and data_scientist.get('status') == 'success':
+            insights = data_scientist
+
+    score = None
+    merlin = agent_results.get('merlin')
+    average = insights.get('average_merlin_score')
+    if merlin and average is not None:
+        try:
+            merlin_score = float(merlin.get('overall_score') or merlin.get('overallscore') or 0)
+            score = round(merlin_score - float(average), 1)
+        except (TypeError, ValueError):
+            score = None
+    return insights, alignment, score
+
+
+def _nextgen_match(application: Dict[str, Any], agent_results: Dict[str, Any], alignment: Any) -> Optional[int]:
+    """Next Gen Match for the UI: DB column, then Merlin, then Milo alignment."""
+    candidates = [application.get('nextgen_match'), (agent_results.get('merlin') or {}).get('nextgen_match')]
+    if isinstance(alignment, dict):
+        candidates.append(alignment.get('nextgen_match'))
+    for value in candidates:
+        if value is not None:
+            try:
+                return int(float(value))
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def build_student_detail(rows: Dict[str, Any]) -> Dict[str, Any]:
+    """Template context for ``student_detail.html`` from ``get_student_detail_rows`` output.
+
+    Document availability is left to the caller: it depends on the local
+    filesystem, not the database.
+    """
+    application = dict(rows['application'])
+    agent_results: Dict[str, Any] = {}
+    for agent in ('tiana', 'rapunzel', 'moana'):
+        if isinstance(rows.get(agent), dict):
+            agent_results[agent] = normalize_agent_row(agent, rows[agent])
+    mulan = [r for r in rows.get('mulan') or [] if isinstance(r, dict)]
+    if mulan:
+        agent_results['mulan'] = [normalize_agent_row('mulan', r) for r in mulan]
+    merlin_row = rows.get('merlin') if isinstance(rows.get('merlin'), dict) else None
+    if merlin_row:
+        agent_results['merlin'] = normalize_agent_row('merlin', merlin_row)
+    aurora = rows.get('aurora') if isinstance(rows.get('aurora'), dict) else None
+    if aurora:
+        agent_results['aurora'] = dict(aurora)
+
+    stored = application.get('agent_results')
+    merge_stored_agent_results(agent_results, stored)
+
+    # Raw Merlin row with its parsed output merged, for pages without Aurora
+    merlin_evaluation = None
+    if not aurora and merlin_row:
+        merlin_evaluation = dict(merlin_row)
+        _fill_empty(merlin_evaluation, _as_dict(merlin_row.get('parsed_json')) or {})
+
+    if not application.get('student_summary') and agent_results:
+        application['student_summary'] = _derived_summary(agent_results)
+
+    milo_insights, milo_alignment, alignment_score = _milo(stored, agent_results)
+    try:
+        human_summary = synthesize_human_summary(agent_results, application)
+    except Exception:
+        human_summary = None
+
+    return {
+        'summary': application,
+        'agent_results': agent_results,
+        'aurora_evaluation': aurora,
+        'merlin_evaluation': merlin_evaluation,
+        'is_training': application.get('is_training_example', False),
+        'reprocess_notice': _reprocess_notice(rows.get('reprocess_audit')),
+        'school_context': _school_context(rows.get('school_enrichment')),
+        'human_summary': human_summary,
+        'milo_insights': milo_insights,
+        'milo_alignment': milo_alignment,
+        'alignment_score': alignment_score,
+        'nextgen_match': _nextgen_match(application, agent_results, milo_alignment),
+    }
+
+
+def synthesize_human_summary(agent_results: dict, application: dict) -> str:
+    """Create a concise, human-readable executive summary from agent_results.
+
+    Uses available fields from merlin, tiana, rapunzel, mulan, moana and aurora.
+    """
+    try:
+        parts = []
+        merlin = agent_results.get('merlin') or {}
+        tiana = agent_results.get('tiana') or {}
+        rap = agent_results.get('rapunzel') or {}
+        mulan = agent_results.get('mulan') or {}
+        aurora = agent_results.get('aurora') or {}
+
+        # Profile / headline
+        headline = []
+        name = application.get('applicant_name') or application.get('student_name')
+        if name:
+            headline.append(name)
+        # course rigor + GPA
+        cr = rap.get('course_rigor_index') or rap.get('course_rigor')
+        gpa = rap.get('gpa') or rap.get('cumulative_weighted') or rap.get('cumulative')
+        if cr:
+            headline.append(f"pursues high‑rigor coursework (rigor={cr})")
+        elif gpa:
+            headline.append(f"weighted GPA ~{gpa}")
+        if headline:
+            parts.append('. '.join(headline) + '.')
+
+        # Strengths
+        strengths = []
+        if (rap.get('honors_awards') or rap.get('honor_roll')):
+            strengths.append('consistent honor‑roll performance')
+        if tiana.get('essay_summary') or (tiana.get('parsed_data') and tiana.get('parsed_data').get('essay_summary')):
+            strengths.append('essay expresses motivation and fit for STEM')
+        if mulan:
+            # if list, inspect first
+            first = mulan[0] if isinstance(mulan, list) and mulan else (mulan if isinstance(mulan, dict) else None)
+            if first and (first.get('endorsement_strength') or first.get('endorsement_strength') == 0 or first.get('endorsementstrength')):
+                strengths.append('teacher recommendation with modest endorsement')
+        if strengths:
+            parts.append('Strengths: ' + '; '.join(strengths) + '.')
+
+        # Risks / concerns
+        risks = []
+        # check AP/Honors performance pattern in rapunzel parsed content
+        if rap.get('course_rigor_index') and (rap.get('summary') and 'AP' in str(rap.get('summary'))):
+            # heuristics: presence of AP and note of lower grades
+            if 'C+' in str(rap.get('summary')) or 'drop' in str(rap.get('summary')).lower():
+                risks.append('modest AP/Honors grades despite high course rigor')
+        if not strengths and (not rap and not mulan and not tiana):
+            risks.append('limited supporting evidence in agent outputs')
+        if risks:
+            parts.append('Risks: ' + '; '.join(risks) + '.')
+
+        # Recommendation / verdict
+        rec = merlin.get('recommendation') or merlin.get('parsed_data', {}).get('recommendation') or aurora.get('merlin_recommendation')
+        score = merlin.get('overall_score') or merlin.get('overallscore')
+        verdict = []
+        if score:
+            verdict.append(f'Overall score ~{score}/100')
+        if rec:
+            verdict.append(f'Recommendation: {rec}')
+        if verdict:
+            parts.append(' '.join(verdict) + '.')
+
+        # If nothing produced, fall back to aurora short note
+        if not parts and aurora:
+            parts.append('Aurora produced a formatted evaluation; see detailed report.')
+
+        return ' '.join(parts)
+    except Exception:
+        return ''
+
+
+class _DetailCache:
+    """Thread-safe LRU of assembled detail views, keyed by application id."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: "OrderedDict[int, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, application_id: int, version: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(application_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(application_id)
+            return entry[1]
+
+    def put(self, application_id: int, version: str, view: Dict[str, Any]) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._entries[application_id] = (version, view)
+            self._entries.move_to_end(application_id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _DetailCache(STUDENT_DETAIL_CACHE_SIZE)
+
+
+def load_student_detail(db: Any, application_id: int) -> Optional[Dict[str, Any]]:
+    """The student detail template context, from cache when nothing has changed.
+
+    None if the application doesn't exist.  The returned dict is shared
+    between requests: treat it as read-only.  The version is read before
+    the rows, so a write racing the load at worst costs one extra miss.
+    """
+    version = db.get_student_detail_version(application_id)
+    if version is None:
+        return None
+    view = _cache.get(application_id, version)
+    if view is not None:
+        return view
+    rows = db.get_student_detail_rows(application_id)
+    if rows is None:
+        return None
+    view = build_student_detail(rows)
+    _cache.put(application_id, version, view)
+    return view
+
+
+def clear_student_detail_cache() -> None:
+    _cache.clear()
+
+
+def agent_rows(rows: Dict[str, Any]) -> Dict[str, Any]:
+    """Latest raw row per agent (``tiana`` … ``aurora``), as the debug endpoints show them."""
+    result: Dict[str, Any] = {}
+    for agent in ('tiana', 'rapunzel', 'moana', 'mulan', 'merlin', 'aurora'):
+        value = rows.get(agent)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            result[agent] = value
+    return result
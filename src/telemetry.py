@@ -2,6 +2,8 @@
 
 Telemetry data is persisted to the ``telemetry_events`` PostgreSQL table so
 it survives process restarts and is consistent across gunicorn workers.
+Writes are batched on a background thread, and dashboard aggregates read the
+``telemetry_rollup_minute`` table instead of scanning every raw event.
 In-memory counters are still maintained for sub-second dashboard updates
 within a single worker's lifetime.
 """
@@ -13,7 +15,7 @@ import time
 import threading
 from collections import defaultdict
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from opentelemetry import trace, metrics
 from opentelemetry.trace import SpanKind
@@ -29,6 +31,13 @@ _logger = logging.getLogger(__name__)
 
 _telemetry_initialized = False
 
+# Write-behind sink for model-call events (see NextGenTelemetry.sink)
+TELEMETRY_QUEUE_MAX = int(os.getenv("TELEMETRY_QUEUE_MAX", "10000"))
+TELEMETRY_BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "200"))
+TELEMETRY_FLUSH_INTERVAL = float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "1.0"))
+# How long a model call may wait for room in a full queue before its event is dropped
+TELEMETRY_ENQUEUE_TIMEOUT = float(os.getenv("TELEMETRY_ENQUEUE_TIMEOUT", "0.05"))
+
 
 def initialize_telemetry(service_name: str = "agent-framework", capture_sensitive_data: bool = False) -> None:
     """
@@ -61,6 +70,7 @@ class NextGenTelemetry:
     """
 
     _db_table_ready = False  # class-level flag — one-time table creation
+    _ddl_lock = threading.Lock()
 
     def __init__(self):
         # Cache counters to avoid re-creating on every call
@@ -80,45 +90,202 @@ class NextGenTelemetry:
         self._recent_calls: List[Dict[str, Any]] = []  # last N model calls
         self._max_recent = 200
         self._tracking_since = datetime.now(timezone.utc).isoformat()
+        self._sink = None  # AuditWriter, started on first model call
 
     # ── Database persistence ──────────────────────────────────────────
+    #
+    # Model calls are written behind: ``_persist_to_db`` only queues the
+    # event, and the sink thread inserts each batch with one multi-row
+    # INSERT and then refreshes the per-minute rollup rows the batch
+    # touched.  Dashboard aggregates read the rollup, so their cost tracks
+    # the number of (minute, agent, model) buckets, not raw events.
 
     @classmethod
     def _ensure_db_table(cls) -> bool:
-        """Create ``telemetry_events`` table if it doesn't exist (idempotent)."""
+        """Make sure ``telemetry_events`` and the rollup table exist.
+
+        One catalog probe per process; the DDL only runs when a table is
+        actually missing, and the rollup is backfilled from raw events the
+        first time it is created.
+        """
         if cls._db_table_ready:
             return True
-        try:
-            from src.database import db
-            db.execute_non_query("""
-                CREATE TABLE IF NOT EXISTS telemetry_events (
-                    id              SERIAL PRIMARY KEY,
-                    event_type      VARCHAR(50) NOT NULL DEFAULT 'model_call',
-                    agent_name      VARCHAR(200),
-                    model           VARCHAR(200),
-                    input_tokens    INTEGER DEFAULT 0,
-                    output_tokens   INTEGER DEFAULT 0,
-                    total_tokens    INTEGER DEFAULT 0,
-                    duration_ms     REAL    DEFAULT 0,
-                    success         BOOLEAN DEFAULT TRUE,
-                    created_at      TIMESTAMPTZ DEFAULT NOW()
+        with cls._ddl_lock:
+            if cls._db_table_ready:
+                return True
+            try:
+                from src.database import db
+                rows = db.execute_query(
+                    "SELECT to_regclass('telemetry_events') IS NOT NULL AS has_events, "
+                    "to_regclass('telemetry_rollup_minute') IS NOT NULL AS has_rollup"
                 )
-            """)
-            # Indexes for fast dashboard queries
-            for idx_sql in [
-                "CREATE INDEX IF NOT EXISTS idx_telem_created ON telemetry_events (created_at DESC)",
-                "CREATE INDEX IF NOT EXISTS idx_telem_agent   ON telemetry_events (agent_name)",
-                "CREATE INDEX IF NOT EXISTS idx_telem_model   ON telemetry_events (model)",
-            ]:
-                try:
-                    db.execute_non_query(idx_sql)
-                except Exception:
-                    pass  # OK if index already exists
-            cls._db_table_ready = True
-            return True
+                present = rows[0] if rows else {}
+                if not present.get("has_events"):
+                    cls._create_events_table(db)
+                if not present.get("has_rollup"):
+                    cls._create_rollup_table(db)
+                    cls._refresh_rollup(db)  # backfill from existing events
+                cls._db_table_ready = True
+                return True
+            except Exception as exc:
+                _logger.debug("telemetry table setup skipped: %s", exc)
+                return False
+
+    @staticmethod
+    def _create_events_table(db) -> None:
+        db.execute_non_query("""
+            CREATE TABLE IF NOT EXISTS telemetry_events (
+                id              SERIAL PRIMARY KEY,
+                event_type      VARCHAR(50) NOT NULL DEFAULT 'model_call',
+                agent_name      VARCHAR(200),
+                model           VARCHAR(200),
+                input_tokens    INTEGER DEFAULT 0,
+                output_tokens   INTEGER DEFAULT 0,
+                total_tokens    INTEGER DEFAULT 0,
+                duration_ms     REAL    DEFAULT 0,
+                success         BOOLEAN DEFAULT TRUE,
+                created_at      TIMESTAMPTZ DEFAULT NOW()
+            )
+        """)
+        # Indexes for fast dashboard queries
+        for idx_sql in [
+            "CREATE INDEX IF NOT EXISTS idx_telem_created ON telemetry_events (created_at DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_telem_agent   ON telemetry_events (agent_name)",
+            "CREATE INDEX IF NOT EXISTS idx_telem_model   ON telemetry_events (model)",
+        ]:
+            try:
+                db.execute_non_query(idx_sql)
+            except Exception:
+                pass  # OK if index already exists
+
+    @staticmethod
+    def _create_rollup_table(db) -> None:
+        db.execute_non_query("""
+            CREATE TABLE IF NOT EXISTS telemetry_rollup_minute (
+                bucket_start    TIMESTAMPTZ  NOT NULL,
+                agent_name      VARCHAR(200) NOT NULL,
+                model           VARCHAR(200) NOT NULL,
+                call_count      INTEGER DEFAULT 0,
+                success_count   INTEGER DEFAULT 0,
+                input_tokens    BIGINT  DEFAULT 0,
+                output_tokens   BIGINT  DEFAULT 0,
+                total_tokens    BIGINT  DEFAULT 0,
+                duration_sum_ms DOUBLE PRECISION DEFAULT 0,
+                duration_min_ms REAL    DEFAULT 0,
+                duration_max_ms REAL    DEFAULT 0,
+                p50_ms          REAL    DEFAULT 0,
+                p95_ms          REAL    DEFAULT 0,
+                last_event_at   TIMESTAMPTZ,
+                PRIMARY KEY (bucket_start, agent_name, model)
+            )
+        """)
+
+    @staticmethod
+    def _refresh_rollup(db, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None) -> None:
+        """Recompute rollup rows for the minutes in ``[since, until)`` (all if None).
+
+        Buckets are rebuilt from the raw events rather than incremented, so
+        percentiles stay exact and concurrent workers converge: whichever
+        refresh runs last has seen every committed event.  The ``WHERE`` on
+        the upsert keeps an older snapshot from overwriting a newer one.
+        """
+        where, params = "WHERE event_type = 'model_call'", []
+        if since is not None:
+            where += " AND created_at >= %s"
+            params.append(since)
+        if until is not None:
+            where += " AND created_at < %s"
+            params.append(until)
+        db.execute_non_query(f"""
+            INSERT INTO telemetry_rollup_minute
+                   (bucket_start, agent_name, model, call_count, success_count,
+                    input_tokens, output_tokens, total_tokens,
+                    duration_sum_ms, duration_min_ms, duration_max_ms,
+                    p50_ms, p95_ms, last_event_at)
+            SELECT date_trunc('minute', created_at),
+                   COALESCE(agent_name, 'unknown'), COALESCE(model, 'unknown'),
+                   COUNT(*),
+                   SUM(CASE WHEN success THEN 1 ELSE 0 END),
+                   COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0),
+                   COALESCE(SUM(total_tokens), 0),
+                   COALESCE(SUM(duration_ms), 0), MIN(duration_ms), MAX(duration_ms),
+                   percentile_cont(0.5)  WITHIN GROUP (ORDER BY duration_ms),
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms),
+                   MAX(created_at)
+            FROM telemetry_events
+            {where}
+            GROUP BY 1, 2, 3
+            ON CONFLICT (bucket_start, agent_name, model) DO UPDATE SET
+                call_count      = EXCLUDED.call_count,
+                success_count   = EXCLUDED.success_count,
+                input_tokens    = EXCLUDED.input_tokens,
+                output_tokens   = EXCLUDED.output_tokens,
+                total_tokens    = EXCLUDED.total_tokens,
+                duration_sum_ms = EXCLUDED.duration_sum_ms,
+                duration_min_ms = EXCLUDED.duration_min_ms,
+                duration_max_ms = EXCLUDED.duration_max_ms,
+                p50_ms          = EXCLUDED.p50_ms,
+                p95_ms          = EXCLUDED.p95_ms,
+                last_event_at   = EXCLUDED.last_event_at
+            WHERE telemetry_rollup_minute.call_count <= EXCLUDED.call_count
+        """, tuple(params))
+
+    @classmethod
+    def _write_events(cls, events: List[Dict[str, Any]]) -> None:
+        """Sink callback: insert a batch of events and refresh their minutes."""
+        if not events:
+            return
+        if not cls._ensure_db_table():
+            raise RuntimeError("telemetry_events table not available")
+        from src.database import db
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(events))
+        params: List[Any] = []
+        for e in events:
+            params.extend((
+                "model_call", e["agent_name"], e["model"],
+                e["input_tokens"], e["output_tokens"], e["input_tokens"] + e["output_tokens"],
+                round(e["duration_ms"], 1), e["success"], e["created_at"],
+            ))
+        db.execute_non_query(
+            f"""INSERT INTO telemetry_events
+                    (event_type, agent_name, model,
+                     input_tokens, output_tokens, total_tokens,
+                     duration_ms, success, created_at)
+                VALUES {placeholders}""",
+            tuple(params),
+        )
+        stamps = [e["created_at"] for e in events]
+        since = min(stamps).replace(second=0, microsecond=0)
+        until = max(stamps).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        try:
+            cls._refresh_rollup(db, since, until)
         except Exception as exc:
-            _logger.debug("telemetry_events table creation skipped: %s", exc)
-            return False
+            # The raw rows are in; a later batch (or backfill) covers the gap.
+            _logger.warning("telemetry rollup refresh failed: %s", exc)
+
+    @property
+    def sink(self):
+        """Lazily-started write-behind sink for model-call events."""
+        if self._sink is None:
+            with self._lock:
+                if self._sink is None:
+                    from src.audit_writer import AuditWriter
+                    self._sink = AuditWriter(
+                        self._write_events, name="telemetry",
+                        max_queue=TELEMETRY_QUEUE_MAX,
+                        batch_size=TELEMETRY_BATCH_SIZE,
+                        flush_interval=TELEMETRY_FLUSH_INTERVAL,
+                    )
+        return self._sink
+
+    def sink_stats(self) -> Optional[Dict[str, int]]:
+        """Sink queue depth and counters (None until the first model call)."""
+        return self._sink.stats() if self._sink is not None else None
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until queued model-call events are in the database."""
+        return self._sink.flush(timeout) if self._sink is not None else True
 
     def _persist_to_db(
         self,
@@ -129,30 +296,41 @@ class NextGenTelemetry:
         duration_ms: float,
         success: bool,
     ) -> None:
-        """Write a model call to the DB (fire-and-forget)."""
-        try:
-            if not self._ensure_db_table():
-                _logger.warning("telemetry_events table not available — skipping DB write for %s", agent_name)
-                return
-            from src.database import db
-            db.execute_non_query(
-                """INSERT INTO telemetry_events
-                       (event_type, agent_name, model,
-                        input_tokens, output_tokens, total_tokens,
-                        duration_ms, success)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
-                ('model_call', agent_name, model,
-                 input_tokens, output_tokens, input_tokens + output_tokens,
-                 round(duration_ms, 1), success),
-            )
-        except Exception as exc:
-            _logger.debug("telemetry DB write failed: %s", exc)
+        """Queue a model call for the DB (fire-and-forget).
+
+        Set ``TELEMETRY_ASYNC=0`` to write it synchronously instead.
+        """
+        event = {
+            "model": model,
+            "agent_name": agent_name,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "duration_ms": duration_ms,
+            "success": success,
+            "created_at": datetime.now(timezone.utc),
+        }
+        if os.getenv("TELEMETRY_ASYNC", "1") == "0":
+            try:
+                self._write_events([event])
+            except Exception as exc:
+                _logger.debug("telemetry DB write failed: %s", exc)
+            return
+        self.sink.submit(event, timeout=TELEMETRY_ENQUEUE_TIMEOUT)
 
     # ── DB query helpers (for API endpoints) ──────────────────────────
 
+    @staticmethod
+    def _token_fields(r: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            "input_tokens": int(r.get("input_tokens") or 0),
+            "output_tokens": int(r.get("output_tokens") or 0),
+            "total_tokens": int(r.get("total_tokens") or 0),
+            "call_count": int(r.get("call_count") or 0),
+        }
+
     @classmethod
     def query_db_token_usage(cls) -> Dict[str, Any]:
-        """Query aggregated token usage from the ``telemetry_events`` table.
+        """Query aggregated token usage from the per-minute rollup.
 
         Returns the same structure as ``get_token_usage()`` but sourced from
         the persistent database instead of in-memory counters.
@@ -170,79 +348,36 @@ class NextGenTelemetry:
                 return empty
             from src.database import db
 
-            # Grand totals
-            rows = db.execute_query("""
-                SELECT COALESCE(SUM(input_tokens),0) AS input_tokens,
-                       COALESCE(SUM(output_tokens),0) AS output_tokens,
-                       COALESCE(SUM(total_tokens),0) AS total_tokens,
-                       COUNT(*) AS call_count,
-                       MIN(created_at) AS first_event
-                FROM telemetry_events
-            """)
-            totals = rows[0] if rows else {}
-            empty["totals"] = {
-                "input_tokens": int(totals.get("input_tokens", 0)),
-                "output_tokens": int(totals.get("output_tokens", 0)),
-                "total_tokens": int(totals.get("total_tokens", 0)),
-                "call_count": int(totals.get("call_count", 0)),
-            }
-            if totals.get("first_event"):
-                empty["tracking_since"] = str(totals["first_event"])
-
-            # By model
-            rows = db.execute_query("""
-                SELECT model,
-                       COALESCE(SUM(input_tokens),0) AS input_tokens,
-                       COALESCE(SUM(output_tokens),0) AS output_tokens,
-                       COALESCE(SUM(total_tokens),0) AS total_tokens,
-                       COUNT(*) AS call_count
-                FROM telemetry_events GROUP BY model ORDER BY total_tokens DESC
-            """)
-            for r in (rows or []):
-                empty["by_model"][r["model"] or "unknown"] = {
-                    "input_tokens": int(r["input_tokens"]),
-                    "output_tokens": int(r["output_tokens"]),
-                    "total_tokens": int(r["total_tokens"]),
-                    "call_count": int(r["call_count"]),
-                }
-
-            # By agent
-            rows = db.execute_query("""
-                SELECT agent_name,
-                       COALESCE(SUM(input_tokens),0) AS input_tokens,
-                       COALESCE(SUM(output_tokens),0) AS output_tokens,
-                       COALESCE(SUM(total_tokens),0) AS total_tokens,
-                       COUNT(*) AS call_count
-                FROM telemetry_events GROUP BY agent_name ORDER BY total_tokens DESC
-            """)
-            for r in (rows or []):
-                empty["by_agent"][r["agent_name"] or "unknown"] = {
-                    "input_tokens": int(r["input_tokens"]),
-                    "output_tokens": int(r["output_tokens"]),
-                    "total_tokens": int(r["total_tokens"]),
-                    "call_count": int(r["call_count"]),
-                }
-
-            # By agent+model combo
+            # One pass over the rollup: per agent+model, everything else is
+            # summed from those rows.
             rows = db.execute_query("""
                 SELECT agent_name, model,
                        COALESCE(SUM(input_tokens),0) AS input_tokens,
                        COALESCE(SUM(output_tokens),0) AS output_tokens,
                        COALESCE(SUM(total_tokens),0) AS total_tokens,
-                       COUNT(*) AS call_count
-                FROM telemetry_events GROUP BY agent_name, model
+                       COALESCE(SUM(call_count),0) AS call_count,
+                       MIN(bucket_start) AS first_event
+                FROM telemetry_rollup_minute GROUP BY agent_name, model
                 ORDER BY total_tokens DESC
             """)
+            first_event = None
             for r in (rows or []):
-                key = f"{r['agent_name'] or 'unknown'}::{r['model'] or 'unknown'}"
-                empty["by_agent_model"][key] = {
-                    "input_tokens": int(r["input_tokens"]),
-                    "output_tokens": int(r["output_tokens"]),
-                    "total_tokens": int(r["total_tokens"]),
-                    "call_count": int(r["call_count"]),
-                }
-
-            # Recent calls (last 50)
+                fields = cls._token_fields(r)
+                agent, model = r["agent_name"] or "unknown", r["model"] or "unknown"
+                empty["by_agent_model"][f"{agent}::{model}"] = dict(fields)
+                for bucket in (empty["totals"],
+                               empty["by_model"].setdefault(model, dict.fromkeys(fields, 0)),
+                               empty["by_agent"].setdefault(agent, dict.fromkeys(fields, 0))):
+                    for k, v in fields.items():
+                        bucket[k] += v
+                if r.get("first_event") and (first_event is None or r["first_event"] < first_event):
+                    first_event = r["first_event"]
+            if first_event:
+                empty["tracking_since"] = str(first_event)
+            for key in ("by_model", "by_agent"):
+                empty[key] = dict(sorted(empty[key].items(), key=lambda kv: -kv[1]["total_tokens"]))
+
+            # Recent calls (last 50) — an index scan on raw events
             rows = db.execute_query("""
                 SELECT agent_name, model, input_tokens, output_tokens,
                        total_tokens, duration_ms, success, created_at
@@ -268,10 +403,12 @@ class NextGenTelemetry:
 
     @classmethod
     def query_db_agent_summary(cls) -> Dict[str, Dict[str, Any]]:
-        """Query per-agent summary statistics from the DB.
+        """Query per-agent summary statistics from the per-minute rollup.
 
         Returns a dict keyed by agent_name with totals, success rate, avg
         duration, and models used — the same shape the dashboard expects.
+        ``p50_duration_ms``/``p95_duration_ms`` are call-weighted means of
+        the per-minute percentiles (exact per minute, approximate overall).
         """
         try:
             if not cls._ensure_db_table():
@@ -279,36 +416,40 @@ class NextGenTelemetry:
             from src.database import db
             rows = db.execute_query("""
                 SELECT agent_name,
-                       COUNT(*)                     AS total,
-                       SUM(CASE WHEN success THEN 1 ELSE 0 END) AS success_count,
-                       SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) AS fail_count,
-                       ROUND(AVG(duration_ms)::numeric, 1)      AS avg_duration_ms,
-                       MIN(duration_ms)             AS min_duration_ms,
-                       MAX(duration_ms)             AS max_duration_ms,
+                       SUM(call_count)              AS total,
+                       SUM(success_count)           AS success_count,
+                       SUM(duration_sum_ms)         AS duration_sum_ms,
+                       MIN(duration_min_ms)         AS min_duration_ms,
+                       MAX(duration_max_ms)         AS max_duration_ms,
+                       SUM(p50_ms * call_count)     AS p50_weighted,
+                       SUM(p95_ms * call_count)     AS p95_weighted,
                        COALESCE(SUM(total_tokens),0) AS total_tokens,
-                       MAX(created_at)              AS last_run,
+                       MAX(last_event_at)           AS last_run,
                        ARRAY_AGG(DISTINCT model)    AS models_used
-                FROM telemetry_events
+                FROM telemetry_rollup_minute
                 GROUP BY agent_name
                 ORDER BY total DESC
             """)
             result: Dict[str, Dict[str, Any]] = {}
             for r in (rows or []):
                 name = r.get("agent_name") or "unknown"
-                total = int(r.get("total", 0))
-                success = int(r.get("success_count", 0))
+                total = int(r.get("total") or 0)
+                success = int(r.get("success_count") or 0)
+                duration_sum = float(r.get("duration_sum_ms") or 0)
                 result[name] = {
                     "total": total,
                     "success": success,
-                    "failed": int(r.get("fail_count", 0)),
-                    "total_duration_ms": 0,
+                    "failed": total - success,
+                    "total_duration_ms": round(duration_sum, 1),
                     "min_duration_ms": float(r.get("min_duration_ms") or 0),
                     "max_duration_ms": float(r.get("max_duration_ms") or 0),
-                    "avg_duration_ms": float(r.get("avg_duration_ms") or 0),
+                    "avg_duration_ms": round(duration_sum / total, 1) if total else 0,
+                    "p50_duration_ms": round(float(r.get("p50_weighted") or 0) / total, 1) if total else 0,
+                    "p95_duration_ms": round(float(r.get("p95_weighted") or 0) / total, 1) if total else 0,
                     "success_rate": round((success / total) * 100, 1) if total > 0 else 0,
                     "total_tokens": int(r.get("total_tokens", 0)),
                     "last_run": str(r.get("last_run", "")),
-                    "models_used": [m for m in (r.get("models_used") or []) if m],
+                    "models_used": [m for m in (r.get("models_used") or []) if m and m != "unknown"],
                 }
             return result
         except Exception as exc:
@@ -352,17 +493,17 @@ class NextGenTelemetry:
                 return {}
             from src.database import db
             rows = db.execute_query("""
-                SELECT COUNT(*)                     AS total_calls,
-                       SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) AS total_errors,
-                       ROUND(AVG(duration_ms)::numeric, 1) AS avg_duration_ms
-                FROM telemetry_events
+                SELECT COALESCE(SUM(call_count),0)                 AS total_calls,
+                       COALESCE(SUM(call_count - success_count),0) AS total_errors,
+                       SUM(duration_sum_ms) / NULLIF(SUM(call_count),0) AS avg_duration_ms
+                FROM telemetry_rollup_minute
             """)
             if rows:
                 r = rows[0]
                 return {
                     "total_calls": int(r.get("total_calls", 0)),
                     "total_errors": int(r.get("total_errors", 0)),
-                    "avg_duration_ms": float(r.get("avg_duration_ms") or 0),
+                    "avg_duration_ms": round(float(r.get("avg_duration_ms") or 0), 1),
                 }
             return {}
         except Exception as exc:
@@ -628,11 +769,13 @@ class NextGenTelemetry:
             self._token_total = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "call_count": 0}
             self._recent_calls.clear()
             self._tracking_since = datetime.now(timezone.utc).isoformat()
-        # Also truncate the DB table
+        # Also truncate the DB tables (after queued events have landed)
+        self.flush()
         try:
             if self._ensure_db_table():
                 from src.database import db
                 db.execute_non_query("DELETE FROM telemetry_events")
+                db.execute_non_query("DELETE FROM telemetry_rollup_minute")
         except Exception:
             pass
 
@@ -0,0 +1,344 @@
+"""Token budgeting for long application documents.
+
+Model inputs used to be capped ad hoc (a 30K-character slice in screening
+and Belle's AI extraction, 1500 characters per field in Milo, nothing at
+all for Rapunzel's transcripts).  This module replaces those cut-offs with
+one deterministic pipeline:
+
+1. ``count_tokens`` counts tokens locally — with ``tiktoken`` when it is
+   installed, otherwise with a word/punctuation heuristic that tracks the
+   o200k tokenizer closely on prose, tables and JSON.
+2. ``input_budget`` maps a deployment name to its model tier (see
+   ``Config.model_tier_*``) and returns that tier's input budget
+   (``TOKEN_BUDGET_<TIER>`` overrides the default).
+3. ``allocate`` splits a budget across sections by priority: every section
+   keeps a small floor so nothing vanishes silently, then higher-priority
+   sections are filled first.
+4. ``compress_text`` brings one section down to its allocation: normalize
+   whitespace, drop repeated header/footer lines and pagination boilerplate,
+   then keep head and tail at line boundaries with an omission marker.
+
+``fit_document`` ties these together for page-marked text: pages are
+prioritized by the type Belle detected for them (transcript tables over
+table-of-contents and sparse pages), and ``pack_sections`` does the same
+for named fields.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Input-token budget for document text, per model tier.  Sized so the
+# largest packets stay well inside each tier's latency envelope; the
+# rest of the prompt (instructions, schema) comes on top.
+TIER_INPUT_BUDGETS = {
+    'orchestrator': 6000,
+    'reasoning': 4000,
+    'premium': 8000,
+    'merlin': 8000,
+    'workhorse': 8000,
+    'fast': 6000,
+    'lightweight': 3000,
+}
+DEFAULT_INPUT_BUDGET = 8000
+
+# Page-type priorities for ``fit_document`` (higher is kept first).
+PAGE_PRIORITIES = {
+    'transcript': 3,
+    'recommendation': 2,
+    'application': 2,
+    'unknown': 1,
+    'sparse': 0,
+}
+PREFERRED_PAGE_PRIORITY = 4
+# Tokens every section keeps (if it has them) before priorities apply.
+SECTION_FLOOR_TOKENS = 48
+
+PAGE_MARKER = re.compile(r'^--- PAGE (\d+) of \d+ ---$', re.MULTILINE)
+_TOKEN_PIECES = re.compile(r'[A-Za-z]+|\d+|[^\sA-Za-z\d]')
+_BOILERPLATE = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'^page \d+( of \d+)?$',
+        r'^\d+ of \d+$',
+        r'^[\w\s,\'\-.]+ - #\d+$',          # "Thai, Brandon - #1807" footer
+        r'^(confidential|this document is confidential)\b.*$',
+        r'^https?://\S+$',
+    )
+]
+_encodings: Dict[str, object] = {}
+
+
+# ── Counting ─────────────────────────────────────────────────────────
+
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    key = model or ''
+    if key not in _encodings:
+        try:
+            try:
+                enc = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding('o200k_base')
+            except KeyError:
+                enc = tiktoken.get_encoding('o200k_base')
+        except Exception as exc:  # encodings unavailable offline
+            logger.debug("tiktoken encoding unavailable (%s); using heuristic counts", exc)
+            enc = None
+        _encodings[key] = enc
+    return _encodings[key]
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Tokens in *text* for *model* (exact with tiktoken, estimated otherwise)."""
+    if not text:
+        return 0
+    enc = _encoding(model)
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    # Letters split roughly every 6 characters, digit runs every 3,
+    # punctuation is a token of its own.
+    total = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece[0].isalpha():
+            total += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            total += 1 + (len(piece) - 1) // 3
+        else:
+            total += 1
+    return total
+
+
+def model_tier(model: Optional[str]) -> Optional[str]:
+    """Name of the configured tier whose deployment is *model*, if any."""
+    if not model:
+        return None
+    from src.config import config
+    for tier in TIER_INPUT_BUDGETS:
+        if getattr(config, f'model_tier_{tier}', None) == model:
+            return tier
+    return None
+
+
+def input_budget(model: Optional[str]) -> int:
+    """Input-token budget for document text sent to *model*."""
+    tier = model_tier(model)
+    if tier is None:
+        return int(os.getenv('TOKEN_BUDGET_DEFAULT', DEFAULT_INPUT_BUDGET))
+    return int(os.getenv(f'TOKEN_BUDGET_{tier.upper()}', TIER_INPUT_BUDGETS[tier]))
+
+
+# ── Compression ──────────────────────────────────────────────────────
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines; keep line structure and page markers."""
+    if not text:
+        return ''
+    lines = [re.sub(r'[ \t ]+', ' ', line).strip() for line in text.splitlines()]
+    out = []
+    for line in lines:
+        if not line and (not out or not out[-1]):
+            continue
+        out.append(line)
+    return '\n'.join(out).strip()
+
+
+def _strip_boilerplate(text: str, seen: Optional[set] = None) -> str:
+    """Drop pagination footers and long lines already seen earlier (running headers).
+
+    Pass the same *seen* set for consecutive pages to drop headers repeated
+    across pages.
+    """
+    seen = set() if seen is None else seen
+    out = []
+    for line in text.split('\n'):
+        if PAGE_MARKER.match(line):
+            out.append(line)
+            continue
+        if any(p.match(line) for p in _BOILERPLATE):
+            continue
+        if len(line) >= 20:
+            if line in seen:
+                continue
+            seen.add(line)
+        out.append(line)
+    return '\n'.join(out)
+
+
+def _head_tail(text: str, max_tokens: int, model: Optional[str]) -> str:
+    """Keep ~3/4 of the budget from the start and ~1/4 from the end, at line boundaries."""
+    lines = text.split('\n')
+    marker_tokens = 12
+    head_budget = max(0, (max_tokens - marker_tokens) * 3 // 4)
+    tail_budget = max(0, max_tokens - marker_tokens - head_budget)
+    head, used = [], 0
+    for line in lines:
+        cost = count_tokens(line, model) + 1
+        if used + cost > head_budget:
+            break
+        head.append(line)
+        used += cost
+    rest = lines[len(head):]
+    clipped_chars = 0
+    if rest and head_budget - used >= 24:
+        # Long paragraphs (and compact JSON) are single lines: keep the part
+        # of the next one that fits, ending at a sentence if there is one.
+        line = rest.pop(0)
+        chars_per_token = max(1, len(line) // max(1, count_tokens(line, model)))
+        clipped = line[:(head_budget - used) * chars_per_token]
+        sentence_end = clipped.rfind('. ')
+        if sentence_end > len(clipped) // 2:
+            clipped = clipped[:sentence_end + 1]
+        head.append(clipped)
+        clipped_chars = len(line) - len(clipped)
+    tail, used = [], 0
+    for line in reversed(rest):
+        cost = count_tokens(line, model) + 1
+        if used + cost > tail_budget:
+            break
+        tail.append(line)
+        used += cost
+    tail.reverse()
+    omitted = len(rest) - len(tail)
+    if not omitted and not clipped_chars:
+        return '\n'.join(head + tail)
+    what = ' and '.join(p for p in (
+        f'{clipped_chars} characters' if clipped_chars else '',
+        f'{omitted} lines' if omitted else '',
+    ) if p)
+    return '\n'.join(head + [f'[... {what} omitted to fit the token budget ...]'] + tail)
+
+
+def compress_text(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Deterministically reduce *text* to about *max_tokens* tokens."""
+    if max_tokens <= 0 or not text:
+        return ''
+    text = normalize_text(text)
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    text = normalize_text(_strip_boilerplate(text))
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    return _head_tail(text, max_tokens, model)
+
+
+# ── Allocation ───────────────────────────────────────────────────────
+
+@dataclass
+class Section:
+    """One unit of input text competing for the budget."""
+    name: str
+    text: str
+    priority: int = 1
+    tokens: int = 0
+
+
+@dataclass
+class BudgetResult:
+    """Sections after fitting, with before/after token counts."""
+    sections: List[Section]
+    budget: int
+    tokens_before: int
+    tokens_after: int
+    trimmed: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return '\n\n'.join(s.text for s in self.sections if s.text)
+
+
+def allocate(sizes: Sequence[int], priorities: Sequence[int], budget: int) -> List[int]:
+    """Token allocation per section: floors first, then by priority (ties share proportionally)."""
+    if sum(sizes) <= budget:
+        return list(sizes)
+    alloc = [min(size, SECTION_FLOOR_TOKENS) for size in sizes]
+    # Not even the floors fit: drop floors from the lowest priority up.
+    for i in sorted(range(len(sizes)), key=lambda i: (priorities[i], -i)):
+        if sum(alloc) <= budget:
+            break
+        alloc[i] = 0
+    remaining = budget - sum(alloc)
+    for level in sorted(set(priorities), reverse=True):
+        if remaining <= 0:
+            break
+        members = [i for i, p in enumerate(priorities) if p == level and alloc[i]]
+        demand = {i: sizes[i] - alloc[i] for i in members}
+        total = sum(demand.values())
+        if total <= remaining:
+            for i in members:
+                alloc[i] = sizes[i]
+            remaining -= total
+        else:
+            for i in members:
+                share = remaining * demand[i] // total
+                alloc[i] += share
+            remaining = 0
+    return alloc
+
+
+def pack_sections(sections: Sequence[Section], budget: int, model: Optional[str] = None) -> BudgetResult:
+    """Fit *sections* into *budget* tokens, compressing the lower-priority ones first."""
+    texts = [normalize_text(s.text) for s in sections]
+    sizes = [count_tokens(t, model) for t in texts]
+    before = sum(sizes)
+    if before > budget:
+        # Running headers and footers repeat on every page; drop them
+        # everywhere but their first occurrence before allocating.
+        seen: set = set()
+        texts = [normalize_text(_strip_boilerplate(t, seen)) for t in texts]
+        sizes = [count_tokens(t, model) for t in texts]
+    alloc = allocate(sizes, [s.priority for s in sections], budget)
+    fitted, trimmed = [], []
+    for section, text, size, limit in zip(sections, texts, sizes, alloc):
+        if limit < size:
+            text = compress_text(text, limit, model)
+            trimmed.append(section.name)
+        fitted.append(Section(section.name, text, section.priority, count_tokens(text, model)))
+    after = sum(s.tokens for s in fitted)
+    if trimmed:
+        logger.info("✂️ Token budget %d: %d → %d tokens (trimmed %s)", budget, before, after, trimmed)
+    return BudgetResult(fitted, budget, before, after, trimmed)
+
+
+def split_pages(text: str) -> List[Tuple[Optional[int], str]]:
+    """``(page_number, text)`` chunks of page-marked text; unmarked text is one chunk."""
+    marks = list(PAGE_MARKER.finditer(text or ''))
+    if not marks:
+        return [(None, text or '')]
+    chunks = []
+    if text[:marks[0].start()].strip():
+        chunks.append((None, text[:marks[0].start()]))
+    for mark, nxt in zip(marks, marks[1:] + [None]):
+        end = nxt.start() if nxt else len(text)
+        chunks.append((int(mark.group(1)), text[mark.start():end]))
+    return chunks
+
+
+def fit_document(text: str, budget: int, model: Optional[str] = None,
+                 section_map: Optional[Dict] = None, prefer: Optional[str] = None) -> BudgetResult:
+    """Fit page-marked *text* into *budget*, keeping high-value pages whole.
+
+    *section_map* is Belle's page map (page number → ``{'type': ...}``);
+    pages of type *prefer* (e.g. ``'transcript'`` for Rapunzel) rank above
+    everything else, and table-of-contents pages rank with sparse ones.
+    """
+    section_map = section_map or {}
+    sections = []
+    for page, chunk in split_pages(text):
+        info = section_map.get(page) or section_map.get(str(page)) or {}
+        page_type = info.get('type', 'unknown') if isinstance(info, dict) else 'unknown'
+        if prefer and page_type == prefer:
+            priority = PREFERRED_PAGE_PRIORITY
+        elif isinstance(info, dict) and 'table of contents' in str(info.get('note', '')):
+            priority = PAGE_PRIORITIES['sparse']
+        else:
+            priority = PAGE_PRIORITIES.get(page_type, PAGE_PRIORITIES['unknown'])
+        sections.append(Section(f'page {page}' if page is not None else 'preamble', chunk, priority))
+    return pack_sections(sections, budget, model)
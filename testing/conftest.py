@@ -1,6 +1,178 @@
-"""Pytest configuration — adds project root to sys.path for imports."""
+"""Pytest configuration — adds project root to sys.path, shared test doubles."""
+import asyncio
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 # Allow `from src.xxx import ...` in tests without sys.path hacks
 sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def isolated_imports(monkeypatch):
+    """``monkeypatch``, and every module first imported during the test is dropped afterwards.
+
+    For tests that stub packages in ``sys.modules`` (test_belle_*): what
+    they import against the stubs is forgotten again, ``sys.modules``
+    entry and parent-package attribute alike, so other tests only ever see
+    the real modules.
+    """
+    before = set(sys.modules)
+    yield monkeypatch
+    for name in set(sys.modules) - before:
+        module = sys.modules.pop(name)
+        parent, _, child = name.rpartition('.')
+        if getattr(sys.modules.get(parent), child, None) is module:
+            delattr(sys.modules[parent], child)
+
+
+# ── Shared test doubles ──────────────────────────────────────────────
+
+class CheckpointDB:
+    """In-memory evaluation_checkpoints; every other database call is a no-op."""
+
+    def __init__(self):
+        self.rows = {}
+        self.loads = 0
+
+    def save_evaluation_checkpoint(self, application_id, step, output_hash, output):
+        self.rows[step] = {'output_hash': output_hash, 'output': output}
+
+    def get_evaluation_checkpoints(self, application_id):
+        self.loads += 1
+        return {step: dict(row) for step, row in self.rows.items()}
+
+    def clear_evaluation_checkpoints(self, application_id, step=None):
+        if step:
+            self.rows.pop(step, None)
+        else:
+            self.rows.clear()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class RecordingJob:
+    """Stands in for ``src.job_store.Job``; keeps every progress update."""
+
+    def __init__(self):
+        self.updates = []
+
+    def progress(self, **fields):
+        self.updates.append(fields)
+
+
+class StubRapunzel:
+    """Returns *gpa* on the first call, *gpa* + *step* on the second, ..."""
+
+    name = 'Rapunzel'
+    model = 'stub'
+
+    def __init__(self, gpa=3.5, step=0.0, delay=0.0):
+        self.gpa, self.step, self.delay = gpa, step, delay
+        self.calls = 0
+
+    async def parse_grades(self, transcript, name, school_context=None, application_id=None):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return {'grades': {'gpa': self.gpa + self.step * (self.calls - 1)}}
+
+
+class StubMoana:
+    """Records the GPA it was handed by Rapunzel."""
+
+    name = 'Moana'
+    model = 'stub'
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.seen = []
+
+    @property
+    def calls(self):
+        return len(self.seen)
+
+    async def analyze_student_school_context(self, rapunzel_grades_data=None, **kwargs):
+        gpa = rapunzel_grades_data['grades']['gpa']
+        self.seen.append(gpa)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return {'narrative': 'rural school', 'gpa_seen': gpa}
+
+
+class StubGaston:
+    """Grades every review *grade*."""
+
+    name = 'Gaston'
+    model = 'stub'
+
+    def __init__(self, grade='A'):
+        self.grade = grade
+        self.calls = 0
+
+    def _create_chat_completion(self, **kwargs):
+        self.calls += 1
+        content = f'{{"grade": "{self.grade}", "score": 50, "feedback": "more detail"}}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def checkpoint_db():
+    return CheckpointDB()
+
+
+@pytest.fixture
+def recording_job():
+    return RecordingJob()
+
+
+@pytest.fixture
+def smee_stubs():
+    """The stub agent classes, for tests that register them with ``smee_harness``."""
+    return SimpleNamespace(Rapunzel=StubRapunzel, Moana=StubMoana, Gaston=StubGaston)
+
+
+@pytest.fixture
+def smee_harness(monkeypatch):
+    """Factory for a SmeeOrchestrator with Belle, school lookup and student matching stubbed.
+
+    ``build(agents, db=None, speculative=False)`` registers *agents*
+    ({step: agent}) and returns a namespace with ``smee``, the document
+    names Belle was asked to read (``belle_calls``), the ``agents`` and
+    ``run(...)``, which evaluates Ada Lovelace's transcript.
+    """
+    import src.agents.smee_orchestrator as smee_module
+
+    def build(agents, db=None, speculative=False):
+        monkeypatch.setattr(smee_module, 'STEP_DELAY', 0)
+        monkeypatch.setattr(smee_module, 'SPECULATIVE_GASTON', speculative)
+        smee = smee_module.SmeeOrchestrator('Smee', client=None, model='stub', db_connection=db)
+        for step, agent in agents.items():
+            smee.register_agent(step, agent)
+        belle_calls = []
+
+        async def belle(document_text, document_name='', context=''):
+            belle_calls.append(document_name)
+            return {'student_info': {'first_name': 'Ada', 'last_name': 'Lovelace',
+                                     'school_name': 'Lincoln High', 'state_code': 'GA'},
+                    'agent_fields': {}}
+
+        async def enrich(**kwargs):
+            return {'school_name': 'Lincoln High', 'component_scores': {}}
+
+        smee._extract_data_with_belle = belle
+        smee._check_or_enrich_high_school = enrich
+        smee._match_or_create_student_record = lambda *args: 7
+        smee._create_chat_completion = lambda *a, **k: 'summary'
+
+        def run(steps=None, transcript='Transcript ' * 20, **kwargs):
+            application = {'application_id': 7, 'applicant_name': 'Ada Lovelace',
+                           'transcript_text': transcript}
+            return asyncio.run(smee.coordinate_evaluation(application, list(steps or agents), **kwargs))
+
+        return SimpleNamespace(smee=smee, agents=agents, belle_calls=belle_calls, run=run)
+
+    return build
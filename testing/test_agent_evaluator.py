@@ -0,0 +1,140 @@
+"""Tests for the concurrent, incremental AgentEvaluator batch runner."""
+
+import threading
+import time
+
+from src.evaluations import agent_evaluator
+from src.evaluations.agent_evaluator import AGENT_EVAL_CONFIG, AgentEvaluator
+
+
+class _EvalDB:
+    """In-memory stand-in: every agent has an output for every student.
+
+    Inserted results are kept and served back to fingerprint lookups.
+    """
+
+    def __init__(self, students=6, saved=()):
+        self.applications = [
+            {"application_id": i, "applicant_name": f"Student {i}", "was_selected": i % 2 == 0,
+             "application_text": "Essay text " * 20, "agent_results": None}
+            for i in range(students)
+        ]
+        self.saved = list(saved)
+        self.edits = {}
+        self.queries = []
+        self.inserted = []
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        if "FROM Applications" in query:
+            return [dict(a) for a in self.applications]
+        if "fingerprint = ANY(%s)" in query:
+            stored = {row[6]: row for batch in self.inserted for row in batch}
+            return [{"fingerprint": f, "score": stored[f][3], "reason": stored[f][4]}
+                    for f in params[0] if f in stored]
+        if "ANY(%s)" in query:
+            return [{"application_id": i, "summary": "A detailed agent summary." + self.edits.get(i, ""),
+                     "essay_summary": "An essay summary of some length.",
+                     "rationale": "A rationale of some length.",
+                     "formatted_evaluation": "A formatted evaluation text.",
+                     "overall_score": 70, "recommendation": "Admit"} for i in params[0]]
+        if "FROM agent_evaluation_results" in query and "batch_id = %s" in query:
+            return [{"application_id": a, "agent_name": g, "evaluator_name": e, "score": s}
+                    for a, g, e, s in self.saved]
+        return []
+
+    def execute_non_query(self, query, params=None):
+        if not query.lstrip().startswith("INSERT"):
+            return 0
+        rows = [params[i:i + 8] for i in range(0, len(params), 8)]
+        self.inserted.append(rows)
+        return len(rows)
+
+
+class _Judge:
+    def __init__(self, name, tracker):
+        self.name = name
+        self.tracker = tracker
+
+    def __call__(self, query, response, context):
+        with self.tracker["lock"]:
+            self.tracker["calls"] += 1
+            self.tracker["in_flight"] += 1
+            self.tracker["peak"] = max(self.tracker["peak"], self.tracker["in_flight"])
+        time.sleep(0.005)
+        with self.tracker["lock"]:
+            self.tracker["in_flight"] -= 1
+        return {self.name: 4.0, f"{self.name}_reason": "ok"}
+
+
+class _StubEvaluator(AgentEvaluator):
+    def __init__(self, db, concurrency):
+        super().__init__(db, concurrency=concurrency)
+        self.sdk_available = True
+        self.tracker = {"lock": threading.Lock(), "calls": 0, "in_flight": 0, "peak": 0}
+
+    def _get_evaluator(self, name):
+        return _Judge(name, self.tracker)
+
+
+def _evals_per_student(agents):
+    return sum(len(AGENT_EVAL_CONFIG[a]["evaluators"]) for a in agents)
+
+
+def test_batch_fans_out_within_bound_and_writes_in_batches(monkeypatch):
+    monkeypatch.setattr(agent_evaluator, "AGENT_EVAL_WRITE_BATCH", 5)
+    db = _EvalDB(students=6)
+    evaluator = _StubEvaluator(db, concurrency=3)
+
+    summary = evaluator.run_batch_evaluation()
+
+    expected = 6 * _evals_per_student(AGENT_EVAL_CONFIG)
+    assert summary["status"] == "completed"
+    assert summary["total_evaluations"] == expected == evaluator.tracker["calls"]
+    assert 1 < evaluator.tracker["peak"] <= 3
+    outputs_queries = [q for q in db.queries if "ANY(%s)" in q and "fingerprint" not in q]
+    assert len(outputs_queries) == len(AGENT_EVAL_CONFIG) + 1  # + consistency
+    assert sum(len(batch) for batch in db.inserted) == expected
+    assert max(len(batch) for batch in db.inserted) == 5
+    assert summary["per_agent"]["Tiana"]["groundedness"] == {
+        "avg": 4.0, "min": 4.0, "max": 4.0, "count": 6}
+
+
+def test_resume_evaluates_only_missing_triples():
+    saved = [(0, "Merlin", "groundedness", 2.0), (1, "Merlin", "groundedness", 3.0)]
+    db = _EvalDB(students=4, saved=saved)
+    evaluator = _StubEvaluator(db, concurrency=2)
+
+    summary = evaluator.run_batch_evaluation(agents=["Merlin"], resume_batch_id="eval_old")
+
+    assert summary["batch_id"] == "eval_old"
+    assert summary["resumed_evaluations"] == 2
+    assert evaluator.tracker["calls"] == 4 * 3 - 2
+    written = {(row[0], row[1], row[2]) for batch in db.inserted for row in batch}
+    assert (0, "Merlin", "groundedness") not in written and len(written) == 10
+    assert all(row[5] == "eval_old" for batch in db.inserted for row in batch)
+    assert summary["per_agent"]["Merlin"]["groundedness"] == {
+        "avg": 3.25, "min": 2.0, "max": 4.0, "count": 4}
+    assert summary["total_evaluations"] == 12
+
+
+def test_unchanged_outputs_reuse_previous_scores():
+    db = _EvalDB(students=5)
+    first = _StubEvaluator(db, concurrency=4)
+    first.run_batch_evaluation(agents=["Rapunzel", "Mulan"])
+    assert first.tracker["calls"] == 5 * 4
+
+    db.edits[3] = " Revised after re-processing."  # changes one output in both tables
+    second = _StubEvaluator(db, concurrency=4)
+    summary = second.run_batch_evaluation(agents=["Rapunzel", "Mulan"])
+
+    assert second.tracker["calls"] == 4  # student 3: 2 agents x 2 evaluators
+    assert summary["reused_evaluations"] == 16
+    assert summary["total_evaluations"] == 20
+    batch_rows = [row for batch in db.inserted for row in batch if row[5] == summary["batch_id"]]
+    assert len(batch_rows) == 20  # the new batch holds a complete result set
+    assert sum(row[7] for row in batch_rows) == 16
+
+    full = _StubEvaluator(db, concurrency=4)
+    full.run_batch_evaluation(agents=["Rapunzel", "Mulan"], incremental=False)
+    assert full.tracker["calls"] == 20
@@ -0,0 +1,116 @@
+"""Tests for src/audit_writer.py and the batched agent_interactions insert."""
+
+import json
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+
+from src.audit_writer import AuditWriter
+from src.database import Database
+
+
+def test_rows_are_written_in_batches_by_size():
+    batches = []
+    writer = AuditWriter(batches.append, batch_size=3, flush_interval=5)
+    for i in range(7):
+        assert writer.submit({'i': i})
+    assert writer.flush(timeout=2)
+    writer.close()
+
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [r['i'] for b in batches for r in b] == list(range(7))
+    stats = writer.stats()
+    assert stats['written'] == 7 and stats['batches'] == 3 and stats['queue_depth'] == 0
+
+
+def test_partial_batch_is_written_after_flush_interval():
+    batches = []
+    writer = AuditWriter(batches.append, batch_size=100, flush_interval=0.05)
+    writer.submit({'i': 1})
+    deadline = time.time() + 2
+    while not batches and time.time() < deadline:
+        time.sleep(0.01)
+    writer.close()
+    assert batches == [[{'i': 1}]]
+
+
+def test_full_queue_drops_and_counts():
+    release = threading.Event()
+
+    def slow_write(batch):
+        release.wait(2)
+
+    writer = AuditWriter(slow_write, max_queue=2, batch_size=1, flush_interval=0)
+    results = [writer.submit({'i': i}) for i in range(10)]
+    release.set()
+    writer.close()
+
+    stats = writer.stats()
+    assert results.count(False) == stats['dropped'] > 0
+    assert stats['enqueued'] + stats['dropped'] == 10
+
+
+def test_failed_batch_is_retried_row_by_row():
+    written = []
+
+    def picky(batch):
+        if len(batch) > 1 or batch[0].get('bad'):
+            raise RuntimeError('nope')
+        written.extend(batch)
+
+    writer = AuditWriter(picky, batch_size=3, flush_interval=5)
+    for row in ({'i': 1}, {'i': 2, 'bad': True}, {'i': 3}):
+        writer.submit(row)
+    writer.close()
+
+    assert [r['i'] for r in written] == [1, 3]
+    assert writer.stats()['failed'] == 1
+
+
+def test_batch_insert_sql_runs_on_sqlite():
+    conn = sqlite3.connect(':memory:')
+    conn.execute(
+        'CREATE TABLE agent_interactions (interaction_id INTEGER PRIMARY KEY, application_id INT, '
+        'agent_name TEXT, interaction_type TEXT, question_text TEXT, user_response TEXT, file_name TEXT, '
+        'file_size INT, file_type TEXT, extracted_data TEXT, timestamp TEXT, sequence_number INT)'
+    )
+    db = Database.__new__(Database)
+    db.execute_non_query = lambda q, p: conn.execute(q.replace('%s', '?'), tuple(str(v) if hasattr(v, 'isoformat') else v for v in p)).rowcount
+
+    source = {'score': Decimal('4.5'), 'keys': ['a']}
+    rows = [Database._interaction_row(1, 'Tiana', 'step_4', extracted_data=source),
+            Database._interaction_row(1, 'Merlin', 'step_6', question_text='q')]
+    source['keys'].append('mutated later')
+
+    assert db.log_agent_interactions_batch(rows) == 2
+    stored = conn.execute('SELECT agent_name, extracted_data FROM agent_interactions ORDER BY interaction_id').fetchall()
+    assert stored[0][0] == 'Tiana'
+    assert json.loads(stored[0][1]) == {'score': 4.5, 'keys': ['a']}
+    assert stored[1] == ('Merlin', None)
+
+
+def test_racing_first_callers_share_one_writer(monkeypatch):
+    started = []
+
+    class _SlowWriter:
+        def __init__(self, write_batch, name):
+            started.append(name)
+            time.sleep(0.05)  # a window for the other threads to arrive
+
+    monkeypatch.setattr('src.audit_writer.AuditWriter', _SlowWriter)
+    db = Database.__new__(Database)
+    barrier = threading.Barrier(8)
+    writers = []
+
+    def first_call():
+        barrier.wait()
+        writers.append(db.audit_writer)
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(started) == 1 and len({id(w) for w in writers}) == 1
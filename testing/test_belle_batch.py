@@ -5,55 +5,60 @@ Runs without Azure dependencies by mocking them.
 """
 import sys, os, re, types, importlib, contextlib
 
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-# ── Mock external dependencies (same approach as test_belle_sections.py) ──
-for mod_name in [
-    'src.telemetry', 'src.observability',
-    'azure', 'azure.ai', 'azure.ai.projects', 'azure.ai.projects.models',
-    'azure.ai.inference', 'azure.ai.inference.models',
-    'azure.identity', 'azure.keyvault', 'azure.keyvault.secrets',
-    'opentelemetry', 'opentelemetry.trace',
-]:
-    if mod_name not in sys.modules:
-        sys.modules[mod_name] = types.ModuleType(mod_name)
-
-# Create mock telemetry with .telemetry attribute
-mock_tel = sys.modules['src.telemetry']
-mock_tel.telemetry = type('T', (), {'track_agent_call': lambda *a, **kw: None})()
-mock_tel.with_agent_span = lambda name: (lambda f: f)
-
-# Mock observability
-mock_obs = sys.modules['src.observability']
-mock_obs.get_tracer = lambda name: type('Tracer', (), {
-    'start_as_current_span': lambda self, *a, **kw: contextlib.nullcontext()
-})()
-mock_obs.should_capture_sensitive_data = lambda: False
-mock_obs.track_agent_call = lambda **kw: (lambda f: f)
-
-# Mock inference models
-mock_models = sys.modules['azure.ai.inference.models']
-mock_models.SystemMessage = lambda **k: k
-mock_models.UserMessage = lambda **k: k
-
-# Stub opentelemetry trace
-ot = sys.modules['opentelemetry.trace']
-ot.get_tracer = lambda *a, **kw: None
-ot.SpanKind = type('SpanKind', (), {'CLIENT': 0, 'SERVER': 1, 'INTERNAL': 2})()
-ot.StatusCode = type('StatusCode', (), {'OK': 0, 'ERROR': 1})()
-
-# Register stub 'src.agents' so __init__.py doesn't pull in every agent
-agents_mod = types.ModuleType('src.agents')
-agents_mod.__path__ = [str(importlib.import_module('pathlib').Path('src/agents').resolve())]
-agents_mod.__package__ = 'src.agents'
-sys.modules['src.agents'] = agents_mod
-
-# Import base agent first
-from src.agents.base_agent import BaseAgent
-agents_mod.BaseAgent = BaseAgent
-
-from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
-from src.document_processor import DocumentProcessor
+def _stub_dependencies(monkeypatch):
+    """Mock external dependencies (same approach as test_belle_sections.py)."""
+    for mod_name in [
+        'src.telemetry', 'src.observability',
+        'azure', 'azure.ai', 'azure.ai.projects', 'azure.ai.projects.models',
+        'azure.ai.inference', 'azure.ai.inference.models',
+        'azure.identity', 'azure.keyvault', 'azure.keyvault.secrets',
+        'opentelemetry', 'opentelemetry.trace',
+    ]:
+        monkeypatch.setitem(sys.modules, mod_name, types.ModuleType(mod_name))
+
+    # Create mock telemetry with .telemetry attribute
+    mock_tel = sys.modules['src.telemetry']
+    mock_tel.telemetry = type('T', (), {'track_agent_call': lambda *a, **kw: None})()
+    mock_tel.with_agent_span = lambda name: (lambda f: f)
+
+    # Mock observability
+    mock_obs = sys.modules['src.observability']
+    mock_obs.get_tracer = lambda name: type('Tracer', (), {
+        'start_as_current_span': lambda self, *a, **kw: contextlib.nullcontext()
+    })()
+    mock_obs.should_capture_sensitive_data = lambda: False
+    mock_obs.track_agent_call = lambda **kw: (lambda f: f)
+
+    # Mock inference models
+    mock_models = sys.modules['azure.ai.inference.models']
+    mock_models.SystemMessage = lambda **k: k
+    mock_models.UserMessage = lambda **k: k
+
+    # Stub opentelemetry trace
+    ot = sys.modules['opentelemetry.trace']
+    ot.get_tracer = lambda *a, **kw: None
+    ot.SpanKind = type('SpanKind', (), {'CLIENT': 0, 'SERVER': 1, 'INTERNAL': 2})()
+    ot.StatusCode = type('StatusCode', (), {'OK': 0, 'ERROR': 1})()
+
+    # Register stub 'src.agents' so __init__.py doesn't pull in every agent
+    agents_mod = types.ModuleType('src.agents')
+    agents_mod.__path__ = [str(importlib.import_module('pathlib').Path('src/agents').resolve())]
+    agents_mod.__package__ = 'src.agents'
+    monkeypatch.setitem(sys.modules, 'src.agents', agents_mod)
+
+    # Import base agent first
+    from src.agents.base_agent import BaseAgent
+    agents_mod.BaseAgent = BaseAgent
+
+
+@pytest.fixture(autouse=True)
+def _stubbed_dependencies(isolated_imports):
+    _stub_dependencies(isolated_imports)
+
 
 PDF_DIR = "/Users/sleepy/Downloads/OneDrive_1_3-2-2026/"
 
@@ -66,6 +71,9 @@ PDF_DIR = "/Users/sleepy/Downloads/OneDrive_1_3-2-2026/"
 
 def test_pdf(filepath):
     """Test a single PDF, return summary dict."""
+    from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
+    from src.document_processor import DocumentProcessor
+
     name = os.path.basename(filepath)
     pages = DocumentProcessor.extract_text_from_pdf(filepath)
     if not pages:
@@ -157,4 +165,5 @@ def main():
                 print(f"    Page {page_num:>2}: {section:<15} T={t:>2} R={rec:>2} A={a:>2}  {note}")
 
 if __name__ == '__main__':
+    _stub_dependencies(pytest.MonkeyPatch())
     main()
@@ -4,44 +4,49 @@ import logging
 import importlib
 import types
 
+import pytest
+
 sys.path.insert(0, '.')
 
 logging.basicConfig(level=logging.INFO)
 
-# Mock out heavy dependencies to allow importing Belle standalone
-for mod_name in ['src.telemetry', 'src.observability', 'azure.ai', 'azure.ai.inference',
-                 'azure.ai.inference.models', 'azure.ai.projects', 'azure.ai.projects.models']:
-    m = types.ModuleType(mod_name)
-    sys.modules[mod_name] = m
 
-# Create mock telemetry
-mock_tel = sys.modules['src.telemetry']
-mock_tel.telemetry = type('T', (), {'track_agent_call': lambda *a, **k: None})()
+def _stub_dependencies(monkeypatch):
+    """Mock out heavy dependencies to allow importing Belle standalone."""
+    for mod_name in ['src.telemetry', 'src.observability', 'azure.ai', 'azure.ai.inference',
+                     'azure.ai.inference.models', 'azure.ai.projects', 'azure.ai.projects.models']:
+        monkeypatch.setitem(sys.modules, mod_name, types.ModuleType(mod_name))
+
+    # Create mock telemetry
+    mock_tel = sys.modules['src.telemetry']
+    mock_tel.telemetry = type('T', (), {'track_agent_call': lambda *a, **k: None})()
 
-# Mock observability
-mock_obs = sys.modules['src.observability']
-mock_obs.get_tracer = lambda name: type('Tracer', (), {'start_as_current_span': lambda self, *a, **k: __import__('contextlib').nullcontext()})()
-mock_obs.should_capture_sensitive_data = lambda: False
+    # Mock observability
+    mock_obs = sys.modules['src.observability']
+    mock_obs.get_tracer = lambda name: type('Tracer', (), {'start_as_current_span': lambda self, *a, **k: __import__('contextlib').nullcontext()})()
+    mock_obs.should_capture_sensitive_data = lambda: False
 
-# Mock inference models
-mock_models = sys.modules['azure.ai.inference.models']
-mock_models.SystemMessage = lambda **k: k
-mock_models.UserMessage = lambda **k: k
+    # Mock inference models
+    mock_models = sys.modules['azure.ai.inference.models']
+    mock_models.SystemMessage = lambda **k: k
+    mock_models.UserMessage = lambda **k: k
 
-from src.document_processor import DocumentProcessor
+    # Prevent src.agents.__init__ from loading all agents (which pulls in azure SDK)
+    # Pre-register a minimal src.agents module
+    agents_mod = types.ModuleType('src.agents')
+    agents_mod.__path__ = [str(__import__('pathlib').Path('src/agents').resolve())]
+    agents_mod.__package__ = 'src.agents'
+    monkeypatch.setitem(sys.modules, 'src.agents', agents_mod)
 
-# Prevent src.agents.__init__ from loading all agents (which pulls in azure SDK)
-# Pre-register a minimal src.agents module
-agents_mod = types.ModuleType('src.agents')
-agents_mod.__path__ = [str(__import__('pathlib').Path('src/agents').resolve())]
-agents_mod.__package__ = 'src.agents'
-sys.modules['src.agents'] = agents_mod
+    # Now import base_agent & belle only
+    from src.agents.base_agent import BaseAgent
+    agents_mod.BaseAgent = BaseAgent
 
-# Now import base_agent & belle only
-from src.agents.base_agent import BaseAgent
-agents_mod.BaseAgent = BaseAgent
 
-from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
+@pytest.fixture(autouse=True)
+def _stubbed_dependencies(isolated_imports):
+    _stub_dependencies(isolated_imports)
+
 
 PDFS = [
     "/Users/sleepy/Downloads/OneDrive_1_3-2-2026/Asekun, Korede.pdf",
@@ -50,6 +55,9 @@ PDFS = [
 
 
 def test_pdf(pdf_path):
+    from src.agents.belle_document_analyzer import BelleDocumentAnalyzer
+    from src.document_processor import DocumentProcessor
+
     print(f"\n{'='*70}")
     print(f"Testing: {pdf_path}")
     print(f"{'='*70}")
@@ -88,10 +96,12 @@ def test_pdf(pdf_path):
     print(f"application_text: {len(result.get('application_text', ''))} chars")
 
 
-for pdf in PDFS:
-    try:
-        test_pdf(pdf)
-    except Exception as e:
-        print(f"ERROR processing {pdf}: {e}")
-        import traceback
-        traceback.print_exc()
+if __name__ == '__main__':
+    _stub_dependencies(pytest.MonkeyPatch())
+    for pdf in PDFS:
+        try:
+            test_pdf(pdf)
+        except Exception as e:
+            print(f"ERROR processing {pdf}: {e}")
+            import traceback
+            traceback.print_exc()
@@ -0,0 +1,83 @@
+"""Tests for the vectorized calibration statistics engine."""
+
+import numpy as np
+
+from src import calibration_stats
+from src.calibration_stats import build_calibration_report, quadratic_weighted_kappa
+
+
+def _row(i, human, milo, gpa, total, overall, match, selected):
+    row = {f'ai_{col}': None for col in calibration_stats.SCORE_COLUMNS}
+    row.update({
+        'application_id': i, 'applicant_name': f'Student {i}', 'high_school': 'Lincoln High',
+        'human_academic': human, 'human_stem': None, 'human_essay': None, 'human_rec': None,
+        'human_bonus': None, 'human_total': total, 'human_selected': selected, 'was_selected': None,
+        'ai_overall': overall, 'ai_recommendation': 'Admit', 'nextgen_match': match,
+        'ai_milo_academic': milo, 'ai_rapunzel_gpa': gpa,
+    })
+    return row
+
+
+ROWS = [
+    _row(1, 3, 3, 95, '10.5', 92, 80, True),
+    _row(2, 2, 2, 70, '8.0', 75, 60, True),
+    _row(3, 1, 2, 55, '5.0', 58, 40, False),
+    _row(4, 0, 0, 20, '2.0', 30, None, False),
+    _row(5, 2, 1, None, '7.0', None, 55, None),
+]
+
+
+def test_report_matches_the_rubric_statistics():
+    report = build_calibration_report(ROWS, bootstrap_samples=200)
+    summary = report['summary']
+
+    assert summary['total_paired'] == 5 and summary['with_ai_scores'] == 4
+    assert summary['selected_count'] == 2 and summary['not_selected_count'] == 2
+    dims = {d['label']: d for d in summary['dimensions']}
+    academic = dims['Academic (Milo est.)']
+    assert academic['n_pairs'] == 4 and academic['mae'] == 0.25
+    assert academic['kappa'] == quadratic_weighted_kappa(np.array([3., 2, 1, 0]), np.array([3., 2, 2, 0]))
+    assert academic['confusion_matrix'][1] == [0, 0, 1, 0]  # human 1, Milo 2
+    lo, hi = academic['kappa_ci']
+    assert lo <= academic['kappa'] <= hi
+    assert dims['Academic Record']['correlation'] > 0.9 and dims['Academic Record']['mae'] is None
+    assert dims['STEM Interest']['n_pairs'] == 0 and dims['STEM Interest']['correlation'] is None
+    assert summary['overall_correlation'] > 0.9
+    assert summary['selection_accuracy'] == 100.0 and summary['selection_total'] == 4
+    assert summary['human_distribution']['median'] == 7.0
+
+    pair = report['pairs'][4]
+    assert pair['human']['total_rating'] == 7.0 and pair['human']['stem_interest'] is None
+    assert pair['ai'] == {'milo_academic': 1.0} and pair['ai_overall'] is None
+    assert pair['has_ai_scores'] is False
+
+
+def test_kappa_handles_perfect_and_constant_agreement():
+    perfect = np.array([0., 1, 2, 3])
+    assert quadratic_weighted_kappa(perfect, perfect) == 1.0
+    assert quadratic_weighted_kappa(np.array([2., 2, 2]), np.array([2., 2, 2])) == 1.0
+    assert quadratic_weighted_kappa(perfect[:2], perfect[:2]) is None
+
+
+class _VersionedDB:
+    def __init__(self):
+        self.version = 'v1'
+        self.loads = 0
+
+    def get_calibration_version(self):
+        return self.version
+
+    def get_calibration_rows(self):
+        self.loads += 1
+        return ROWS
+
+
+def test_report_is_cached_until_the_data_version_changes():
+    calibration_stats.clear_calibration_cache()
+    db = _VersionedDB()
+
+    first = calibration_stats.load_calibration_report(db)
+    assert calibration_stats.load_calibration_report(db) is first and db.loads == 1
+
+    db.version = 'v2'
+    assert calibration_stats.load_calibration_report(db) is not first and db.loads == 2
@@ -0,0 +1,100 @@
+"""Tests for token-based evaluation cancellation."""
+
+import asyncio
+import threading
+import time
+
+import src.agents.cancellation as cancellation
+from src.agents.smee_orchestrator import EVALUATION_COMPLETE_STEP
+from src.agents.step_graph import Step, StepGraph
+
+
+class _StuckRapunzel:
+    name = 'Rapunzel'
+    model = 'stub'
+
+    def __init__(self):
+        self.started = threading.Event()
+
+    async def parse_grades(self, transcript, name, school_context=None, application_id=None):
+        self.started.set()
+        await asyncio.sleep(30)  # a model call that never comes back
+        return {'grades': {}}
+
+
+def test_cancel_interrupts_an_in_flight_step(monkeypatch, checkpoint_db, smee_harness):
+    monkeypatch.setattr(cancellation, 'CANCEL_NOTIFY', False)
+    db, rapunzel = checkpoint_db, _StuckRapunzel()
+    harness = smee_harness({'grade_reader': rapunzel}, db=db)
+    smee = harness.smee
+    outcome = {}
+
+    def run():
+        outcome['result'] = harness.run()
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    assert rapunzel.started.wait(5)
+
+    started = time.perf_counter()
+    assert cancellation.cancel(7, 'stuck')
+    worker.join(5)
+    assert time.perf_counter() - started < 1.0
+
+    result = outcome['result']
+    assert result['status'] == 'cancelled' and result['reason'] == 'stuck'
+    assert 'belle_extraction' in db.rows and EVALUATION_COMPLETE_STEP not in db.rows
+    assert cancellation.get_token(7) is None
+    assert smee.get_workflow_status()['state'] == 'cancelled'
+
+
+def test_queued_job_leaves_the_semaphore_queue_promptly(monkeypatch):
+    monkeypatch.setattr(cancellation, 'CANCEL_NOTIFY', False)
+    semaphore = threading.Semaphore(1)
+    semaphore.acquire()  # the only slot is held by a stuck evaluation
+    outcome = {}
+
+    def queued():
+        with cancellation.cancel_scope(8) as token:
+            outcome['acquired'] = cancellation.acquire_unless_cancelled(semaphore, token)
+
+    worker = threading.Thread(target=queued)
+    worker.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    cancellation.cancel(8)
+    worker.join(2)
+
+    assert outcome['acquired'] is False
+    assert time.perf_counter() - started < 1.0
+    semaphore.release()
+    assert semaphore.acquire(blocking=False)  # the queued job took nothing
+
+
+def test_nested_scopes_share_one_token(monkeypatch):
+    monkeypatch.setattr(cancellation, 'CANCEL_NOTIFY', False)
+    with cancellation.cancel_scope(9) as outer:
+        with cancellation.cancel_scope(9) as inner:
+            assert inner is outer
+        assert cancellation.get_token(9) is outer
+    assert cancellation.get_token(9) is None
+
+
+def test_cancelling_the_graph_task_cancels_running_steps():
+    finished = []
+
+    async def slow():
+        await asyncio.sleep(30)
+        finished.append('slow')
+
+    async def main():
+        graph = StepGraph([Step('a', slow), Step('b', slow)])
+        task = asyncio.create_task(graph.run())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == [] and finished == []
@@ -0,0 +1,53 @@
+"""Tests for checkpoint-based resume in SmeeOrchestrator."""
+
+import pytest
+
+from src.agents.smee_orchestrator import EVALUATION_COMPLETE_STEP
+
+
+@pytest.fixture
+def harness(checkpoint_db, smee_harness, smee_stubs):
+    return smee_harness({'grade_reader': smee_stubs.Rapunzel(), 'school_context': smee_stubs.Moana()},
+                        db=checkpoint_db)
+
+
+def test_interrupted_run_resumes_at_first_incomplete_step(checkpoint_db, harness):
+    db = checkpoint_db
+    rapunzel, moana = harness.agents['grade_reader'], harness.agents['school_context']
+    harness.run()
+    assert {'belle_extraction', 'student_match', 'grade_reader', 'school_context',
+            EVALUATION_COMPLETE_STEP} <= set(db.rows)
+
+    # Simulate a worker crash after Rapunzel finished but before Moana did
+    for step in ('school_context', 'pocahontas', 'persist_core_results', 'normalize_scores',
+                 'student_evaluator', 'gaston', 'aurora', 'aurora_persist', EVALUATION_COMPLETE_STEP):
+        db.rows.pop(step, None)
+    db.loads = 0
+    result = harness.run()
+
+    assert db.loads == 1
+    assert len(harness.belle_calls) == 1 and rapunzel.calls == 1 and moana.calls == 2
+    assert result['results']['grade_reader']['grades'] == {'gpa': 3.5}
+    assert result['results']['school_context']['gpa_seen'] == 3.5
+    assert EVALUATION_COMPLETE_STEP in db.rows
+
+
+def test_finished_run_or_changed_document_starts_afresh(checkpoint_db, harness):
+    rapunzel = harness.agents['grade_reader']
+    harness.run()
+    harness.run()
+    assert len(harness.belle_calls) == 2 and rapunzel.calls == 2
+
+    checkpoint_db.rows.pop(EVALUATION_COMPLETE_STEP)
+    harness.run(transcript='Revised transcript ' * 20)
+    assert len(harness.belle_calls) == 3 and rapunzel.calls == 3
+
+
+def test_incremental_run_reruns_only_requested_steps(harness):
+    rapunzel, moana = harness.agents['grade_reader'], harness.agents['school_context']
+    harness.run()
+    result = harness.run(rerun_steps=['school_context'])
+
+    assert len(harness.belle_calls) == 1 and rapunzel.calls == 1 and moana.calls == 2
+    assert result['results']['grade_reader']['grades'] == {'gpa': 3.5}
+    assert 'grade_reader' in result['completed_steps']
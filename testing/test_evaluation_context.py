@@ -0,0 +1,106 @@
+"""Tests for per-evaluation state on a shared SmeeOrchestrator."""
+
+import asyncio
+
+import src.agents.smee_orchestrator as smee_module
+from src.agents.base_agent import BaseAgent
+from src.agents.evaluation_context import EvaluationContext, current_evaluation, evaluation_scope
+from src.agents.smee_orchestrator import SmeeOrchestrator
+
+
+class _Echo(BaseAgent):
+    async def process(self, message: str) -> str:
+        self.add_to_history('user', message)
+        return message
+
+
+class _Rapunzel(_Echo):
+    model = 'stub'
+
+    def __init__(self, orchestrator):
+        super().__init__('Rapunzel', client=None)
+        self.orchestrator = orchestrator
+        self.seen = []
+
+    async def parse_grades(self, transcript, name, school_context=None, application_id=None):
+        await self.process(name)
+        # Yield so the other evaluation interleaves before we read state back
+        await asyncio.sleep(0.02)
+        self.seen.append((name, self.orchestrator._current_applicant_name,
+                          [m['content'] for m in self.conversation_history]))
+        return {'grades': {'gpa': 4.0 if name == 'Ada Lovelace' else 3.0}}
+
+
+def _shared_smee(monkeypatch):
+    monkeypatch.setattr(smee_module, 'STEP_DELAY', 0)
+    monkeypatch.setattr(smee_module, 'SPECULATIVE_GASTON', False)
+    smee = SmeeOrchestrator('Smee', client=None, model='stub')
+    rapunzel = _Rapunzel(smee)
+    smee.register_agent('grade_reader', rapunzel)
+
+    async def belle(document_text, document_name='', context=''):
+        first, last = document_text.split()[:2]
+        return {'student_info': {'first_name': first, 'last_name': last}, 'agent_fields': {}}
+
+    async def enrich(**kwargs):
+        return {}
+
+    smee._extract_data_with_belle = belle
+    smee._check_or_enrich_high_school = enrich
+    smee._create_chat_completion = lambda *a, **k: 'summary'
+    return smee, rapunzel
+
+
+def _application(name):
+    return {'applicant_name': name, 'application_text': f'{name} essay',
+            'transcript_text': f'{name} transcript ' * 20}
+
+
+def test_concurrent_evaluations_keep_separate_state(monkeypatch):
+    smee, rapunzel = _shared_smee(monkeypatch)
+    progress = {'Ada Lovelace': [], 'Grace Hopper': []}
+
+    async def run_both():
+        return await asyncio.gather(*(
+            smee.coordinate_evaluation(_application(name), ['grade_reader'],
+                                       progress_callback=progress[name].append)
+            for name in progress
+        ))
+
+    ada, grace = asyncio.run(run_both())
+
+    assert ada['results']['grade_reader']['grades']['gpa'] == 4.0
+    assert grace['results']['grade_reader']['grades']['gpa'] == 3.0
+    assert ada['applicant_name'] == 'Ada Lovelace' and grace['applicant_name'] == 'Grace Hopper'
+    for name, applicant, history in rapunzel.seen:
+        assert applicant == name and history == [name]
+    assert progress['Ada Lovelace'] and progress['Grace Hopper']
+    assert rapunzel.conversation_history == []  # nothing leaked onto the instance
+
+
+def test_workflow_status_reflects_the_last_evaluation(monkeypatch):
+    smee, _ = _shared_smee(monkeypatch)
+    assert smee.get_workflow_status()['state'] == 'idle'
+
+    asyncio.run(smee.coordinate_evaluation(_application('Ada Lovelace'), ['grade_reader']))
+
+    status = smee.get_workflow_status()
+    assert status['state'] == 'complete'
+    assert status['last_evaluation']['applicant_name'] == 'Ada Lovelace'
+    assert current_evaluation() is None
+
+
+def test_agent_state_outside_an_evaluation_stays_on_the_instance():
+    agent = _Echo('Bashful', client=None)
+    asyncio.run(agent.process('hello'))
+    agent.set_trace_context(application_id=7)
+
+    context = EvaluationContext(application_id=42, applicant_name='Ada')
+    with evaluation_scope(context):
+        assert agent.conversation_history == []
+        assert agent._trace_context['app.application_id'] == 42
+        asyncio.run(agent.process('inside'))
+
+    assert [m['content'] for m in agent.conversation_history] == ['hello']
+    assert context.conversations['Bashful'][0]['content'] == 'inside'
+    assert agent._trace_context['app.application_id'] == 7
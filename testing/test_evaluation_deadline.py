@@ -0,0 +1,79 @@
+"""Tests for evaluation time budgets and graceful degradation."""
+
+import time
+from types import SimpleNamespace
+
+import src.agents.base_agent as base_agent_module
+import src.agents.smee_orchestrator as smee_module
+from src.agents import deadline
+from src.agents.base_agent import BaseAgent
+from src.agents.evaluation_context import EvaluationContext, evaluation_scope
+
+
+def _spent(seconds, fraction):
+    """A budget with *fraction* of its *seconds* already used."""
+    return deadline.Budget('evaluation', seconds, started=time.monotonic() - seconds * fraction)
+
+
+def test_step_slice_is_capped_by_the_evaluation_budget(monkeypatch):
+    monkeypatch.setitem(deadline.STEP_BUDGETS, 'grade_reader', 100.0)
+    with deadline.step_budget('grade_reader') as outside:
+        assert outside is None and not deadline.nearly_exhausted()
+
+    context = EvaluationContext(budget=_spent(100, 0.5))
+    with evaluation_scope(context):
+        with deadline.step_budget('grade_reader') as step:
+            assert deadline.current_budget() is step
+            assert 49 < step.remaining() <= 50  # the evaluation ends first
+            assert not step.nearly_exhausted()
+        assert deadline.current_budget() is context.budget
+
+    context = EvaluationContext(budget=_spent(100, 0.9))
+    with evaluation_scope(context), deadline.step_budget('grade_reader') as step:
+        assert step.nearly_exhausted()  # fresh slice, but the evaluation is late
+        assert deadline.capped_timeout(240) == deadline.MIN_CALL_SECONDS
+
+
+class _Agent(BaseAgent):
+    async def process(self, message):
+        return message
+
+
+def test_model_call_skips_refinements_and_drops_tier_when_budget_is_tight(monkeypatch):
+    calls = []
+
+    def create(model, messages, **kwargs):
+        calls.append(model)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='ok'))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(base_agent_module, 'get_tracer', lambda: None)
+    monkeypatch.setattr(base_agent_module.config, 'model_tier_workhorse', 'gpt-5.4')
+    agent = _Agent('Merlin', client=client)
+
+    context = EvaluationContext(budget=_spent(100, 0.9))
+    with evaluation_scope(context):
+        agent._create_chat_completion('merlin.evaluate', model='gpt-5.4-pro',
+                                      messages=[{'role': 'user', 'content': 'hi'}], refinements=2)
+
+    assert calls == ['gpt-5.4']
+    assert {d['action'] for d in context.degradations} == {'skip_refinements', 'faster_tier'}
+
+    calls.clear()
+    with evaluation_scope(EvaluationContext(budget=_spent(100, 0.1))):
+        agent._create_chat_completion('merlin.evaluate', model='gpt-5.4-pro',
+                                      messages=[{'role': 'user', 'content': 'hi'}], refinements=2)
+    assert calls == ['gpt-5.4-pro', 'gpt-5.4-pro']
+
+
+def test_late_evaluation_skips_optional_gaston_review(monkeypatch, smee_harness, smee_stubs):
+    monkeypatch.setattr(smee_module, 'EVALUATION_BUDGET_SECONDS', 0.001)
+    gaston = smee_stubs.Gaston('A')
+    harness = smee_harness({'grade_reader': smee_stubs.Rapunzel(), 'gaston': gaston}, speculative=True)
+    result = harness.run(['grade_reader'])
+
+    assert result['results']['grade_reader']['grades'] == {'gpa': 3.5}
+    assert gaston.calls == 0
+    budget = result['budget']
+    assert budget['exceeded'] and budget['degraded']
+    assert {'step': 'grade_reader_review', 'action': 'skip_gaston_review'}.items() <= budget['degradations'][0].items()
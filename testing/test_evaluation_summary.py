@@ -0,0 +1,104 @@
+"""Tests for the denormalized evaluation_summary table."""
+
+import json
+
+from src.database import Database
+from src.evaluation_summary import SUMMARY_COLUMNS, summarize
+
+
+class _SummaryDB(Database):
+    """A Database backed by one stored application row; writes are recorded."""
+
+    def __init__(self, row):
+        super().__init__()
+        self.row = row
+        self.writes = []
+        self._evaluation_summary_ready = True
+
+    def get_table_name(self, logical_name):
+        return logical_name
+
+    def get_applications_column(self, logical):
+        return logical
+
+    def has_applications_column(self, column_name):
+        return True
+
+    def _get_table_columns(self, table_name):
+        return {'application_id', 'status', 'agent_results', 'student_summary', 'nextgen_match'}
+
+    def execute_query(self, query, params=None):
+        if 'FROM applications a' in query:
+            return [dict(self.row)]
+        return []
+
+    def execute_non_query(self, query, params=None):
+        self.writes.append((' '.join(query.split()), params))
+        if query.lstrip().startswith('UPDATE applications'):
+            for clause, value in zip(query.split('SET')[1].split(','), params):
+                self.row[clause.split('=')[0].strip().strip('"')] = value
+        return 1
+
+
+def _summary_write(db):
+    upserts = [params for query, params in db.writes if query.startswith('INSERT INTO evaluation_summary')]
+    assert upserts, 'no evaluation_summary upsert'
+    return dict(zip(('application_id',) + SUMMARY_COLUMNS, upserts[-1]))
+
+
+def test_summarize_follows_the_reader_fallback_chains():
+    agent_results = {
+        'merlin': {'overallscore': '87.5', 'recommendation': 'Admit', 'nextgen_match': 81},
+        'milo_alignment': {'match_score': 70, 'tier': 'ADMIT',
+                           'rubric_scores': {'academic_record': 3, 'essay': 2}},
+        'school_context': {'school': 'Decatur High'},
+        'grade_reader': {'parsed_json': json.dumps({'gpa': 3.6})},
+        '_normalized_scores': {'tiana_readiness': 78, 'rapunzel_gpa_normalized': None},
+        'gaston': {'flags': ['a', 'b']},
+    }
+    row = summarize(json.dumps(agent_results), {'recommendation': None})
+
+    assert set(row) == set(SUMMARY_COLUMNS)
+    assert row['merlin_score'] == 87.5 and row['recommendation'] == 'Admit'
+    assert row['school_name'] == 'Decatur High' and row['tier'] == 'ADMIT'
+    assert row['nextgen_match'] == 81
+    assert row['rapunzel_gpa'] == 90.0 and row['tiana_readiness'] == 78
+    assert row['milo_academic'] == 3 and row['milo_essay'] == 2 and row['milo_stem'] is None
+    assert row['gaston_flags'] == 2
+
+    # student_summary wins for the score, the applications column for the match,
+    # Moana's context row for the school; Milo backs up a missing Merlin score
+    row = summarize(agent_results, {'overall_score': 0}, nextgen_match='64.0', school_name='Lincoln High')
+    assert row['merlin_score'] == 0 and row['nextgen_match'] == 64.0 and row['school_name'] == 'Lincoln High'
+    assert summarize({'milo_alignment': {'match_score': 70}})['merlin_score'] == 70
+    assert summarize('not json', None) == dict.fromkeys(SUMMARY_COLUMNS)
+
+
+def test_persisting_agent_results_refreshes_the_summary_row():
+    db = _SummaryDB({'agent_results': None, 'student_summary': None, 'nextgen_match': None,
+                     'moana_school_name': 'Lincoln High', 'merlin_overall_score': None,
+                     'merlin_recommendation': None})
+
+    db.update_application(5, status='Completed')
+    assert not [q for q, _ in db.writes if 'evaluation_summary' in q]
+
+    db.update_application(5, agent_results={'merlin': {'overall_score': 91, 'recommendation': 'Strong Admit'}})
+    written = _summary_write(db)
+    assert written['application_id'] == 5
+    assert written['merlin_score'] == 91 and written['recommendation'] == 'Strong Admit'
+    assert written['school_name'] == 'Lincoln High'
+
+    db.update_application(5, nextgen_match=77)
+    assert _summary_write(db)['nextgen_match'] == 77
+
+
+def test_summary_refresh_failure_does_not_fail_the_write():
+    db = _SummaryDB({'agent_results': '{}'})
+
+    def broken(application_id, summary):
+        raise RuntimeError('evaluation_summary is locked')
+
+    db.upsert_evaluation_summary = broken
+    db.update_application(5, agent_results={'merlin': {'overall_score': 91}})
+    assert db.refresh_evaluation_summary(5) is False
+    assert db.writes[0][0].startswith('UPDATE applications')
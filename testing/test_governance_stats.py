@@ -0,0 +1,110 @@
+"""Tests for the governance stats engine and its shared snapshots."""
+
+import json
+
+from src import governance_stats
+from src.database import Database
+
+
+class _SchoolsDB(Database):
+    """A Database with one school_enriched_data table; queries are recorded."""
+
+    def __init__(self, rows, columns):
+        super().__init__()
+        self.rows = rows
+        self.columns = columns
+        self.queries = []
+
+    def has_table(self, table_name):
+        return table_name == 'school_enriched_data'
+
+    def _get_table_columns(self, table_name):
+        return self.columns
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        return [dict(row) for row in self.rows]
+
+
+def test_provenance_counts_every_field_in_one_scan():
+    fields = sorted(set(governance_stats.GOSA_FIELDS + governance_stats.NCES_FIELDS
+                        + governance_stats.AI_ESTIMATED_FIELDS))
+    columns = set(fields) - {'fesr_star_rating'}
+    rows = [
+        {'analysis_status': 'csv_imported', 'cnt': 30, **{f: 30 for f in fields}},
+        {'analysis_status': 'complete', 'cnt': 10, **{f: 0 for f in fields}, 'opportunity_score': 10},
+    ]
+    db = _SchoolsDB(rows, columns)
+
+    report = governance_stats.compute_provenance(db)
+
+    assert len(db.queries) == 1
+    assert 'GROUP BY analysis_status' in db.queries[0]
+    assert 'COUNT(act_math_avg) AS act_math_avg' in db.queries[0]
+    assert 'fesr_star_rating' not in db.queries[0]
+    assert report['total_schools'] == 40
+    assert report['source_counts'] == {'csv_imported': 30, 'complete': 10}
+    assert report['fields']['act_math_avg'] == {
+        'category': 'gosa_authoritative', 'has_value': 30, 'missing': 10, 'coverage_pct': 75.0}
+    assert report['fields']['opportunity_score']['has_value'] == 40
+    assert report['fields']['opportunity_score']['category'] == 'ai_estimated'
+    assert report['fields']['fesr_star_rating']['category'] == 'unknown'
+    assert report['summary']['gosa_fields_with_data'] == len(governance_stats.GOSA_FIELDS) - 1
+
+
+class _SnapshotDB:
+    """Stands in for the snapshot table: one stored row per kind, writes recorded."""
+
+    def __init__(self, version='3@2026-10-01'):
+        self.version = version
+        self.stored = {}
+        self.saves = []
+
+    def get_governance_snapshot(self, kind, sources):
+        row = self.stored.get(kind, {})
+        return {'payload': row.get('payload'), 'source_version': row.get('source_version'),
+                'age_seconds': row.get('age_seconds'), 'current_version': self.version}
+
+    def save_governance_snapshot(self, kind, payload, source_version):
+        self.saves.append(kind)
+        self.stored[kind] = {'payload': json.loads(payload), 'source_version': source_version,
+                             'age_seconds': 0.0}
+
+
+def test_snapshot_is_recomputed_only_when_stale(monkeypatch):
+    computed = []
+
+    def compute(db):
+        computed.append(db.version)
+        return {'status': 'success', 'total_schools': len(computed)}
+
+    monkeypatch.setitem(governance_stats._COMPUTE, 'provenance', compute)
+    db = _SnapshotDB()
+
+    first = governance_stats.get_snapshot(db, 'provenance')
+    assert first['total_schools'] == 1 and '_cached_at' in first and 'generated_at' in first
+    assert governance_stats.get_snapshot(db, 'provenance')['total_schools'] == 1
+    assert computed == ['3@2026-10-01']
+
+    db.version = '4@2026-10-02'  # a school was added
+    assert governance_stats.get_snapshot(db, 'provenance')['total_schools'] == 2
+
+    db.stored['provenance']['age_seconds'] = governance_stats.GOVERNANCE_SNAPSHOT_MAX_AGE + 1
+    assert governance_stats.get_snapshot(db, 'provenance')['total_schools'] == 3
+
+    assert governance_stats.get_snapshot(db, 'provenance', force=True)['total_schools'] == 4
+    assert db.saves == ['provenance'] * 4
+    assert db.stored['provenance']['source_version'] == f"{governance_stats.STATS_VERSION}|4@2026-10-02"
+
+
+def test_unreadable_snapshot_table_falls_back_to_live_compute(monkeypatch):
+    monkeypatch.setitem(governance_stats._COMPUTE, 'oversight',
+                        lambda db: {'status': 'success', 'evaluations': {'total': 5}})
+    db = _SnapshotDB()
+
+    def broken(kind, sources):
+        raise RuntimeError('permission denied for table governance_snapshots')
+
+    db.get_governance_snapshot = broken
+    assert governance_stats.get_snapshot(db, 'oversight')['evaluations'] == {'total': 5}
+    assert db.saves == []
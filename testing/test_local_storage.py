@@ -0,0 +1,81 @@
+"""Tests for src/local_storage.py — local chunked-upload assembly."""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.local_storage import LocalChunkedUploadStore
+
+CHUNK = 1024
+
+
+def _chunks(data, size=CHUNK):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalChunkedUploadStore(root=str(tmp_path))
+
+
+def test_out_of_order_concurrent_chunks_assemble(store):
+    data = os.urandom(CHUNK * 7 + 123)
+    parts = _chunks(data)
+    order = list(range(len(parts)))
+    random.Random(3).shuffle(order)
+
+    def stage(i):
+        return store.stage("c", "up/file.pdf", i, parts[i], total_chunks=len(parts),
+                           chunk_size=CHUNK, total_size=len(data),
+                           checksum=hashlib.sha256(parts[i]).hexdigest())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(stage, order))
+
+    result = store.commit("c", "up/file.pdf", len(parts),
+                          file_checksum=hashlib.sha256(data).hexdigest())
+    assert result["success"]
+    with open(result["local_path"], "rb") as fh:
+        assert fh.read() == data
+    assert not os.path.exists(result["local_path"] + ".chunks")
+    assert not os.path.exists(result["local_path"] + ".partial")
+
+
+def test_chunk_size_learned_from_first_chunk(store):
+    data = os.urandom(CHUNK * 3 + 10)
+    parts = _chunks(data)
+    for i, part in enumerate(parts):
+        store.stage("c", "up/a.bin", i, part, total_chunks=len(parts))
+    result = store.commit("c", "up/a.bin", len(parts))
+    with open(result["local_path"], "rb") as fh:
+        assert fh.read() == data
+
+
+def test_commit_reports_missing_chunks(store):
+    parts = _chunks(os.urandom(CHUNK * 4))
+    for i in (0, 2):
+        store.stage("c", "up/b.bin", i, parts[i], total_chunks=4, chunk_size=CHUNK)
+    result = store.commit("c", "up/b.bin", 4)
+    assert not result["success"]
+    assert result["missing_chunks"] == [1, 3]
+    assert not store.exists("c", "up/b.bin")
+
+
+def test_bad_chunk_checksum_rejected(store):
+    with pytest.raises(ValueError):
+        store.stage("c", "up/d.bin", 0, b"hello", total_chunks=1, checksum="0" * 64)
+
+
+def test_file_checksum_mismatch_not_committed(store):
+    store.stage("c", "up/e.bin", 0, b"hello", total_chunks=1)
+    result = store.commit("c", "up/e.bin", 1, file_checksum="0" * 64)
+    assert not result["success"]
+    assert not store.exists("c", "up/e.bin")
+
+
+def test_path_traversal_rejected(store):
+    with pytest.raises(ValueError):
+        store.path_for("c", "../../etc/passwd")
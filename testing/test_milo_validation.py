@@ -0,0 +1,130 @@
+"""Tests for the concurrent Milo cross-validation runner."""
+
+import random
+import re
+import threading
+import time
+
+import pytest
+
+from src import milo_validation
+
+
+class _FakeMilo:
+    """Scores students by their ``merit``; records calls and peak concurrency."""
+
+    model = 'fake-model'
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.insight_calls = []
+        self.scored = []
+        self.leaks = 0
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak_in_flight = 0
+
+    def _system_prompt_insights(self):
+        return 'insights prompt'
+
+    def _system_prompt_evaluate(self):
+        return 'evaluate prompt'
+
+    def _enter(self):
+        with self._lock:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self._in_flight -= 1
+
+    async def build_insights(self, train):
+        self._enter()
+        self.insight_calls.append({r['application_id'] for r in train})
+        return {'status': 'success', 'trained_on': sorted(r['application_id'] for r in train)}
+
+    async def _evaluate_batch(self, batch, insights):
+        self._enter()
+        results = []
+        for record in batch:
+            self.leaks += record['application_id'] in insights['trained_on']
+            self.scored.append(record['application_id'])
+            if record['application_id'] in self.failing:
+                results.append({'status': 'error', 'nextgen_match': 0, 'tier': 'DECLINE'})
+            else:
+                results.append({'nextgen_match': record['merit'], 'tier': 'STRONG'})
+        return results
+
+
+def _records(n=30):
+    return [{'application_id': i, 'applicant_name': f'Student {i}',
+             'was_selected': i % 3 == 0, 'merit': 90 if i % 3 == 0 else 20}
+            for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    milo_validation.clear_validation_cache()
+    yield
+    milo_validation.clear_validation_cache()
+
+
+def test_folds_match_the_previous_split():
+    records = _records(31)
+    legacy = list(records)
+    random.seed(42)
+    random.shuffle(legacy)
+
+    folds = milo_validation.fold_split(records, 3)
+
+    assert [r for _, holdout in folds for r in holdout] == legacy
+    assert [len(holdout) for _, holdout in folds] == [10, 10, 11]
+    for train, holdout in folds:
+        assert len(train) + len(holdout) == 31
+
+
+def test_cross_validation_runs_folds_concurrently_within_the_model_bound(recording_job):
+    milo = _FakeMilo()
+    job = recording_job
+
+    result = milo_validation.run_cross_validation(
+        milo, _records(), k=3, threshold=50, job=job, concurrency=2)
+
+    assert sorted(p['application_id'] for p in result['predictions']) == list(range(30))
+    assert {p['fold'] for p in result['predictions']} == {1, 2, 3}
+    assert len(milo.insight_calls) == 3 and all(len(ids) == 20 for ids in milo.insight_calls)
+    assert milo.leaks == 0  # holdouts are scored with insights from the other folds
+    assert milo.peak_in_flight <= 2
+    assert result['metrics']['accuracy'] == 100.0
+    assert result['metrics']['total_evaluated'] == 30
+
+    batches = [u['progress'] for u in job.updates if 'progress' in u]
+    counts = [tuple(map(int, re.match(r'Batch (\d+)/(\d+)', text).groups())) for text in batches]
+    assert counts[0] == (0, 6) and counts[-1] == (6, 6)
+    assert [done for done, _ in counts] == sorted(done for done, _ in counts)
+    assert job.updates[-1] == {'completed_folds': 3}
+    partial = [u['partial_metrics']['total_evaluated'] for u in job.updates if 'partial_metrics' in u]
+    assert partial[-1] == 30 and partial[1] < 30
+
+
+def test_rerun_reuses_evaluations_except_failures():
+    records = _records(16)
+    first = milo_validation.run_validation(_FakeMilo(failing={4}), records, threshold=50)
+    assert first['cache_hits'] == 0
+    assert first['total_training_students'] == 16
+
+    milo = _FakeMilo()
+    second = milo_validation.run_validation(milo, records, threshold=50)
+    assert milo.scored == [4] and milo.insight_calls == []
+    assert second['cache_hits'] == 15
+    assert second['metrics']['accuracy'] == 1.0
+
+    refreshed = _FakeMilo()
+    milo_validation.run_validation(refreshed, records, threshold=50, use_cache=False)
+    assert sorted(refreshed.scored) == list(range(16))
+
+    changed = [dict(r) for r in records]
+    changed[0]['merit'] = 85  # a new training signature: everything is re-scored
+    milo = _FakeMilo()
+    milo_validation.run_validation(milo, changed, threshold=50)
+    assert len(milo.scored) == 16
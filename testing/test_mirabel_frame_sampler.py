@@ -0,0 +1,68 @@
+"""Tests for src/agents/mirabel_frame_sampler.py — Mirabel frame sampling."""
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from src.agents.mirabel_frame_sampler import FrameSampler, dhash, sample_indices
+
+
+def _write_video(path, seconds=6, fps=10, size=(160, 120)):
+    """Static first half, moving square in the second half."""
+    width, height = size
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(seconds * fps):
+        frame = np.full((height, width, 3), 40, dtype=np.uint8)
+        cv2.rectangle(frame, (10, 10), (60, 60), (200, 200, 200), -1)
+        if i >= seconds * fps // 2:
+            x = 10 + (i * 7) % (width - 40)
+            cv2.rectangle(frame, (x, 70), (x + 30, 110), (0, 0, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def test_sample_indices_thins_to_max_frames():
+    indices = sample_indices(total_frames=3000, fps=30, frame_interval=1.0, max_frames=10, max_duration=600)
+    assert len(indices) == 10
+    assert indices[0] == 0
+    assert indices == sorted(indices)
+
+
+def test_sample_indices_respects_max_duration():
+    indices = sample_indices(total_frames=30 * 120, fps=30, frame_interval=10.0, max_frames=100, max_duration=60)
+    assert max(indices) < 60 * 30
+
+
+def test_dhash_is_stable_for_identical_frames():
+    frame = np.random.default_rng(1).integers(0, 255, (90, 120, 3), dtype=np.uint8)
+    assert dhash(frame) == dhash(frame.copy())
+    assert dhash(frame) != dhash(255 - frame)
+
+
+def test_sampler_matches_legacy_positions_without_dedupe(tmp_path):
+    path = tmp_path / "clip.mp4"
+    _write_video(path)
+    frames, stats = FrameSampler(frame_interval=0.5, max_frames=20, max_duration=600, dedupe=False).sample(str(path))
+
+    assert stats["total_frames"] == 60
+    assert [f["timestamp"] for f in frames] == [i * 0.5 for i in range(12)]
+    assert [f["index"] for f in frames] == list(range(12))
+    assert all(f["image_bytes"][:3] == b"\xff\xd8\xff" for f in frames)
+    assert stats["extracted_frame_count"] == 12
+
+
+def test_sampler_skips_static_duplicates(tmp_path):
+    path = tmp_path / "clip.mp4"
+    _write_video(path)
+    frames, stats = FrameSampler(frame_interval=0.5, max_frames=20, max_duration=600).sample(str(path))
+
+    assert stats["duplicates_skipped"] >= 4
+    assert frames[0]["timestamp"] == 0.0
+    assert len(frames) + stats["duplicates_skipped"] == 12
+
+
+def test_sampler_handles_missing_file(tmp_path):
+    frames, stats = FrameSampler(3.0, 20, 600).sample(str(tmp_path / "missing.mp4"))
+    assert frames == []
+    assert stats["extracted_frame_count"] == 0
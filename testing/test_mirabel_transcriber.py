@@ -0,0 +1,130 @@
+"""Tests for src/agents/mirabel_transcriber.py — chunked audio transcription."""
+
+import math
+import struct
+import threading
+import time
+import wave
+
+from src.agents.mirabel_transcriber import (
+    Transcript,
+    TranscriptSegment,
+    split_wav,
+    transcribe_chunked,
+)
+
+RATE = 1000  # tiny sample rate keeps the fixtures small
+
+
+def _write_wav(path, seconds, silent_at=()):
+    """Sine tone with 0.2s silent gaps starting at each time in *silent_at*."""
+    frames = bytearray()
+    for i in range(int(seconds * RATE)):
+        t = i / RATE
+        quiet = any(s <= t < s + 0.2 for s in silent_at)
+        value = 0 if quiet else int(8000 * math.sin(2 * math.pi * 50 * t))
+        frames += struct.pack("<h", value)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(bytes(frames))
+
+
+def _duration(path):
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / w.getframerate()
+
+
+def test_short_audio_is_not_split(tmp_path):
+    audio = tmp_path / "a.wav"
+    _write_wav(audio, 50)
+    assert split_wav(str(audio), str(tmp_path), chunk_seconds=45) == [(str(audio), 0.0)]
+
+
+def test_split_cuts_at_quiet_point_and_keeps_all_audio(tmp_path):
+    audio = tmp_path / "a.wav"
+    _write_wav(audio, 100, silent_at=(28.5, 57.9))
+    chunks = split_wav(str(audio), str(tmp_path), chunk_seconds=30)
+
+    offsets = [offset for _, offset in chunks]
+    assert offsets[0] == 0.0
+    assert 28.5 <= offsets[1] <= 28.7
+    assert 57.9 <= offsets[2] <= 58.1
+    assert sum(_duration(path) for path, _ in chunks) == 100
+
+
+def test_short_tail_is_folded_into_previous_chunk(tmp_path):
+    audio = tmp_path / "a.wav"
+    _write_wav(audio, 65)
+    chunks = split_wav(str(audio), str(tmp_path), chunk_seconds=30)
+    assert len(chunks) == 2
+    assert _duration(chunks[-1][0]) > 30
+
+
+def test_transcribe_chunked_offsets_and_orders_segments(tmp_path):
+    audio = tmp_path / "a.wav"
+    _write_wav(audio, 100)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_whisper(path):
+        with lock:
+            active.append(path)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(path)
+        n = int(path[-7:-4])
+        return [TranscriptSegment(0.0, 5.0, f" chunk {n} start "), TranscriptSegment(5.0, 9.0, f"chunk {n} end")]
+
+    timings = {}
+    transcript = transcribe_chunked(str(audio), fake_whisper, str(tmp_path),
+                                    chunk_seconds=30, max_workers=3, timings=timings)
+
+    assert transcript.chunk_count == 3
+    assert max(peak) > 1
+    assert [s.text for s in transcript.segments][:3] == ["chunk 0 start", "chunk 0 end", "chunk 1 start"]
+    assert transcript.segments[2].start >= 28
+    assert transcript.timestamped_text.splitlines()[0] == "[0:00] chunk 0 start"
+    assert set(timings) == {"audio_split_ms", "transcription_ms"}
+
+
+def test_failed_chunk_is_skipped(tmp_path):
+    audio = tmp_path / "a.wav"
+    _write_wav(audio, 75)
+
+    def flaky(path):
+        if path.endswith("chunk_001.wav"):
+            raise RuntimeError("429")
+        return [TranscriptSegment(0.0, 1.0, "ok")]
+
+    transcript = transcribe_chunked(str(audio), flaky, str(tmp_path), chunk_seconds=30)
+    assert transcript.text == "ok ok"
+
+
+def test_all_chunks_empty_returns_none(tmp_path):
+    audio = tmp_path / "a.wav"
+    _write_wav(audio, 20)
+    assert transcribe_chunked(str(audio), lambda p: [], str(tmp_path), chunk_seconds=30) is None
+    assert Transcript().text == ""
+
+
+def test_video_without_frames_falls_back_to_the_audio_transcript():
+    from src.agents.mirabel_video_analyzer import MirabelVideoAnalyzer
+
+    mirabel = MirabelVideoAnalyzer.__new__(MirabelVideoAnalyzer)
+    mirabel.name = "Mirabel"
+    mirabel._extract_frames = lambda path: ([], {"extracted_frame_count": 0})
+
+    def audio(path, timings):
+        time.sleep(0.05)  # still transcribing when frame extraction gives up
+        return Transcript(segments=[TranscriptSegment(0.0, 2.0, "I want to study biology.")])
+
+    mirabel._extract_and_transcribe_audio = audio
+    result = mirabel.analyze_video("talk.mp4", "talk.mp4")
+
+    assert result["agent_fields"]["application_text"] == "I want to study biology."
+    assert result["video_metadata"]["has_audio_transcript"] is True
+    assert result["summary"] == "No frames extracted; audio transcript available."
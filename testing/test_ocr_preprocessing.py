@@ -0,0 +1,68 @@
+"""Tests for src/ocr_preprocessing.py — OCR page rendering and payload size."""
+
+import fitz
+import pytest
+
+from src import ocr_preprocessing as ocr
+
+
+def _page_with_text(width=612, height=792, margin=150):
+    doc = fitz.open()
+    page = doc.new_page(width=width, height=height)
+    y = margin
+    while y < height - margin:
+        page.insert_text((margin, y), "AP Calculus BC   A   1.0", fontsize=11)
+        y += 18
+    return doc, page
+
+
+def test_choose_render_dpi_scales_with_page_size():
+    letter = ocr.choose_render_dpi(612, 792)
+    tall = ocr.choose_render_dpi(612, 1584)
+    assert tall < letter
+    assert ocr.OCR_MIN_DPI <= tall <= letter <= ocr.OCR_MAX_DPI
+
+
+def test_find_content_rect_crops_blank_margins():
+    doc, page = _page_with_text(margin=200)
+    rect = ocr.find_content_rect(page)
+    assert rect.x0 > 100 and rect.y0 > 100
+    assert rect.get_area() < page.rect.get_area() * 0.7
+    doc.close()
+
+
+def test_find_content_rect_blank_page_is_full_page():
+    doc = fitz.open()
+    page = doc.new_page()
+    assert ocr.find_content_rect(page) == page.rect
+    doc.close()
+
+
+def test_split_tall_rect_only_splits_tall_regions():
+    assert len(ocr.split_tall_rect(fitz.Rect(0, 0, 612, 792))) == 1
+    tiles = ocr.split_tall_rect(fitz.Rect(0, 0, 612, 2400))
+    assert len(tiles) > 1
+    assert tiles[0].y0 == 0 and tiles[-1].y1 == 2400
+    # Neighbouring tiles overlap so no line is cut in half
+    assert all(a.y1 > b.y0 for a, b in zip(tiles, tiles[1:]))
+
+
+@pytest.mark.parametrize("fmt,mime", [("jpeg", "image/jpeg"), ("png", "image/png")])
+def test_render_page_for_ocr_is_grayscale_and_smaller(fmt, mime):
+    doc, page = _page_with_text(margin=60)
+    segments = ocr.render_page_for_ocr(page, "page 1 of 1", image_format=fmt)
+    assert len(segments) == 1
+    seg = segments[0]
+    assert seg.mime_type == mime == ocr.image_mime_type(seg.image_bytes)
+    assert seg.label == "page 1 of 1"
+    assert max(seg.width, seg.height) <= ocr.OCR_TARGET_LONG_EDGE
+    assert len(seg.image_bytes) < len(ocr.render_page_legacy(page))
+    doc.close()
+
+
+def test_render_tall_page_labels_parts():
+    doc, page = _page_with_text(height=2400, margin=40)
+    segments = ocr.render_page_for_ocr(page, "page 2 of 5")
+    assert len(segments) > 1
+    assert segments[0].label == f"page 2 of 5, part 1 of {len(segments)}"
+    doc.close()
@@ -0,0 +1,69 @@
+"""Tests for the per-evaluation PromptContext cache."""
+
+import json
+
+from src.agents.prompt_context import (
+    PromptContext, compact_result, dumps, estimate_tokens, normalize_text,
+)
+
+
+def test_normalize_text_collapses_whitespace_but_keeps_lines():
+    text = "--- PAGE 1 of 2 ---\n\n\n  Dear   committee,\t\n\n\nShe  excels.  "
+    assert normalize_text(text) == "--- PAGE 1 of 2 ---\n\nDear committee,\n\nShe excels."
+
+
+def test_section_is_cached_until_field_is_reassigned():
+    application = {'application_text': 'line one\n' * 400}
+    ctx = PromptContext.attach(application)
+
+    view = ctx.section('application_text', max_tokens=100, agent='Tiana')
+    assert estimate_tokens(view) <= 110 and '\nline one\n[...' in view
+    assert ctx.section('application_text') is ctx.section('application_text')
+
+    application['application_text'] = 'rewritten by Belle'
+    assert ctx.section('application_text') == 'rewritten by Belle'
+    assert ctx.report()['Tiana']['calls'] == 1
+
+
+def test_digest_drops_bookkeeping_and_is_order_independent():
+    a = {'status': 'success', 'raw_response': 'x' * 5000, 'score': 3.14159,
+         'evidence': [f'e{i}' for i in range(20)], 'empty': ''}
+    b = dict(reversed(list(a.items())))
+    digest = compact_result(a)
+
+    assert dumps(digest) == dumps(compact_result(b))
+    assert set(digest) == {'evidence', 'score'}
+    assert digest['score'] == 3.142
+    assert digest['evidence'][-1] == '[... 8 more]'
+
+
+def test_digest_is_recomputed_for_a_revised_result():
+    ctx = PromptContext({})
+    first = {'gpa': 3.1}
+    assert ctx.digest('grade_reader', first) is ctx.digest('grade_reader', first)
+    assert ctx.digest('grade_reader', {'gpa': 3.9}) == {'gpa': 3.9}
+
+
+def test_digests_fit_a_shared_budget():
+    results = {
+        'grade_reader': {'notes': 'n' * 20000, 'courses': list(range(50))},
+        'application_reader': {'essay_summary': 'short'},
+        'unrelated': {'x': 1},
+    }
+    ctx = PromptContext({})
+    out = ctx.digests(results, ['grade_reader', 'application_reader', 'missing'], max_tokens=300)
+
+    assert list(out) == ['application_reader', 'grade_reader']
+    assert estimate_tokens(dumps(out)) <= 300
+    assert out['application_reader'] == {'essay_summary': 'short'}
+
+
+def test_report_and_detach():
+    application = {}
+    ctx = PromptContext.attach(application)
+    legacy = json.dumps({'raw_response': 'r' * 400, 'score': 2})
+    ctx.digest_text('application_reader', json.loads(legacy), agent='Smee', legacy=legacy)
+
+    assert PromptContext.detach(application) is ctx and application == {}
+    row = ctx.report()['Smee']
+    assert row['tokens_after'] < row['tokens_before'] and row['saved_pct'] > 90
@@ -0,0 +1,175 @@
+"""Tests for the concurrent school enrichment engine."""
+
+import re
+import threading
+import time
+
+import pytest
+
+from src import model_limits
+from src.school_enrichment import NaveenMoanaStep, SchoolEnrichmentEngine, replace_moana_summary
+
+
+class _SchoolDB:
+    """school_enriched_data rows in memory; applies the steps' keyed UPDATEs."""
+
+    def __init__(self, n):
+        self.rows = {
+            i: {'school_enrichment_id': i, 'school_name': f'School {i}', 'state_code': 'GA',
+                'school_district': 'District', 'analysis_status': 'pending',
+                'data_source_notes': 'NCES import.'}
+            for i in range(n)
+        }
+        self._lock = threading.Lock()
+
+    def get_school_enriched_data(self, school_id):
+        with self._lock:
+            return dict(self.rows[school_id])
+
+    def execute_non_query(self, query, params=None):
+        columns = re.findall(r'(\w+) = %s', query)
+        with self._lock:
+            self.rows[params[-1]].update(zip(columns, params))
+        return 1
+
+
+class _FakeNaveen:
+    model = 'workhorse-model'
+
+    def __init__(self, flaky=(), broken=()):
+        self.flaky = set(flaky)
+        self.broken = set(broken)
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _system_prompt():
+        return 'naveen prompt'
+
+    def analyze_school(self, school_name, school_district=None, state_code=None, existing_data=None):
+        with self._lock:
+            self.calls.append(school_name)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        if school_name in self.broken or (school_name in self.flaky and self.calls.count(school_name) == 1):
+            return {'status': 'error', 'analysis_status': 'error', 'error': 'model timeout'}
+        return {'status': 'success', 'analysis_status': 'complete',
+                'enriched_data': {'opportunity_score': 72, 'graduation_rate': '91%',
+                                  'academic_courses': {'ap_course_count': 'About 14'},
+                                  'honors_programs': True, 'school_profile_summary': 'x'}}
+
+
+@pytest.fixture(autouse=True)
+def _fast_limits(monkeypatch):
+    monkeypatch.setenv('MODEL_RPM_DEFAULT', '600000')
+    monkeypatch.setattr(model_limits, '_limiters', {})
+
+
+def _step(db, naveen, summaries=None, refresh=False):
+    step = NaveenMoanaStep(db, naveen, moana_client=object(), moana_model='main-model', refresh=refresh)
+
+    def summary(school):
+        if summaries is not None:
+            summaries.append(school['school_name'])
+        return f"{school['school_name']} serves a rural district."
+
+    step._moana_summary = summary
+    return step
+
+
+def test_engine_runs_schools_concurrently_with_retries_and_idempotent_writes(recording_job):
+    db = _SchoolDB(12)
+    naveen = _FakeNaveen(flaky={'School 3'}, broken={'School 7'})
+    job = recording_job
+    engine = SchoolEnrichmentEngine(job=job, concurrency=4, attempts=2, backoff=0)
+
+    summary = engine.run([db.get_school_enriched_data(i) for i in range(12)], _step(db, naveen))
+
+    assert 1 < naveen.peak <= 4
+    assert summary['updated'] == 11 and summary['errors'] == 1 and summary['retries'] == 2
+    assert [f['school_name'] for f in summary['failures']] == ['School 7']
+    assert db.rows[7]['analysis_status'] == 'error'
+
+    row = db.rows[3]
+    assert row['analysis_status'] == 'complete'
+    assert row['ap_course_count'] == 14 and row['graduation_rate'] == 91.0
+    assert row['honors_course_count'] == 10 and row['moana_requirements_met'] is True
+    assert row['data_source_notes'].count('Moana Context Summary') == 1
+
+    assert job.updates[-1]['processed'] == 12 and job.updates[-1]['total'] == 12
+
+    # A rerun replaces the Moana summary instead of appending another
+    engine.run([{**db.get_school_enriched_data(3), 'analysis_status': 'complete'}], _step(db, naveen))
+    notes = db.rows[3]['data_source_notes']
+    assert notes.startswith('NCES import.') and notes.count('Moana Context Summary') == 1
+
+
+def test_dry_run_plans_without_model_calls_or_writes():
+    db = _SchoolDB(5)
+    db.rows[0]['analysis_status'] = 'complete'
+    naveen = _FakeNaveen()
+    before = {i: dict(r) for i, r in db.rows.items()}
+
+    plan = SchoolEnrichmentEngine(concurrency=5).plan(
+        [db.get_school_enriched_data(i) for i in range(5)], _step(db, naveen))
+
+    assert naveen.calls == [] and db.rows == before
+    assert plan['status'] == 'dry_run' and plan['total'] == 5
+    assert plan['model_calls'] == {'workhorse-model': 4, 'main-model': 5}
+    assert plan['schools'][0]['actions'] == ['moana']
+    assert plan['estimated_minutes'] >= 1
+
+
+def test_rate_limiter_spaces_requests_across_threads(monkeypatch):
+    limiter = model_limits.RateLimiter(rpm=600)
+    delays = sorted(limiter.reserve() for _ in range(5))
+    assert delays[0] == 0
+    assert all(abs((b - a) - 0.1) < 0.01 for a, b in zip(delays, delays[1:]))
+
+    monkeypatch.setenv('MODEL_RPM_DEFAULT', '42')
+    monkeypatch.setattr(model_limits, '_limiters', {})
+    assert model_limits.limiter_for('unknown-deployment').rpm == 42
+    assert model_limits.limiter_for('unknown-deployment') is model_limits.limiter_for('unknown-deployment')
+
+
+def test_replace_moana_summary_drops_every_earlier_summary():
+    notes = 'CSV note.\n\n🌊 Moana Context Summary (2025-01-01 10:00):\nOld.\n\n🌊 Moana Context Summary (2025-02-01 10:00):\nOlder.'
+    assert replace_moana_summary(notes, 'New.', '2025-03-01 10:00') == (
+        'CSV note.\n\n🌊 Moana Context Summary (2025-03-01 10:00):\nNew.')
+
+
+def test_unchanged_schools_reuse_stored_results_after_reset():
+    db = _SchoolDB(6)
+    engine = SchoolEnrichmentEngine(concurrency=3, backoff=0)
+    engine.run([db.get_school_enriched_data(i) for i in range(6)], _step(db, _FakeNaveen()))
+    assert all(row['enrichment_fingerprint'] and row['moana_fingerprint'] for row in db.rows.values())
+
+    # /api/schools/reset-for-reanalysis, then a GOSA update for one school
+    for row in db.rows.values():
+        row.update(analysis_status='csv_imported', moana_requirements_met=None)
+    db.rows[2]['dropout_rate'] = 4.5
+    naveen, summaries = _FakeNaveen(), []
+    rows = [db.get_school_enriched_data(i) for i in range(6)]
+
+    plan = engine.plan(rows, _step(db, naveen))
+    assert plan['model_calls'] == {'workhorse-model': 1, 'main-model': 1}
+    assert plan['schools'][0]['actions'] == ['naveen_reused', 'moana_reused']
+
+    summary = engine.run(rows, _step(db, naveen, summaries))
+
+    assert naveen.calls == ['School 2'] and summaries == ['School 2']
+    assert summary['reused'] == 5 and summary['updated'] == 1
+    assert all(row['analysis_status'] == 'complete' and row['moana_requirements_met'] is True
+               for row in db.rows.values())
+
+    naveen, summaries = _FakeNaveen(), []
+    for row in db.rows.values():
+        row['analysis_status'] = 'csv_imported'
+    engine.run([db.get_school_enriched_data(i) for i in range(6)],
+               _step(db, naveen, summaries, refresh=True))
+    assert len(naveen.calls) == 6 and len(summaries) == 6
@@ -0,0 +1,49 @@
+"""Tests for the speculative Gaston quality gate in SmeeOrchestrator."""
+
+import pytest
+
+
+@pytest.fixture
+def evaluate(smee_harness, smee_stubs):
+    def run(grade, speculative=True):
+        rapunzel = smee_stubs.Rapunzel(gpa=4.0, step=1.0, delay=0.01)
+        moana = smee_stubs.Moana(delay=0.01)
+        harness = smee_harness({'grade_reader': rapunzel, 'school_context': moana,
+                                'gaston': smee_stubs.Gaston(grade)}, speculative=speculative)
+        return harness.run(['grade_reader', 'school_context']), rapunzel, moana
+    return run
+
+
+def test_passing_review_does_not_rerun_downstream(evaluate):
+    result, rapunzel, moana = evaluate('A')
+
+    assert rapunzel.calls == 1 and moana.seen == [4.0]
+    spec = result['speculation']
+    assert spec['reviewed'] == ['grade_reader'] and spec['rejected'] == []
+    assert spec['rejection_rate'] == 0.0 and spec['reexecuted_steps'] == []
+    # Moana ran alongside the review rather than after it
+    steps = result['step_timeline']['steps']
+    assert steps['school_context']['start_ms'] < steps['grade_reader_review']['end_ms']
+    # Transcript and review payload came from the shared prompt context
+    assert {'Rapunzel', 'Gaston'} <= set(result['prompt_tokens'])
+
+
+def test_rejection_revises_result_and_reruns_stale_consumers(evaluate):
+    result, rapunzel, moana = evaluate('F')
+
+    assert rapunzel.calls == 2
+    assert result['results']['grade_reader']['grades']['gpa'] == 5.0
+    # First Moana run saw the ungated grades; the re-run sees the revision
+    assert moana.seen == [4.0, 5.0]
+    spec = result['speculation']
+    assert spec['rejected'] == ['grade_reader'] and spec['rejection_rate'] == 1.0
+    assert 'school_context' in spec['reexecuted_steps']
+
+
+@pytest.mark.parametrize('grade, calls', [('A', 1), ('F', 2)])
+def test_gated_mode_reviews_inline(evaluate, grade, calls):
+    result, rapunzel, moana = evaluate(grade, speculative=False)
+
+    assert rapunzel.calls == calls and moana.seen == [3.0 + calls]
+    assert 'speculation' not in result
+    assert 'grade_reader_review' not in result['step_timeline']['steps']
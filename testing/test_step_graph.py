@@ -0,0 +1,135 @@
+"""Tests for src/agents/step_graph.py — the orchestrator step scheduler."""
+
+import asyncio
+
+import pytest
+
+from src.agents.step_graph import Step, StepGraph
+
+
+def _sleeper(log, name, seconds, fail=False):
+    async def run():
+        log.append(('start', name))
+        await asyncio.sleep(seconds)
+        log.append(('end', name))
+        if fail:
+            raise RuntimeError(f"{name} broke")
+    return run
+
+
+def test_dependencies_follow_inputs_outputs_and_after():
+    graph = StepGraph([
+        Step('a', _sleeper([], 'a', 0), outputs=('x',)),
+        Step('b', _sleeper([], 'b', 0), inputs=('x', 'not_produced')),
+        Step('c', _sleeper([], 'c', 0), after=('a', 'b', 'missing')),
+    ])
+    deps = graph.dependencies()
+    assert deps == {'a': set(), 'b': {'a'}, 'c': {'a', 'b'}}
+    assert graph.topological_order() == ['a', 'b', 'c']
+
+
+def test_cycle_and_duplicate_are_rejected():
+    graph = StepGraph([
+        Step('a', _sleeper([], 'a', 0), inputs=('y',), outputs=('x',)),
+        Step('b', _sleeper([], 'b', 0), inputs=('x',), outputs=('y',)),
+    ])
+    with pytest.raises(ValueError, match='cycle'):
+        graph.topological_order()
+    with pytest.raises(ValueError, match='Duplicate'):
+        graph.add(Step('a', _sleeper([], 'a', 0)))
+
+
+def test_ready_steps_run_concurrently_and_critical_path_is_reported():
+    log = []
+    graph = StepGraph([
+        Step('slow', _sleeper(log, 'slow', 0.15), outputs=('s',)),
+        Step('fast', _sleeper(log, 'fast', 0.05), outputs=('f',)),
+        Step('after_fast', _sleeper(log, 'after_fast', 0.05), inputs=('f',)),
+        Step('join', _sleeper(log, 'join', 0.01), inputs=('s', 'f')),
+    ])
+    timeline = asyncio.run(graph.run())
+
+    # after_fast starts before slow finishes — no stage barrier
+    assert log.index(('start', 'after_fast')) < log.index(('end', 'slow'))
+    assert timeline['total_ms'] < 250
+    assert timeline['critical_path'] == ['slow', 'join']
+    assert timeline['parallelism'] > 1.0
+    assert all(s['status'] == 'completed' for s in timeline['steps'].values())
+
+
+def test_failed_step_is_recorded_and_dependents_still_run():
+    log = []
+    graph = StepGraph([
+        Step('a', _sleeper(log, 'a', 0, fail=True), outputs=('x',)),
+        Step('b', _sleeper(log, 'b', 0), inputs=('x',)),
+    ])
+    timeline = asyncio.run(graph.run())
+    assert timeline['steps']['a']['status'] == 'failed'
+    assert 'broke' in timeline['steps']['a']['error']
+    assert timeline['steps']['b']['status'] == 'completed'
+
+
+def test_cancellation_stops_new_steps():
+    log = []
+    graph = StepGraph([
+        Step('a', _sleeper(log, 'a', 0.01), outputs=('x',)),
+        Step('b', _sleeper(log, 'b', 0), inputs=('x',)),
+    ])
+    timeline = asyncio.run(graph.run(should_cancel=lambda: ('end', 'a') in log))
+    assert timeline['cancelled'] is True
+    assert timeline['steps']['a']['status'] == 'completed'
+    assert timeline['steps']['b']['status'] == 'not_run'
+
+
+def test_max_concurrency_limits_steps_in_flight():
+    active = []
+    peak = []
+
+    def make(name):
+        async def run():
+            active.append(name)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(name)
+        return run
+
+    graph = StepGraph([Step(n, make(n)) for n in 'abcd'])
+    asyncio.run(graph.run(max_concurrency=2))
+    assert max(peak) == 2
+
+
+def test_orchestrator_step_ordering_helpers():
+    from src.agents.smee_orchestrator import SmeeOrchestrator
+
+    smee = SmeeOrchestrator('Smee', client=None, model='test')
+    assert smee._ensure_merlin_last(['a', 'student_evaluator', 'b']) == ['a', 'b', 'student_evaluator']
+    ordered = smee._order_evaluation_steps(
+        ['x', 'opt', 'student_evaluator', 'core1', 'pre'],
+        pre_core_agents=['pre'], core_agents=['core1'], optional_agents=['opt'],
+        merlin_agent='student_evaluator',
+    )
+    assert ordered == ['pre', 'core1', 'x', 'opt', 'student_evaluator']
+
+
+def test_downstream_is_transitive_and_ordered():
+    graph = StepGraph([
+        Step('a', _sleeper([], 'a', 0), outputs=('x',)),
+        Step('b', _sleeper([], 'b', 0), inputs=('x',), outputs=('y',)),
+        Step('c', _sleeper([], 'c', 0), inputs=('y',)),
+        Step('d', _sleeper([], 'd', 0)),
+    ])
+    assert graph.downstream(['a']) == ['b', 'c']
+    assert graph.downstream(['c', 'd']) == []
+
+
+def test_resumable_drops_steps_downstream_of_a_rerun():
+    graph = StepGraph([
+        Step('a', _sleeper([], 'a', 0), outputs=('x',)),
+        Step('b', _sleeper([], 'b', 0), inputs=('x',), outputs=('y',)),
+        Step('review', _sleeper([], 'review', 0), inputs=('x',)),
+        Step('c', _sleeper([], 'c', 0), inputs=('y',)),
+        Step('d', _sleeper([], 'd', 0)),
+    ])
+    assert graph.resumable(['a', 'b', 'c', 'd', 'gone']) == ['a', 'b', 'c', 'd']
+    assert graph.resumable(['b', 'c', 'd']) == ['d']
+    assert graph.resumable(['a', 'b', 'c'], extra_deps={'b': ['review']}) == ['a']
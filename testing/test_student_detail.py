@@ -0,0 +1,121 @@
+"""Tests for the single-query, cached student detail loader."""
+
+import json
+
+from src import student_detail
+from src.database import Database
+
+
+class _DetailDB(Database):
+    """A Database whose schema lookups are fixed and whose queries are recorded."""
+
+    def __init__(self, row):
+        super().__init__()
+        self.row = row
+        self.queries = []
+        self._evaluation_summary_ready = True
+
+    def get_table_name(self, logical_name):
+        return logical_name
+
+    def get_applications_column(self, logical):
+        return logical
+
+    def resolve_table_column(self, table_logical, candidates):
+        return candidates[0]
+
+    def has_table(self, table_name):
+        return True
+
+    def has_applications_column(self, column_name):
+        return True
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        return [dict(self.row)]
+
+    def execute_non_query(self, query, params=None):
+        return 1
+
+
+def _merlin_row():
+    content = json.dumps({'overall_score': 88, 'recommendation': 'Admit',
+                          'executive_summary': 'Strong lab record.', 'nextgen_match': 72})
+    return {'merlin_evaluation_id': 3, 'overall_score': None, 'recommendation': None,
+            'parsed_json': json.dumps({'role': 'assistant', 'refusal': None, 'content': content})}
+
+
+def test_one_query_loads_the_application_and_every_agent_table():
+    db = _DetailDB({
+        'application_id': 7, 'applicant_name': 'Ada Lovelace', 'nextgen_match': None,
+        'student_summary': json.dumps({'overall_score': 88}),
+        'agent_results': json.dumps({'milo_alignment': {'nextgen_match': 64, 'tier': 'ADMIT'}}),
+        '_detail_tiana': {'essay_summary': 'Loves robotics', 'readiness_score': 0},
+        '_detail_mulan': [{'recommender_name': 'Dr. Hopper', 'endorsement_strength': 8},
+                          {'recommender_name': 'Mr. Turing'}],
+        '_detail_merlin': _merlin_row(),
+        '_detail_reprocess_audit': {'source_file_name': 'reprocess:new_upload:essay.pdf'},
+        '_detail_school_enrichment': {'school_name': 'Lincoln High', 'state_code': 'GA',
+                                      'opportunity_score': 61},
+    })
+    rows = db.get_student_detail_rows(7)
+
+    assert len(db.queries) == 1
+    query = db.queries[0]
+    assert query.count('LEFT JOIN LATERAL') == 8
+    assert 'jsonb_agg(to_jsonb(x) ORDER BY x.created_at DESC)' in query
+    assert rows['application']['agent_results']['milo_alignment']['tier'] == 'ADMIT'
+
+    view = student_detail.build_student_detail(rows)
+    agents = view['agent_results']
+    assert agents['tiana']['essaysummary'] == 'Loves robotics' and agents['tiana']['readinessscore'] == 0
+    assert [m['recommendername'] for m in agents['mulan']] == ['Dr. Hopper', 'Mr. Turing']
+    assert agents['mulan'][0]['endorsementstrength'] == 8
+    merlin = agents['merlin']
+    assert merlin['overall_score'] == 88 and merlin['recommendation'] == 'Admit'
+    assert merlin['human_summary'] == 'Strong lab record.'
+    assert agents['milo_alignment'] == {'nextgen_match': 64, 'tier': 'ADMIT'}
+    assert view['nextgen_match'] == 72  # Merlin beats Milo when the column is empty
+    assert view['reprocess_notice']['message'] == 'New upload: essay.pdf'
+    assert view['school_context']['opportunity_score'] == 61
+    assert view['merlin_evaluation']['role'] == 'assistant'  # no Aurora row: raw Merlin backup
+    assert 'Recommendation: Admit' in view['human_summary']
+
+
+def test_empty_merlin_row_gives_way_to_stored_results():
+    agent_results = {'merlin': {'overall_score': None, 'recommendation': None}}
+    student_detail.merge_stored_agent_results(
+        agent_results, {'merlin': {'overall_score': 91, 'recommendation': 'Strong Admit'}, 'gaston': {}})
+    assert agent_results['merlin']['overall_score'] == 91 and 'gaston' in agent_results
+
+    agent_results = {'merlin': {'overall_score': 80, 'rationale': ''}}
+    student_detail.merge_stored_agent_results(
+        agent_results, {'merlin': {'overall_score': 91, 'rationale': 'Kept the row, filled the gap'}})
+    assert agent_results['merlin'] == {'overall_score': 80, 'rationale': 'Kept the row, filled the gap'}
+
+
+class _CountingDB:
+    def __init__(self):
+        self.version = 'v1'
+        self.loads = 0
+
+    def get_student_detail_version(self, application_id):
+        return self.version if application_id == 7 else None
+
+    def get_student_detail_rows(self, application_id):
+        self.loads += 1
+        return {'application': {'application_id': application_id, 'applicant_name': f'Load {self.loads}'}}
+
+
+def test_view_is_cached_until_the_version_changes():
+    student_detail.clear_student_detail_cache()
+    db = _CountingDB()
+
+    first = student_detail.load_student_detail(db, 7)
+    assert student_detail.load_student_detail(db, 7) is first
+    assert db.loads == 1
+
+    db.version = 'v2'
+    assert student_detail.load_student_detail(db, 7)['summary']['applicant_name'] == 'Load 2'
+    assert student_detail.load_student_detail(db, 8) is None
+    assert db.loads == 2
@@ -0,0 +1,97 @@
+"""Tests for the keyset-paginated student list query."""
+
+from decimal import Decimal
+
+import pytest
+
+from src.database import Database
+
+
+class _PageDB(Database):
+    """A Database whose schema lookups are fixed and whose queries are recorded."""
+
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+        self.queries = []
+        self._evaluation_summary_ready = True
+
+    def get_table_name(self, logical_name):
+        return logical_name
+
+    def get_applications_column(self, logical):
+        return logical
+
+    def get_training_example_column(self):
+        return 'is_training_example'
+
+    def get_test_data_column(self):
+        return 'is_test_data'
+
+    def has_applications_column(self, column_name):
+        return True
+
+    def execute_query(self, query, params=None):
+        self.queries.append((query, params))
+        return [dict(row) for row in self.rows]
+
+
+def _row(app_id, name, score):
+    return {'application_id': app_id, 'applicant_name': name, 'high_school': 'Lincoln High',
+            'merlin_score': score, 'sort_name': name.lower(),
+            '_k0': Decimal(str(score)), '_k1': name.lower(), '_k2': app_id}
+
+
+def test_page_projects_score_in_sql_and_returns_a_cursor():
+    db = _PageDB([_row(1, 'Ada Lovelace', 91.5), _row(2, 'Grace Hopper', 88), _row(3, 'Alan Turing', 80)])
+    page = db.get_student_page(sort='score', descending=True, limit=2)
+
+    query, params = db.queries[0]
+    assert params[-1] == 3  # one extra row tells us whether there is a next page
+    assert 'a.agent_results' not in query.replace('a.agent_results::text', '')
+    assert 'ORDER BY COALESCE(p.merlin_score, -1) DESC' in query
+    assert page['has_more'] and page['next_cursor']
+    assert [s['application_id'] for s in page['students']] == [1, 2]
+    assert page['students'][0] == {'application_id': 1, 'applicant_name': 'Ada Lovelace',
+                                   'high_school': 'Lincoln High', 'merlin_score': 91.5}
+
+    db.queries.clear()
+    db.get_student_page(sort='score', descending=True, limit=2, after=page['next_cursor'],
+                        filters={'school': 'lincoln', 'selected': True})
+    query, params = db.queries[0]
+    assert ('(COALESCE(p.merlin_score, -1), p.sort_name, p.application_id) < '
+            '(%s::numeric, %s::text, %s::bigint)') in query
+    assert list(params[-4:]) == [88.0, 'grace hopper', 2, 3]
+    assert '%lincoln%' in params and True in params
+
+
+def test_last_page_has_no_cursor_and_training_adds_historical_match():
+    db = _PageDB([_row(1, 'Ada Lovelace', 91.5)])
+    page = db.get_student_page(is_training=True, sort='score', filters={'historical_match': False})
+    query, params = db.queries[0]
+    assert page['has_more'] is False and page['next_cursor'] is None
+    assert 'AS has_historical_match' in query and 'p.has_historical_match = %s' in query
+    assert 'a.is_training_example = TRUE' in query
+
+
+def test_cursor_must_match_the_sort_order():
+    db = _PageDB([_row(1, 'Ada Lovelace', 91.5), _row(2, 'Grace Hopper', 88)])
+    cursor = db.get_student_page(sort='score', limit=1)['next_cursor']
+    with pytest.raises(ValueError):
+        db.get_student_page(sort='name', after=cursor)
+    with pytest.raises(ValueError):
+        db.get_student_page(sort='score', after='not-a-cursor')
+    with pytest.raises(ValueError):
+        db.get_student_page(sort='shoe_size')
+
+
+def test_counts_apply_the_list_filters():
+    db = _PageDB([{'total': 4, 'selected': 4, 'historical_match': 1}])
+    counts = db.get_student_list_counts(is_training=True, filters={'selected': True})
+    query, params = db.queries[0]
+    assert 'COALESCE(p.was_selected, FALSE) = %s' in query and params[-1] is True
+    assert counts == {'total': 4, 'selected': 4, 'not_selected': 0, 'historical_match': 1}
+
+    db.queries.clear()
+    db.get_student_list_counts(is_training=True, filters={'selected': None})
+    assert 'FROM applications a' in db.queries[0][0] and 'p.' not in db.queries[0][0]
@@ -0,0 +1,129 @@
+"""Tests for the write-behind telemetry sink and rollup-backed queries."""
+
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+# test_belle_* install bare stub modules (no __spec__) for these at import time
+for _name in list(sys.modules):
+    if (_name.startswith(('opentelemetry', 'src.observability', 'src.telemetry'))
+            and getattr(sys.modules[_name], '__spec__', None) is None):
+        del sys.modules[_name]
+
+import src.database  # noqa: E402
+from src.audit_writer import AuditWriter  # noqa: E402
+from src.telemetry import NextGenTelemetry  # noqa: E402
+
+
+class _FakeDb:
+    """Records SQL; answers the catalog probe and rollup reads."""
+
+    def __init__(self, has_rollup=True, rollup_rows=None):
+        self.queries = []
+        self.statements = []
+        self.has_rollup = has_rollup
+        self.rollup_rows = rollup_rows or []
+
+    def execute_query(self, sql, params=None):
+        self.queries.append(sql)
+        if 'to_regclass' in sql:
+            return [{'has_events': True, 'has_rollup': self.has_rollup}]
+        if 'FROM telemetry_rollup_minute' in sql:
+            return self.rollup_rows
+        return []
+
+    def execute_non_query(self, sql, params=None):
+        self.statements.append((' '.join(sql.split()), params))
+        return 1
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = _FakeDb()
+    monkeypatch.setattr(src.database, 'db', db)
+    monkeypatch.setattr(NextGenTelemetry, '_db_table_ready', False)
+    monkeypatch.delenv('TELEMETRY_ASYNC', raising=False)
+    return db
+
+
+def test_model_calls_are_written_as_one_batch_plus_rollup_refresh(fake_db):
+    telem = NextGenTelemetry()
+    for i in range(5):
+        telem.log_model_call('gpt-x', 100, 20 + i, 250.0 + i, agent_name='Tiana')
+    assert telem.flush(timeout=5)
+
+    inserts = [s for s in fake_db.statements if s[0].startswith('INSERT INTO telemetry_events')]
+    refreshes = [s for s in fake_db.statements if s[0].startswith('INSERT INTO telemetry_rollup_minute')]
+    assert len(inserts) == 1
+    assert len(inserts[0][1]) == 5 * 9  # five rows of nine columns
+    assert len(refreshes) == 1
+    since, until = refreshes[0][1]
+    assert since.second == 0 and (until - since).total_seconds() in (60, 120)
+    assert telem.sink_stats()['written'] == 5
+
+
+def test_missing_rollup_table_is_created_and_backfilled_once(fake_db):
+    fake_db.has_rollup = False
+    assert NextGenTelemetry._ensure_db_table()
+    assert NextGenTelemetry._ensure_db_table()
+
+    probes = [q for q in fake_db.queries if 'to_regclass' in q]
+    creates = [s for s, _ in fake_db.statements if 'CREATE TABLE IF NOT EXISTS telemetry_rollup_minute' in s]
+    backfills = [p for s, p in fake_db.statements if s.startswith('INSERT INTO telemetry_rollup_minute')]
+    assert len(probes) == 1 and len(creates) == 1
+    assert backfills == [()]  # unbounded refresh
+    assert not any('telemetry_events (' in s for s, _ in fake_db.statements if s.startswith('CREATE TABLE'))
+
+
+def test_token_usage_is_summed_from_rollup_rows(fake_db):
+    first = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    fake_db.rollup_rows = [
+        {'agent_name': 'Tiana', 'model': 'gpt-x', 'input_tokens': 100, 'output_tokens': 10,
+         'total_tokens': 110, 'call_count': 2, 'first_event': first},
+        {'agent_name': 'Merlin', 'model': 'gpt-x', 'input_tokens': 300, 'output_tokens': 30,
+         'total_tokens': 330, 'call_count': 1, 'first_event': first.replace(minute=5)},
+        {'agent_name': 'Tiana', 'model': 'gpt-mini', 'input_tokens': 5, 'output_tokens': 5,
+         'total_tokens': 10, 'call_count': 1, 'first_event': first.replace(minute=2)},
+    ]
+    usage = NextGenTelemetry.query_db_token_usage()
+
+    assert usage['totals'] == {'input_tokens': 405, 'output_tokens': 45, 'total_tokens': 450, 'call_count': 4}
+    assert usage['by_model']['gpt-x']['total_tokens'] == 440
+    assert usage['by_agent']['Tiana'] == {'input_tokens': 105, 'output_tokens': 15,
+                                          'total_tokens': 120, 'call_count': 3}
+    assert list(usage['by_agent']) == ['Merlin', 'Tiana']
+    assert usage['by_agent_model']['Tiana::gpt-mini']['call_count'] == 1
+    assert usage['tracking_since'] == str(first)
+    aggregates = [q for q in fake_db.queries if 'SUM(' in q]
+    assert aggregates and all('telemetry_rollup_minute' in q for q in aggregates)
+
+
+def test_agent_summary_derives_averages_from_rollup(fake_db):
+    fake_db.rollup_rows = [{
+        'agent_name': 'Gaston', 'total': 4, 'success_count': 3, 'duration_sum_ms': 1000.0,
+        'min_duration_ms': 100.0, 'max_duration_ms': 400.0, 'p50_weighted': 1000.0,
+        'p95_weighted': 1520.0, 'total_tokens': 900, 'last_run': None,
+        'models_used': ['gpt-x', 'unknown'],
+    }]
+    summary = NextGenTelemetry.query_db_agent_summary()['Gaston']
+    assert summary['failed'] == 1 and summary['success_rate'] == 75.0
+    assert summary['avg_duration_ms'] == 250.0
+    assert summary['p50_duration_ms'] == 250.0 and summary['p95_duration_ms'] == 380.0
+    assert summary['models_used'] == ['gpt-x']
+
+
+def test_submit_waits_for_room_before_dropping():
+    release = threading.Event()
+    writer = AuditWriter(lambda batch: release.wait(2), max_queue=1, batch_size=1, flush_interval=0)
+    writer.submit({'i': 0})  # taken by the worker, which then blocks
+    while writer.stats()['queue_depth']:
+        time.sleep(0.005)
+    assert writer.submit({'i': 1})  # fills the queue
+    threading.Timer(0.05, release.set).start()
+    assert writer.submit({'i': 2}, timeout=2)
+    writer.close()
+    stats = writer.stats()
+    assert stats['throttled'] >= 1 and stats['dropped'] == 0
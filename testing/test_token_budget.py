@@ -0,0 +1,85 @@
+"""Tests for token budgeting of long application documents."""
+
+import pytest
+
+import src.token_budget as token_budget
+from src.token_budget import (
+    Section, allocate, compress_text, count_tokens, fit_document, input_budget, pack_sections,
+)
+
+
+@pytest.fixture(autouse=True)
+def heuristic_counts(monkeypatch):
+    # Keep counts deterministic whether or not tiktoken is installed.
+    monkeypatch.setattr(token_budget, 'tiktoken', None)
+
+
+def _page(number, total, body):
+    return f"--- PAGE {number} of {total} ---\n{body}"
+
+
+def test_heuristic_counts_words_digits_and_punctuation():
+    assert count_tokens('') == 0
+    assert count_tokens('Biology | A | 1.0 credit') == 9
+    assert count_tokens('internationalization') == 4
+
+
+def test_input_budget_follows_model_tier(monkeypatch):
+    from src.config import config
+    monkeypatch.setattr(config, 'model_tier_premium', 'premium-deployment', raising=False)
+    assert input_budget('premium-deployment') == token_budget.TIER_INPUT_BUDGETS['premium']
+    monkeypatch.setenv('TOKEN_BUDGET_PREMIUM', '1234')
+    assert input_budget('premium-deployment') == 1234
+    assert input_budget('some-other-model') == token_budget.DEFAULT_INPUT_BUDGET
+
+
+def test_allocate_keeps_floors_then_fills_by_priority():
+    alloc = allocate([1000, 1000, 1000], [3, 1, 1], 1200)
+    assert alloc[0] == 1000 and alloc[1] == alloc[2] == 100
+    assert allocate([10, 20], [1, 2], 100) == [10, 20]
+    assert sum(allocate([500] * 10, [1] * 10, 100)) <= 100
+
+
+def test_compress_drops_boilerplate_before_cutting():
+    body = '\n'.join(['Lincoln High School Official Transcript', 'Page 3 of 9', 'Chemistry | A'] * 5)
+    assert count_tokens(body) > 40
+    out = compress_text(body, 40)
+    assert 'omitted' not in out
+    assert out.count('Lincoln High School Official Transcript') == 1
+    assert 'Page 3 of 9' not in out and 'Chemistry | A' in out
+
+
+def test_compress_keeps_head_and_tail_within_budget():
+    text = '\n'.join(f'Course {i} | grade B | {i}.0 credit' for i in range(300))
+    out = compress_text(text, 200)
+    assert count_tokens(out) <= 200
+    assert out.startswith('Course 0 |') and out.endswith('299.0 credit')
+    assert 'lines omitted to fit the token budget' in out
+
+
+def test_fit_document_keeps_transcript_pages_over_boilerplate_pages():
+    transcript = '\n'.join(f'Algebra {i} | A | 1.0 credit' for i in range(60))
+    essay = ' '.join(f'I studied topic {i} in depth.' for i in range(200))
+    text = '\n\n'.join([
+        _page(1, 3, 'Table of Contents\nEssay 2\nTranscript 3\n' + 'filler line\n' * 100),
+        _page(2, 3, essay),
+        _page(3, 3, transcript),
+    ])
+    section_map = {1: {'type': 'application', 'note': 'table of contents page'},
+                   2: {'type': 'application'}, 3: {'type': 'transcript'}}
+    result = fit_document(text, 900, section_map=section_map, prefer='transcript')
+
+    assert 'page 3' not in result.trimmed and transcript in result.text
+    assert {'page 1', 'page 2'} <= set(result.trimmed)
+    assert result.tokens_after <= 900 < result.tokens_before
+    assert '--- PAGE 1 of 3 ---' in result.text  # low-value pages shrink, not vanish
+
+
+def test_pack_sections_is_deterministic_and_leaves_inputs_alone():
+    sections = [Section('transcript_text', 'grade line\n' * 400, 3),
+                Section('application_text', 'essay sentence. ' * 400, 2)]
+    first = pack_sections(sections, 500)
+    second = pack_sections(sections, 500)
+    assert first.text == second.text
+    assert sections[0].text == 'grade line\n' * 400
+    assert first.trimmed and first.tokens_after <= 500
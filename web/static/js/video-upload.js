@@ -7,8 +7,10 @@
  * Flow:
  *   1. User selects files via <input type=file>
  *   2. On form submit, files are sliced into ≤100 KB chunks
- *   3. Each chunk is POSTed to /api/file/upload-chunk
- *   4. After the last chunk the server commits the block list
+ *   3. Chunks are POSTed to /api/file/upload-chunk concurrently, in any order
+ *   4. When the last missing chunk arrives the server commits the block
+ *      list; a retried upload first asks /api/file/upload-status/<id>
+ *      which chunks are missing and only re-sends those
  *   5. Blob paths are stored in a hidden <input> so the regular
  *      form POST carries references (not raw bytes)
  *
@@ -28,10 +30,10 @@
  */
 const VideoUpload = (() => {
   const CHUNK_SIZE = 100 * 1024; // 100 KB per chunk – stays under Front Door WAF 128 KB body inspection limit
-  const PARALLEL_UPLOADS = 3; // Upload up to 3 chunks concurrently
+  const PARALLEL_UPLOADS = 4; // Upload up to 4 chunks concurrently
 
   let _cfg = {};
-  let _pendingFiles = []; // [{file, uploadId, blobPath, container, status}]
+  let _pendingFiles = []; // [{file, uploadId, blobPath, container, status, attempted}]
 
   function _uuid() {
     return 'xxxxxxxxxxxx4xxxyxxxxxxxxxxxxxxx'.replace(/[xy]/g, c => {
@@ -40,13 +42,46 @@ const VideoUpload = (() => {
     });
   }
 
+  /* ── SHA-256 of a Blob (server verifies each chunk) ─────────── */
+  async function _sha256Hex(blob) {
+    // crypto.subtle is only available in secure contexts (HTTPS / localhost)
+    if (!(window.crypto && window.crypto.subtle)) return null;
+    const buf = await window.crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(buf)).map(b => b.toString(16).padStart(2, '0')).join('');
+  }
+
+  /* ── Ask the server which chunks it already has (resume) ───── */
+  async function _fetchStatus(uploadId) {
+    try {
+      const resp = await fetch(`/api/file/upload-status/${encodeURIComponent(uploadId)}`);
+      if (!resp.ok) return null;
+      return await resp.json();
+    } catch (_) {
+      return null;
+    }
+  }
+
   /* ── Upload a single file in chunks (with parallelism) ─────── */
   async function _uploadFile(entry, onProgress) {
     const file = entry.file;
     const totalChunks = Math.ceil(file.size / CHUNK_SIZE);
     const appType = _cfg.appTypeGetter ? _cfg.appTypeGetter() : '2026';
 
-    let completedChunks = 0;
+    function _markDone(data) {
+      entry.blobPath = data.blob_path;
+      entry.container = data.container;
+      entry.status = 'done';
+    }
+
+    // Resuming a previous attempt: only send the chunks the server lacks
+    let pending = [...Array(totalChunks).keys()];
+    const prior = entry.attempted ? await _fetchStatus(entry.uploadId) : null;
+    entry.attempted = true;
+    if (prior) {
+      if (prior.complete) { _markDone(prior); onProgress(100); return; }
+      if (Array.isArray(prior.missing)) pending = prior.missing;
+    }
+    let completedChunks = totalChunks - pending.length;
 
     async function _sendChunk(i) {
       const start = i * CHUNK_SIZE;
@@ -58,8 +93,12 @@ const VideoUpload = (() => {
       fd.append('upload_id', entry.uploadId);
       fd.append('chunk_index', i);
       fd.append('total_chunks', totalChunks);
+      fd.append('chunk_size', CHUNK_SIZE);
+      fd.append('total_size', file.size);
       fd.append('filename', file.name);
       fd.append('app_type', appType);
+      const digest = await _sha256Hex(chunk);
+      if (digest) fd.append('chunk_sha256', digest);
 
       let retries = 3;
       let resp;
@@ -93,30 +132,42 @@ const VideoUpload = (() => {
       completedChunks++;
       onProgress(Math.round((completedChunks / totalChunks) * 100));
 
-      if (data.complete) {
-        entry.blobPath = data.blob_path;
-        entry.container = data.container;
-        entry.status = 'done';
-      }
-    }
-
-    // Upload non-final chunks in parallel batches, then send the final chunk last
-    // (server commits on final chunk, so it must arrive after all others)
-    const nonFinalChunks = [];
-    for (let i = 0; i < totalChunks - 1; i++) {
-      nonFinalChunks.push(i);
+      if (data.complete) _markDone(data);
     }
 
-    // Process in batches of PARALLEL_UPLOADS
-    for (let b = 0; b < nonFinalChunks.length; b += PARALLEL_UPLOADS) {
-      const batch = nonFinalChunks.slice(b, b + PARALLEL_UPLOADS);
-      await Promise.all(batch.map(i => _sendChunk(i)));
+    // Non-final chunks go out concurrently through a small worker pool and
+    // may land in any order; the server commits once the set is complete.
+    // The final chunk is still sent last so servers without upload-session
+    // tracking (which commit on the last index) keep working.
+    const finalIdx = totalChunks - 1;
+    const body = pending.filter(i => i !== finalIdx);
+    let next = 0;
+    async function _worker() {
+      while (next < body.length) {
+        await _sendChunk(body[next++]);
+      }
     }
+    await Promise.all(Array.from({ length: Math.min(PARALLEL_UPLOADS, body.length) }, _worker));
+    if (pending.includes(finalIdx)) await _sendChunk(finalIdx);
 
-    // Send the final chunk (triggers server-side commit)
-    if (totalChunks > 0) {
-      await _sendChunk(totalChunks - 1);
+    // Another request may still be committing, or session tracking may be
+    // off — ask for an explicit commit (idempotent once committed).
+    for (let attempt = 0; entry.status !== 'done' && attempt < 5; attempt++) {
+      const fd = new FormData();
+      fd.append('upload_id', entry.uploadId);
+      const resp = await fetch('/api/file/upload-commit', { method: 'POST', body: fd });
+      const data = await resp.json().catch(() => ({}));
+      if (data.complete) { _markDone(data); break; }
+      if (resp.status === 409 && Array.isArray(data.missing_chunks)) {
+        for (const i of data.missing_chunks) await _sendChunk(i);
+        continue;
+      }
+      if (resp.status !== 202) {
+        throw new Error(data.error || `Commit failed (HTTP ${resp.status})`);
+      }
+      await new Promise(r => setTimeout(r, 500));
     }
+    if (entry.status !== 'done') throw new Error('Upload did not complete');
   }
 
   /* ── Upload ALL pending files sequentially ───────────────────── */
@@ -130,6 +181,7 @@ const VideoUpload = (() => {
 
     for (let idx = 0; idx < _pendingFiles.length; idx++) {
       const entry = _pendingFiles[idx];
+      if (entry.status === 'done') continue; // already committed on a previous attempt
       const label = _pendingFiles.length > 1
         ? `File ${idx + 1}/${_pendingFiles.length}: ${entry.file.name}`
         : entry.file.name;